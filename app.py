@@ -8,15 +8,18 @@ Flask 애플리케이션 메인 파일
 - services/ : 비즈니스 로직
 - utils/ : 데이터베이스 및 인프라
 """
-from flask import Flask, send_from_directory, session
+from flask import Flask, session, abort, redirect, url_for
 import logging
 
 from config import config
 from routes import register_blueprints
 from utils.firebase_auth import initialize_firebase
-from utils.user_manager import is_admin
+from utils.user_manager import is_admin, can_access_meeting
+from utils.decorators import login_required
 from utils.db_manager import DatabaseManager
-from utils.vector_db_manager import vdb_manager
+from services.cleanup_service import cleanup_service
+from services.vector_sync_service import vector_sync_service
+from utils.service_container import services
 
 # ==================== 로깅 설정 ====================
 logging.basicConfig(
@@ -48,11 +51,17 @@ except Exception as e:
 # DatabaseManager 인스턴스 생성
 db = DatabaseManager(str(config.DATABASE_PATH))
 
-# VectorDBManager에 DatabaseManager 주입
-vdb_manager.db_manager = db
-
 logger.info("✅ 데이터베이스 매니저 초기화 완료")
 
+# 삭제된 회의의 벡터/파일 정리 (이전 실행에서 남은 항목도 이어서 처리)
+cleanup_service.start()
+
+# SQLite 변경분을 벡터 DB에 반영 + 주기적 정합성 검사 (이전 실행에서 남은 항목도 이어서 처리)
+vector_sync_service.start()
+
+# 지연 초기화 서비스 중 WARMUP_SERVICES에 지정된 것만 백그라운드에서 미리 생성 (기본값: 없음, 첫 사용 시 생성)
+services.warm_up(config.WARMUP_SERVICES)
+
 
 # ==================== Context Processor ====================
 @app.context_processor
@@ -88,9 +97,11 @@ register_blueprints(app)
 
 # ==================== 정적 파일 라우트 ====================
 @app.route("/uploads/<path:filename>")
+@login_required
 def uploaded_file(filename):
     """
-    업로드된 파일 제공 (오디오 파일 스트리밍)
+    업로드된 파일 제공 (이전 버전 링크 호환용)
+    새 화면은 권한 확인/Range/ETag를 지원하는 /media/<meeting_id>/audio를 사용합니다.
 
     Args:
         filename: 파일명
@@ -98,7 +109,14 @@ def uploaded_file(filename):
     Returns:
         파일 데이터
     """
-    return send_from_directory(str(config.UPLOAD_FOLDER), filename)
+    meeting_id = db.get_meeting_id_by_audio_file(filename)
+    if not meeting_id:
+        abort(404)
+
+    if not can_access_meeting(session['user_id'], meeting_id):
+        abort(403)
+
+    return redirect(url_for('media.stream_media', meeting_id=meeting_id))
 
 
 # ==================== 에러 핸들러 ====================
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+청킹 방식 벤치마크 스크립트 (child vs semantic)
+청킹 방식별로 청크 수/크기, 청크 응집도, 검색 품질을 비교합니다.
+
+- 기본: 합성 회의 (주제가 바뀌는 위치를 알고 있는 임베딩, OpenAI 호출 없음)
+  · 주제 순도: 청크 안에서 가장 많은 주제가 차지하는 비율
+  · 주제 경계 적중률: 실제 주제 전환 위치 중 청크 경계와 일치하는 비율
+  · 검색 품질: 주제 질의로 청크를 유사도 순으로 가져올 때, 1위 청크의 정밀도와
+    그 주제 세그먼트의 80%를 덮는 데 필요한 청크 수/그때의 정밀도 (청크 수가 적고 정밀도가 높을수록
+    같은 답변에 필요한 컨텍스트가 작음)
+- --from-db: 저장된 회의를 OpenAI로 세그먼트 임베딩하여 응집도만 비교 (정답 주제가 없으므로 검색 품질 제외)
+  · 청크 안 인접 유사도 - 청크 경계 유사도: 클수록 주제가 바뀌는 곳에서 잘 나눈 것
+
+실행 방법:
+    python benchmark_chunking.py                       # 합성 회의 50개
+    python benchmark_chunking.py --percentile 90       # semantic 분리 기준 변경
+    python benchmark_chunking.py --from-db 5           # 최근 회의 5개 (임베딩 비용 발생)
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from config import config
+from utils.chunking import child_chunk_ranges, semantic_chunk_ranges, segment_distances
+from utils.tokenizer import count_tokens_batch, pack_batches
+
+COVERAGE_TARGET = 0.8
+
+
+def make_meeting(rng, dim):
+    """
+    주제가 여러 번 바뀌는 합성 회의 (화자 교대는 주제와 무관)
+
+    Returns:
+        tuple: (segments, vectors, topics, centers)
+    """
+    centers = rng.normal(size=(rng.integers(4, 9), dim))
+    centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+
+    segments, vectors, topics = [], [], []
+    start_time, speaker = 0.0, 0
+    for topic in range(len(centers)):
+        for _ in range(rng.integers(4, 21)):
+            if rng.random() < 0.1:
+                # "네", "그렇죠" 같은 짧은 맞장구는 주제와 상관없는 임베딩
+                vector = rng.normal(size=dim)
+                length = int(rng.integers(2, 10))
+            else:
+                vector = centers[topic] + 1.2 * rng.normal(size=dim) / np.sqrt(dim)
+                length = int(rng.integers(20, 150))
+            if rng.random() < 0.4:
+                speaker = (speaker + 1) % 3
+            segments.append({'speaker_label': str(speaker), 'start_time': start_time, 'segment': "가" * length})
+            vectors.append(vector)
+            topics.append(topic)
+            start_time += float(rng.uniform(2, 15))
+    return segments, np.array(vectors, dtype=np.float32), np.array(topics), centers
+
+
+def chunk_ranges(strategy, segments, vectors, percentile):
+    lengths = [count + 1 for count in count_tokens_batch(seg['segment'] for seg in segments)]
+    start_times = [seg['start_time'] for seg in segments]
+    if strategy == "child":
+        return child_chunk_ranges(
+            lengths, start_times, config.CHILD_CHUNK_MAX_SEGMENTS, config.CHILD_CHUNK_MAX_TOKENS,
+            config.TIME_GAP_THRESHOLD_SECONDS
+        )
+    return semantic_chunk_ranges(
+        vectors, lengths, start_times,
+        min_segments=config.SEMANTIC_CHUNK_MIN_SEGMENTS,
+        max_segments=config.SEMANTIC_CHUNK_MAX_SEGMENTS,
+        max_size=config.SEMANTIC_CHUNK_MAX_TOKENS,
+        breakpoint_percentile=percentile,
+        time_gap_threshold=config.TIME_GAP_THRESHOLD_SECONDS
+    )
+
+
+def coherence(vectors, ranges):
+    """(청크 안 인접 유사도 평균, 청크 경계 인접 유사도 평균)"""
+    similarities = 1.0 - segment_distances(vectors)
+    boundary = np.zeros(len(similarities), dtype=bool)
+    boundary[[end - 1 for _, end in ranges[:-1]]] = True
+    inside = similarities[~boundary].mean() if (~boundary).any() else float("nan")
+    across = similarities[boundary].mean() if boundary.any() else float("nan")
+    return inside, across
+
+
+def retrieval(rng, vectors, topics, centers, ranges):
+    """
+    주제별 질의 → 청크 검색 품질
+
+    청크 임베딩은 세그먼트 임베딩 평균으로 근사합니다. (합성 데이터에는 청크 텍스트가 없음)
+
+    Returns:
+        tuple: (1위 청크의 세그먼트 정밀도,
+                주제 세그먼트 80%를 덮는 데 필요한 청크 수, 그 청크들의 세그먼트 정밀도) 주제 평균
+    """
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    chunk_vectors = np.array([normalized[begin:end].mean(axis=0) for begin, end in ranges])
+    chunk_vectors /= np.linalg.norm(chunk_vectors, axis=1, keepdims=True)
+    chunk_topics = [topics[begin:end] for begin, end in ranges]
+
+    results = []
+    for topic, center in enumerate(centers):
+        query = center + 0.8 * rng.normal(size=len(center)) / np.sqrt(len(center))
+        order = np.argsort(-(chunk_vectors @ (query / np.linalg.norm(query))))
+        matched = np.array([np.sum(chunk_topics[i] == topic) for i in order])
+        sizes = np.array([len(chunk_topics[i]) for i in order])
+
+        count = int(np.searchsorted(np.cumsum(matched) / np.sum(topics == topic), COVERAGE_TARGET)) + 1
+        results.append((matched[0] / sizes[0], count, matched[:count].sum() / sizes[:count].sum()))
+    return tuple(np.mean(results, axis=0))
+
+
+def run_synthetic(args, strategies):
+    rng = np.random.default_rng(args.seed)
+    meetings = [make_meeting(rng, args.dim) for _ in range(args.meetings)]
+    print(f"📊 합성 회의 {args.meetings}개, 세그먼트 {sum(len(m[0]) for m in meetings)}개, dim={args.dim}")
+    print(f"  {'방식':10} {'청크/회의':>9} {'세그/청크':>9} {'주제순도':>8} {'경계적중':>8} "
+          f"{'안-경계 유사도':>14} {'1위정밀도':>9} {'80%청크수':>9} {'80%정밀도':>9}")
+
+    for strategy in strategies:
+        stats = []
+        query_rng = np.random.default_rng(args.seed + 1)
+        for segments, vectors, topics, centers in meetings:
+            ranges = chunk_ranges(strategy, segments, vectors, args.percentile)
+            purity = np.mean([np.bincount(topics[begin:end]).max() / (end - begin) for begin, end in ranges])
+            true_boundaries = set(np.flatnonzero(np.diff(topics)) + 1)
+            hit = len(true_boundaries & {begin for begin, _ in ranges}) / max(1, len(true_boundaries))
+            inside, across = coherence(vectors, ranges)
+            top_precision, needed, precision = retrieval(query_rng, vectors, topics, centers, ranges)
+            stats.append((len(ranges), len(segments) / len(ranges), purity, hit, inside - across,
+                          top_precision, needed, precision))
+
+        means = np.nanmean(np.array(stats, dtype=np.float64), axis=0)
+        print(f"  {strategy:10} {means[0]:9.1f} {means[1]:9.2f} {means[2]:8.3f} {means[3]:8.3f} "
+              f"{means[4]:14.3f} {means[5]:9.3f} {means[6]:9.2f} {means[7]:9.3f}")
+
+
+def run_from_db(args, strategies):
+    from langchain_openai import OpenAIEmbeddings
+    from utils.db_manager import DatabaseManager
+
+    db = DatabaseManager(str(config.DATABASE_PATH))
+    embeddings = OpenAIEmbeddings()
+    meetings = db.get_all_meetings()[:args.from_db]
+    print(f"📊 저장된 회의 {len(meetings)}개 (세그먼트 임베딩: OpenAI)")
+    print(f"  {'방식':10} {'청크/회의':>9} {'세그/청크':>9} {'청크 안 유사도':>14} {'경계 유사도':>11} {'차이':>7}")
+
+    prepared = []
+    for meeting in meetings:
+        segments = db.get_segments_by_meeting_id(meeting['meeting_id'])
+        if len(segments) < 2:
+            continue
+        texts = [seg['segment'] or " " for seg in segments]
+        vectors = []
+        batches = pack_batches(count_tokens_batch(texts), config.EMBED_BATCH_MAX_TOKENS, config.EMBED_BATCH_MAX_TEXTS)
+        for begin, end in batches:
+            vectors.extend(embeddings.embed_documents(texts[begin:end]))
+        prepared.append((segments, np.array(vectors, dtype=np.float32)))
+
+    for strategy in strategies:
+        stats = []
+        for segments, vectors in prepared:
+            ranges = chunk_ranges(strategy, segments, vectors, args.percentile)
+            inside, across = coherence(vectors, ranges)
+            stats.append((len(ranges), len(segments) / len(ranges), inside, across, inside - across))
+        if not stats:
+            print("⚠️  세그먼트가 2개 이상인 회의가 없습니다.")
+            return
+        means = np.nanmean(np.array(stats, dtype=np.float64), axis=0)
+        print(f"  {strategy:10} {means[0]:9.1f} {means[1]:9.2f} {means[2]:14.3f} {means[3]:11.3f} {means[4]:7.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="청킹 방식별 응집도/검색 품질 비교")
+    parser.add_argument("--meetings", type=int, default=50, help="합성 회의 수 (기본값: 50)")
+    parser.add_argument("--dim", type=int, default=256, help="합성 임베딩 차원 (기본값: 256)")
+    parser.add_argument("--percentile", type=float, default=config.SEMANTIC_BREAKPOINT_PERCENTILE,
+                        help=f"semantic 분리 백분위 (기본값: {config.SEMANTIC_BREAKPOINT_PERCENTILE})")
+    parser.add_argument("--from-db", type=int, default=0, help="저장된 최근 회의 N개로 측정 (OpenAI 임베딩 사용)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    strategies = ("child", "semantic")
+    print("=" * 70)
+    if args.from_db:
+        run_from_db(args, strategies)
+    else:
+        run_synthetic(args, strategies)
+    print("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
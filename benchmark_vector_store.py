@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+벡터 저장소 벤치마크 스크립트
+합성 임베딩(군집된 랜덤 벡터)을 각 백엔드에 넣고 검색 지연시간과 recall@k(정확한 전체 비교 대비)를 비교합니다.
+OpenAI 임베딩을 호출하지 않으며, 임시 폴더에 저장소를 만들었다가 지웁니다.
+
+실행 방법:
+    python benchmark_vector_store.py                              # 500개 청크 (사용자 1명 규모)
+    python benchmark_vector_store.py --rows 50000 --meetings 2000 # 대규모 (numpy는 IVF 사용)
+    python benchmark_vector_store.py --backends numpy             # numpy만
+    python benchmark_vector_store.py --backends numpy --compression none,float16,int8,pca
+                                                                  # 압축 방식별 recall/지연시간/인덱스 크기 비교
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from config import config
+from utils.vector_db_manager import ChromaVectorStore, create_chroma_client
+from utils.numpy_vector_store import NumpyVectorStore, CODECS
+
+
+def make_corpus(rows, dim, meetings, seed):
+    """회의별로 주제가 모인 합성 임베딩과 메타데이터 생성"""
+    rng = np.random.default_rng(seed)
+    topics = rng.normal(size=(max(1, rows // 20), dim))
+    vectors = topics[rng.integers(0, len(topics), rows)] + 0.6 * rng.normal(size=(rows, dim))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    ids = [f"bench_{i}" for i in range(rows)]
+    metadatas = [{"meeting_id": f"m{i % meetings}", "chunk_index": i // meetings} for i in range(rows)]
+    return ids, vectors.astype(np.float32), metadatas
+
+
+def make_scenarios(meetings, rng):
+    """(이름, where 생성 함수) 목록"""
+    def accessible(count):
+        return {"meeting_id": {"$in": [f"m{i}" for i in rng.choice(meetings, min(count, meetings), replace=False)]}}
+
+    return [
+        ("전체", lambda: None),
+        ("회의 1개", lambda: {"meeting_id": f"m{rng.integers(meetings)}"}),
+        ("접근 가능 회의 10개", lambda: accessible(10)),
+    ]
+
+
+def exact_top_k(vectors, metadatas, query, k, where):
+    """정답: 조건에 맞는 행 전체와 정확히 비교한 상위 k개 행 번호"""
+    if where is None:
+        rows = np.arange(len(vectors))
+    else:
+        clause = where["meeting_id"]
+        wanted = set(clause["$in"]) if isinstance(clause, dict) else {clause}
+        rows = np.array([i for i, metadata in enumerate(metadatas) if metadata["meeting_id"] in wanted])
+    scores = vectors[rows] @ query
+    return set(rows[np.argsort(-scores)[:k]].tolist())
+
+
+def open_store(backend, directory):
+    if backend == "numpy":
+        return NumpyVectorStore(Path(directory) / "numpy", "bench", embedding_function=None)
+    if backend == "chroma":
+        client = create_chroma_client("embedded", str(Path(directory) / "chroma"))
+        return ChromaVectorStore(client, "bench", embedding_function=None)
+    raise ValueError(f"알 수 없는 백엔드: {backend}")
+
+
+def run_backend(backend, corpus, queries, k, meetings, seed, codec="none"):
+    """
+    Returns:
+        tuple: (저장 시간(초), 검색 행렬 크기(bytes), [(시나리오, p50, p95, recall), ...])
+    """
+    ids, vectors, metadatas = corpus
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        store = open_store(backend, directory)
+
+        started = time.perf_counter()
+        for begin in range(0, len(ids), 1000):
+            end = begin + 1000
+            store.add(ids[begin:end], [""] * len(ids[begin:end]), metadatas[begin:end], embeddings=vectors[begin:end])
+        if codec != "none":
+            store.build_compressed_index(codec)
+        insert_seconds = time.perf_counter() - started
+        # Chroma는 HNSW 인덱스 크기를 알 수 없으므로 원본 float32 크기로 표시
+        index_bytes = store.index_stats()['search_bytes'] if backend == "numpy" else vectors.nbytes
+
+        rng = np.random.default_rng(seed)
+        for name, make_where in make_scenarios(meetings, rng):
+            # 첫 검색(캐시/인덱스 준비)은 측정에서 제외
+            store.similarity_search_by_vector_with_score(queries[0], k=k, where=make_where())
+
+            latencies = []
+            recall = 0.0
+            for query in queries:
+                where = make_where()
+                started = time.perf_counter()
+                found = store.similarity_search_by_vector_with_score(query, k=k, where=where)
+                latencies.append((time.perf_counter() - started) * 1000)
+
+                truth = exact_top_k(vectors, metadatas, query, k, where)
+                found_rows = {int(doc.id.split("_")[1]) for doc, _ in found}
+                recall += len(truth & found_rows) / max(1, len(truth))
+
+            results.append((name, np.percentile(latencies, 50), np.percentile(latencies, 95), recall / len(queries)))
+    return insert_seconds, index_bytes, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="벡터 저장소 검색 지연시간/recall 비교")
+    parser.add_argument("--rows", type=int, default=500, help="청크 수 (기본값: 500)")
+    parser.add_argument("--dim", type=int, default=1536, help="임베딩 차원 (기본값: 1536, text-embedding-ada-002)")
+    parser.add_argument("--meetings", type=int, default=25, help="회의 수 (기본값: 25)")
+    parser.add_argument("--queries", type=int, default=200, help="시나리오별 쿼리 수 (기본값: 200)")
+    parser.add_argument("-k", type=int, default=5, help="검색 결과 수 (기본값: 5)")
+    parser.add_argument("--backends", default="numpy,chroma", help="비교할 백엔드 (기본값: numpy,chroma)")
+    parser.add_argument("--compression", default="none", help=f"numpy 압축 방식 목록 ({', '.join(CODECS)}, 기본값: none)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.rows, args.dim, args.meetings, args.seed)
+    rng = np.random.default_rng(args.seed + 1)
+    queries = corpus[1][rng.integers(0, args.rows, args.queries)] + 0.05 * rng.normal(size=(args.queries, args.dim))
+    queries = (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(np.float32)
+
+    print("=" * 70)
+    print(f"📊 벡터 저장소 벤치마크: {args.rows}개 청크, {args.meetings}개 회의, dim={args.dim}, k={args.k}")
+    print("=" * 70)
+
+    runs = []
+    for backend in [name.strip() for name in args.backends.split(",") if name.strip()]:
+        codecs = [name.strip() for name in args.compression.split(",") if name.strip()] if backend == "numpy" else ["none"]
+        runs.extend((backend, codec) for codec in codecs)
+
+    for backend, codec in runs:
+        label = backend if codec == "none" else f"{backend}[{codec}]"
+        try:
+            insert_seconds, index_bytes, results = run_backend(
+                backend, corpus, queries, args.k, args.meetings, args.seed, codec
+            )
+        except ImportError as e:
+            print(f"\n⚠️  {label}: 라이브러리를 불러올 수 없어 건너뜁니다 ({e})")
+            continue
+
+        print(f"\n🗄️  {label} (저장 {insert_seconds:.2f}초, 검색 행렬 {index_bytes / 1e6:.1f}MB)")
+        print(f"  {'시나리오':20} {'p50 ms':>9} {'p95 ms':>9} {f'recall@{args.k}':>10}")
+        for name, p50, p95, recall in results:
+            # recall이 NUMPY_RECALL_TOLERANCE보다 많이 떨어지면 표시
+            marker = "  ⚠️" if recall < 1.0 - config.NUMPY_RECALL_TOLERANCE else ""
+            print(f"  {name:20} {p50:9.3f} {p95:9.3f} {recall:10.3f}{marker}")
+
+    print("=" * 70)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
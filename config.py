@@ -24,6 +24,8 @@ class Config:
     UPLOAD_FOLDER = BASE_DIR / "uploads"
     DATABASE_FOLDER = BASE_DIR / "database"
     DATABASE_PATH = DATABASE_FOLDER / "minute_ai.db"
+    MEDIA_FOLDER = UPLOAD_FOLDER / "media"  # 파형 peaks, 재생용 변환본 등 파생 파일
+    COLD_STORAGE_FOLDER = Path(os.getenv('COLD_STORAGE_FOLDER', str(BASE_DIR / "cold_storage")))  # 원본 보관용 (저비용 스토리지 마운트 경로)
 
     # ==================== Flask 설정 ====================
     SECRET_KEY: str = os.getenv('FLASK_SECRET_KEY', '')
@@ -48,21 +50,197 @@ class Config:
     MAX_FILE_SIZE_MB: int = 500
     UPLOAD_TIMEOUT_SECONDS: int = 1200  # 20분
 
+    # ==================== ffmpeg 실행 설정 ====================
+    FFMPEG_MAX_PROCESSES: int = int(os.getenv('FFMPEG_MAX_PROCESSES', str(max(1, (os.cpu_count() or 2) // 2))))
+    FFMPEG_THREADS_PER_PROCESS: int = 2  # 프로세스당 인코딩/필터 스레드 수
+    FFMPEG_NICENESS: int = 10  # 웹 요청 처리보다 낮은 우선순위 (0이면 조정 안 함)
+    FFMPEG_QUEUE_TIMEOUT_SECONDS: int = 600  # 실행 슬롯 최대 대기 시간
+    FFMPEG_STREAMABLE_EXTENSIONS: Set[str] = {"wav", "mp3", "flac"}  # 업로드 스트림을 바로 전달할 수 있는 형식
+
+    # ==================== 미디어 제공 설정 ====================
+    MEDIA_CACHE_MAX_AGE_SECONDS: int = 86400  # 브라우저 캐시 유지 시간 (파일명이 고유하므로 내용 불변)
+    WAVEFORM_SAMPLE_RATE: int = 8000  # 파형 계산용 디코딩 샘플레이트
+    WAVEFORM_PEAKS_PER_SECOND: int = 20  # 가장 세밀한 레벨의 초당 peak 수
+    WAVEFORM_LEVELS: int = 4  # 해상도 레벨 수 (레벨마다 1/4로 축소)
+    PLAYBACK_RENDITION_ENABLED: bool = os.getenv('PLAYBACK_RENDITION_ENABLED', 'True').lower() == 'true'
+    PLAYBACK_AUDIO_BITRATE: str = "48k"  # 재생용 AAC 모노 비트레이트 (음성 기준)
+    PLAYBACK_VIDEO_HEIGHT: int = 360  # 재생용 비디오 높이 (비디오 업로드만 해당)
+    PLAYBACK_VIDEO_CRF: int = 30  # 재생용 H.264 화질 (높을수록 작음)
+    PLAYBACK_HLS_ENABLED: bool = os.getenv('PLAYBACK_HLS_ENABLED', 'False').lower() == 'true'
+    PLAYBACK_HLS_SEGMENT_SECONDS: int = 10
+    MOVE_ORIGINAL_TO_COLD_STORAGE: bool = os.getenv('MOVE_ORIGINAL_TO_COLD_STORAGE', 'True').lower() == 'true'
+
+    # ==================== 오디오 전처리 설정 ====================
+    AUDIO_PREPROCESS_ENABLED: bool = os.getenv('AUDIO_PREPROCESS_ENABLED', 'True').lower() == 'true'
+    AUDIO_SILENCE_THRESHOLD_DB: int = -35  # 이 음량 이하를 무음으로 판단
+    AUDIO_SILENCE_MIN_SECONDS: float = 2.0  # 이 길이 이상의 무음만 제거 대상
+    AUDIO_SILENCE_KEEP_SECONDS: float = 0.5  # 중간 무음을 제거할 때 남겨둘 길이 (발화 경계 보존)
+    AUDIO_LOUDNORM_TARGET_LUFS: int = -16  # 음량 정규화 목표
+    AUDIO_TARGET_SAMPLE_RATE: int = 16000
+    AUDIO_TARGET_BITRATE: str = "24k"  # Opus 모노 음성용 비트레이트
+
     # ==================== STT 설정 ====================
     DEFAULT_TIME_INCREMENT_SECONDS: float = 5.0
+    STT_SEGMENT_FLUSH_SIZE: int = 20  # 스트리밍 STT 중 세그먼트를 DB에 나눠 저장하는 단위
+
+    # ==================== 벡터 DB 설정 ====================
+    # embedded: 프로세스 안에서 VECTOR_DB_PATH를 직접 여는 PersistentClient (워커 1개일 때만 안전)
+    # http: Chroma 서버에 접속 (여러 워커/호스트가 같은 인덱스 공유)
+    #       로컬/테스트용 서버: chroma run --path ./database/vector_db --port 8000
+    VECTOR_DB_MODE: str = os.getenv('VECTOR_DB_MODE', 'embedded')
+    VECTOR_DB_PATH = DATABASE_FOLDER / "vector_db"
+    CHROMA_HOST: str = os.getenv('CHROMA_HOST', 'localhost')
+    CHROMA_PORT: int = int(os.getenv('CHROMA_PORT', '8000'))
+    CHROMA_SSL: bool = os.getenv('CHROMA_SSL', 'False').lower() == 'true'
+    CHROMA_AUTH_TOKEN: str = os.getenv('CHROMA_AUTH_TOKEN', '')  # 서버 토큰 인증 사용 시
+    CHROMA_HEALTHCHECK_INTERVAL_SECONDS: int = 30  # heartbeat 결과 재사용 시간
+
+    # ==================== 벡터 저장소 백엔드 설정 ====================
+    # chroma: ChromaDB (위 VECTOR_DB_MODE 사용)
+    # numpy: 프로세스 안의 메모리 매핑 행렬 + 회의별 파티션 (소규모 설치용, embedded 모드처럼 워커 1개일 때만 안전)
+    VECTOR_STORE_BACKEND: str = os.getenv('VECTOR_STORE_BACKEND', 'chroma')
+    NUMPY_VECTOR_PATH = DATABASE_FOLDER / "vector_numpy"
+    NUMPY_PARTITION_KEY: str = 'meeting_id'  # 이 메타데이터 값별로 행을 묶어, 회의로 제한한 검색은 해당 행만 계산
+    NUMPY_IVF_MIN_ROWS: int = 20000  # 후보 행이 이 수 이상이면 IVF 근사 검색 (미만은 전체 비교)
+    NUMPY_IVF_NPROBE: int = 8  # IVF 검색 시 탐색할 클러스터 수
+    NUMPY_IVF_TRAIN_ITERATIONS: int = 10  # IVF 클러스터(k-means) 학습 반복 횟수
+    NUMPY_COMPACT_MIN_DEAD_ROWS: int = 1000  # 삭제된 행이 이 수 이상이고 절반을 넘으면 행렬 파일 압축
+    # 압축 인덱스: none, float16(메모리 1/2), int8(1/4), pca/truncate(NUMPY_REDUCED_DIMENSIONS 차원으로 축소)
+    # 설정을 바꾼 뒤 python migrate_vector_index.py로 변환 (truncate는 text-embedding-3 계열 임베딩에서만 사용)
+    # float16/int8은 메모리만 줄고 풀어서 계산하는 비용이 있으므로 지연시간은 benchmark_vector_store.py --compression으로 확인
+    NUMPY_VECTOR_COMPRESSION: str = os.getenv('NUMPY_VECTOR_COMPRESSION', 'none')
+    NUMPY_REDUCED_DIMENSIONS: int = 256  # pca/truncate 축소 차원
+    NUMPY_RESCORE_CANDIDATES: int = 100  # 압축 인덱스로 고른 뒤 원본 벡터로 다시 계산할 후보 수 (최소 k의 4배)
+    NUMPY_RECALL_TOLERANCE: float = 0.02  # 변환 시 허용하는 recall@5 하락폭 (넘으면 변환 취소)
 
     # ==================== 청킹(Chunking) 설정 ====================
-    CHUNK_SIZE: int = 1000  # 텍스트 청크 최대 크기
-    CHUNK_OVERLAP: int = 200  # 청크 중복 크기
+    # 청크 크기는 토큰 수 기준 (utils/tokenizer.py, 임베딩 모델과 같은 인코딩)
+    TOKENIZER_ENCODING: str = 'cl100k_base'  # text-embedding-ada-002 / text-embedding-3 계열
+    CHUNK_SIZE: int = 512  # 폴백 분할(RecursiveCharacterTextSplitter) 청크 최대 토큰 수
+    CHUNK_OVERLAP: int = 64  # 폴백 분할 청크 중복 토큰 수
     TIME_GAP_THRESHOLD_SECONDS: int = 60  # 화자 변경 인식 기준 (초)
+    # 부모-자식 검색: 세그먼트 몇 개짜리 자식 청크로 검색하고, 답변에는 앞뒤 세그먼트를 붙인 부모 구간을 사용
+    CHILD_CHUNK_MAX_SEGMENTS: int = 3  # 자식 청크 하나에 묶는 최대 세그먼트 수
+    CHILD_CHUNK_MAX_TOKENS: int = 256  # 자식 청크 최대 토큰 수 (이보다 긴 세그먼트는 단독 청크)
+    PARENT_CONTEXT_SEGMENTS: int = 4  # 부모 구간: 자식 청크 앞뒤로 붙이는 세그먼트 수
+    PARENT_MAX_SEGMENTS: int = 40  # 겹쳐서 합쳐진 부모 구간 하나의 최대 세그먼트 수
+    PARENT_MAX_TOKENS: int = 1500  # 부모 구간 하나의 최대 토큰 수 (검색된 자식 청크는 항상 포함, 앞뒤 문맥을 줄임)
+    # 자식 청크 방식 (utils/chunking.py, 바꾼 뒤 새로 저장/재색인되는 회의부터 적용)
+    # child: 세그먼트 수/토큰 수 기준 (CHILD_CHUNK_MAX_SEGMENTS, CHILD_CHUNK_MAX_TOKENS, 임베딩 불필요)
+    # semantic: 인접 세그먼트 임베딩 거리가 튀는 곳(주제 전환)에서 분리 (세그먼트 임베딩 비용 추가)
+    # 비교: python benchmark_chunking.py
+    CHUNKING_STRATEGY: str = os.getenv('CHUNKING_STRATEGY', 'child')
+    SEMANTIC_CHUNK_MIN_SEGMENTS: int = 2  # 주제 전환 위치에서 자를 때 청크의 최소 세그먼트 수
+    SEMANTIC_CHUNK_MAX_SEGMENTS: int = 8  # semantic 청크 최대 세그먼트 수
+    SEMANTIC_CHUNK_MAX_TOKENS: int = 512  # semantic 청크 최대 토큰 수
+    SEMANTIC_BREAKPOINT_PERCENTILE: float = 80  # 회의 안에서 이 백분위 이상인 거리 봉우리를 주제 전환으로 판단
+    # 임베딩 요청 묶음 (청크/세그먼트를 순서대로 토큰 합 기준으로 묶어서 요청)
+    EMBED_BATCH_MAX_TOKENS: int = 100000  # 요청당 최대 토큰 합 (OpenAI 한도 300,000 이하)
+    EMBED_BATCH_MAX_TEXTS: int = 1000  # 요청당 최대 텍스트 수
 
     # ==================== 검색 설정 ====================
     SEARCH_RESULTS_PER_COLLECTION: int = 3  # 컬렉션당 검색 결과 수
     SEARCH_MULTIPLIER: int = 10  # 검색 결과 배수
+    CHILD_SEARCH_RESULTS: int = 5  # 챗봇이 사용하는 자식 청크 수 (부모 구간으로 넓힌 뒤 겹치는 구간은 합침)
+    # 챗봇 검색 소스별 결과 수 (ChatManager.retrieval_sources의 키, 없는 소스는 SEARCH_RESULTS_PER_COLLECTION)
+    RETRIEVAL_SOURCE_QUOTAS: dict = {"chunks": CHILD_SEARCH_RESULTS, "subtopics": SEARCH_RESULTS_PER_COLLECTION}
+    RETRIEVAL_DEADLINE_SECONDS: float = float(os.getenv('RETRIEVAL_DEADLINE_SECONDS', '10'))  # 이 시간 안에 끝나지 않은 검색 소스는 제외
+    RETRIEVAL_MAX_WORKERS: int = 8  # 검색 소스를 동시에 실행하는 스레드 수 (요청 간 공유)
+    RETRIEVAL_MAX_INFLIGHT_PER_SOURCE: int = 4  # 소스별 동시 실행 상한 (시간 초과로 남은 검색 포함, 소스 수 x 상한 <= 스레드 수)
+    # 재순위(utils/reranker.py): 후보를 넉넉하게 가져와 MMR/중복 제거 후 토큰 예산 안에서 선택
+    RERANK_ENABLED: bool = os.getenv('RERANK_ENABLED', 'True').lower() == 'true'
+    RERANK_CANDIDATE_MULTIPLIER: int = 4  # 소스별 할당량의 몇 배를 후보로 가져올지
+    RERANK_MMR_LAMBDA: float = 0.7  # 1에 가까울수록 관련도, 0에 가까울수록 다양성 우선
+    RERANK_DUPLICATE_THRESHOLD: float = 0.95  # 이미 고른 결과와 코사인 유사도가 이 이상이면 중복으로 제외
+    RERANK_TOKEN_BUDGET: int = 3000  # 선택한 청크/요약의 토큰 합 상한 (부모 구간 확장 전 기준)
+    # cross-encoder: '' (사용 안 함), 'onnx' (Hugging Face Hub ONNX 모델, onnxruntime CPU)
+    RERANK_CROSS_ENCODER: str = os.getenv('RERANK_CROSS_ENCODER', '')
+    RERANK_CROSS_ENCODER_MODEL: str = os.getenv('RERANK_CROSS_ENCODER_MODEL', 'cross-encoder/mmarco-mMiniLMv2-L12-H384-v1')
+    RERANK_CROSS_ENCODER_ONNX_FILE: str = 'onnx/model.onnx'  # 모델 저장소 안의 ONNX 파일 경로
+    RERANK_CROSS_ENCODER_THREADS: int = 2  # cross-encoder 추론 스레드 수
+    NOTE_SEARCH_DEFAULT_LIMIT: int = 20  # 키워드 노트 검색 기본 결과 수
+    NOTE_SEARCH_MAX_LIMIT: int = 100  # 키워드 노트 검색 최대 결과 수
+    NOTE_SEARCH_SNIPPET_CHARS: int = 40  # 검색어 앞뒤로 보여줄 글자 수
+
+    # ==================== 셀프 쿼리(필터 추출) 설정 ====================
+    # 날짜/따옴표 제목/알려진 회의 제목은 규칙으로 찾고, 못 찾았을 때만 LLM으로 필터 추출
+    SELF_QUERY_LLM_FALLBACK: bool = os.getenv('SELF_QUERY_LLM_FALLBACK', 'True').lower() == 'true'
+    SELF_QUERY_LLM_CUES: tuple = ("회의", "미팅", "노트", "회의록", "제목", "날짜", "지난", "저번", "이번 주", "최근", "언제")  # 이 표현이 있을 때만 LLM 호출
+    SELF_QUERY_MIN_TITLE_CHARS: int = 2  # 질문 속 회의 제목으로 인정할 최소 글자 수 (짧은 제목 오탐 방지)
+    SELF_QUERY_TITLE_INDEX_TTL_SECONDS: int = 60  # 회의 제목 인덱스를 다시 읽는 주기
+    SELF_QUERY_CACHE_SIZE: int = 1024  # LLM 필터 추출 결과 캐시 크기 (컬렉션, 질문 단위)
+    SELF_QUERY_CACHE_TTL_SECONDS: int = 3600  # LLM 필터 추출 결과 캐시 유지 시간
+
+    # ==================== 노트 목록 설정 ====================
+    NOTES_PAGE_SIZE: int = 50  # 노트 목록 한 페이지 크기
+    NOTES_MAX_PAGE_SIZE: int = 200  # 노트 목록 최대 페이지 크기
+    NOTES_DELTA_SKEW_SECONDS: int = 2  # 변경분 조회 시 다음 기준 시각을 앞당기는 여유 (동시 쓰기 누락 방지)
+    NOTES_DELETION_RETENTION_DAYS: int = 30  # 삭제 기록 보관 기간 (변경분 조회용)
+
+    # ==================== 모델 라우팅 설정 ====================
+    MODEL_ROUTING_ENABLED: bool = os.getenv('MODEL_ROUTING_ENABLED', 'True').lower() == 'true'
+    ROUTING_STT_FLASH_MAX_AUDIO_SECONDS: int = 900  # 15분 이하 오디오는 flash
+    ROUTING_SUMMARY_FLASH_MAX_CHARS: int = 8000  # 스크립트 8000자 이하 요약은 flash
+    ROUTING_MINUTES_FLASH_MAX_CHARS: int = 12000  # 스크립트+요약 12000자 이하 회의록은 flash
+    ROUTING_CHAT_FLASH_MAX_CHARS: int = 30000  # 챗봇 컨텍스트 30000자 초과 시 pro
+    ROUTING_SLO_SECONDS: dict = {  # 작업별 지연시간 목표 (초)
+        'stt': 600,
+        'summary': 90,
+        'minutes': 120,
+        'chat': 20,
+    }
+    CIRCUIT_BREAKER_WINDOW: int = 20  # 최근 요청 기록 수
+    CIRCUIT_BREAKER_MIN_REQUESTS: int = 5  # 판단에 필요한 최소 요청 수
+    CIRCUIT_BREAKER_FAILURE_RATE: float = 0.5  # 실패/SLO 초과 비율 임계값
+    CIRCUIT_BREAKER_COOLDOWN_SECONDS: int = 60  # OPEN 상태 유지 시간
+
+    # ==================== LLM 작업 중복 방지 설정 ====================
+    JOB_LEASE_SECONDS: int = 60  # 리스 만료 시간 (리더가 주기적으로 연장)
+    JOB_WAIT_TIMEOUT_SECONDS: int = 1200  # 백그라운드 처리에서 진행 중인 작업 결과 최대 대기 시간 (20분, 요청은 기다리지 않고 202 응답)
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0  # 다른 워커의 결과 폴링 간격
+    JOB_RESULT_RETENTION_SECONDS: int = 3600  # 완료된 리스 기록 보관 시간
 
     # ==================== 관리자 설정 ====================
     ADMIN_EMAILS: list = os.getenv('ADMIN_EMAILS', '').split(',') if os.getenv('ADMIN_EMAILS') else []
 
+    # ==================== DB 마이그레이션 설정 ====================
+    DB_MIGRATION_BATCH_SIZE: int = 500  # 데이터 채우기(backfill) 배치 크기 (배치마다 커밋)
+    DB_MIGRATION_BATCH_PAUSE_SECONDS: float = 0.05  # 배치 사이 대기 시간 (다른 요청의 쓰기에 잠금 양보)
+
+    # ==================== 삭제 정리 작업 설정 ====================
+    CLEANUP_INTERVAL_SECONDS: int = 30  # 정리 대기열 확인 주기
+    CLEANUP_BATCH_SIZE: int = 20  # 한 번에 처리할 삭제 건수
+    CLEANUP_LEASE_SECONDS: int = 300  # 처리 중인 항목을 다른 프로세스가 가져가지 않는 시간
+    CLEANUP_RETRY_BASE_SECONDS: int = 30  # 실패 시 첫 재시도 대기 시간 (이후 2배씩 증가)
+    CLEANUP_MAX_BACKOFF_SECONDS: int = 3600  # 최대 재시도 대기 시간
+
+    # ==================== 전사 조회 설정 ====================
+    TRANSCRIPT_WINDOW_SIZE: int = 200  # 뷰어가 한 번에 불러오는 세그먼트 수
+    TRANSCRIPT_WINDOW_MAX_SIZE: int = 1000
+
+    # ==================== 화자 통계 설정 ====================
+    SPEAKER_STATS_CHARS_PER_SECOND: float = 6.0  # 발화 길이 추정용 말하기 속도 (마지막 발화, 끼어들기 판정)
+    SPEAKER_STATS_MAX_SEGMENT_SECONDS: float = 30.0  # 다음 발화까지 간격이 이보다 길면 침묵으로 보고 잘라냄
+
+    # ==================== 벡터 DB 동기화 설정 ====================
+    VECTOR_SYNC_INTERVAL_SECONDS: int = 10  # 반영 대기열 확인 주기
+    VECTOR_SYNC_BATCH_SIZE: int = 20  # 한 번에 처리할 반영 작업 수
+    VECTOR_SYNC_LEASE_SECONDS: int = 600  # 처리 중인 작업을 다른 작업자가 가져가지 않는 시간 (임베딩 포함)
+    VECTOR_SYNC_RETRY_BASE_SECONDS: int = 15  # 실패 시 첫 재시도 대기 시간 (이후 2배씩 증가)
+    VECTOR_SYNC_MAX_BACKOFF_SECONDS: int = 3600  # 최대 재시도 대기 시간
+    VECTOR_RECONCILE_INTERVAL_SECONDS: int = 3600  # SQLite ↔ ChromaDB 정합성 검사 주기
+    VECTOR_RECONCILE_GRACE_SECONDS: int = 600  # 생성 직후(STT 저장 중)인 회의는 청크 누락 검사에서 제외
+    CHILD_REINDEX_BATCH_LIMIT: int = 20  # 이전 방식 청크 재색인 요청 1회에 등록할 최대 회의 수 (관리자 요청 시에만 실행)
+
+    # ==================== 권한 캐시 설정 ====================
+    # 프로세스별 캐시이므로 다른 워커의 공유 해제/삭제는 최대 TTL만큼 늦게 반영됨
+    ACCESS_CACHE_TTL_SECONDS: int = 30
+
+    # ==================== 서비스 초기화 설정 ====================
+    # 외부 클라이언트를 만드는 서비스는 처음 사용할 때 생성 (utils/service_container.py)
+    # 첫 요청 지연을 없애려면 시작 직후 백그라운드에서 미리 생성할 서비스를 지정 (예: vdb_manager,chat_manager)
+    WARMUP_SERVICES: list = [name.strip() for name in os.getenv('WARMUP_SERVICES', '').split(',') if name.strip()]
+
     # ==================== 로깅 설정 ====================
     LOG_LEVEL: str = os.getenv('LOG_LEVEL', 'INFO')
     LOG_FORMAT: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -104,6 +282,8 @@ class Config:
         """필요한 디렉토리 생성"""
         cls.UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
         cls.DATABASE_FOLDER.mkdir(parents=True, exist_ok=True)
+        cls.MEDIA_FOLDER.mkdir(parents=True, exist_ok=True)
+        cls.COLD_STORAGE_FOLDER.mkdir(parents=True, exist_ok=True)
 
     @classmethod
     def print_config_status(cls, show_secrets: bool = False):
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+벡터 인덱스 변환 스크립트 (numpy 백엔드)
+- 압축 인덱스(float16/int8 양자화, PCA/truncate 차원 축소)를 만들거나 해제합니다.
+- 변환 후 recall@5를 측정해 NUMPY_RECALL_TOLERANCE보다 많이 떨어지면 이전 방식으로 되돌립니다.
+- --from-chroma: 기존 Chroma 컬렉션의 문서/메타데이터/임베딩을 numpy 저장소로 복사합니다. (임베딩 재계산 없음)
+  복사 후 .env에 VECTOR_STORE_BACKEND=numpy를 설정하고 서버를 다시 시작하세요.
+
+서버(워커)를 멈춘 상태에서 실행하세요. (numpy 저장소는 한 프로세스에서만 열 수 있음)
+
+실행 방법:
+    python migrate_vector_index.py                 # NUMPY_VECTOR_COMPRESSION 설정으로 변환
+    python migrate_vector_index.py --codec int8    # 방식 지정 (none, float16, int8, pca, truncate)
+    python migrate_vector_index.py --codec none    # 압축 인덱스 삭제 (원본 행렬만 사용)
+    python migrate_vector_index.py --from-chroma   # Chroma → numpy 복사 후 변환
+    python migrate_vector_index.py --status        # 현재 인덱스 정보만 출력
+"""
+
+import argparse
+import sys
+
+from config import config
+from utils.vector_db_manager import VectorDBManager, ChromaVectorStore, create_chroma_client
+from utils.numpy_vector_store import NumpyVectorStore, CODECS
+
+COPY_BATCH_SIZE = 1000
+
+
+def open_stores():
+    """컬렉션별 numpy 저장소 (임베딩 함수 없이 열기)"""
+    return {
+        key: NumpyVectorStore(config.NUMPY_VECTOR_PATH / name, name, embedding_function=None)
+        for key, name in VectorDBManager.COLLECTION_NAMES.items()
+    }
+
+
+def print_stats(stores):
+    for key, store in stores.items():
+        stats = store.index_stats()
+        ratio = stats['full_bytes'] / stats['search_bytes'] if stats['search_bytes'] else 1.0
+        print(
+            f"  {store.name:18} 압축={stats['codec']:8} 문서 {stats['alive']:>7}개  "
+            f"검색 행렬 {stats['search_bytes'] / 1e6:8.1f}MB (원본 {stats['full_bytes'] / 1e6:.1f}MB, {ratio:.1f}배 축소)"
+        )
+
+
+def copy_from_chroma(stores):
+    """Chroma 컬렉션 → numpy 저장소 복사 (같은 id는 교체)"""
+    client = create_chroma_client(config.VECTOR_DB_MODE, str(config.VECTOR_DB_PATH))
+    for key, store in stores.items():
+        source = ChromaVectorStore(client, store.name, embedding_function=None)
+        total = source.count()
+        copied = 0
+        while copied < total:
+            batch = source.get(include=["documents", "metadatas", "embeddings"], limit=COPY_BATCH_SIZE, offset=copied)
+            if not batch['ids']:
+                break
+            store.add(batch['ids'], batch['documents'], batch['metadatas'], embeddings=batch['embeddings'])
+            copied += len(batch['ids'])
+            print(f"  📥 {store.name}: {copied}/{total}")
+        print(f"✅ {store.name}: Chroma에서 {copied}개 복사")
+
+
+def convert(store, codec, dimensions, force):
+    """
+    압축 방식 변환 후 recall 확인 (허용 범위를 넘으면 이전 방식으로 복구)
+
+    Returns:
+        bool: 변환 유지 여부
+    """
+    previous = store.index_stats()['codec']
+    if not store.count():
+        # 압축 파라미터는 저장된 벡터로 학습하므로 문서가 생긴 뒤 다시 실행
+        print(f"ℹ️  {store.name}: 문서가 없어 건너뜁니다. (문서 저장 후 다시 실행)")
+        return True
+
+    baseline = store.evaluate_recall(k=5)
+    store.build_compressed_index(codec, dimensions)
+    result = store.evaluate_recall(k=5)
+    drop = baseline['recall'] - result['recall']
+
+    print(
+        f"  {store.name}: {previous} → {codec}  recall@5 {baseline['recall']:.3f} → {result['recall']:.3f}  "
+        f"검색 {baseline['avg_ms']:.2f}ms → {result['avg_ms']:.2f}ms"
+    )
+    if drop > config.NUMPY_RECALL_TOLERANCE and not force:
+        print(f"❌ {store.name}: recall 하락({drop:.3f})이 허용 범위({config.NUMPY_RECALL_TOLERANCE})를 넘어 {previous}(으)로 되돌립니다. (--force로 유지)")
+        store.build_compressed_index(previous, dimensions)
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="numpy 벡터 인덱스 압축 변환")
+    parser.add_argument("--codec", choices=CODECS, default=None, help="압축 방식 (기본값: NUMPY_VECTOR_COMPRESSION 설정)")
+    parser.add_argument("--dimensions", type=int, default=None, help="pca/truncate 축소 차원 (기본값: NUMPY_REDUCED_DIMENSIONS)")
+    parser.add_argument("--from-chroma", action="store_true", help="Chroma 컬렉션을 먼저 복사")
+    parser.add_argument("--force", action="store_true", help="recall이 허용 범위를 넘어도 변환 유지")
+    parser.add_argument("--status", action="store_true", help="현재 인덱스 정보만 출력")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("🔧 벡터 인덱스 변환")
+    print("=" * 70)
+
+    stores = open_stores()
+    print("📌 현재 상태:")
+    print_stats(stores)
+    if args.status:
+        return 0
+
+    if args.from_chroma:
+        print("\n📥 Chroma에서 복사:")
+        copy_from_chroma(stores)
+
+    codec = args.codec or config.NUMPY_VECTOR_COMPRESSION
+    print(f"\n🔄 압축 방식 변환: {codec}")
+    kept = [convert(store, codec, args.dimensions, args.force) for store in stores.values()]
+
+    print("\n📌 변환 후:")
+    print_stats(stores)
+    if codec != config.NUMPY_VECTOR_COMPRESSION and all(kept):
+        print(f"\n⚠️  .env에 NUMPY_VECTOR_COMPRESSION={codec}을 설정하세요. (시작 시 설정과 인덱스가 다르면 경고)")
+    if args.from_chroma and config.VECTOR_STORE_BACKEND != 'numpy':
+        print("⚠️  .env에 VECTOR_STORE_BACKEND=numpy를 설정하고 서버를 다시 시작하세요.")
+    print("=" * 70)
+    return 0 if all(kept) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+import 시간 분석 스크립트
+`python -X importtime`으로 모듈을 import하고, 결과를 패키지/모듈별로 정리해 출력합니다.
+서버(워커) 콜드 스타트가 느려졌을 때 어떤 라이브러리가 시작 시점에 불러와지는지 확인하는 용도입니다.
+
+실행 방법:
+    python profile_imports.py                     # app 모듈 (서버 시작과 같은 경로)
+    python profile_imports.py -m routes.chat      # 특정 모듈만
+    python profile_imports.py --top 30 --min-ms 5 # 상위 30개, 5ms 미만 생략
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+# 이 프로젝트의 최상위 모듈 (외부 라이브러리와 구분해서 출력)
+PROJECT_MODULES = ("app", "config", "routes", "services", "utils")
+
+# "import time:       self [us] |   cumulative | imported package"
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def run_importtime(module):
+    """
+    새 인터프리터에서 모듈을 import하고 -X importtime 출력을 파싱합니다.
+
+    Args:
+        module (str): import할 모듈 이름
+
+    Returns:
+        tuple: (entries, wall_seconds, returncode, error_lines)
+               entries는 [(self_us, cumulative_us, depth, name), ...] (import 순서)
+    """
+    project_dir = os.path.dirname(os.path.abspath(__file__))
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=project_dir,
+        capture_output=True,
+        text=True,
+    )
+    wall_seconds = time.perf_counter() - started
+
+    entries = []
+    error_lines = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((int(self_us), int(cumulative_us), len(indent) // 2, name))
+        elif not line.startswith("import time:"):
+            error_lines.append(line)
+
+    return entries, wall_seconds, result.returncode, error_lines
+
+
+def print_report(module, entries, wall_seconds, top, min_ms):
+    """패키지별/모듈별 import 시간 요약 출력"""
+    total_self_ms = sum(self_us for self_us, _, _, _ in entries) / 1000
+
+    print("=" * 70)
+    print(f"⏱️  import 시간 분석: {module}")
+    print("=" * 70)
+    print(f"  인터프리터 포함 전체: {wall_seconds * 1000:8.1f} ms")
+    print(f"  import 합계:          {total_self_ms:8.1f} ms ({len(entries)}개 모듈)")
+
+    # 1. 최상위 패키지별 합계 (self 시간 합, 패키지 안의 모든 하위 모듈 포함)
+    by_package = defaultdict(lambda: [0, 0])
+    for self_us, _, _, name in entries:
+        package = name.split(".")[0]
+        by_package[package][0] += self_us
+        by_package[package][1] += 1
+
+    print(f"\n📦 패키지별 (상위 {top}개)")
+    print(f"  {'ms':>9}  {'비율':>6}  {'모듈 수':>6}  패키지")
+    for package, (self_us, count) in sorted(by_package.items(), key=lambda item: -item[1][0])[:top]:
+        ms = self_us / 1000
+        if ms < min_ms:
+            break
+        share = ms / total_self_ms * 100 if total_self_ms else 0
+        marker = "  (프로젝트)" if package in PROJECT_MODULES else ""
+        print(f"  {ms:9.1f}  {share:5.1f}%  {count:6d}  {package}{marker}")
+
+    # 2. 프로젝트 모듈별 누적 시간 (해당 모듈이 처음 불러온 하위 import 포함 → 무거운 import를 끌어오는 위치)
+    print(f"\n🧩 프로젝트 모듈별 누적 시간 (하위 import 포함, 상위 {top}개)")
+    project_entries = [
+        entry for entry in entries
+        if entry[3].split(".")[0] in PROJECT_MODULES
+    ]
+    for self_us, cumulative_us, _, name in sorted(project_entries, key=lambda entry: -entry[1])[:top]:
+        if cumulative_us / 1000 < min_ms:
+            break
+        print(f"  {cumulative_us / 1000:9.1f} ms  (자체 {self_us / 1000:7.1f} ms)  {name}")
+
+    # 3. 외부 라이브러리 중 누적 시간이 큰 진입점 (프로젝트 모듈이 직접 import한 모듈)
+    print(f"\n🐢 느린 외부 import 진입점 (상위 {top}개)")
+    entry_points = []
+    parent_is_project = []
+    # importtime 출력은 하위 모듈이 먼저 나오고 부모가 뒤에 나오므로 역순으로 부모를 추적
+    for self_us, cumulative_us, depth, name in reversed(entries):
+        del parent_is_project[depth:]
+        is_project = name.split(".")[0] in PROJECT_MODULES
+        if not is_project and (depth == 0 or (parent_is_project and parent_is_project[-1])):
+            entry_points.append((cumulative_us, name))
+        parent_is_project.append(is_project)
+    for cumulative_us, name in sorted(entry_points, reverse=True)[:top]:
+        if cumulative_us / 1000 < min_ms:
+            break
+        print(f"  {cumulative_us / 1000:9.1f} ms  {name}")
+
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="python -X importtime 결과 요약")
+    parser.add_argument("-m", "--module", default="app", help="import할 모듈 (기본값: app)")
+    parser.add_argument("--top", type=int, default=15, help="항목별 출력 개수 (기본값: 15)")
+    parser.add_argument("--min-ms", type=float, default=1.0, help="이보다 짧은 항목은 생략 (기본값: 1ms)")
+    args = parser.parse_args()
+
+    entries, wall_seconds, returncode, error_lines = run_importtime(args.module)
+
+    if not entries:
+        print(f"❌ import 시간 정보를 얻지 못했습니다: {args.module}")
+        print("\n".join(error_lines[-20:]))
+        return 1
+
+    print_report(args.module, entries, wall_seconds, args.top, args.min_ms)
+
+    if returncode != 0:
+        print("⚠️  import 중 오류가 발생했습니다 (위 결과는 오류 직전까지):")
+        print("\n".join(error_lines[-20:]))
+        return returncode
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,6 +20,7 @@ def register_blueprints(app: Flask):
     from .summary import summary_bp
     from .chat import chat_bp
     from .admin import admin_bp
+    from .media import media_bp
 
     # Blueprint 등록
     app.register_blueprint(auth_bp)
@@ -27,5 +28,6 @@ def register_blueprints(app: Flask):
     app.register_blueprint(summary_bp)
     app.register_blueprint(chat_bp)
     app.register_blueprint(admin_bp)
+    app.register_blueprint(media_bp)
 
     logger.info("✅ 모든 Blueprint 등록 완료")
@@ -11,6 +11,11 @@ from utils.db_manager import DatabaseManager
 from utils.vector_db_manager import vdb_manager
 from utils.stt import STTManager
 from utils.decorators import login_required, admin_required
+from utils.model_router import model_router
+from utils.ffmpeg_runner import ffmpeg_runner
+from services.cleanup_service import cleanup_service
+from services.vector_sync_service import vector_sync_service
+from utils.service_container import services
 
 # Blueprint 생성
 admin_bp = Blueprint('admin', __name__)
@@ -141,21 +146,10 @@ def upload_script():
                 owner_id=user_id
             )
 
-            # Step 3: Vector DB 저장
+            # Step 3: Vector DB 저장 (save_stt_to_db가 등록한 대기열 작업을 바로 반영)
             yield f"data: {json.dumps({'event': 'vector', 'message': 'Vector DB 저장 중...'})}\n\n"
 
-            # DB에서 저장된 세그먼트 다시 조회
-            all_segments = db.get_segments_by_meeting_id(meeting_id)
-
-            if all_segments:
-                first_segment = all_segments[0]
-                vdb_manager.add_meeting_as_chunk(
-                    meeting_id=meeting_id,
-                    title=first_segment['title'],
-                    meeting_date=first_segment['meeting_date'],
-                    audio_file=first_segment['audio_file'],
-                    segments=all_segments
-                )
+            if vector_sync_service.process_meeting(meeting_id):
                 print(f"✅ meeting_chunks에 저장 완료 (meeting_id: {meeting_id})")
 
             # 완료
@@ -413,3 +407,118 @@ def delete_vector_db_entry():
         import traceback
         traceback.print_exc()
         return jsonify({"success": False, "error": f"벡터 DB 삭제 중 오류 발생: {str(e)}"}), 500
+
+
+@admin_bp.route("/api/model_routing", methods=["GET"])
+@login_required
+@admin_required
+def model_routing_stats():
+    """모델 라우팅 상태 조회 API (관리자 전용): 서킷 상태, 지연 추정치, 최근 결정"""
+    try:
+        return jsonify({"success": True, "stats": model_router.get_stats()})
+    except Exception as e:
+        print(f"❌ 모델 라우팅 상태 조회 오류: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@admin_bp.route("/api/retrieval_stats", methods=["GET"])
+@login_required
+@admin_required
+def retrieval_stats():
+    """챗봇 검색 소스 실행 현황 조회 API (관리자 전용): 실행 중/시간 초과로 버린/상한으로 건너뛴 검색 수"""
+    try:
+        return jsonify({"success": True, "stats": services.get("chat_manager").get_retrieval_stats()})
+    except Exception as e:
+        print(f"❌ 검색 실행 현황 조회 오류: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@admin_bp.route("/api/ffmpeg_stats", methods=["GET"])
+@login_required
+@admin_required
+def ffmpeg_stats():
+    """ffmpeg 작업 현황 조회 API (관리자 전용): 실행/대기 중인 프로세스 수"""
+    try:
+        return jsonify({"success": True, "stats": ffmpeg_runner.get_stats()})
+    except Exception as e:
+        print(f"❌ ffmpeg 상태 조회 오류: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@admin_bp.route("/api/cleanup_stats", methods=["GET"])
+@login_required
+@admin_required
+def cleanup_stats():
+    """삭제된 회의 정리 작업 현황 조회 API (관리자 전용): 정리 대기 항목 수"""
+    try:
+        return jsonify({"success": True, "stats": cleanup_service.get_stats()})
+    except Exception as e:
+        print(f"❌ 정리 작업 상태 조회 오류: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@admin_bp.route("/api/vector_sync_stats", methods=["GET"])
+@login_required
+@admin_required
+def vector_sync_stats():
+    """벡터 DB 동기화 현황 조회 API (관리자 전용): 반영 대기/재시도 항목 수, 마지막 정합성 검사 결과"""
+    try:
+        return jsonify({"success": True, "stats": vector_sync_service.get_stats()})
+    except Exception as e:
+        print(f"❌ 벡터 DB 동기화 상태 조회 오류: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@admin_bp.route("/api/vector_sync/reconcile", methods=["POST"])
+@login_required
+@admin_required
+def reconcile_vectors():
+    """SQLite ↔ ChromaDB 정합성 검사 즉시 실행 API (관리자 전용): 발견한 불일치를 복구 대기열에 등록"""
+    try:
+        return jsonify({"success": True, "result": vector_sync_service.reconcile()})
+    except Exception as e:
+        print(f"❌ 벡터 DB 정합성 검사 오류: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@admin_bp.route("/api/vector_sync/reindex_legacy_chunks", methods=["POST"])
+@login_required
+@admin_required
+def reindex_legacy_chunks():
+    """
+    이전 방식(부모-자식 검색 도입 전) 청크 재색인 등록 API (관리자 전용)
+    요청마다 최대 CHILD_REINDEX_BATCH_LIMIT개 회의만 등록합니다. (remaining이 0이 될 때까지 나눠서 요청)
+
+    Request JSON (optional):
+        {"limit": 10}
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        limit = data.get('limit')
+        if limit is not None and (not isinstance(limit, int) or limit < 1):
+            return jsonify({"success": False, "error": "limit은 1 이상의 정수여야 합니다."}), 400
+        return jsonify({"success": True, "result": vector_sync_service.reindex_legacy_chunks(limit)})
+    except Exception as e:
+        print(f"❌ 이전 방식 청크 재색인 등록 오류: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+@admin_bp.route("/api/service_status", methods=["GET"])
+@login_required
+@admin_required
+def service_status():
+    """지연 초기화 서비스 상태 조회 API (관리자 전용): 서비스별 생성 여부와 생성에 걸린 시간"""
+    return jsonify({"success": True, "services": services.status()})
+
+
+@admin_bp.route("/api/vector_db/health", methods=["GET"])
+@login_required
+@admin_required
+def vector_db_health():
+    """벡터 DB 연결 상태 조회 API (관리자 전용): 모드(embedded/http), heartbeat 성공 여부와 응답 시간"""
+    try:
+        health = vdb_manager.health_check(force=True)
+    except Exception as e:
+        # http 모드에서 서버에 연결할 수 없으면 클라이언트 생성부터 실패
+        health = {"backend": config.VECTOR_STORE_BACKEND, "mode": config.VECTOR_DB_MODE, "ok": False, "error": str(e)}
+    return jsonify({"success": True, "health": health}), (200 if health["ok"] else 503)
@@ -10,14 +10,15 @@ from utils.vector_db_manager import vdb_manager
 from utils.chat_manager import ChatManager
 from utils.decorators import login_required
 from utils.user_manager import can_access_meeting, get_user_accessible_meeting_ids
+from utils.service_container import services
 
 logger = logging.getLogger(__name__)
 
 # Blueprint 생성
 chat_bp = Blueprint('chat', __name__)
 
-# ChatManager 초기화 (similarity retriever 사용)
-chat_manager = ChatManager(vdb_manager, retriever_type="similarity")
+# ChatManager (similarity retriever 사용, 첫 질문 시 생성)
+chat_manager = services.register("chat_manager", lambda: ChatManager(vdb_manager, retriever_type="similarity"))
 
 
 @chat_bp.route("/api/chat", methods=["POST"])
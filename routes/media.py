@@ -0,0 +1,132 @@
+"""
+미디어 관련 라우트
+회의 오디오/비디오 스트리밍 (Range 요청 지원, 재생용 변환본 우선), HLS, 파형 peaks 제공
+"""
+from flask import Blueprint, jsonify, session, send_file, abort, request
+import logging
+
+from config import config
+from utils.decorators import login_required
+from utils.user_manager import can_access_meeting
+from services.media_service import media_service
+
+logger = logging.getLogger(__name__)
+
+# Blueprint 생성
+media_bp = Blueprint('media', __name__)
+
+
+def _private_cache(response):
+    """권한 확인이 필요한 리소스이므로 공유 캐시(프록시)에는 저장하지 않도록 설정"""
+    response.cache_control.public = False
+    response.cache_control.private = True
+    response.vary.add('Cookie')
+    return response
+
+
+@media_bp.route("/media/<string:meeting_id>/audio")
+@login_required
+def stream_media(meeting_id):
+    """
+    회의 오디오/비디오 스트리밍
+
+    - Range 요청(206 Partial Content)으로 전체 다운로드 없이 원하는 위치부터 재생
+    - 파일 메타데이터(크기·수정 시각·inode) 기반 ETag로 If-None-Match / If-Range 처리 (첫 요청에서 파일을 읽지 않음)
+    - WSGI 서버가 지원하면 wsgi.file_wrapper(sendfile)로 복사 없이 전송
+    - 재생용 변환본이 있으면 변환본을 우선 제공 (?variant=original 로 원본 요청 가능)
+
+    Args:
+        meeting_id: 회의 ID
+
+    Returns:
+        파일 데이터 (200/206/304)
+    """
+    user_id = session['user_id']
+
+    # 권한 체크
+    if not can_access_meeting(user_id, meeting_id):
+        abort(403)
+
+    variant = request.args.get('variant', 'auto')
+    media = media_service.resolve_playback(meeting_id, variant=variant)
+    if not media:
+        abort(404)
+
+    response = send_file(
+        media['path'],
+        mimetype=media['mime_type'],
+        conditional=True,
+        etag=media['etag'],
+        max_age=config.MEDIA_CACHE_MAX_AGE_SECONDS
+    )
+    return _private_cache(response)
+
+
+@media_bp.route("/media/<string:meeting_id>/peaks")
+@login_required
+def get_waveform_peaks(meeting_id):
+    """
+    파형 peaks 데이터 조회 (다중 해상도 JSON)
+
+    Args:
+        meeting_id: 회의 ID
+
+    Returns:
+        JSON: {version, sample_rate, duration, bits, levels: [{samples_per_peak, peaks_per_second, length, data}]}
+    """
+    user_id = session['user_id']
+
+    # 권한 체크
+    if not can_access_meeting(user_id, meeting_id):
+        return jsonify({
+            "success": False,
+            "error": "접근 권한이 없습니다."
+        }), 403
+
+    peaks_path = media_service.get_peaks_path(meeting_id)
+    if not peaks_path:
+        return jsonify({
+            "success": False,
+            "error": "파형 데이터가 없습니다."
+        }), 404
+
+    response = send_file(
+        peaks_path,
+        mimetype='application/json',
+        conditional=True,
+        max_age=config.MEDIA_CACHE_MAX_AGE_SECONDS
+    )
+    return _private_cache(response)
+
+
+@media_bp.route("/media/<string:meeting_id>/hls/<string:filename>")
+@login_required
+def stream_hls(meeting_id, filename):
+    """
+    HLS 플레이리스트/세그먼트 제공 (PLAYBACK_HLS_ENABLED인 경우에만 생성됨)
+
+    Args:
+        meeting_id: 회의 ID
+        filename: playlist.m3u8 또는 세그먼트 파일명
+
+    Returns:
+        파일 데이터
+    """
+    user_id = session['user_id']
+
+    # 권한 체크
+    if not can_access_meeting(user_id, meeting_id):
+        abort(403)
+
+    path = media_service.get_hls_path(meeting_id, filename)
+    if not path:
+        abort(404)
+
+    mimetype = 'application/vnd.apple.mpegurl' if filename.endswith('.m3u8') else 'video/iso.segment'
+    response = send_file(
+        path,
+        mimetype=mimetype,
+        conditional=True,
+        max_age=config.MEDIA_CACHE_MAX_AGE_SECONDS
+    )
+    return _private_cache(response)
@@ -7,6 +7,7 @@ from werkzeug.utils import secure_filename
 import os
 import uuid
 import json
+import html
 import logging
 from datetime import datetime
 
@@ -14,21 +15,27 @@ logger = logging.getLogger(__name__)
 
 from config import config
 from utils.db_manager import DatabaseManager
-from utils.vector_db_manager import vdb_manager
 from utils.stt import STTManager
 from utils.decorators import login_required
 from utils.user_manager import (
     can_access_meeting,
     can_edit_meeting,
-    get_user_meetings,
-    get_shared_meetings,
+    list_meetings,
+    get_meetings_changed_since,
+    normalize_since,
     share_meeting,
     get_shared_users,
-    remove_share
+    remove_share,
+    is_admin,
+    get_user_accessible_meeting_ids
 )
-from utils.analysis import calculate_speaker_share
+from utils.analysis import build_speaker_share
 from utils.validation import validate_title, parse_meeting_date
+from utils.ffmpeg_runner import ffmpeg_runner, FFmpegCancelled
 from services.upload_service import upload_service
+from services.media_service import media_service
+from services.cleanup_service import cleanup_service
+from services.vector_sync_service import vector_sync_service
 
 # Blueprint 생성
 meetings_bp = Blueprint('meetings', __name__)
@@ -50,32 +57,81 @@ def index():
     return render_template("index.html")
 
 
+def _parse_notes_query(args):
+    """
+    노트 목록 조회 파라미터 파싱 (/notes, /shared-notes, /notes_json 공통)
+
+    Returns:
+        dict: list_meetings()에 전달할 인자 (cursor 제외)
+
+    Raises:
+        ValueError: 잘못된 파라미터
+    """
+    try:
+        limit = int(args.get('limit', config.NOTES_PAGE_SIZE))
+    except ValueError:
+        raise ValueError("limit는 숫자여야 합니다.")
+
+    filters = {
+        "limit": max(1, min(limit, config.NOTES_MAX_PAGE_SIZE)),
+        "order": "asc" if args.get('order') == 'asc' else "desc",
+        "date_from": args.get('date_from') or None,
+        "date_to": args.get('date_to') or None,
+        "title_prefix": args.get('title') or None,
+        "owner_id": None,
+    }
+    for key in ("date_from", "date_to"):
+        if filters[key]:
+            try:
+                datetime.strptime(filters[key], "%Y-%m-%d")
+            except ValueError:
+                raise ValueError(f"{key}는 YYYY-MM-DD 형식이어야 합니다.")
+    if args.get('owner_id'):
+        try:
+            filters["owner_id"] = int(args['owner_id'])
+        except ValueError:
+            raise ValueError("owner_id는 숫자여야 합니다.")
+    return filters
+
+
+def _render_notes_page(template, scope):
+    user_id = session['user_id']
+    try:
+        filters = _parse_notes_query(request.args)
+    except ValueError as e:
+        return str(e), 400
+
+    page = list_meetings(user_id, scope=scope, **filters)
+    return render_template(
+        template,
+        meetings=page['meetings'],
+        next_cursor=page['next_cursor'],
+        filters=filters
+    )
+
+
 @meetings_bp.route("/notes")
 @login_required
 def notes():
     """
-    내 노트 목록 조회
+    내 노트 목록 조회 (첫 페이지, 이후 페이지는 /notes_json으로 이어서 조회)
 
     Returns:
         HTML: 노트 목록 페이지
     """
-    user_id = session['user_id']
-    meetings = get_user_meetings(user_id)
-    return render_template("notes.html", meetings=meetings)
+    return _render_notes_page("notes.html", "mine")
 
 
 @meetings_bp.route("/shared-notes")
 @login_required
 def shared_notes():
     """
-    공유받은 노트 목록 조회
+    공유받은 노트 목록 조회 (첫 페이지, 이후 페이지는 /notes_json으로 이어서 조회)
 
     Returns:
         HTML: 공유 노트 목록 페이지
     """
-    user_id = session['user_id']
-    shared_meetings = get_shared_meetings(user_id)
-    return render_template("shared-notes.html", meetings=shared_meetings)
+    return _render_notes_page("shared-notes.html", "shared")
 
 
 @meetings_bp.route("/view/<string:meeting_id>")
@@ -103,13 +159,14 @@ def view_meeting(meeting_id):
 @login_required
 def get_meeting_data(meeting_id):
     """
-    회의 데이터 조회 (전사, 요약, 화자 정보 등)
+    회의 메타데이터 조회 (제목, 날짜, 화자 정보, 세그먼트 수 등)
+    전사 내용은 회의 길이와 관계없이 응답 크기가 일정하도록 /api/meeting/<id>/transcript에서 구간별로 조회
 
     Args:
         meeting_id: 회의 ID
 
     Returns:
-        JSON: 회의 전체 데이터
+        JSON: 회의 헤더와 통계
     """
     user_id = session['user_id']
 
@@ -120,29 +177,21 @@ def get_meeting_data(meeting_id):
             "error": "접근 권한이 없습니다."
         }), 403
 
-    # 회의 데이터 조회
-    rows = db.get_meeting_by_id(meeting_id)
+    # 회의 헤더 조회
+    meeting = db.get_meeting_header(meeting_id)
 
-    if not rows:
+    if not meeting:
         return jsonify({
             "success": False,
             "error": "회의를 찾을 수 없습니다."
         }), 404
 
-    # 전사 데이터 변환 (dict로 변환)
-    transcript = [dict(row) for row in rows]
+    # 화자별 발언 통계 (전사 저장 시 계산된 값) 및 점유율 차트 데이터
+    speaker_stats = db.get_speaker_stats(meeting_id)
+    speaker_share_data = build_speaker_share(speaker_stats)
 
-    # 회의 정보 추출
-    audio_file = rows[0]['audio_file']
-    title = rows[0]['title']
-    meeting_date = rows[0]['meeting_date']
-
-    # 참석자 목록 추출 (중복 제거)
-    participants = list(set([t['speaker_label'] for t in transcript if t.get('speaker_label')]))
-    participants.sort()
-
-    # 화자별 점유율 계산
-    speaker_share_data = calculate_speaker_share(meeting_id)
+    # 참석자 목록 (화자 통계에서 추출)
+    participants = sorted(stat['speaker_label'] for stat in speaker_stats)
 
     # 수정 권한 확인 (owner 또는 admin만 수정 가능)
     can_edit = can_edit_meeting(user_id, meeting_id)
@@ -150,21 +199,78 @@ def get_meeting_data(meeting_id):
     return jsonify({
         "success": True,
         "meeting_id": meeting_id,
-        "title": title,
-        "meeting_date": meeting_date,
+        "title": meeting['title'],
+        "meeting_date": meeting['meeting_date'],
         "participants": participants,
-        "audio_url": f"/uploads/{audio_file}",
-        "transcript": transcript,
+        "segment_count": sum(stat['segment_count'] for stat in speaker_stats),
+        "last_start_time": max((stat['last_start'] or 0 for stat in speaker_stats), default=0),
+        "transcript_url": f"/api/meeting/{meeting_id}/transcript",
+        "audio_url": f"/media/{meeting_id}/audio",
+        "media_type": media_service.media_type_of(meeting['audio_file']),
+        "peaks_url": f"/media/{meeting_id}/peaks",
+        "hls_url": media_service.get_hls_url(meeting_id),
         "speaker_share": speaker_share_data,
+        "speaker_stats": speaker_stats,
         "can_edit": can_edit
     })
 
 
+@meetings_bp.route("/api/meeting/<string:meeting_id>/transcript")
+@login_required
+def get_meeting_transcript(meeting_id):
+    """
+    전사 구간 조회 (스크롤/재생 위치에 따라 필요한 부분만 로드)
+
+    Query Parameters:
+        after: 이 segment_id 다음부터 (아래로 스크롤)
+        before: 이 segment_id 이전까지 (위로 스크롤)
+        t: 이 시간(초)을 포함하는 세그먼트부터 (재생 위치 이동)
+        limit: 최대 세그먼트 수 (기본값: TRANSCRIPT_WINDOW_SIZE)
+
+    Returns:
+        JSON: {success, columns: [segment_id, start_time, speaker_label, segment], rows: [[...], ...],
+               has_before, has_after}
+    """
+    user_id = session['user_id']
+
+    # 권한 체크
+    if not can_access_meeting(user_id, meeting_id):
+        return jsonify({
+            "success": False,
+            "error": "접근 권한이 없습니다."
+        }), 403
+
+    try:
+        after_id = int(request.args['after']) if request.args.get('after') else None
+        before_id = int(request.args['before']) if request.args.get('before') else None
+        from_time = float(request.args['t']) if request.args.get('t') else None
+        limit = int(request.args.get('limit', config.TRANSCRIPT_WINDOW_SIZE))
+    except ValueError:
+        return jsonify({
+            "success": False,
+            "error": "after, before, limit는 정수, t는 숫자여야 합니다."
+        }), 400
+
+    window = db.get_transcript_window(
+        meeting_id,
+        after_id=after_id,
+        before_id=before_id,
+        from_time=from_time,
+        limit=max(1, min(limit, config.TRANSCRIPT_WINDOW_MAX_SIZE))
+    )
+
+    return jsonify({
+        "success": True,
+        "columns": list(DatabaseManager.TRANSCRIPT_WINDOW_COLUMNS),
+        **window
+    })
+
+
 @meetings_bp.route("/api/delete_meeting/<string:meeting_id>", methods=["POST"])
 @login_required
 def delete_meeting(meeting_id):
     """
-    회의 삭제 (SQLite, Vector DB, 오디오 파일 모두 삭제)
+    회의 삭제 (SQLite는 즉시 연쇄 삭제, Vector DB와 파일은 백그라운드 정리)
 
     Args:
         meeting_id: 회의 ID
@@ -182,17 +288,23 @@ def delete_meeting(meeting_id):
         }), 403
 
     try:
-        # Vector DB, SQLite DB, 오디오 파일 모두 삭제
-        # db_type="all"로 모든 데이터 삭제
-        result = vdb_manager.delete_from_collection(db_type="all", meeting_id=meeting_id)
-        return jsonify(result)
+        # 처리 중인 업로드가 있으면 먼저 중단 (ffmpeg 종료, 이후 STT 중간 저장도 이 취소 기록을 보고 중단)
+        ffmpeg_runner.cancel(meeting_id)
 
-    except ValueError as e:
-        # meeting_id를 찾을 수 없는 경우
+        # meetings 헤더 삭제 → 하위 테이블 연쇄 삭제 + 정리 대기열 등록
+        if not db.delete_meeting_by_id(meeting_id):
+            return jsonify({
+                "success": False,
+                "error": "회의를 찾을 수 없습니다."
+            }), 404
+
+        # Vector DB, 오디오/미디어 파일은 백그라운드에서 정리
+        cleanup_service.wake()
         return jsonify({
-            "success": False,
-            "error": str(e)
-        }), 404
+            "success": True,
+            "message": "회의 데이터가 성공적으로 삭제되었습니다."
+        })
+
     except Exception as e:
         logger.error(f"❌ 회의 삭제 실패: {e}", exc_info=True)
         return jsonify({
@@ -239,8 +351,10 @@ def update_meeting_title(meeting_id):
                 "error": error_message
             }), 400
 
-        # DB 업데이트
+        # DB 업데이트 (벡터 DB 메타데이터는 대기열을 통해 백그라운드에서 반영)
         result = db.update_meeting_title(meeting_id, new_title)
+        if result['success']:
+            vector_sync_service.wake()
 
         return jsonify(result)
 
@@ -291,8 +405,10 @@ def update_meeting_date(meeting_id):
         # 날짜 파싱 및 포맷팅
         formatted_date = parse_meeting_date(new_date)
 
-        # DB 업데이트
+        # DB 업데이트 (벡터 DB 메타데이터는 대기열을 통해 백그라운드에서 반영)
         result = db.update_meeting_date(meeting_id, formatted_date)
+        if result['success']:
+            vector_sync_service.wake()
 
         return jsonify(result)
 
@@ -460,8 +576,13 @@ def upload_and_process():
         return render_template("index.html", error=error_message)
     
     # 파일 저장 (generator 시작 전에 완료)
+    # 스트리밍 가능한 형식은 전처리(무음 분석) 단계에서 읽으면서 동시에 저장
     meeting_id = uuid.uuid4().hex
-    file_path, original_filename, is_video = upload_service.save_uploaded_file(file, meeting_id)
+    upload_stream = None
+    if config.AUDIO_PREPROCESS_ENABLED and upload_service.can_stream_upload(file.filename):
+        file_path, original_filename, is_video, upload_stream = upload_service.open_upload_stream(file, meeting_id)
+    else:
+        file_path, original_filename, is_video = upload_service.save_uploaded_file(file, meeting_id)
     meeting_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
     # SSE Generator 함수
@@ -472,12 +593,38 @@ def upload_and_process():
             # Step 1: 파일 업로드 완료
             yield f"data: {json.dumps({'step': 'upload', 'message': '파일 업로드가 완료되었습니다...', 'icon': '📤'})}\n\n"
             
-            # Step 2: 비디오 변환 (필요 시)
+            # Step 2: 오디오 전처리 (무음 제거 + 압축, 비디오는 오디오 추출 포함)
             audio_path_for_stt = file_path
-            if is_video:
+            offset_map = None
+            preprocessed = False
+            if config.AUDIO_PREPROCESS_ENABLED:
+                yield f"data: {json.dumps({'step': 'convert', 'message': '오디오를 STT용으로 최적화하는 중...', 'icon': '🎚️'})}\n\n"
+
+                for kind, payload in upload_service.iter_preprocess_audio(
+                    file_path, job_id=meeting_id, upload_stream=upload_stream
+                ):
+                    if kind == 'progress':
+                        percent = payload.get('percent')
+                        message = '오디오를 STT용으로 최적화하는 중...'
+                        if percent is not None:
+                            message = f'오디오를 STT용으로 최적화하는 중... ({percent:.0f}%)'
+                        yield f"data: {json.dumps({'step': 'convert', 'message': message, 'icon': '🎚️', 'progress': percent})}\n\n"
+                    else:
+                        preprocessed, processed_path, offset_map, error_msg = payload
+
+                if preprocessed:
+                    temp_audio_path = processed_path
+                    audio_path_for_stt = processed_path
+                else:
+                    # 전처리 실패 시 기존 방식으로 진행
+                    logger.warning(f"⚠️ 오디오 전처리 실패, 원본으로 진행합니다: {error_msg}")
+                    offset_map = None
+
+            # Step 2-1: 비디오 변환 (전처리를 하지 않은 경우)
+            if is_video and not preprocessed:
                 yield f"data: {json.dumps({'step': 'convert', 'message': '비디오를 오디오로 변환 중...', 'icon': '🎬'})}\n\n"
                 
-                success, temp_audio_path, error_msg = upload_service.convert_video_to_audio(file_path)
+                success, temp_audio_path, error_msg = upload_service.convert_video_to_audio(file_path, job_id=meeting_id)
                 if not success:
                     yield f"data: {json.dumps({'step': 'error', 'message': f'비디오 변환 실패: {error_msg}'})}\n\n"
                     return
@@ -492,7 +639,9 @@ def upload_and_process():
                 meeting_id=meeting_id,
                 title=title,
                 meeting_date=meeting_date,
-                owner_id=owner_id
+                owner_id=owner_id,
+                source_path=file_path,
+                offset_map=offset_map
             )
 
             if not result['success']:
@@ -506,6 +655,17 @@ def upload_and_process():
             if temp_audio_path:
                 upload_service.cleanup_temp_files(temp_audio_path)
 
+            # 재생용 미디어 등록 (ETag, 파형 peaks) - 실패해도 재생은 가능하므로 계속 진행
+            try:
+                media_service.ingest_media(actual_meeting_id, file_path, job_id=meeting_id)
+
+                # 저용량 재생용 변환본은 백그라운드에서 생성 (완료 전까지는 원본 재생)
+                media_service.schedule_renditions(actual_meeting_id, job_id=meeting_id)
+            except FFmpegCancelled:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️  미디어 등록 실패: {e}", exc_info=True)
+
             # Step 4: 문단 요약 생성
             yield f"data: {json.dumps({'step': 'summary', 'message': '회의 내용을 분석하고 요약하고 있습니다...', 'icon': '📝'})}\n\n"
 
@@ -526,6 +686,22 @@ def upload_and_process():
             redirect_url = f"/view/{actual_meeting_id}"
             yield f"data: {json.dumps({'step': 'complete', 'message': '노트 생성이 완료되었습니다!', 'redirect': redirect_url, 'icon': '✅'})}\n\n"
         
+        except GeneratorExit:
+            # 클라이언트 연결 종료: 실행 중인 ffmpeg 작업 취소
+            logger.warning(f"⚠️ 클라이언트 연결이 끊겨 처리를 중단합니다 (meeting_id: {meeting_id})")
+            ffmpeg_runner.cancel(meeting_id)
+            if upload_stream is not None:
+                upload_stream.finish()
+            if temp_audio_path:
+                upload_service.cleanup_temp_files(temp_audio_path)
+            raise
+
+        except FFmpegCancelled:
+            logger.warning(f"⚠️ ffmpeg 작업이 취소되었습니다 (meeting_id: {meeting_id})")
+            if temp_audio_path:
+                upload_service.cleanup_temp_files(temp_audio_path)
+            yield f"data: {json.dumps({'step': 'error', 'message': '처리가 취소되었습니다.'})}\n\n"
+
         except Exception as e:
             logger.error(f"❌ 업로드 처리 실패: {e}", exc_info=True)
 
@@ -544,16 +720,207 @@ def upload_and_process():
 @login_required
 def notes_json():
     """
-    노트 목록을 JSON으로 반환 (업로드 상태 확인용)
-    
+    노트 목록을 JSON으로 반환 (페이지 이어서 조회, 업로드 상태 확인용)
+
+    Query Parameters:
+        scope: mine (기본값, Admin은 전체) / shared
+        cursor: 이전 응답의 next_cursor
+        limit, order(desc/asc), date_from, date_to(YYYY-MM-DD), title(제목 접두어), owner_id
+        since: 지정하면 해당 시각 이후 추가/변경/삭제된 노트만 반환 (ISO 8601 또는 이전 응답의 next_since)
+
+    Returns:
+        JSON: {success, meetings, next_cursor} 또는 since 지정 시 {success, meetings, deleted, next_since, reset}
+    """
+    try:
+        user_id = session['user_id']
+        scope = "shared" if request.args.get('scope') == 'shared' else "mine"
+
+        since = request.args.get('since')
+        if since:
+            try:
+                since = normalize_since(since)
+            except ValueError:
+                return jsonify({"success": False, "error": "since 형식이 올바르지 않습니다."}), 400
+            changes = get_meetings_changed_since(user_id, since, scope=scope)
+            return jsonify({"success": True, "since": since, **changes})
+
+        try:
+            filters = _parse_notes_query(request.args)
+            page = list_meetings(user_id, scope=scope, cursor=request.args.get('cursor'), **filters)
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+
+        return jsonify({"success": True, **page})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+# ==================== 노트 검색 ====================
+
+def _build_snippet(content, terms, radius):
+    """
+    검색어가 처음 등장하는 위치 주변을 잘라 <mark>로 강조한 HTML 조각을 만듭니다.
+
+    Args:
+        content (str): 원문
+        terms (list): 검색어 목록
+        radius (int): 검색어 앞뒤로 보여줄 글자 수
+
+    Returns:
+        str: HTML 이스케이프된 스니펫
+    """
+    lowered = content.lower()
+    positions = [lowered.find(term.lower()) for term in terms]
+    positions = [pos for pos in positions if pos >= 0]
+    first = min(positions) if positions else 0
+
+    start = max(first - radius, 0)
+    end = min(first + radius * 2, len(content))
+    window = content[start:end]
+
+    # 강조 구간 계산 후 이스케이프 (원문의 HTML은 그대로 노출되지 않도록)
+    marks = []
+    window_lower = window.lower()
+    for term in terms:
+        term_lower = term.lower()
+        pos = window_lower.find(term_lower)
+        while pos >= 0 and term_lower:
+            marks.append((pos, pos + len(term_lower)))
+            pos = window_lower.find(term_lower, pos + len(term_lower))
+    marks.sort()
+
+    parts = []
+    cursor = 0
+    for mark_start, mark_end in marks:
+        if mark_start < cursor:
+            continue
+        parts.append(html.escape(window[cursor:mark_start]))
+        parts.append(f"<mark>{html.escape(window[mark_start:mark_end])}</mark>")
+        cursor = mark_end
+    parts.append(html.escape(window[cursor:]))
+
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(content) else ""
+    return prefix + "".join(parts) + suffix
+
+
+@meetings_bp.route("/api/search_notes")
+@login_required
+def search_notes():
+    """
+    전사 내용, 문단 요약, 회의록 키워드 검색 (FTS5, 모델 호출 없음)
+
+    Query Parameters:
+        q: 검색어 (공백으로 구분된 모든 단어를 포함하는 결과)
+        meeting_id: 특정 회의로 한정 (선택)
+        type: segment / summary / minutes (선택, 쉼표로 여러 개 지정)
+        limit: 최대 결과 수 (기본값: NOTE_SEARCH_DEFAULT_LIMIT)
+
+    Returns:
+        JSON: {success, query, results: [{source_type, meeting_id, title, meeting_date, start_time, snippet}]}
+    """
+    try:
+        user_id = session['user_id']
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({"success": False, "error": "검색어를 입력해주세요."}), 400
+
+        meeting_id = request.args.get('meeting_id') or None
+        if meeting_id and not can_access_meeting(user_id, meeting_id):
+            return jsonify({"success": False, "error": "접근 권한이 없습니다."}), 403
+
+        sources = None
+        if request.args.get('type'):
+            sources = [s.strip() for s in request.args['type'].split(',') if s.strip()]
+            invalid = [s for s in sources if s not in DatabaseManager.SEARCH_SOURCES]
+            if invalid:
+                return jsonify({"success": False, "error": f"지원하지 않는 검색 대상입니다: {', '.join(invalid)}"}), 400
+
+        try:
+            limit = int(request.args.get('limit', config.NOTE_SEARCH_DEFAULT_LIMIT))
+        except ValueError:
+            limit = config.NOTE_SEARCH_DEFAULT_LIMIT
+        limit = max(1, min(limit, config.NOTE_SEARCH_MAX_LIMIT))
+
+        # Admin은 전체 검색, 일반 사용자는 본인/공유받은 노트만
+        accessible_meeting_ids = None
+        if not meeting_id and not is_admin(user_id):
+            accessible_meeting_ids = get_user_accessible_meeting_ids(user_id)
+
+        rows = db.search_notes(
+            query,
+            accessible_meeting_ids=accessible_meeting_ids,
+            meeting_id=meeting_id,
+            sources=sources,
+            limit=limit
+        )
+
+        terms = query.split()
+        results = [{
+            "source_type": row['source_type'],
+            "meeting_id": row['meeting_id'],
+            "title": row['title'],
+            "meeting_date": row['meeting_date'],
+            "start_time": row['start_time'],
+            "snippet": _build_snippet(row['content'], terms, config.NOTE_SEARCH_SNIPPET_CHARS)
+        } for row in rows]
+
+        return jsonify({"success": True, "query": query, "results": results})
+
+    except Exception as e:
+        logger.error(f"❌ 노트 검색 실패: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
+# ==================== 화자 분석 ====================
+
+@meetings_bp.route("/api/analytics/speakers")
+@login_required
+def speaker_analytics():
+    """
+    여러 회의에 걸친 화자별 발언 통계 (meeting_speaker_stats SQL 집계)
+
+    Query Parameters:
+        date_from: 시작 날짜 (YYYY-MM-DD, 포함, 선택)
+        date_to: 종료 날짜 (YYYY-MM-DD, 포함, 선택)
+        interval: day / month (선택, 지정하면 기간별로 나누어 집계)
+
     Returns:
-        JSON: 노트 목록
+        JSON: {success, speakers: [{speaker_label, period, meeting_count, talk_seconds, char_count,
+                                    segment_count, turn_count, interruptions}]}
     """
     try:
         user_id = session['user_id']
-        meetings = get_user_meetings(user_id)
-        return jsonify({"success": True, "meetings": meetings})
+
+        date_from = request.args.get('date_from') or None
+        date_to = request.args.get('date_to') or None
+        for key, value in (("date_from", date_from), ("date_to", date_to)):
+            if value:
+                try:
+                    datetime.strptime(value, "%Y-%m-%d")
+                except ValueError:
+                    return jsonify({"success": False, "error": f"{key}는 YYYY-MM-DD 형식이어야 합니다."}), 400
+
+        interval = request.args.get('interval') or None
+        if interval and interval not in DatabaseManager.SPEAKER_STATS_INTERVALS:
+            return jsonify({"success": False, "error": "interval은 day 또는 month여야 합니다."}), 400
+
+        # Admin은 전체, 일반 사용자는 본인/공유받은 노트만
+        accessible_meeting_ids = None
+        if not is_admin(user_id):
+            accessible_meeting_ids = get_user_accessible_meeting_ids(user_id)
+
+        speakers = db.aggregate_speaker_stats(
+            accessible_meeting_ids=accessible_meeting_ids,
+            date_from=date_from,
+            date_to=date_to,
+            interval=interval
+        )
+
+        return jsonify({"success": True, "speakers": speakers})
+
     except Exception as e:
+        logger.error(f"❌ 화자 분석 조회 실패: {e}")
         return jsonify({"success": False, "error": str(e)}), 500
 
 
@@ -2,7 +2,7 @@
 요약 및 회의록 관련 라우트
 문단 요약, 회의록 생성
 """
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, url_for
 import logging
 
 from config import config
@@ -11,6 +11,8 @@ from utils.vector_db_manager import vdb_manager
 from utils.stt import STTManager
 from utils.decorators import login_required
 from utils.user_manager import can_access_meeting
+from utils.job_coordinator import job_coordinator, make_content_version, JobInProgress
+from services.vector_sync_service import vector_sync_service
 
 logger = logging.getLogger(__name__)
 
@@ -21,6 +23,34 @@ summary_bp = Blueprint('summary', __name__)
 db = DatabaseManager(str(config.DATABASE_PATH))
 stt_manager = STTManager()
 
+# 결과를 폴링할 수 있는 작업 종류
+POLLABLE_JOB_TYPES = ("summary", "minutes")
+
+
+def _job_in_progress_response(e: JobInProgress):
+    """
+    동일한 작업이 진행 중일 때의 202 응답 (요청 스레드를 붙잡고 기다리지 않음)
+
+    Args:
+        e: job_coordinator.run(wait=False)이 발생시킨 JobInProgress
+
+    Returns:
+        (JSON, 202): 작업 식별자와 결과 폴링 URL
+    """
+    poll_url = url_for(
+        'summary.job_status',
+        meeting_id=e.meeting_id, job_type=e.job_type, content_version=e.content_version
+    )
+    response = jsonify({
+        "success": True,
+        "status": "running",
+        "message": "같은 작업이 이미 진행 중입니다. poll_url로 결과를 확인하세요.",
+        "job": {"meeting_id": e.meeting_id, "job_type": e.job_type, "content_version": e.content_version},
+        "poll_url": poll_url
+    })
+    response.headers['Location'] = poll_url
+    return response, 202
+
 
 @summary_bp.route("/api/summarize/<string:meeting_id>", methods=["POST"])
 @login_required
@@ -32,7 +62,7 @@ def summarize(meeting_id):
         meeting_id: 회의 ID
 
     Returns:
-        JSON: 요약 내용
+        JSON: 요약 내용 (같은 작업이 진행 중이면 202와 poll_url)
     """
     user_id = session['user_id']
 
@@ -52,14 +82,26 @@ def summarize(meeting_id):
                 "error": "해당 회의를 찾을 수 없습니다."
             }), 404
 
-        # 2. title, transcript_text, meeting_date, audio_file 추출
+        # 2. title, transcript_text 추출
         title = rows[0]['title']
-        meeting_date = rows[0]['meeting_date']
-        audio_file = rows[0]['audio_file']
         transcript_text = " ".join([row['segment'] for row in rows])
 
-        # 3. stt_manager의 subtopic_generate를 이용해 요약 생성
-        summary_content = stt_manager.subtopic_generate(title, transcript_text)
+        # 3. 요약 생성 + 'meeting_subtopic' DB 저장
+        #    동일한 회의/내용에 대한 요청이 동시에 들어오면 한 번만 실행하고 결과를 공유
+        def run_summary():
+            summary = stt_manager.subtopic_generate(title, transcript_text)
+            if summary:
+                # SQLite 저장 + 벡터 DB 반영 대기열 등록 (한 트랜잭션) 후 바로 반영
+                db.save_summary(meeting_id, summary)
+                vector_sync_service.process_meeting(meeting_id)
+            return summary
+
+        try:
+            summary_content = job_coordinator.run(
+                meeting_id, "summary", make_content_version(title, transcript_text), run_summary, wait=False
+            )
+        except JobInProgress as e:
+            return _job_in_progress_response(e)
 
         if not summary_content:
             return jsonify({
@@ -67,15 +109,6 @@ def summarize(meeting_id):
                 "error": "요약 생성에 실패했습니다."
             }), 500
 
-        # 4. 생성한 내용을 'meeting_subtopic' DB에 저장
-        vdb_manager.add_meeting_as_subtopic(
-            meeting_id=meeting_id,
-            title=title,
-            meeting_date=meeting_date,
-            audio_file=audio_file,
-            summary_content=summary_content
-        )
-
         return jsonify({
             "success": True,
             "message": "요약이 성공적으로 생성 및 저장되었습니다.",
@@ -90,6 +123,65 @@ def summarize(meeting_id):
         }), 500
 
 
+@summary_bp.route("/api/job_status/<string:meeting_id>/<string:job_type>/<string:content_version>")
+@login_required
+def job_status(meeting_id, job_type, content_version):
+    """
+    진행 중인 요약/회의록 작업의 결과 조회 (202 응답의 poll_url)
+
+    Args:
+        meeting_id: 회의 ID
+        job_type: 작업 종류 (summary / minutes)
+        content_version: 입력 내용 버전
+
+    Returns:
+        JSON: 진행 중이면 202, 완료되면 result 포함
+    """
+    user_id = session['user_id']
+
+    # 권한 체크
+    if not can_access_meeting(user_id, meeting_id):
+        return jsonify({
+            "success": False,
+            "error": "접근 권한이 없습니다."
+        }), 403
+
+    if job_type not in POLLABLE_JOB_TYPES:
+        return jsonify({
+            "success": False,
+            "error": "지원하지 않는 작업 종류입니다."
+        }), 400
+
+    try:
+        job = job_coordinator.get_status(meeting_id, job_type, content_version)
+        if not job:
+            return jsonify({
+                "success": False,
+                "status": "not_found",
+                "error": "작업을 찾을 수 없습니다. 다시 요청해주세요."
+            }), 404
+
+        if job['status'] == 'running':
+            return jsonify({"success": True, "status": "running"}), 202
+
+        if job['status'] == 'done' and job['result']:
+            return jsonify({"success": True, "status": "done", "result": job['result']})
+
+        # 실패, 리더 중단(리스 만료), 빈 결과
+        return jsonify({
+            "success": False,
+            "status": job['status'],
+            "error": job['error'] or "작업이 완료되지 않았습니다. 다시 요청해주세요."
+        }), 500
+
+    except Exception as e:
+        logger.error(f"❌ 작업 상태 조회 실패: {e}", exc_info=True)
+        return jsonify({
+            "success": False,
+            "error": f"작업 상태 조회 중 오류 발생: {str(e)}"
+        }), 500
+
+
 @summary_bp.route("/api/check_summary/<string:meeting_id>")
 @login_required
 def check_summary(meeting_id):
@@ -112,8 +204,8 @@ def check_summary(meeting_id):
         }), 403
 
     try:
-        # Vector DB에서 문단 요약 조회
-        summary_content = vdb_manager.get_summary_by_meeting_id(meeting_id)
+        # SQLite에 저장된 문단 요약 원문 조회 (요약 원문 저장 이전에 생성된 회의는 Vector DB에서 조회)
+        summary_content = db.get_summary_by_meeting_id(meeting_id) or vdb_manager.get_summary_by_meeting_id(meeting_id)
 
         if summary_content:
             return jsonify({
@@ -146,7 +238,7 @@ def generate_minutes(meeting_id):
         meeting_id: 회의 ID
 
     Returns:
-        JSON: 회의록 내용
+        JSON: 회의록 내용 (같은 작업이 진행 중이면 202와 poll_url)
     """
     user_id = session['user_id']
 
@@ -180,13 +272,29 @@ def generate_minutes(meeting_id):
                 "error": "청킹된 회의 내용을 찾을 수 없습니다. 오디오 파일을 먼저 업로드해주세요."
             }), 400
 
-        # 4. stt_manager의 generate_minutes를 이용해 회의록 생성 (meeting_date 전달)
-        minutes_content = stt_manager.generate_minutes(
-            title,
-            transcript_text,
-            chunks_content,
-            meeting_date
-        )
+        # 4. 회의록 생성 (meeting_date 전달) + SQLite DB 저장
+        #    동일한 회의/내용에 대한 요청이 동시에 들어오면 한 번만 실행하고 결과를 공유
+        def run_minutes():
+            minutes = stt_manager.generate_minutes(
+                title,
+                transcript_text,
+                chunks_content,
+                meeting_date
+            )
+            if minutes:
+                db.save_minutes(meeting_id, title, meeting_date, minutes)
+            return minutes
+
+        try:
+            minutes_content = job_coordinator.run(
+                meeting_id,
+                "minutes",
+                make_content_version(title, meeting_date, transcript_text, chunks_content),
+                run_minutes,
+                wait=False
+            )
+        except JobInProgress as e:
+            return _job_in_progress_response(e)
 
         if not minutes_content:
             return jsonify({
@@ -194,9 +302,6 @@ def generate_minutes(meeting_id):
                 "error": "회의록 생성에 실패했습니다."
             }), 500
 
-        # 5. 생성된 회의록을 SQLite DB에 저장
-        db.save_minutes(meeting_id, title, meeting_date, minutes_content)
-
         return jsonify({
             "success": True,
             "message": "회의록이 성공적으로 생성 및 저장되었습니다.",
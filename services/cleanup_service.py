@@ -0,0 +1,120 @@
+"""
+정리 작업 서비스
+삭제된 회의의 벡터 데이터, 업로드 원본, 파생 미디어 파일을 백그라운드에서 정리합니다.
+
+회의 삭제는 meetings 헤더 1행 삭제로 즉시 끝나고, 트리거가 정리 대기열(meeting_tombstones)에 항목을 남깁니다.
+이 서비스는 대기열을 배치 단위로 처리하며, 실패한 항목은 지수 백오프로 재시도합니다.
+처리 도중 서버가 종료되어도 항목이 남아 있으므로 다음 실행 때 이어서 정리됩니다.
+"""
+import os
+import json
+import time
+import threading
+
+from config import config
+from utils.db_manager import DatabaseManager
+from utils.vector_db_manager import vdb_manager
+from services.media_service import media_service
+
+
+class CleanupService:
+    """삭제된 회의 정리 (백그라운드 GC)"""
+
+    def __init__(self):
+        self.db = DatabaseManager(str(config.DATABASE_PATH))
+        self._wake_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """백그라운드 정리 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="meeting-cleanup", daemon=True)
+            self._thread.start()
+        print(f"✅ 회의 정리 작업 시작 (주기: {config.CLEANUP_INTERVAL_SECONDS}초, 배치: {config.CLEANUP_BATCH_SIZE}개)")
+
+    def wake(self):
+        """삭제 직후 주기를 기다리지 않고 바로 정리하도록 깨움"""
+        self._wake_event.set()
+
+    def _run(self):
+        while True:
+            try:
+                # 한 배치가 가득 찼으면 쉬지 않고 다음 배치 처리
+                while self.drain() >= config.CLEANUP_BATCH_SIZE:
+                    pass
+            except Exception as e:
+                print(f"⚠️  회의 정리 작업 오류: {e}")
+
+            self._wake_event.wait(config.CLEANUP_INTERVAL_SECONDS)
+            self._wake_event.clear()
+
+    def drain(self, batch_size: int = None) -> int:
+        """
+        정리 대기열에서 처리 시각이 된 항목을 한 배치 처리합니다.
+
+        Args:
+            batch_size: 배치 크기 (기본값: CLEANUP_BATCH_SIZE)
+
+        Returns:
+            int: 가져온 항목 수
+        """
+        tombstones = self.db.claim_tombstones(
+            batch_size or config.CLEANUP_BATCH_SIZE,
+            config.CLEANUP_LEASE_SECONDS
+        )
+
+        for tombstone in tombstones:
+            try:
+                self.cleanup_meeting(tombstone)
+                self.db.complete_tombstone(tombstone['id'])
+            except Exception as e:
+                attempts = tombstone['attempts'] + 1
+                delay = min(config.CLEANUP_RETRY_BASE_SECONDS * (2 ** (attempts - 1)), config.CLEANUP_MAX_BACKOFF_SECONDS)
+                self.db.fail_tombstone(tombstone['id'], e, time.time() + delay)
+                print(f"⚠️  회의 정리 실패 ({attempts}회차, {delay}초 후 재시도): {tombstone['meeting_id']} - {e}")
+
+        return len(tombstones)
+
+    def cleanup_meeting(self, tombstone: dict):
+        """
+        삭제된 회의 1건의 외부 데이터를 정리합니다. (모든 단계는 다시 실행해도 안전)
+
+        Args:
+            tombstone: 정리 대기열 항목 (meeting_id, audio_file, media)
+
+        Raises:
+            Exception: 어느 단계든 실패하면 항목을 남겨 재시도
+        """
+        meeting_id = tombstone['meeting_id']
+
+        # 1. 벡터 DB (chunks, subtopic)
+        vdb_manager.delete_meeting_vectors(meeting_id)
+
+        # 2. 파생 미디어 파일 (peaks, 변환본, HLS, 보관 스토리지 원본)
+        media = json.loads(tombstone['media']) if tombstone.get('media') else {}
+        media_service.delete_media_files(media)
+
+        # 3. uploads 폴더의 원본 파일
+        for filename in {tombstone.get('audio_file'), media.get('original_file')}:
+            if not filename:
+                continue
+            path = os.path.join(str(config.UPLOAD_FOLDER), filename)
+            if os.path.exists(path):
+                os.remove(path)
+                print(f"🗑️  원본 파일 삭제: {path}")
+
+        print(f"✅ 회의 정리 완료: {meeting_id}")
+
+    def get_stats(self) -> dict:
+        """정리 대기 중인 항목 수 (관리자 모니터링용)"""
+        return {
+            "pending": self.db.count_tombstones(),
+            "running": bool(self._thread and self._thread.is_alive()),
+        }
+
+
+# 싱글톤 인스턴스
+cleanup_service = CleanupService()
@@ -0,0 +1,431 @@
+"""
+미디어 서비스
+회의 오디오/비디오 재생을 위한 비즈니스 로직 (ETag 계산, 파형 peaks 생성, 재생용 변환본 생성, 파일 경로 확인)
+"""
+import os
+import json
+import shutil
+import sqlite3
+import mimetypes
+import threading
+
+import numpy as np
+
+from config import config
+from utils.db_manager import DatabaseManager
+from utils.ffmpeg_runner import ffmpeg_runner, FFmpegCancelled
+
+
+class MediaService:
+    """회의 미디어 처리 서비스"""
+
+    def __init__(self):
+        self.db = DatabaseManager(str(config.DATABASE_PATH))
+
+    # ==================== 인제스트 ====================
+
+    def ingest_media(self, meeting_id: str, file_path: str, job_id: str = None) -> dict:
+        """
+        업로드된 원본 파일을 재생용으로 등록합니다. (ETag 계산 + 파형 peaks 생성)
+
+        Args:
+            meeting_id: 회의 ID
+            file_path: 원본 파일 경로
+            job_id: ffmpeg 작업 취소 단위 (meeting_id)
+
+        Returns:
+            dict: 저장된 meeting_media 정보
+        """
+        self.register_original(meeting_id, file_path)
+
+        peaks_file, duration = self.generate_waveform_peaks(meeting_id, file_path, job_id=job_id)
+        self.db.save_meeting_media(meeting_id, peaks_file=peaks_file, duration=duration)
+
+        print(f"✅ 미디어 등록 완료: {os.path.basename(file_path)} (길이: {duration:.0f}초)")
+        return self.db.get_meeting_media(meeting_id)
+
+    def register_original(self, meeting_id: str, file_path: str) -> dict:
+        """
+        원본 파일의 ETag(파일 메타데이터 기반), 크기, MIME 타입을 기록합니다.
+        미디어 정보가 없는 기존 회의는 첫 재생 요청에서 호출되므로 파일 내용을 읽지 않습니다.
+
+        Args:
+            meeting_id: 회의 ID
+            file_path: 원본 파일 경로
+
+        Returns:
+            dict: 저장된 meeting_media 정보
+        """
+        self.db.save_meeting_media(
+            meeting_id,
+            original_file=os.path.basename(file_path),
+            original_etag=self.compute_etag(file_path),
+            original_bytes=os.path.getsize(file_path),
+            mime_type=mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+        )
+        return self.db.get_meeting_media(meeting_id)
+
+    @staticmethod
+    def compute_etag(file_path: str) -> str:
+        """
+        ETag 값 계산 (Range 요청의 If-Range 검증용)
+        파일 크기 + 수정 시각(ns) + inode로 만듭니다. stat 한 번이면 되므로 큰 원본도 전체를 읽지 않습니다.
+        (원본/변환본은 저장 후 내용이 바뀌지 않고, 다시 쓰면 수정 시각이 달라짐)
+        """
+        stat = os.stat(file_path)
+        return f"{stat.st_size:x}-{stat.st_mtime_ns:x}-{stat.st_ino:x}"
+
+    def generate_waveform_peaks(self, meeting_id: str, file_path: str, job_id: str = None) -> tuple[str, float]:
+        """
+        다중 해상도 파형 peaks 파일(JSON)을 생성합니다.
+        각 레벨은 [min, max, min, max, ...] 형태의 -127~127 정수 배열입니다.
+
+        Args:
+            meeting_id: 회의 ID
+            file_path: 원본 파일 경로
+            job_id: ffmpeg 작업 취소 단위 (meeting_id)
+
+        Returns:
+            (peaks_file, duration): 저장된 peaks 파일명과 오디오 길이(초)
+        """
+        sample_rate = config.WAVEFORM_SAMPLE_RATE
+        raw_path = os.path.join(str(config.MEDIA_FOLDER), f"{meeting_id}_waveform.raw")
+
+        try:
+            # 1. 저해상도 모노 16-bit PCM으로 디코딩
+            result = ffmpeg_runner.run([
+                "-y",
+                "-i", file_path,
+                "-vn",
+                "-ac", "1",
+                "-ar", str(sample_rate),
+                "-f", "s16le",
+                raw_path
+            ], job_id=job_id)
+            if result.returncode != 0:
+                raise RuntimeError(f"파형 디코딩 실패: {result.stderr[-500:]}")
+
+            samples = np.fromfile(raw_path, dtype=np.int16)
+        finally:
+            if os.path.exists(raw_path):
+                os.remove(raw_path)
+
+        duration = len(samples) / float(sample_rate)
+
+        # 2. 가장 세밀한 레벨 계산 후, 4배씩 축소하며 상위 레벨 생성
+        samples_per_peak = max(sample_rate // config.WAVEFORM_PEAKS_PER_SECOND, 1)
+        mins, maxs = self._compute_peaks(samples, samples_per_peak)
+
+        levels = []
+        for _ in range(config.WAVEFORM_LEVELS):
+            levels.append({
+                "samples_per_peak": samples_per_peak,
+                "peaks_per_second": round(sample_rate / samples_per_peak, 4),
+                "length": int(len(mins)),
+                "data": np.column_stack((mins, maxs)).ravel().tolist()
+            })
+            if len(mins) <= 1:
+                break
+            mins, maxs = self._downsample(mins, maxs, 4)
+            samples_per_peak *= 4
+
+        peaks_file = f"{meeting_id}.peaks.json"
+        peaks_path = os.path.join(str(config.MEDIA_FOLDER), peaks_file)
+        with open(peaks_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": 1,
+                "sample_rate": sample_rate,
+                "duration": round(duration, 3),
+                "bits": 8,
+                "levels": levels
+            }, f, separators=(",", ":"))
+
+        return peaks_file, duration
+
+    # ==================== 재생용 변환본 ====================
+
+    def schedule_renditions(self, meeting_id: str, job_id: str = None):
+        """
+        재생용 변환본 생성을 백그라운드에서 실행합니다. (업로드 응답을 기다리게 하지 않음)
+        동시 실행 수는 ffmpeg_runner가 제한합니다.
+
+        Args:
+            meeting_id: 회의 ID
+            job_id: ffmpeg 작업 취소 단위 (meeting_id)
+        """
+        if not config.PLAYBACK_RENDITION_ENABLED:
+            return
+
+        def worker():
+            try:
+                self.create_renditions(meeting_id, job_id=job_id)
+            except FFmpegCancelled:
+                print(f"⚠️  재생용 변환이 취소되었습니다 (meeting_id: {meeting_id})")
+            except Exception as e:
+                print(f"❌ 재생용 변환 실패 (meeting_id: {meeting_id}): {e}")
+
+        threading.Thread(target=worker, name=f"rendition-{meeting_id}", daemon=True).start()
+
+    def create_renditions(self, meeting_id: str, job_id: str = None) -> dict:
+        """
+        저용량 재생용 파일을 생성하고, 원본을 보관 스토리지로 이동합니다.
+        - 오디오: AAC 모노 (faststart, 바로 재생 가능)
+        - 비디오: 360p H.264 + AAC 모노
+        - (선택) HLS 세그먼트 플레이리스트
+
+        Args:
+            meeting_id: 회의 ID
+            job_id: ffmpeg 작업 취소 단위 (meeting_id)
+
+        Returns:
+            dict: 갱신된 meeting_media 정보
+        """
+        media = self.db.get_meeting_media(meeting_id)
+        if not media:
+            raise ValueError(f"미디어 정보가 없습니다: {meeting_id}")
+
+        source_path = self._original_path(media)
+        if not os.path.isfile(source_path):
+            raise FileNotFoundError(f"원본 파일이 없습니다: {source_path}")
+
+        is_video = (media.get("mime_type") or "").startswith("video/")
+        rendition_file = f"{meeting_id}.playback.{'mp4' if is_video else 'm4a'}"
+        rendition_path = os.path.join(str(config.MEDIA_FOLDER), rendition_file)
+
+        # 1. 프로그레시브 재생 파일 (moov 앞쪽 배치로 다운로드 즉시 재생)
+        args = ["-y", "-i", source_path]
+        if is_video:
+            args += [
+                "-vf", f"scale=-2:{config.PLAYBACK_VIDEO_HEIGHT}",
+                "-c:v", "libx264", "-preset", "veryfast", "-crf", str(config.PLAYBACK_VIDEO_CRF),
+            ]
+        else:
+            args += ["-vn"]
+        args += [
+            "-c:a", "aac", "-b:a", config.PLAYBACK_AUDIO_BITRATE, "-ac", "1",
+            "-movflags", "+faststart",
+            rendition_path
+        ]
+        result = ffmpeg_runner.run(args, job_id=job_id, duration=media.get("duration"))
+        if result.returncode != 0:
+            raise RuntimeError(f"재생용 변환 실패: {result.stderr[-500:]}")
+
+        rendition_bytes = os.path.getsize(rendition_path)
+        fields = {
+            "rendition_file": rendition_file,
+            "rendition_etag": self.compute_etag(rendition_path),
+            "rendition_mime": "video/mp4" if is_video else "audio/mp4",
+            "rendition_bytes": rendition_bytes,
+        }
+
+        # 2. (선택) HLS 세그먼트 - 변환본을 재인코딩 없이 분할
+        if config.PLAYBACK_HLS_ENABLED:
+            fields["hls_playlist"] = self._create_hls(meeting_id, rendition_path, job_id)
+
+        self.db.save_meeting_media(meeting_id, **fields)
+
+        original_bytes = media.get("original_bytes") or 0
+        print(f"✅ 재생용 변환 완료: {rendition_file} "
+              f"({original_bytes / 1024 / 1024:.1f}MB → {rendition_bytes / 1024 / 1024:.1f}MB)")
+
+        # 3. 원본을 보관 스토리지로 이동 (재생은 변환본 사용)
+        if config.MOVE_ORIGINAL_TO_COLD_STORAGE:
+            self.move_original_to_cold(meeting_id)
+
+        return self.db.get_meeting_media(meeting_id)
+
+    def _create_hls(self, meeting_id: str, rendition_path: str, job_id: str = None) -> str:
+        """변환본을 HLS(fMP4 세그먼트)로 분할하고 플레이리스트 파일명(상대 경로)을 반환"""
+        hls_dir = os.path.join(str(config.MEDIA_FOLDER), f"{meeting_id}_hls")
+        os.makedirs(hls_dir, exist_ok=True)
+
+        result = ffmpeg_runner.run([
+            "-y",
+            "-i", rendition_path,
+            "-c", "copy",
+            "-f", "hls",
+            "-hls_time", str(config.PLAYBACK_HLS_SEGMENT_SECONDS),
+            "-hls_playlist_type", "vod",
+            "-hls_segment_type", "fmp4",
+            "-hls_segment_filename", os.path.join(hls_dir, "segment_%05d.m4s"),
+            os.path.join(hls_dir, "playlist.m3u8")
+        ], job_id=job_id)
+        if result.returncode != 0:
+            raise RuntimeError(f"HLS 변환 실패: {result.stderr[-500:]}")
+
+        return f"{meeting_id}_hls/playlist.m3u8"
+
+    def move_original_to_cold(self, meeting_id: str):
+        """
+        원본 파일을 보관 스토리지(COLD_STORAGE_FOLDER)로 이동합니다.
+        이동 중에 회의가 삭제되면 정리 작업이 이미 끝났을 수 있으므로 보관 스토리지의 사본을 직접 삭제합니다.
+        (정리 작업은 보관 위치 기록과 관계없이 두 폴더를 모두 확인)
+
+        Args:
+            meeting_id: 회의 ID
+        """
+        media = self.db.get_meeting_media(meeting_id)
+        if not media or media.get("original_storage") == "cold":
+            return
+
+        hot_path = os.path.join(str(config.UPLOAD_FOLDER), media["original_file"])
+        cold_path = os.path.join(str(config.COLD_STORAGE_FOLDER), media["original_file"])
+        if not os.path.isfile(hot_path):
+            return
+
+        shutil.move(hot_path, cold_path)
+        try:
+            self.db.save_meeting_media(meeting_id, original_storage="cold")
+        except sqlite3.IntegrityError:
+            # 헤더가 삭제되어 meeting_media를 다시 만들 수 없음 (외래 키) → 삭제된 회의
+            os.remove(cold_path)
+            print(f"🗑️  이동 중 삭제된 회의의 원본 파일 삭제: {cold_path}")
+            return
+        print(f"📦 원본 파일 보관 스토리지로 이동: {cold_path}")
+
+    def _original_path(self, media: dict) -> str:
+        """원본 파일의 현재 위치 (hot: uploads, cold: 보관 스토리지)"""
+        folder = config.COLD_STORAGE_FOLDER if media.get("original_storage") == "cold" else config.UPLOAD_FOLDER
+        return os.path.join(str(folder), media["original_file"])
+
+    @staticmethod
+    def _compute_peaks(samples, samples_per_peak):
+        """samples_per_peak 단위 구간마다 최소/최대값(8-bit)을 계산"""
+        if len(samples) == 0:
+            return np.zeros(0, dtype=np.int8), np.zeros(0, dtype=np.int8)
+
+        pad = (-len(samples)) % samples_per_peak
+        if pad:
+            samples = np.concatenate([samples, np.zeros(pad, dtype=samples.dtype)])
+        blocks = samples.reshape(-1, samples_per_peak)
+
+        mins = (blocks.min(axis=1) >> 8).astype(np.int8)
+        maxs = (blocks.max(axis=1) >> 8).astype(np.int8)
+        return mins, maxs
+
+    @staticmethod
+    def _downsample(mins, maxs, factor):
+        """인접한 factor개의 peak를 하나로 합침"""
+        pad = (-len(mins)) % factor
+        if pad:
+            mins = np.concatenate([mins, np.zeros(pad, dtype=mins.dtype)])
+            maxs = np.concatenate([maxs, np.zeros(pad, dtype=maxs.dtype)])
+        return mins.reshape(-1, factor).min(axis=1), maxs.reshape(-1, factor).max(axis=1)
+
+    # ==================== 조회 ====================
+
+    def resolve_playback(self, meeting_id: str, variant: str = "auto"):
+        """
+        재생할 파일 경로와 ETag, MIME 타입을 확인합니다.
+        재생용 변환본이 있으면 우선 사용하고, 미디어 정보가 없는 기존 회의는 처음 요청 시 등록합니다.
+
+        Args:
+            meeting_id: 회의 ID
+            variant: 'auto' (변환본 우선) 또는 'original'
+
+        Returns:
+            dict or None: {'path', 'etag', 'mime_type'} (파일이 없으면 None)
+        """
+        media = self.db.get_meeting_media(meeting_id)
+
+        if variant != "original" and media and media.get("rendition_file"):
+            rendition_path = os.path.join(str(config.MEDIA_FOLDER), media["rendition_file"])
+            if os.path.isfile(rendition_path):
+                return {
+                    "path": rendition_path,
+                    "etag": media["rendition_etag"],
+                    "mime_type": media["rendition_mime"]
+                }
+
+        if not media or not media.get("original_etag"):
+            audio_file = self.db.get_audio_file_by_meeting_id(meeting_id)
+            if not audio_file:
+                return None
+            file_path = os.path.join(str(config.UPLOAD_FOLDER), audio_file)
+            if not os.path.isfile(file_path):
+                return None
+            media = self.register_original(meeting_id, file_path)
+
+        file_path = self._original_path(media)
+        if not os.path.isfile(file_path):
+            return None
+
+        return {
+            "path": file_path,
+            "etag": media["original_etag"],
+            "mime_type": media["mime_type"]
+        }
+
+    def get_peaks_path(self, meeting_id: str):
+        """파형 peaks 파일 경로 (없으면 None)"""
+        media = self.db.get_meeting_media(meeting_id)
+        if not media or not media.get("peaks_file"):
+            return None
+        peaks_path = os.path.join(str(config.MEDIA_FOLDER), media["peaks_file"])
+        return peaks_path if os.path.isfile(peaks_path) else None
+
+    def get_hls_path(self, meeting_id: str, filename: str):
+        """
+        HLS 플레이리스트/세그먼트 파일 경로 (없거나 회의 폴더 밖이면 None)
+
+        Args:
+            meeting_id: 회의 ID
+            filename: 플레이리스트 또는 세그먼트 파일명
+        """
+        media = self.db.get_meeting_media(meeting_id)
+        if not media or not media.get("hls_playlist"):
+            return None
+
+        hls_dir = os.path.realpath(os.path.join(str(config.MEDIA_FOLDER), os.path.dirname(media["hls_playlist"])))
+        path = os.path.realpath(os.path.join(hls_dir, filename))
+        if os.path.dirname(path) != hls_dir or not os.path.isfile(path):
+            return None
+        return path
+
+    def get_hls_url(self, meeting_id: str):
+        """HLS 플레이리스트 URL (생성되지 않았으면 None)"""
+        media = self.db.get_meeting_media(meeting_id)
+        if not media or not media.get("hls_playlist"):
+            return None
+        return f"/media/{meeting_id}/hls/{os.path.basename(media['hls_playlist'])}"
+
+    def media_type_of(self, audio_file: str) -> str:
+        """플레이어 선택용 미디어 종류 ('video' 또는 'audio')"""
+        mime_type = mimetypes.guess_type(audio_file or "")[0] or ""
+        return "video" if mime_type.startswith("video/") else "audio"
+
+    # ==================== 삭제 ====================
+
+    def delete_media_files(self, media: dict):
+        """
+        회의의 파생 미디어 파일(peaks, 변환본, HLS)과 보관 스토리지의 원본을 삭제합니다.
+        회의 삭제 후 정리 대기열에서 호출되며, 이미 삭제된 파일은 건너뜁니다. (재시도 가능)
+        보관 스토리지로 이동하는 중에 삭제된 경우 기록은 hot이어도 사본이 있을 수 있으므로 보관 위치 기록과 관계없이 확인합니다.
+        uploads 폴더의 원본 파일은 정리 작업(cleanup_service)에서 삭제됩니다.
+
+        Args:
+            media: 삭제 시점의 meeting_media 정보 (peaks_file, rendition_file, hls_playlist, original_file, original_storage)
+
+        Raises:
+            OSError: 파일 삭제 실패 시
+        """
+        paths = []
+        for key in ("peaks_file", "rendition_file"):
+            if media.get(key):
+                paths.append(os.path.join(str(config.MEDIA_FOLDER), media[key]))
+        if media.get("original_file"):
+            paths.append(os.path.join(str(config.COLD_STORAGE_FOLDER), media["original_file"]))
+
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+                print(f"🗑️  미디어 파일 삭제: {path}")
+
+        if media.get("hls_playlist"):
+            hls_dir = os.path.join(str(config.MEDIA_FOLDER), os.path.dirname(media["hls_playlist"]))
+            if os.path.isdir(hls_dir):
+                shutil.rmtree(hls_dir)
+
+
+# 싱글톤 인스턴스
+media_service = MediaService()
@@ -4,6 +4,8 @@
 """
 import os
 import uuid
+import queue
+import threading
 import subprocess
 from pathlib import Path
 from werkzeug.utils import secure_filename
@@ -11,9 +13,49 @@ from datetime import datetime
 
 from config import config
 from utils.stt import STTManager
-from utils.db_manager import DatabaseManager
-from utils.vector_db_manager import vdb_manager
+from utils.db_manager import DatabaseManager, MeetingDeletedError
+from services.vector_sync_service import vector_sync_service
+from utils.job_coordinator import job_coordinator, make_content_version
+from utils.audio_preprocessor import audio_preprocessor, OffsetMap
+from utils.ffmpeg_runner import ffmpeg_runner, FFmpegCancelled
 from utils.validation import validate_title, parse_meeting_date
+from utils.service_container import services
+
+
+class UploadTeeStream:
+    """
+    업로드 스트림을 읽는 동시에 디스크에 저장하는 래퍼
+    ffmpeg stdin으로 전달하면 파일 저장과 무음 분석을 한 번의 읽기로 처리할 수 있습니다.
+    """
+
+    def __init__(self, source, dest_path: str):
+        self._source = source
+        self._dest = open(dest_path, "wb")
+        self._lock = threading.Lock()
+        self.bytes_written = 0
+
+    def read(self, size: int = -1) -> bytes:
+        with self._lock:
+            if self._dest.closed:
+                return b""
+            chunk = self._source.read(size)
+            if chunk:
+                self._dest.write(chunk)
+                self.bytes_written += len(chunk)
+            return chunk
+
+    def finish(self):
+        """남은 데이터를 모두 저장하고 파일을 닫습니다. (여러 번 호출해도 안전)"""
+        with self._lock:
+            if self._dest.closed:
+                return
+            while True:
+                chunk = self._source.read(64 * 1024)
+                if not chunk:
+                    break
+                self._dest.write(chunk)
+                self.bytes_written += len(chunk)
+            self._dest.close()
 
 
 class UploadService:
@@ -22,7 +64,7 @@ class UploadService:
     def __init__(self):
         self.stt_manager = STTManager()
         self.db = DatabaseManager(str(config.DATABASE_PATH))
-        self.vdb_manager = vdb_manager
+        self.vector_sync = vector_sync_service
 
     def validate_file(self, filename: str) -> tuple[bool, str]:
         """
@@ -57,31 +99,63 @@ class UploadService:
         Returns:
             (file_path, original_filename, is_video): 저장된 파일 경로, 원본 파일명, 비디오 여부
         """
+        file_path, original_filename, is_video = self._build_upload_path(file.filename)
+
+        # 파일 저장
+        file.save(file_path)
+
+        print(f"✅ 파일 저장: {file_path} (비디오: {is_video})")
+
+        return file_path, original_filename, is_video
+
+    def can_stream_upload(self, filename: str) -> bool:
+        """
+        업로드 스트림을 ffmpeg에 바로 전달할 수 있는 형식인지 확인
+        (mp4/m4a는 메타데이터가 파일 끝에 있을 수 있어 탐색 가능한 파일이 필요)
+        """
+        extension = filename.rsplit('.', 1)[-1].lower()
+        return extension in config.FFMPEG_STREAMABLE_EXTENSIONS
+
+    def open_upload_stream(self, file, meeting_id: str) -> tuple[str, str, bool, UploadTeeStream]:
+        """
+        업로드 파일을 스트림으로 열기 (읽는 동시에 디스크에 저장)
+
+        Args:
+            file: Werkzeug FileStorage 객체
+            meeting_id: 회의 ID
+
+        Returns:
+            (file_path, original_filename, is_video, stream): 저장될 경로, 원본 파일명, 비디오 여부, 저장 스트림
+        """
+        file_path, original_filename, is_video = self._build_upload_path(file.filename)
+        stream = UploadTeeStream(file.stream, file_path)
+
+        print(f"✅ 파일 스트리밍 저장 시작: {file_path} (비디오: {is_video})")
+
+        return file_path, original_filename, is_video, stream
+
+    def _build_upload_path(self, filename: str) -> tuple[str, str, bool]:
+        """업로드 파일 저장 경로 생성 (파일명 보안 처리 + 충돌 방지)"""
         # 파일명 보안 처리
-        original_filename = secure_filename(file.filename)
+        original_filename = secure_filename(filename)
 
         # UUID 추가 (파일명 충돌 방지)
         unique_id = uuid.uuid4().hex[:8]
-        filename = f"{unique_id}_{original_filename}"
-
-        # 파일 저장
-        file_path = config.UPLOAD_FOLDER / filename
-        file.save(str(file_path))
+        file_path = config.UPLOAD_FOLDER / f"{unique_id}_{original_filename}"
 
         # 비디오 파일 여부 확인
         extension = original_filename.rsplit('.', 1)[1].lower()
         is_video = (extension == 'mp4')
 
-        print(f"✅ 파일 저장: {file_path} (비디오: {is_video})")
-
         return str(file_path), original_filename, is_video
 
-    def convert_video_to_audio(self, video_path: str) -> tuple[bool, str, str]:
+    def convert_video_to_audio(self, video_path: str, job_id: str = None) -> tuple[bool, str, str]:
         """
         비디오 파일을 오디오 파일로 변환 (ffmpeg 사용)
 
         Args:
             video_path: 비디오 파일 경로
+            job_id: ffmpeg 작업 취소 단위 (meeting_id)
 
         Returns:
             (success, audio_path, error_message): 변환 결과
@@ -90,9 +164,8 @@ class UploadService:
             # 출력 파일 경로 (같은 위치에 .wav로 저장)
             audio_path = video_path.rsplit('.', 1)[0] + '_converted.wav'
 
-            # ffmpeg 명령어
-            command = [
-                'ffmpeg',
+            # ffmpeg 인자 (동시 실행 수/우선순위는 ffmpeg_runner가 관리, 20분 타임아웃)
+            args = [
                 '-y',  # 덮어쓰기
                 '-i', video_path,
                 '-vn',  # 비디오 스트림 제거
@@ -102,15 +175,7 @@ class UploadService:
                 audio_path
             ]
 
-            # 실행 (20분 타임아웃)
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                encoding='utf-8',
-                errors='ignore',
-                timeout=config.UPLOAD_TIMEOUT_SECONDS
-            )
+            result = ffmpeg_runner.run(args, job_id=job_id)
 
             if result.returncode == 0:
                 print(f"✅ 비디오 → 오디오 변환 성공: {audio_path}")
@@ -125,70 +190,192 @@ class UploadService:
             print(f"❌ {error_msg}")
             return False, "", error_msg
 
+        except FFmpegCancelled:
+            raise
+
         except Exception as e:
             error_msg = f"변환 중 오류: {str(e)}"
             print(f"❌ {error_msg}")
             return False, "", error_msg
 
+    def preprocess_audio(
+        self,
+        file_path: str,
+        job_id: str = None,
+        on_progress=None,
+        upload_stream: UploadTeeStream = None
+    ) -> tuple[bool, str, OffsetMap, str]:
+        """
+        STT 전 오디오 전처리 (무음 제거, 음량 정규화, Opus 모노 재인코딩)
+        비디오 파일도 이 단계에서 오디오만 추출됩니다.
+
+        Args:
+            file_path: 업로드된 원본 파일 경로
+            job_id: ffmpeg 작업 취소 단위 (meeting_id)
+            on_progress: 진행 상황 콜백 (dict: phase, percent, out_seconds)
+            upload_stream: 아직 저장 중인 업로드 스트림 (있으면 저장과 동시에 분석)
+
+        Returns:
+            (success, processed_path, offset_map, error_message): 전처리 결과
+
+        Raises:
+            FFmpegCancelled: 작업이 취소된 경우 (클라이언트 연결 종료, 회의 삭제)
+        """
+        try:
+            result = audio_preprocessor.preprocess(
+                file_path,
+                job_id=job_id,
+                on_progress=on_progress,
+                input_stream=upload_stream
+            )
+            print(f"✅ 오디오 전처리 완료: {result.output_path} "
+                  f"({result.original_duration:.0f}초 → {result.processed_duration:.0f}초)")
+            return True, result.output_path, result.offset_map, ""
+
+        except FFmpegCancelled:
+            raise
+
+        except subprocess.TimeoutExpired:
+            error_msg = "전처리 타임아웃 (20분 초과)"
+            print(f"❌ {error_msg}")
+            return False, "", OffsetMap.identity(), error_msg
+
+        except Exception as e:
+            error_msg = f"전처리 중 오류: {str(e)}"
+            print(f"❌ {error_msg}")
+            return False, "", OffsetMap.identity(), error_msg
+
+        finally:
+            # 분석이 중간에 실패해도 원본 파일은 끝까지 저장 (폴백/재생용)
+            if upload_stream is not None:
+                upload_stream.finish()
+
+    def iter_preprocess_audio(self, file_path: str, job_id: str = None, upload_stream: UploadTeeStream = None):
+        """
+        오디오 전처리를 백그라운드 스레드에서 실행하면서 진행 상황을 차례로 반환합니다. (SSE 스트리밍용)
+
+        Yields:
+            ('progress', dict): 진행 상황 (phase, percent, out_seconds)
+            ('done', tuple): preprocess_audio의 반환값 (마지막 한 번)
+
+        Raises:
+            FFmpegCancelled: 작업이 취소된 경우
+        """
+        events = queue.Queue()
+
+        def worker():
+            try:
+                result = self.preprocess_audio(
+                    file_path,
+                    job_id=job_id,
+                    on_progress=lambda progress: events.put(('progress', progress)),
+                    upload_stream=upload_stream
+                )
+                events.put(('done', result))
+            except BaseException as e:
+                events.put(('error', e))
+
+        thread = threading.Thread(target=worker, name=f"preprocess-{job_id}", daemon=True)
+        thread.start()
+
+        while True:
+            kind, payload = events.get()
+            if kind == 'error':
+                raise payload
+            yield kind, payload
+            if kind == 'done':
+                return
+
     def process_audio_file(
         self,
         audio_path: str,
         meeting_id: str,
         title: str,
         meeting_date: str,
-        owner_id: int
+        owner_id: int,
+        source_path: str = None,
+        offset_map: OffsetMap = None
     ) -> dict:
         """
         오디오 파일 STT 처리 및 DB 저장
 
         Args:
-            audio_path: 오디오 파일 경로
+            audio_path: STT에 보낼 오디오 파일 경로 (전처리된 파일일 수 있음)
             meeting_id: 회의 ID
             title: 회의 제목
             meeting_date: 회의 날짜
             owner_id: 소유자 ID
+            source_path: 재생용 원본 파일 경로 (없으면 audio_path 사용)
+            offset_map: 전처리 시간 → 원본 시간 변환표 (무음 제거 시)
 
         Returns:
             dict: 처리 결과 (segments, meeting_id 등)
         """
-        # STT 처리
+        audio_filename = os.path.basename(source_path or audio_path)
+        offset_map = offset_map or OffsetMap.identity()
+        pending = []
+
+        def flush_segments(final=False):
+            # 파싱된 세그먼트를 SQLite DB에 이어서 저장
+            # (마지막 저장에서만 벡터 DB 청크 생성을 같은 트랜잭션으로 대기열에 등록)
+            if not pending and not final:
+                return
+            # 처리 중에 회의가 삭제되었으면 (delete_meeting이 같은 job_id로 취소 기록) 저장하지 않고 중단
+            if ffmpeg_runner.is_cancelled(meeting_id):
+                raise FFmpegCancelled(f"삭제된 회의입니다: {meeting_id}")
+            try:
+                self.db.save_stt_to_db(
+                    segments=pending,
+                    audio_filename=audio_filename,
+                    title=title,
+                    meeting_date=meeting_date,
+                    owner_id=owner_id,
+                    meeting_id=meeting_id,
+                    index_vectors=final
+                )
+            except MeetingDeletedError as e:
+                # 다른 프로세스에서 삭제된 경우 (DB 트리거가 헤더 재생성을 막음)
+                raise FFmpegCancelled(str(e)) from e
+            pending.clear()
+
+        def on_segment(segment):
+            # 무음 제거로 당겨진 시간을 원본 기준으로 복원 (반환되는 segments에도 그대로 반영됨)
+            segment['start_time'] = offset_map.to_original(segment['start_time'])
+            # STT 응답이 끝나기 전에 앞부분 세그먼트를 먼저 저장
+            pending.append(segment)
+            if len(pending) >= config.STT_SEGMENT_FLUSH_SIZE:
+                flush_segments()
+
+        # STT 처리 (스트리밍 응답을 받으면서 세그먼트 단위로 저장)
         print(f"🎤 STT 처리 시작: {audio_path}")
-        segments = self.stt_manager.transcribe_audio(audio_path)
+        stt_report = {}
+        segments = self.stt_manager.transcribe_audio(audio_path, on_segment=on_segment, report=stt_report)
 
         if not segments:
             raise ValueError("STT 처리 결과가 없습니다.")
 
-        print(f"✅ STT 완료: {len(segments)}개 세그먼트")
+        flush_segments(final=True)
+        saved_meeting_id = meeting_id
+        lost_ranges = stt_report.get('lost_ranges', [])
 
-        # SQLite DB 저장
-        audio_filename = os.path.basename(audio_path)
-        saved_meeting_id = self.db.save_stt_to_db(
-            segments=segments,
-            audio_filename=audio_filename,
-            title=title,
-            meeting_date=meeting_date,
-            owner_id=owner_id
-        )
+        if lost_ranges:
+            print(f"⚠️ STT 완료 (일부 누락): {len(segments)}개 세그먼트, 누락 구간 {len(lost_ranges)}개")
+        else:
+            print(f"✅ STT 완료: {len(segments)}개 세그먼트")
 
-        # Vector DB 저장 (청킹 + 임베딩)
-        # DB에서 저장된 세그먼트 다시 조회
-        all_segments = self.db.get_segments_by_meeting_id(saved_meeting_id)
-
-        if all_segments:
-            first_segment = all_segments[0]
-            self.vdb_manager.add_meeting_as_chunk(
-                meeting_id=saved_meeting_id,
-                title=first_segment['title'],
-                meeting_date=first_segment['meeting_date'],
-                audio_file=first_segment['audio_file'],
-                segments=all_segments
-            )
+        # Vector DB 저장 (청킹 + 임베딩): 대기열에 등록된 작업을 이 스레드에서 바로 반영
+        # 실패해도 대기열에 남아 백그라운드 작업이 재시도
+        if self.vector_sync.process_meeting(saved_meeting_id):
             print(f"✅ meeting_chunks에 저장 완료 (meeting_id: {saved_meeting_id})")
+        else:
+            print(f"⚠️ meeting_chunks 저장 대기 중 (백그라운드 재시도, meeting_id: {saved_meeting_id})")
 
         return {
             'success': True,
             'meeting_id': saved_meeting_id,
-            'segments': segments
+            'segments': segments,
+            'partial': bool(lost_ranges),
+            'lost_ranges': lost_ranges
         }
 
     def generate_summary(self, meeting_id: str) -> dict:
@@ -214,20 +401,25 @@ class UploadService:
         # transcript_text 생성
         transcript_text = " ".join([row['segment'] for row in all_segments])
 
-        # subtopic_generate를 이용해 요약 생성
-        summary_content = self.stt_manager.subtopic_generate(first_segment['title'], transcript_text)
+        # subtopic_generate를 이용해 요약 생성 후 meeting_subtopic DB에 저장
+        # (뷰어에서 같은 요약을 동시에 요청해도 한 번만 실행되도록 job_coordinator 사용)
+        def run_summary():
+            summary = self.stt_manager.subtopic_generate(first_segment['title'], transcript_text)
+            if summary:
+                # SQLite 저장 + 벡터 DB 반영 대기열 등록 (한 트랜잭션) 후 바로 반영
+                self.db.save_summary(meeting_id, summary)
+                self.vector_sync.process_meeting(meeting_id)
+            return summary
+
+        summary_content = job_coordinator.run(
+            meeting_id,
+            "summary",
+            make_content_version(first_segment['title'], transcript_text),
+            run_summary
+        )
 
         if not summary_content:
             raise ValueError("요약 생성에 실패했습니다.")
-
-        # meeting_subtopic DB에 저장
-        self.vdb_manager.add_meeting_as_subtopic(
-            meeting_id=meeting_id,
-            title=first_segment['title'],
-            meeting_date=first_segment['meeting_date'],
-            audio_file=first_segment['audio_file'],
-            summary_content=summary_content
-        )
         print(f"✅ 문단 요약 생성 및 저장 완료 (meeting_id: {meeting_id})")
 
         # 마인드맵 키워드 자동 생성
@@ -275,5 +467,5 @@ class UploadService:
                     print(f"⚠️  임시 파일 삭제 실패: {file_path} - {e}")
 
 
-# 싱글톤 인스턴스
-upload_service = UploadService()
+# 싱글톤 인스턴스 (처음 사용할 때 생성)
+upload_service = services.register("upload_service", UploadService)
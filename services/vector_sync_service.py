@@ -0,0 +1,291 @@
+"""
+벡터 DB 동기화 서비스
+SQLite에 기록된 벡터 DB 반영 대기열(vector_outbox)을 처리하고, 주기적으로 두 저장소의 불일치를 찾아 복구합니다.
+
+전사 저장, 문단 요약 저장, 제목/날짜 변경은 SQLite 트랜잭션 안에서 대기열 항목을 함께 기록합니다.
+이 서비스는 항목마다 SQLite의 현재 상태를 읽어 ChromaDB에 반영하므로 여러 번 실행해도 결과가 같고,
+실패한 항목은 지수 백오프로 재시도합니다. 요청 처리 중에는 ChromaDB에 직접 쓰지 않습니다.
+"""
+import time
+import threading
+
+from config import config
+from utils.db_manager import DatabaseManager
+from utils.vector_db_manager import vdb_manager
+from services.cleanup_service import cleanup_service
+
+
+class VectorSyncService:
+    """SQLite → ChromaDB 반영 작업자 + 정합성 검사 (Singleton 인스턴스로 사용)"""
+
+    def __init__(self):
+        self.db = DatabaseManager(str(config.DATABASE_PATH))
+        self._wake_event = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._last_reconcile = None
+
+    def start(self):
+        """백그라운드 반영 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="vector-sync", daemon=True)
+            self._thread.start()
+        print(f"✅ 벡터 DB 동기화 작업 시작 (주기: {config.VECTOR_SYNC_INTERVAL_SECONDS}초, 정합성 검사: {config.VECTOR_RECONCILE_INTERVAL_SECONDS}초)")
+
+    def wake(self):
+        """대기열에 항목을 등록한 직후 주기를 기다리지 않고 바로 반영하도록 깨움"""
+        self._wake_event.set()
+
+    def _run(self):
+        next_reconcile = time.monotonic() + config.VECTOR_RECONCILE_INTERVAL_SECONDS
+        while True:
+            try:
+                # 벡터 DB에 연결할 수 없으면 대기 항목의 재시도 횟수를 소모하지 않고 다음 주기에 다시 확인
+                if self._backend_ready():
+                    # 한 배치가 가득 찼으면 쉬지 않고 다음 배치 처리
+                    while self.drain() >= config.VECTOR_SYNC_BATCH_SIZE:
+                        pass
+
+                    if time.monotonic() >= next_reconcile:
+                        next_reconcile = time.monotonic() + config.VECTOR_RECONCILE_INTERVAL_SECONDS
+                        self.reconcile()
+            except Exception as e:
+                print(f"⚠️  벡터 DB 동기화 작업 오류: {e}")
+
+            self._wake_event.wait(config.VECTOR_SYNC_INTERVAL_SECONDS)
+            self._wake_event.clear()
+
+    def _backend_ready(self) -> bool:
+        """반영할 항목이 있을 때 벡터 DB 연결 상태 확인 (heartbeat 결과는 일정 시간 재사용)"""
+        if not self.db.count_vector_sync()['pending']:
+            return True
+        try:
+            health = vdb_manager.health_check()
+        except Exception as e:
+            # http 모드에서 서버가 내려가 있으면 클라이언트 생성 자체가 실패
+            health = {'ok': False, 'error': str(e)}
+        if not health['ok']:
+            print(f"⚠️  벡터 DB에 연결할 수 없어 반영을 미룹니다: {health['error']}")
+        return health['ok']
+
+    # ==================== 대기열 처리 ====================
+
+    def drain(self, batch_size: int = None, meeting_id: str = None) -> int:
+        """
+        반영 대기열에서 처리 시각이 된 항목을 한 배치 처리합니다.
+
+        Args:
+            batch_size: 배치 크기 (기본값: VECTOR_SYNC_BATCH_SIZE)
+            meeting_id: 특정 회의의 항목만 처리
+
+        Returns:
+            int: 가져온 항목 수
+        """
+        entries = self.db.claim_vector_sync(
+            batch_size or config.VECTOR_SYNC_BATCH_SIZE,
+            config.VECTOR_SYNC_LEASE_SECONDS,
+            meeting_id=meeting_id
+        )
+
+        for entry in entries:
+            try:
+                self.apply(entry)
+                self.db.complete_vector_sync(entry['id'], entry['version'])
+            except Exception as e:
+                attempts = entry['attempts'] + 1
+                delay = min(config.VECTOR_SYNC_RETRY_BASE_SECONDS * (2 ** (attempts - 1)), config.VECTOR_SYNC_MAX_BACKOFF_SECONDS)
+                self.db.fail_vector_sync(entry['id'], e, time.time() + delay)
+                print(f"⚠️  벡터 DB 반영 실패 ({attempts}회차, {delay}초 후 재시도): {entry['meeting_id']} {entry['operation']} - {e}")
+
+        return len(entries)
+
+    def process_meeting(self, meeting_id: str) -> bool:
+        """
+        회의 1건의 대기 항목을 호출한 스레드에서 바로 처리합니다.
+        업로드/요약 작업처럼 이미 백그라운드에서 실행 중이고, 직후 단계가 벡터 DB를 읽는 경우에 사용합니다.
+        실패한 항목은 대기열에 남아 백그라운드 작업이 재시도합니다.
+
+        Args:
+            meeting_id: 회의 ID
+
+        Returns:
+            bool: 대기 항목이 모두 반영되었는지 여부
+        """
+        self.drain(len(self.db.VECTOR_SYNC_OPERATIONS), meeting_id=meeting_id)
+        pending = self.db.count_vector_sync(meeting_id)['pending']
+        if pending:
+            self.wake()
+        return not pending
+
+    def apply(self, entry: dict):
+        """
+        대기열 항목 1건을 ChromaDB에 반영합니다. (SQLite의 현재 상태 기준, 다시 실행해도 안전)
+
+        Args:
+            entry: 대기열 항목 (meeting_id, operation)
+
+        Raises:
+            Exception: 반영에 실패하면 항목을 남겨 재시도
+        """
+        meeting_id = entry['meeting_id']
+        operation = entry['operation']
+
+        header = self.db.get_meeting_header(meeting_id)
+        if not header:
+            # 그 사이 삭제된 회의 (벡터 정리는 정리 대기열이 처리)
+            return
+
+        if operation == 'index_chunks':
+            segments = self.db.get_segments_by_meeting_id(meeting_id)
+            chunk_ids = []
+            if segments:
+                chunk_ids = vdb_manager.add_meeting_as_chunk(
+                    meeting_id=meeting_id,
+                    title=header['title'],
+                    meeting_date=header['meeting_date'],
+                    audio_file=header['audio_file'],
+                    segments=segments
+                )
+            # 새 청크를 먼저 저장(같은 id는 교체)한 뒤 남은 이전 청크만 삭제 (재색인 중에도 검색 결과가 비지 않도록)
+            vdb_manager.delete_meeting_vectors(meeting_id, db_types=('chunks',), keep_ids=chunk_ids)
+
+        elif operation == 'index_subtopic':
+            summary_content = self.db.get_summary_by_meeting_id(meeting_id)
+            vdb_manager.delete_meeting_vectors(meeting_id, db_types=('subtopic',))
+            if summary_content:
+                vdb_manager.add_meeting_as_subtopic(
+                    meeting_id=meeting_id,
+                    title=header['title'],
+                    meeting_date=header['meeting_date'],
+                    audio_file=header['audio_file'],
+                    summary_content=summary_content
+                )
+
+        elif operation == 'sync_metadata':
+            result = vdb_manager.update_meeting_metadata(meeting_id, header['title'], header['meeting_date'])
+            if not result['success']:
+                raise RuntimeError(result.get('error', '알 수 없는 오류'))
+
+        else:
+            raise ValueError(f"알 수 없는 작업: {operation}")
+
+    # ==================== 이전 방식 청크 재색인 ====================
+
+    def reindex_legacy_chunks(self, limit: int = None) -> dict:
+        """
+        부모-자식 검색 이전 방식의 청크가 남은 회의를 최대 limit개만 index_chunks 대기열에 등록합니다.
+        (관리자가 요청할 때만 실행, 임베딩 비용이 한 번에 몰리지 않도록 나눠서 등록)
+        재색인 전의 청크도 검색에는 그대로 사용됩니다.
+
+        Args:
+            limit: 이번에 등록할 최대 회의 수 (기본값/상한: CHILD_REINDEX_BATCH_LIMIT)
+
+        Returns:
+            dict: legacy_meetings(이전 방식 청크가 남은 회의 수), pending(이미 대기 중), enqueued, remaining
+        """
+        limit = min(limit or config.CHILD_REINDEX_BATCH_LIMIT, config.CHILD_REINDEX_BATCH_LIMIT)
+
+        legacy = vdb_manager.scan_legacy_chunk_meetings()
+        snapshot = self.db.get_vector_sync_snapshot(config.VECTOR_RECONCILE_GRACE_SECONDS)
+        legacy &= set(snapshot['meetings'])
+        pending = {meeting_id for meeting_id in legacy if (meeting_id, 'index_chunks') in snapshot['pending']}
+
+        targets = sorted(legacy - pending)[:limit]
+        if targets:
+            self.db.enqueue_vector_sync([(meeting_id, 'index_chunks') for meeting_id in targets])
+            self.wake()
+
+        result = {
+            "legacy_meetings": len(legacy),
+            "pending": len(pending),
+            "enqueued": len(targets),
+            "remaining": len(legacy) - len(pending) - len(targets),
+        }
+        print(f"🔁 이전 방식 청크 재색인 등록: {result}")
+        return result
+
+    # ==================== 정합성 검사 ====================
+
+    def reconcile(self) -> dict:
+        """
+        SQLite와 ChromaDB를 비교하여 불일치를 대기열에 등록합니다.
+
+        - 청크가 없는 회의 → index_chunks
+        - 문단 요약은 있는데 subtopic 벡터가 없는 회의 → index_subtopic
+        - 제목/날짜 메타데이터가 다른 회의 → sync_metadata
+        - SQLite에 없는 회의의 벡터 → 정리 대기열(meeting_tombstones)
+
+        Returns:
+            dict: 불일치 유형별 건수
+        """
+        started = time.monotonic()
+
+        # 벡터 DB를 먼저 읽어야 그 사이 새로 생성된 회의의 벡터를 고아로 오인하지 않음
+        indexed = {
+            db_type: vdb_manager.scan_meeting_metadata(db_type)
+            for db_type in ('chunks', 'subtopic')
+        }
+
+        snapshot = self.db.get_vector_sync_snapshot(config.VECTOR_RECONCILE_GRACE_SECONDS)
+        meetings = snapshot['meetings']
+        pending = snapshot['pending']
+
+        repairs = []
+
+        def repair(meeting_id, operation):
+            if (meeting_id, operation) not in pending:
+                repairs.append((meeting_id, operation))
+
+        for meeting_id in snapshot['settled']:
+            if meeting_id not in indexed['chunks']:
+                repair(meeting_id, 'index_chunks')
+            if meeting_id in snapshot['summarized'] and meeting_id not in indexed['subtopic']:
+                repair(meeting_id, 'index_subtopic')
+
+        stale = {
+            meeting_id
+            for vectors in indexed.values()
+            for meeting_id, values in vectors.items()
+            if meeting_id in meetings and values != {meetings[meeting_id]}
+        }
+        for meeting_id in stale:
+            repair(meeting_id, 'sync_metadata')
+
+        orphans = sorted(
+            (set(indexed['chunks']) | set(indexed['subtopic'])) - set(meetings) - snapshot['tombstoned']
+        )
+
+        if repairs:
+            self.db.enqueue_vector_sync(repairs)
+            self.wake()
+        if orphans:
+            self.db.enqueue_orphan_tombstones(orphans)
+            cleanup_service.wake()
+
+        result = {
+            "checked_meetings": len(meetings),
+            "index_chunks": sum(1 for _, operation in repairs if operation == 'index_chunks'),
+            "index_subtopic": sum(1 for _, operation in repairs if operation == 'index_subtopic'),
+            "sync_metadata": sum(1 for _, operation in repairs if operation == 'sync_metadata'),
+            "orphans": len(orphans),
+            "elapsed_seconds": round(time.monotonic() - started, 2),
+        }
+        self._last_reconcile = {"finished_at": time.time(), **result}
+
+        if repairs or orphans:
+            print(f"🔧 벡터 DB 불일치 복구 등록: {result}")
+        return result
+
+    def get_stats(self) -> dict:
+        """반영 대기 항목 수와 마지막 정합성 검사 결과 (관리자 모니터링용)"""
+        return {
+            **self.db.count_vector_sync(),
+            "running": bool(self._thread and self._thread.is_alive()),
+            "last_reconcile": self._last_reconcile,
+        }
+
+
+# 싱글톤 인스턴스
+vector_sync_service = VectorSyncService()
@@ -508,6 +508,12 @@ document.addEventListener('DOMContentLoaded', () => {
                     if (stepUpload) stepUpload.classList.add('active');
                     break;
 
+                case 'convert':
+                    if (progressIcon) progressIcon.textContent = data.icon || '🎚️';
+                    if (progressStatus) progressStatus.textContent = data.message;
+                    if (stepUpload) stepUpload.classList.add('active');
+                    break;
+
                 case 'stt':
                     if (progressIcon) progressIcon.textContent = data.icon || '🎤';
                     if (progressStatus) progressStatus.textContent = data.message;
@@ -863,29 +869,24 @@ document.addEventListener('DOMContentLoaded', () => {
             return;
         }
 
-        // 실제로 새 노트가 생성되었는지 확인 (최근 5분 이내)
+        // 업로드 시작 이후 새 노트가 생성되었는지 확인 (변경분만 조회)
         try {
-            const fiveMinutesAgo = Date.now() - (5 * 60 * 1000);
-            const response = await fetch('/notes_json');
+            const since = new Date(startTime).toISOString();
+            const response = await fetch(`/notes_json?since=${encodeURIComponent(since)}`);
 
             if (response.ok) {
                 const data = await response.json();
 
-                // 최근 생성된 노트가 있는지 확인
-                if (data.meetings && data.meetings.length > 0) {
-                    const latestMeeting = data.meetings[0];
-                    const meetingTime = new Date(latestMeeting.meeting_date).getTime();
-
-                    // upload_start_time 이후에 생성된 노트가 있으면 작업 완료된 것
-                    if (meetingTime >= startTime) {
-                        console.log('✅ 업로드 작업 완료 확인 - 플래그 제거');
-                        sessionStorage.removeItem('upload_in_progress');
-                        sessionStorage.removeItem('upload_start_time');
+                // upload_start_time 이후에 생성된 노트가 있으면 작업 완료된 것
+                const createdMeeting = (data.meetings || []).find(meeting => meeting.created_at > data.since);
+                if (createdMeeting) {
+                    console.log('✅ 업로드 작업 완료 확인 - 플래그 제거');
+                    sessionStorage.removeItem('upload_in_progress');
+                    sessionStorage.removeItem('upload_start_time');
 
-                        // 완료된 노트로 자동 이동
-                        window.location.href = `/view/${latestMeeting.meeting_id}`;
-                        return;
-                    }
+                    // 완료된 노트로 자동 이동
+                    window.location.href = `/view/${createdMeeting.meeting_id}`;
+                    return;
                 }
             }
         } catch (error) {
@@ -7,14 +7,20 @@ document.addEventListener('DOMContentLoaded', () => {
     const minutesContainer = document.getElementById('minutes-container');
     const meetingTitle = document.getElementById('meeting-title');
 
-    let segments = [];
-    let currentSegmentIndex = -1;
+    let segments = []; // 현재 불러온 구간의 세그먼트 (시간순)
+    let hasBefore = false; // 불러온 구간 앞에 세그먼트가 더 있는지
+    let hasAfter = false; // 불러온 구간 뒤에 세그먼트가 더 있는지
+    let transcriptUrl = ''; // 전사 구간 조회 API
+    let windowRequest = null; // 진행 중인 구간 요청 (동시에 하나만)
+    let currentSegmentId = null;
+    const MAX_RENDERED_SEGMENTS = 1000; // 화면에 유지할 최대 세그먼트 수 (넘으면 반대쪽부터 제거)
     let summaryGenerated = false; // 요약 생성 여부 추적
     let minutesGenerated = false; // 회의록 생성 여부 추적
     let currentPlayer = null; // 현재 사용 중인 플레이어 (비디오 또는 오디오)
     let participants = []; // 참석자 목록
     const speakerColors = ['#4A90E2', '#50C878', '#F39C12', '#9B59B6', '#E74C3C', '#1ABC9C', '#E91E63', '#FFC107']; // 화자 색상 팔레트
     let speakerShareData = null; // 화자별 점유율 데이터
+    let speakerStats = []; // 화자별 발언 통계 (발언 시간, 발언 횟수, 끼어들기)
     let chartInstance = null; // Chart.js 인스턴스
     let originalMeetingDate = ''; // 원본 회의 날짜 (DB 형식: "YYYY-MM-DD HH:MM:SS")
 
@@ -57,7 +63,7 @@ document.addEventListener('DOMContentLoaded', () => {
             }
 
             // 데이터로 뷰어 설정
-            segments = data.transcript;
+            transcriptUrl = data.transcript_url;
             meetingTitle.textContent = data.title;
 
             // 편집 권한이 있는 경우 연필 버튼 표시
@@ -76,11 +82,13 @@ document.addEventListener('DOMContentLoaded', () => {
             // 원본 회의 날짜 저장
             originalMeetingDate = data.meeting_date;
 
-            // 파일 확장자 확인하여 비디오/오디오 플레이어 선택
-            const audioUrl = data.audio_url;
-            const fileExtension = audioUrl.split('.').pop().toLowerCase();
+            // 미디어 종류 확인하여 비디오/오디오 플레이어 선택
+            // HLS 플레이리스트가 있고 브라우저가 기본 지원하면 HLS, 아니면 재생용 변환본(프로그레시브)
+            const probe = document.createElement(data.media_type === 'video' ? 'video' : 'audio');
+            const useHls = data.hls_url && probe.canPlayType('application/vnd.apple.mpegurl');
+            const audioUrl = useHls ? data.hls_url : data.audio_url;
 
-            if (fileExtension === 'mp4') {
+            if (data.media_type === 'video') {
                 // 비디오 파일인 경우 비디오 플레이어 사용
                 videoPlayer.src = audioUrl;
                 videoPlayer.style.display = 'block';
@@ -96,6 +104,11 @@ document.addEventListener('DOMContentLoaded', () => {
                 console.log('🎵 오디오 플레이어 활성화');
             }
 
+            // 파형 표시 (peaks 파일이 없으면 생략)
+            if (data.peaks_url) {
+                loadWaveform(data.peaks_url);
+            }
+
             // 회의 날짜 표시
             displayMeetingDate(data.meeting_date);
 
@@ -105,8 +118,13 @@ document.addEventListener('DOMContentLoaded', () => {
 
             // 화자별 점유율 데이터 저장
             speakerShareData = data.speaker_share;
+            speakerStats = data.speaker_stats || [];
 
-            renderTranscript(segments);
+            // 전사 내용은 첫 구간만 불러오고 스크롤/재생 위치에 따라 추가로 로드
+            await loadTranscriptAt(null);
+            if (!segments.length && data.segment_count) {
+                showError('전사 내용을 불러오는 데 실패했습니다.');
+            }
 
             // 문단 요약 존재 여부 확인 및 표시
             await checkAndDisplaySummary();
@@ -163,62 +181,237 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     }
 
-    // 회의록 렌더링
-    function renderTranscript(segments) {
-        transcriptContainer.innerHTML = '';
-        segments.forEach((segment, index) => {
-            const segDiv = document.createElement('div');
-            segDiv.className = 'segment-block';
-            segDiv.dataset.startTime = segment.start_time;
-            segDiv.dataset.index = index;
-
-            const time = new Date(segment.start_time * 1000).toISOString().substr(14, 5);
-
-            // speaker_label에 해당하는 색상 찾기
-            const speakerIndex = participants.indexOf(segment.speaker_label);
-            const speakerColor = speakerIndex >= 0 ? speakerColors[speakerIndex % speakerColors.length] : '#333';
-
-            segDiv.innerHTML = `
-                <div class="segment-block-header">
-                    <span class="segment-speaker" style="color: ${speakerColor}; font-weight: bold;">Speaker ${segment.speaker_label}</span>
-                    <span class="segment-time">${time}</span>
-                </div>
-                <p class="segment-block-text">${segment.segment}</p>
-            `;
+    // 전사 구간 조회 (응답의 배열 행을 객체로 변환)
+    async function fetchTranscriptWindow(params) {
+        const query = new URLSearchParams(params).toString();
+        const response = await fetch(query ? `${transcriptUrl}?${query}` : transcriptUrl);
+        const data = await response.json();
 
-            // 클릭 시 해당 시간으로 이동 및 재생
-            segDiv.addEventListener('click', () => {
-                if (currentPlayer) {
-                    currentPlayer.currentTime = segment.start_time;
-                    currentPlayer.play();
-                }
-            });
+        if (!response.ok || !data.success) {
+            throw new Error(data.error || '전사 내용을 불러오는 데 실패했습니다.');
+        }
+
+        const rows = data.rows.map(row => Object.fromEntries(data.columns.map((column, i) => [column, row[i]])));
+        return { rows, hasBefore: data.has_before, hasAfter: data.has_after };
+    }
+
+    // 구간 요청은 동시에 하나만 실행 (스크롤/재생 이벤트가 연속으로 발생해도 중복 요청 방지)
+    function loadWindow(task) {
+        if (windowRequest) return windowRequest;
+        windowRequest = task()
+            .catch(error => console.warn('⚠️ 전사 구간 로드 실패:', error))
+            .finally(() => { windowRequest = null; });
+        return windowRequest;
+    }
+
+    // 지정한 시간(초)을 포함하는 구간으로 교체 (null이면 처음부터)
+    function loadTranscriptAt(time) {
+        return loadWindow(async () => {
+            const page = await fetchTranscriptWindow(time === null ? {} : { t: time });
+            segments = page.rows;
+            hasBefore = page.hasBefore;
+            hasAfter = page.hasAfter;
+            currentSegmentId = null;
+
+            transcriptContainer.innerHTML = '';
+            transcriptContainer.append(...segments.map(createSegmentElement));
+            transcriptContainer.scrollTop = 0;
+        });
+    }
+
+    // 불러온 구간 뒤에 다음 구간 추가
+    function loadMoreAfter() {
+        if (!hasAfter || !segments.length) return windowRequest;
+        return loadWindow(async () => {
+            const page = await fetchTranscriptWindow({ after: segments[segments.length - 1].segment_id });
+            segments = segments.concat(page.rows);
+            hasAfter = page.hasAfter;
+            transcriptContainer.append(...page.rows.map(createSegmentElement));
+            trimRenderedSegments('front');
+        });
+    }
 
-            transcriptContainer.appendChild(segDiv);
+    // 불러온 구간 앞에 이전 구간 추가 (보고 있던 위치 유지)
+    function loadMoreBefore() {
+        if (!hasBefore || !segments.length) return windowRequest;
+        return loadWindow(async () => {
+            const page = await fetchTranscriptWindow({ before: segments[0].segment_id });
+            const previousHeight = transcriptContainer.scrollHeight;
+            segments = page.rows.concat(segments);
+            hasBefore = page.hasBefore;
+            transcriptContainer.prepend(...page.rows.map(createSegmentElement));
+            transcriptContainer.scrollTop += transcriptContainer.scrollHeight - previousHeight;
+            trimRenderedSegments('back');
         });
     }
 
+    // 화면에 유지하는 세그먼트 수 제한 (긴 회의를 끝까지 스크롤해도 DOM 크기가 일정)
+    function trimRenderedSegments(side) {
+        const excess = segments.length - MAX_RENDERED_SEGMENTS;
+        if (excess <= 0) return;
+
+        if (side === 'front') {
+            const previousHeight = transcriptContainer.scrollHeight;
+            segments.splice(0, excess);
+            for (let i = 0; i < excess; i++) {
+                transcriptContainer.firstElementChild.remove();
+            }
+            transcriptContainer.scrollTop -= previousHeight - transcriptContainer.scrollHeight;
+            hasBefore = true;
+        } else {
+            segments.splice(-excess);
+            for (let i = 0; i < excess; i++) {
+                transcriptContainer.lastElementChild.remove();
+            }
+            hasAfter = true;
+        }
+    }
+
+    // 스크롤이 끝에 가까워지면 다음/이전 구간 로드
+    transcriptContainer.addEventListener('scroll', () => {
+        const threshold = 300;
+        const { scrollTop, clientHeight, scrollHeight } = transcriptContainer;
+        if (scrollTop + clientHeight >= scrollHeight - threshold) {
+            loadMoreAfter();
+        } else if (scrollTop <= threshold) {
+            loadMoreBefore();
+        }
+    });
+
+    // 세그먼트 요소 생성
+    function createSegmentElement(segment) {
+        const segDiv = document.createElement('div');
+        segDiv.className = 'segment-block';
+        segDiv.dataset.startTime = segment.start_time;
+        segDiv.dataset.segmentId = segment.segment_id;
+
+        const time = new Date(segment.start_time * 1000).toISOString().substr(14, 5);
+
+        // speaker_label에 해당하는 색상 찾기
+        const speakerIndex = participants.indexOf(segment.speaker_label);
+        const speakerColor = speakerIndex >= 0 ? speakerColors[speakerIndex % speakerColors.length] : '#333';
+
+        segDiv.innerHTML = `
+            <div class="segment-block-header">
+                <span class="segment-speaker" style="color: ${speakerColor}; font-weight: bold;">Speaker ${segment.speaker_label}</span>
+                <span class="segment-time">${time}</span>
+            </div>
+            <p class="segment-block-text">${segment.segment}</p>
+        `;
+
+        // 클릭 시 해당 시간으로 이동 및 재생
+        segDiv.addEventListener('click', () => {
+            if (currentPlayer) {
+                currentPlayer.currentTime = segment.start_time;
+                currentPlayer.play();
+            }
+        });
+
+        return segDiv;
+    }
+
+    // 파형 peaks 로드 및 그리기 (클릭 시 해당 위치로 이동)
+    async function loadWaveform(peaksUrl) {
+        const canvas = document.getElementById('waveform-canvas');
+        if (!canvas) return;
+
+        try {
+            const response = await fetch(peaksUrl);
+            if (!response.ok) return;
+            const peaks = await response.json();
+
+            // 캔버스 너비에 가장 가까운 해상도 레벨 선택
+            const width = canvas.clientWidth || 800;
+            const level = peaks.levels.find(l => l.length <= width * 2) || peaks.levels[peaks.levels.length - 1];
+
+            canvas.width = width;
+            canvas.style.display = 'block';
+            drawWaveform(canvas, level, 0);
+
+            canvas.addEventListener('click', (event) => {
+                if (!currentPlayer || !peaks.duration) return;
+                const ratio = event.offsetX / canvas.clientWidth;
+                currentPlayer.currentTime = ratio * peaks.duration;
+                currentPlayer.play();
+            });
+
+            const updateProgress = () => {
+                if (!currentPlayer || !peaks.duration) return;
+                drawWaveform(canvas, level, currentPlayer.currentTime / peaks.duration);
+            };
+            audioPlayer.addEventListener('timeupdate', updateProgress);
+            videoPlayer.addEventListener('timeupdate', updateProgress);
+        } catch (error) {
+            console.warn('⚠️ 파형 로드 실패:', error);
+        }
+    }
+
+    function drawWaveform(canvas, level, progress) {
+        const ctx = canvas.getContext('2d');
+        const width = canvas.width;
+        const height = canvas.height;
+        const mid = height / 2;
+        const count = level.length;
+
+        ctx.clearRect(0, 0, width, height);
+        for (let x = 0; x < width; x++) {
+            const index = Math.floor(x / width * count);
+            const min = level.data[index * 2] || 0;
+            const max = level.data[index * 2 + 1] || 0;
+            ctx.fillStyle = (x / width) <= progress ? '#4A90E2' : '#C5D5E8';
+            ctx.fillRect(x, mid - (max / 128) * mid, 1, Math.max(1, ((max - min) / 128) * mid));
+        }
+    }
+
+    // 불러온 구간에서 재생 시간을 포함하는 세그먼트 위치 (시작 시간이 time 이하인 마지막 세그먼트, 이진 탐색)
+    function findSegmentIndex(time) {
+        let low = 0;
+        let high = segments.length - 1;
+        let found = -1;
+        while (low <= high) {
+            const mid = (low + high) >> 1;
+            if (segments[mid].start_time <= time) {
+                found = mid;
+                low = mid + 1;
+            } else {
+                high = mid - 1;
+            }
+        }
+        return found;
+    }
+
+    // 재생 위치가 불러온 구간 밖인지 확인
+    function isOutsideLoadedWindow(time) {
+        if (!segments.length) return false;
+        return (hasBefore && time < segments[0].start_time)
+            || (hasAfter && time > segments[segments.length - 1].start_time);
+    }
+
     // 재생 시간에 맞춰 하이라이트 (오디오 & 비디오 공통)
     function setupPlayerTimeUpdate(player) {
         player.addEventListener('timeupdate', () => {
+            if (!segments.length || player.seeking) return;
             const currentTime = player.currentTime;
-            let newSegmentIndex = -1;
 
-            for (let i = 0; i < segments.length; i++) {
-                const segment = segments[i];
-                const nextSegment = segments[i + 1];
-                const startTime = segment.start_time;
-                const endTime = nextSegment ? nextSegment.start_time : player.duration;
+            // 재생이 불러온 구간의 끝에 도달하면 다음 구간을 이어서 로드
+            if (hasAfter && currentTime >= segments[segments.length - 1].start_time) {
+                loadMoreAfter();
+            }
+
+            const index = findSegmentIndex(currentTime);
+            const segmentId = index >= 0 ? segments[index].segment_id : null;
 
-                if (currentTime >= startTime && currentTime < endTime) {
-                    newSegmentIndex = i;
-                    break;
-                }
+            if (segmentId !== currentSegmentId) {
+                currentSegmentId = segmentId;
+                highlightSegment(currentSegmentId);
             }
+        });
 
-            if (newSegmentIndex !== currentSegmentIndex) {
-                currentSegmentIndex = newSegmentIndex;
-                highlightSegment(currentSegmentIndex);
+        // 불러온 구간 밖으로 이동하면 해당 위치의 구간으로 교체
+        player.addEventListener('seeked', async () => {
+            if (windowRequest) await windowRequest;
+            if (isOutsideLoadedWindow(player.currentTime)) {
+                await loadTranscriptAt(player.currentTime);
             }
         });
     }
@@ -228,16 +421,18 @@ document.addEventListener('DOMContentLoaded', () => {
     setupPlayerTimeUpdate(videoPlayer);
 
     // 세그먼트 하이라이트 함수
-    function highlightSegment(index) {
-        const segmentBlocks = document.querySelectorAll('.segment-block');
-        segmentBlocks.forEach((block, i) => {
-            if (i === index) {
-                block.classList.add('current');
-                block.scrollIntoView({ behavior: 'smooth', block: 'center' });
-            } else {
-                block.classList.remove('current');
-            }
-        });
+    function highlightSegment(segmentId) {
+        const previous = transcriptContainer.querySelector('.segment-block.current');
+        if (previous) {
+            previous.classList.remove('current');
+        }
+        if (segmentId === null) return;
+
+        const block = transcriptContainer.querySelector(`.segment-block[data-segment-id="${segmentId}"]`);
+        if (block) {
+            block.classList.add('current');
+            block.scrollIntoView({ behavior: 'smooth', block: 'center' });
+        }
     }
 
     // 오류 메시지 표시
@@ -281,6 +476,16 @@ document.addEventListener('DOMContentLoaded', () => {
         attachMinutesButtonListener();
     }
 
+    // 다른 요청에서 같은 작업이 진행 중일 때(202) 결과가 나올 때까지 poll_url 조회
+    async function waitForJob(pollUrl) {
+        while (true) {
+            await new Promise(resolve => setTimeout(resolve, 2000));
+            const response = await fetch(pollUrl);
+            const job = await response.json();
+            if (response.status !== 202) return job;
+        }
+    }
+
     // 회의록 생성 버튼 이벤트 리스너
     function attachMinutesButtonListener() {
         const generateMinutesButton = document.getElementById('generate-minutes-button');
@@ -308,7 +513,13 @@ document.addEventListener('DOMContentLoaded', () => {
                         },
                     });
 
-                    const data = await response.json();
+                    let data = await response.json();
+
+                    // 같은 회의록을 다른 요청에서 생성 중이면 완료될 때까지 결과 조회
+                    if (response.status === 202) {
+                        const job = await waitForJob(data.poll_url);
+                        data = job.success ? { success: true, minutes: job.result } : job;
+                    }
 
                     if (data.success) {
                         // 완료 UI 표시 (노트 생성과 동일하게)
@@ -515,6 +726,17 @@ document.addEventListener('DOMContentLoaded', () => {
                         callbacks: {
                             label: function(context) {
                                 return context.parsed.y.toFixed(2) + '%';
+                            },
+                            afterLabel: function(context) {
+                                const stat = speakerStats.find(s => s.speaker_label === context.label);
+                                if (!stat) return '';
+                                const minutes = Math.floor(stat.talk_seconds / 60);
+                                const seconds = Math.round(stat.talk_seconds % 60);
+                                return [
+                                    `발언 시간: ${minutes}분 ${seconds}초`,
+                                    `발언 횟수: ${stat.turn_count}회`,
+                                    `끼어들기: ${stat.interruptions}회`
+                                ];
                             }
                         }
                     }
@@ -0,0 +1,17 @@
+"""pytest 공통 설정: 저장소 루트를 import 경로에 추가"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """임시 파일에 새로 만든 DatabaseManager (Singleton을 테스트마다 초기화)"""
+    from utils.db_manager import DatabaseManager
+
+    monkeypatch.setattr(DatabaseManager, "_instance", None)
+    monkeypatch.setattr(DatabaseManager, "_initialized", False)
+    return DatabaseManager(str(tmp_path / "test.db"))
@@ -0,0 +1,68 @@
+"""utils/access_control.py 권한 캐시 테스트"""
+import pytest
+
+from config import config
+from utils.access_control import AccessControl
+
+
+@pytest.fixture
+def access(db, monkeypatch):
+    monkeypatch.setattr(config, "DATABASE_PATH", db.db_path)
+    monkeypatch.setattr(AccessControl, "_instance", None)
+    monkeypatch.setattr(AccessControl, "_initialized", False)
+    return AccessControl()
+
+
+def _execute(db, sql, *params):
+    conn = db._get_connection()
+    try:
+        conn.execute(sql, params)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def shared_meeting(db):
+    _execute(db, "INSERT INTO users (id, google_id, email, name, role) VALUES (1, 'g1', 'owner@x', 'owner', 'user')")
+    _execute(db, "INSERT INTO users (id, google_id, email, name, role) VALUES (2, 'g2', 'reader@x', 'reader', 'user')")
+    db.save_stt_to_db([{"speaker": 1, "start_time": 0.0, "text": "안건", "confidence": 0.9}],
+                      "a.wav", "회의", owner_id=1, meeting_id="m1", index_vectors=False)
+    _execute(db, "INSERT INTO meeting_shares (meeting_id, owner_id, shared_with_user_id, permission) VALUES ('m1', 1, 2, 'read')")
+    return "m1"
+
+
+def test_share_revoked_in_another_process_is_seen_before_ttl(db, access, shared_meeting):
+    assert access.can_access(2, shared_meeting)
+
+    # 다른 워커에서 공유 해제 (이 프로세스의 캐시는 무효화되지 않음)
+    _execute(db, "DELETE FROM meeting_shares WHERE meeting_id = ? AND shared_with_user_id = 2", shared_meeting)
+
+    assert not access.can_access(2, shared_meeting)
+    assert access.can_access(1, shared_meeting)
+
+
+def test_meeting_deleted_in_another_process_is_seen_before_ttl(db, access, shared_meeting):
+    assert access.can_edit(1, shared_meeting)
+    assert access.can_access(2, shared_meeting)
+
+    _execute(db, "DELETE FROM meetings WHERE meeting_id = ?", shared_meeting)
+
+    assert not access.can_access(1, shared_meeting)
+    assert not access.can_access(2, shared_meeting)
+
+
+def test_role_change_is_seen_before_ttl(db, access, shared_meeting):
+    assert not access.is_admin(2)
+    _execute(db, "UPDATE users SET role = 'admin' WHERE id = 2")
+    assert access.is_admin(2)
+
+
+def test_unchanged_version_uses_cache(db, access, shared_meeting, monkeypatch):
+    assert access.can_access(2, shared_meeting)
+    loads = []
+    original = access._load
+    monkeypatch.setattr(access, "_load", lambda user_id: loads.append(user_id) or original(user_id))
+
+    assert access.can_access(2, shared_meeting)
+    assert loads == []
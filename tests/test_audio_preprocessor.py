@@ -0,0 +1,57 @@
+"""utils/audio_preprocessor.py 무음 구간 계산/시간 변환표 테스트"""
+import pytest
+
+from utils.audio_preprocessor import AudioPreprocessor, OffsetMap
+
+SILENCEDETECT_LOG = """
+  Duration: 00:01:40.00, start: 0.000000, bitrate: 256 kb/s
+[silencedetect @ 0x1] silence_start: -0.01
+[silencedetect @ 0x1] silence_end: 5 | silence_duration: 5
+[silencedetect @ 0x1] silence_start: 40
+[silencedetect @ 0x1] silence_end: 50 | silence_duration: 10
+[silencedetect @ 0x1] silence_start: 95
+"""
+
+
+@pytest.fixture
+def preprocessor():
+    preprocessor = AudioPreprocessor()
+    preprocessor.keep_silence_seconds = 1.0
+    return preprocessor
+
+
+def test_parse_silencedetect_closes_trailing_silence_at_duration():
+    duration, silences = AudioPreprocessor.parse_silencedetect(SILENCEDETECT_LOG)
+
+    assert duration == 100.0
+    assert silences == [(0.0, 5.0), (40.0, 50.0), (95.0, 100.0)]
+
+
+def test_keep_intervals_drop_edges_and_pad_middle_silence(preprocessor):
+    _, silences = AudioPreprocessor.parse_silencedetect(SILENCEDETECT_LOG)
+
+    assert preprocessor.compute_keep_intervals(100.0, silences) == [(5.0, 40.5), (49.5, 95.0)]
+    # 패딩을 남기면 남는 것이 없는 짧은 무음은 자르지 않음
+    assert preprocessor.compute_keep_intervals(10.0, [(4.0, 4.8)]) == [(0.0, 10.0)]
+
+
+def test_offset_map_maps_processed_time_back_to_original():
+    offset_map = AudioPreprocessor.build_offset_map([(5.0, 40.5), (49.5, 95.0)])
+
+    assert offset_map.to_original(0.0) == 5.0
+    assert offset_map.to_original(10.0) == 15.0
+    assert offset_map.to_original(35.5) == 49.5
+    assert offset_map.to_original(40.0) == 54.0
+    # 끝을 넘는 시간은 마지막 유지 구간의 끝으로 고정
+    assert offset_map.to_original(500.0) == 95.0
+
+
+def test_offset_map_round_trip_and_identity():
+    offset_map = AudioPreprocessor.build_offset_map([(5.0, 40.5), (49.5, 95.0)])
+
+    restored = OffsetMap.from_dict(offset_map.to_dict())
+    assert restored.spans == offset_map.spans
+    assert restored.to_original(40.0) == 54.0
+
+    assert OffsetMap.identity().to_original(12.345) == 12.345
+    assert OffsetMap.from_dict(None).to_original(3.0) == 3.0
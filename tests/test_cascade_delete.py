@@ -0,0 +1,281 @@
+"""외래 키(ON DELETE CASCADE) 마이그레이션, 회의 삭제, 정리 대기열(GC) 테스트"""
+import json
+import sqlite3
+import time
+
+import pytest
+
+from config import config
+from utils.db_manager import DatabaseManager
+
+# 외래 키가 없던 이전 버전의 하위 테이블 (meetings 헤더 테이블 도입 이전)
+LEGACY_SCHEMA = """
+    CREATE TABLE meeting_dialogues (
+        segment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        meeting_id TEXT NOT NULL,
+        meeting_date TEXT,
+        speaker_label TEXT,
+        start_time REAL,
+        segment TEXT,
+        confidence REAL,
+        audio_file TEXT,
+        title TEXT,
+        owner_id INTEGER
+    );
+    CREATE TABLE meeting_minutes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        meeting_id TEXT UNIQUE NOT NULL,
+        title TEXT,
+        meeting_date TEXT,
+        minutes_content TEXT NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        owner_id INTEGER
+    );
+    CREATE TABLE meeting_mindmap (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        meeting_id TEXT UNIQUE NOT NULL,
+        mindmap_content TEXT NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        google_id TEXT UNIQUE NOT NULL,
+        email TEXT UNIQUE NOT NULL,
+        name TEXT,
+        profile_picture TEXT,
+        role TEXT DEFAULT 'user',
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE meeting_shares (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        meeting_id TEXT NOT NULL,
+        owner_id INTEGER NOT NULL,
+        shared_with_user_id INTEGER NOT NULL,
+        permission TEXT DEFAULT 'read',
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (owner_id) REFERENCES users(id),
+        FOREIGN KEY (shared_with_user_id) REFERENCES users(id),
+        UNIQUE(meeting_id, shared_with_user_id)
+    );
+    CREATE TABLE meeting_summaries (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        meeting_id TEXT UNIQUE NOT NULL,
+        summary_content TEXT NOT NULL,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE meeting_media (
+        meeting_id TEXT PRIMARY KEY,
+        original_file TEXT,
+        original_etag TEXT,
+        original_bytes INTEGER,
+        mime_type TEXT,
+        duration REAL,
+        peaks_file TEXT,
+        created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+        updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    );
+    CREATE TABLE meeting_access (
+        user_id INTEGER NOT NULL,
+        meeting_id TEXT NOT NULL,
+        permission TEXT NOT NULL,
+        PRIMARY KEY (user_id, meeting_id)
+    ) WITHOUT ROWID;
+"""
+
+
+def _seed_meeting(conn, meeting_id, owner_id, viewer_id):
+    """하위 테이블마다 행을 채운 회의 1건"""
+    for i in range(3):
+        conn.execute("""
+            INSERT INTO meeting_dialogues
+            (meeting_id, meeting_date, speaker_label, start_time, segment, confidence, audio_file, title, owner_id)
+            VALUES (?, '2025-01-01 10:00:00', '1', ?, ?, 0.9, ?, '회의', ?)
+        """, (meeting_id, float(i), f"{meeting_id} 발언 {i}", f"{meeting_id}.wav", owner_id))
+    conn.execute("INSERT INTO meeting_minutes (meeting_id, minutes_content, owner_id) VALUES (?, '회의록', ?)",
+                 (meeting_id, owner_id))
+    conn.execute("INSERT INTO meeting_mindmap (meeting_id, mindmap_content) VALUES (?, '마인드맵')", (meeting_id,))
+    conn.execute("INSERT INTO meeting_shares (meeting_id, owner_id, shared_with_user_id) VALUES (?, ?, ?)",
+                 (meeting_id, owner_id, viewer_id))
+    conn.execute("INSERT INTO meeting_summaries (meeting_id, summary_content) VALUES (?, '요약')", (meeting_id,))
+    conn.execute("INSERT INTO meeting_media (meeting_id, original_file, peaks_file) VALUES (?, ?, ?)",
+                 (meeting_id, f"{meeting_id}.wav", f"{meeting_id}.peaks.json"))
+    conn.execute("INSERT INTO meeting_access (user_id, meeting_id, permission) VALUES (?, ?, 'owner')",
+                 (owner_id, meeting_id))
+    conn.execute("INSERT INTO meeting_access (user_id, meeting_id, permission) VALUES (?, ?, 'read')",
+                 (viewer_id, meeting_id))
+
+
+def _counts(conn, meeting_id=None):
+    where = " WHERE meeting_id = ?" if meeting_id else ""
+    params = (meeting_id,) if meeting_id else ()
+    return {
+        table: conn.execute(f"SELECT COUNT(*) FROM {table}{where}", params).fetchone()[0]
+        for table in DatabaseManager.CASCADE_TABLES
+    }
+
+
+@pytest.fixture
+def legacy_db_path(tmp_path):
+    """외래 키 없는 이전 스키마에 회의 2건을 채운 DB 파일"""
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    conn.execute("INSERT INTO users (id, google_id, email) VALUES (1, 'g1', 'owner@example.com')")
+    conn.execute("INSERT INTO users (id, google_id, email) VALUES (2, 'g2', 'viewer@example.com')")
+    _seed_meeting(conn, "m1", 1, 2)
+    _seed_meeting(conn, "m2", 1, 2)
+    conn.commit()
+    conn.close()
+    return path
+
+
+@pytest.fixture
+def legacy_counts(legacy_db_path):
+    """마이그레이션 전 하위 테이블별 행 수"""
+    conn = sqlite3.connect(legacy_db_path)
+    try:
+        return _counts(conn)
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def migrated_db(legacy_db_path, legacy_counts, monkeypatch):
+    """이전 스키마 DB를 열어 마이그레이션을 실행한 DatabaseManager"""
+    monkeypatch.setattr(DatabaseManager, "_instance", None)
+    monkeypatch.setattr(DatabaseManager, "_initialized", False)
+    return DatabaseManager(str(legacy_db_path))
+
+
+def test_migration_adds_cascade_foreign_keys_without_losing_rows(migrated_db, legacy_counts):
+    conn = migrated_db._get_connection()
+    try:
+        assert _counts(conn) == legacy_counts
+        assert all(count > 0 for count in legacy_counts.values())
+
+        for table in DatabaseManager.CASCADE_TABLES:
+            fks = [fk for fk in conn.execute(f"PRAGMA foreign_key_list({table})") if fk["table"] == "meetings"]
+            assert [(fk["from"], fk["to"], fk["on_delete"]) for fk in fks] == [("meeting_id", "meeting_id", "CASCADE")], table
+
+        assert conn.execute("PRAGMA foreign_key_check").fetchall() == []
+        assert migrated_db.count_tombstones() == 0
+    finally:
+        conn.close()
+
+
+def test_delete_removes_all_children_and_writes_one_tombstone(migrated_db, legacy_counts):
+    assert migrated_db.delete_meeting_by_id("m1")
+
+    conn = migrated_db._get_connection()
+    try:
+        assert set(_counts(conn, "m1").values()) == {0}
+        assert _counts(conn, "m2") == {table: count // 2 for table, count in legacy_counts.items()}
+
+        tombstones = conn.execute("SELECT meeting_id, audio_file, media FROM meeting_tombstones").fetchall()
+    finally:
+        conn.close()
+
+    assert len(tombstones) == 1
+    assert (tombstones[0]["meeting_id"], tombstones[0]["audio_file"]) == ("m1", "m1.wav")
+    media = json.loads(tombstones[0]["media"])
+    assert (media["original_file"], media["peaks_file"]) == ("m1.wav", "m1.peaks.json")
+
+    # 이미 삭제된 회의는 대기열에 다시 등록되지 않음
+    assert not migrated_db.delete_meeting_by_id("m1")
+    assert migrated_db.count_tombstones() == 1
+
+
+def test_orphan_rows_are_dropped_and_queued_for_cleanup(legacy_db_path, monkeypatch):
+    conn = sqlite3.connect(legacy_db_path)
+    # 세그먼트가 없는 회의의 회의록/미디어 (헤더가 만들어지지 않음)
+    conn.execute("INSERT INTO meeting_minutes (meeting_id, minutes_content) VALUES ('orphan', '회의록')")
+    conn.execute("INSERT INTO meeting_media (meeting_id, original_file) VALUES ('orphan', 'orphan.wav')")
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(DatabaseManager, "_instance", None)
+    monkeypatch.setattr(DatabaseManager, "_initialized", False)
+    db = DatabaseManager(str(legacy_db_path))
+
+    conn = db._get_connection()
+    try:
+        assert set(_counts(conn, "orphan").values()) == {0}
+        tombstones = conn.execute("SELECT meeting_id, media FROM meeting_tombstones").fetchall()
+    finally:
+        conn.close()
+    # 회의록과 미디어 테이블에서 각각 한 번씩 등록, 미디어 정보는 재생성 전에 기록됨
+    assert {row["meeting_id"] for row in tombstones} == {"orphan"}
+    assert any(row["media"] and json.loads(row["media"])["original_file"] == "orphan.wav" for row in tombstones)
+
+
+class FakeVectorManager:
+    def __init__(self, error=None):
+        self.error = error
+        self.deleted = []
+
+    def delete_meeting_vectors(self, meeting_id):
+        if self.error:
+            raise self.error
+        self.deleted.append(meeting_id)
+
+
+class FakeMediaService:
+    def __init__(self):
+        self.deleted = []
+
+    def delete_media_files(self, media):
+        self.deleted.append(media)
+
+
+@pytest.fixture
+def cleanup(migrated_db, tmp_path, monkeypatch):
+    """테스트 DB와 가짜 벡터/미디어 정리를 사용하는 CleanupService"""
+    from services import cleanup_service as module
+
+    upload_folder = tmp_path / "uploads"
+    upload_folder.mkdir()
+    monkeypatch.setattr(config, "UPLOAD_FOLDER", upload_folder)
+    monkeypatch.setattr(module, "vdb_manager", FakeVectorManager())
+    monkeypatch.setattr(module, "media_service", FakeMediaService())
+
+    service = module.CleanupService()
+    assert service.db is migrated_db
+    return service, module
+
+
+def test_cleanup_drains_tombstone_after_delete(cleanup, migrated_db, tmp_path):
+    service, module = cleanup
+    audio = tmp_path / "uploads" / "m1.wav"
+    audio.write_bytes(b"RIFF")
+
+    migrated_db.delete_meeting_by_id("m1")
+    assert service.drain() == 1
+
+    assert module.vdb_manager.deleted == ["m1"]
+    assert module.media_service.deleted[0]["peaks_file"] == "m1.peaks.json"
+    assert not audio.exists()
+    assert migrated_db.count_tombstones() == 0
+    assert service.drain() == 0
+
+
+def test_failed_cleanup_is_retried_with_backoff(cleanup, migrated_db, monkeypatch):
+    service, module = cleanup
+    monkeypatch.setattr(module, "vdb_manager", FakeVectorManager(error=RuntimeError("vector db down")))
+
+    migrated_db.delete_meeting_by_id("m1")
+    started = time.time()
+    assert service.drain() == 1
+
+    conn = migrated_db._get_connection()
+    try:
+        row = conn.execute("SELECT attempts, last_error, next_attempt_at FROM meeting_tombstones").fetchone()
+    finally:
+        conn.close()
+    assert (row["attempts"], row["last_error"]) == (1, "vector db down")
+    assert row["next_attempt_at"] >= started + config.CLEANUP_RETRY_BASE_SECONDS
+
+    # 재시도 시각 전에는 다시 가져가지 않음
+    assert service.drain() == 0
+    assert migrated_db.count_tombstones() == 1
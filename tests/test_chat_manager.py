@@ -0,0 +1,61 @@
+"""utils/chat_manager.py 검색 소스 동시 실행 테스트"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from config import config
+from utils.chat_manager import ChatManager
+
+
+class _FakeVectorDB:
+    def embed_query(self, query):
+        return [1.0, 0.0]
+
+
+@pytest.fixture
+def chat_manager(monkeypatch):
+    monkeypatch.setattr(config, "RETRIEVAL_DEADLINE_SECONDS", 0.1)
+    monkeypatch.setattr(config, "RETRIEVAL_MAX_INFLIGHT_PER_SOURCE", 2)
+    monkeypatch.setattr(config, "RERANK_ENABLED", False)
+
+    # Singleton/__init__(Gemini 클라이언트 생성)을 거치지 않고 검색에 필요한 속성만 준비
+    manager = object.__new__(ChatManager)
+    manager.vdb_manager = _FakeVectorDB()
+    manager._executor = ThreadPoolExecutor(max_workers=4)
+    manager._retrieval_stats = {}
+    manager._stats_lock = threading.Lock()
+    yield manager
+    manager._executor.shutdown(wait=True)
+
+
+def test_slow_source_is_capped_and_does_not_starve_others(chat_manager):
+    release = threading.Event()
+
+    def slow(query, embedding, where, k, with_embeddings):
+        release.wait(5)
+        return ["late"]
+
+    def fast(query, embedding, where, k, with_embeddings):
+        return ["doc"] * k
+
+    chat_manager.retrieval_sources = {"slow": slow, "fast": fast}
+
+    for _ in range(4):
+        results = chat_manager.search_documents("질문")
+        assert results["slow"] == []
+        assert len(results["fast"]) == config.SEARCH_RESULTS_PER_COLLECTION
+
+    stats = chat_manager.get_retrieval_stats()
+    assert stats["slow"] == {"running": 2, "abandoned": 2, "abandoned_running": 2, "skipped": 2}
+    assert stats["fast"]["running"] == 0
+
+    release.set()
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        stats = chat_manager.get_retrieval_stats()["slow"]
+        if stats["running"] == 0 and stats["abandoned_running"] == 0:
+            break
+        time.sleep(0.01)
+    assert (stats["running"], stats["abandoned_running"]) == (0, 0)
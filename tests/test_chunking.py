@@ -0,0 +1,62 @@
+"""utils/chunking.py 구간 계산 테스트"""
+from utils.chunking import child_chunk_ranges, expand_within_budget, semantic_chunk_ranges
+
+# 앞 3개와 뒤 3개 세그먼트의 주제가 다른 임베딩 (세그먼트 2와 3 사이에서 거리가 튐)
+TWO_TOPICS = [[1.0, 0.0], [1.0, 0.1], [1.0, 0.0], [0.0, 1.0], [0.1, 1.0], [0.0, 1.0]]
+
+
+def test_child_ranges_respect_segment_and_size_limits():
+    ranges = child_chunk_ranges([1, 1, 1, 1, 5, 1], [0, 1, 2, 3, 4, 5],
+                                max_segments=3, max_size=4, time_gap_threshold=30)
+
+    # 크기 상한보다 큰 세그먼트(4번)는 단독 구간
+    assert ranges == [(0, 3), (3, 4), (4, 5), (5, 6)]
+
+
+def test_child_ranges_split_on_time_gap():
+    assert child_chunk_ranges([1, 1, 1], [0, 1, 60], max_segments=10, max_size=10, time_gap_threshold=30) == [(0, 2), (2, 3)]
+    assert child_chunk_ranges([], [], max_segments=3, max_size=10, time_gap_threshold=30) == []
+
+
+def _semantic(vectors, start_times=None, **limits):
+    options = dict(min_segments=1, max_segments=10, max_size=100, breakpoint_percentile=80, time_gap_threshold=30)
+    options.update(limits)
+    count = len(vectors)
+    return semantic_chunk_ranges(vectors, [1] * count, start_times or list(range(count)), **options)
+
+
+def test_semantic_ranges_split_at_topic_change():
+    assert _semantic(TWO_TOPICS) == [(0, 3), (3, 6)]
+
+
+def test_semantic_ranges_split_on_time_gap_without_topic_change():
+    vectors = [[1.0, 0.0]] * 4
+    assert _semantic(vectors, start_times=[0, 1, 100, 101], min_segments=3) == [(0, 2), (2, 4)]
+
+
+def test_semantic_ranges_cover_all_segments_within_limits():
+    ranges = _semantic(TWO_TOPICS, max_segments=2)
+
+    assert ranges[0][0] == 0 and ranges[-1][1] == len(TWO_TOPICS)
+    assert all(prev[1] == cur[0] for prev, cur in zip(ranges, ranges[1:]))
+    assert all(0 < end - begin <= 2 for begin, end in ranges)
+
+
+def test_semantic_ranges_single_segment():
+    assert _semantic([[1.0, 0.0]]) == [(0, 1)]
+    assert _semantic([]) == []
+
+
+def test_expand_within_budget_grows_both_sides_alternately():
+    lengths = [1, 1, 1, 1, 1, 1, 1]
+
+    assert expand_within_budget(lengths, 3, 4, max_size=3) == (2, 5)
+    assert expand_within_budget(lengths, 3, 4, max_size=4) == (1, 5)
+    # 한쪽 끝에 닿으면 다른 쪽으로만 넓힘
+    assert expand_within_budget(lengths, 0, 1, max_size=3) == (0, 3)
+
+
+def test_expand_within_budget_keeps_core_over_budget_and_skips_large_neighbour():
+    assert expand_within_budget([5, 5, 5], 1, 2, max_size=3) == (1, 2)
+    # 앞쪽 항목이 너무 커도 뒤쪽은 계속 넓힘
+    assert expand_within_budget([10, 1, 1, 1], 1, 2, max_size=3) == (1, 4)
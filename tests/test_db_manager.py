@@ -0,0 +1,129 @@
+"""utils/db_manager.py 저장/삭제 테스트"""
+import time
+
+import pytest
+
+from utils.db_manager import MeetingDeletedError
+
+
+def _segment(i):
+    return {"speaker": 1, "start_time": float(i), "text": f"문장 {i}", "confidence": 0.9}
+
+
+def _count(db, sql, *params):
+    conn = db._get_connection()
+    try:
+        return conn.execute(sql, params).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _updated_at(db, meeting_id):
+    time.sleep(0.01)  # updated_at은 밀리초 단위
+    conn = db._get_connection()
+    try:
+        return conn.execute("SELECT updated_at FROM meetings WHERE meeting_id = ?", (meeting_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_deleted_meeting_is_not_recreated_by_later_flush(db):
+    db.save_stt_to_db([_segment(0)], "a.wav", "회의", "2025-01-01 10:00:00", meeting_id="m1", index_vectors=False)
+    assert db.delete_meeting_by_id("m1")
+
+    with pytest.raises(MeetingDeletedError):
+        db.save_stt_to_db([_segment(1)], "a.wav", "회의", "2025-01-01 10:00:00", meeting_id="m1", index_vectors=False)
+    with pytest.raises(MeetingDeletedError):
+        db.save_stt_to_db([], "a.wav", "회의", "2025-01-01 10:00:00", meeting_id="m1", index_vectors=True)
+
+    assert _count(db, "SELECT COUNT(*) FROM meetings WHERE meeting_id = 'm1'") == 0
+    assert _count(db, "SELECT COUNT(*) FROM meeting_dialogues WHERE meeting_id = 'm1'") == 0
+    assert _count(db, "SELECT COUNT(*) FROM vector_outbox WHERE meeting_id = 'm1' AND operation = 'index_chunks'") == 0
+
+
+def test_streamed_flushes_append_to_same_meeting(db):
+    db.save_stt_to_db([_segment(0)], "a.wav", "회의", "2025-01-01 10:00:00", meeting_id="m2", index_vectors=False)
+    db.save_stt_to_db([_segment(1)], "a.wav", "회의", "2025-01-01 10:00:00", meeting_id="m2", index_vectors=True)
+
+    assert _count(db, "SELECT COUNT(*) FROM meeting_dialogues WHERE meeting_id = 'm2'") == 2
+    assert _count(db, "SELECT COUNT(*) FROM vector_outbox WHERE meeting_id = 'm2' AND operation = 'index_chunks'") == 1
+
+
+def test_streamed_flushes_bump_updated_at_only_on_final_flush(db):
+    db.save_stt_to_db([_segment(0)], "a.wav", "회의", "2025-01-01 10:00:00", meeting_id="m3", index_vectors=False)
+    created = _updated_at(db, "m3")
+
+    db.save_stt_to_db([_segment(1)], "a.wav", "회의", "2025-01-01 10:00:00", meeting_id="m3", index_vectors=False)
+    assert _updated_at(db, "m3") == created
+
+    db.save_stt_to_db([_segment(2)], "a.wav", "회의", "2025-01-01 10:00:00", meeting_id="m3", index_vectors=True)
+    assert _updated_at(db, "m3") > created
+
+
+def test_fts_bigrams():
+    from utils.db_manager import fts_bigrams
+
+    assert fts_bigrams("정기회의 시작, A_b!") == "정기 기회 회의 시작 A b"
+    assert fts_bigrams("") == ""
+
+
+def test_search_notes_finds_two_syllable_terms_with_index(db):
+    db.save_stt_to_db([
+        {"speaker": 1, "start_time": 0.0, "text": "오늘 정기회의를 시작합니다", "confidence": 0.9},
+        {"speaker": 2, "start_time": 5.0, "text": "예산 보고서는 다음 주에", "confidence": 0.9},
+        {"speaker": 1, "start_time": 9.0, "text": "회의 의견을 모아 주세요", "confidence": 0.9},
+    ], "a.wav", "주간 회의", "2025-01-01 10:00:00", meeting_id="m1")
+
+    results = db.search_notes("정기회의", sources=["segment"])
+    assert [r["content"] for r in results] == ["오늘 정기회의를 시작합니다"]
+    assert results[0]["rank"] != 0.0
+    assert (results[0]["title"], results[0]["meeting_date"]) == ("주간 회의", "2025-01-01 10:00:00")
+
+    assert [r["start_time"] for r in db.search_notes("예산 보고서", sources=["segment"])] == [5.0]
+    assert len(db.search_notes("회의", sources=["segment"])) == 2
+    # 2-gram("회의", "의견")이 단어 경계를 넘어 이어지지만 원문에는 없는 검색어
+    assert db.search_notes("회의견", sources=["segment"]) == []
+    # 한 글자 검색어는 본문 부분 일치
+    assert len(db.search_notes("주", sources=["segment"])) == 2
+
+
+def test_search_index_follows_updates_and_deletes(db):
+    db.save_stt_to_db([{"speaker": 1, "start_time": 0.0, "text": "첫 안건", "confidence": 0.9}],
+                      "a.wav", "회의", meeting_id="m1")
+    conn = db._get_connection()
+    try:
+        conn.execute("UPDATE meeting_dialogues SET segment = '두번째 의제' WHERE meeting_id = 'm1'")
+        conn.commit()
+    finally:
+        conn.close()
+
+    assert db.search_notes("안건") == []
+    assert len(db.search_notes("의제")) == 1
+    db.delete_meeting_by_id("m1")
+    assert db.search_notes("의제") == []
+
+
+def test_legacy_trigram_index_is_rebuilt_as_bigrams(db):
+    from utils import db_migrations
+
+    db.save_stt_to_db([{"speaker": 1, "start_time": 0.0, "text": "예산 심의", "confidence": 0.9}],
+                      "a.wav", "회의", meeting_id="m1")
+    conn = db._get_connection()
+    try:
+        # 이전 버전의 trigram 인덱스 상태로 되돌림
+        for suffix in ("ai", "ad", "au"):
+            conn.execute(f"DROP TRIGGER segments_fts_{suffix}")
+        conn.execute("DROP TABLE segments_fts")
+        conn.execute("""
+            CREATE VIRTUAL TABLE segments_fts USING fts5(
+                segment, content='meeting_dialogues', content_rowid='segment_id', tokenize='trigram'
+            )
+        """)
+        conn.execute("DELETE FROM schema_version WHERE version >= 5")
+        conn.commit()
+
+        assert db_migrations.run_migrations(conn, db)[0] == 5
+    finally:
+        conn.close()
+
+    assert len(db.search_notes("심의", sources=["segment"])) == 1
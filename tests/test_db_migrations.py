@@ -0,0 +1,105 @@
+"""utils/db_migrations.py 마이그레이션 실행기 테스트"""
+import sqlite3
+
+import pytest
+
+from utils import db_migrations
+from utils.db_migrations import Migration, MigrationContext
+
+
+@pytest.fixture
+def conn(tmp_path):
+    connection = sqlite3.connect(str(tmp_path / "migrations.db"))
+    yield connection
+    connection.close()
+
+
+def _use_migrations(monkeypatch, *migrations):
+    monkeypatch.setattr(db_migrations, "MIGRATIONS", tuple(migrations))
+
+
+def test_applies_pending_migrations_in_order_once(conn, monkeypatch):
+    calls = []
+    _use_migrations(
+        monkeypatch,
+        Migration(1, "create", lambda ctx: (calls.append(1), ctx.cursor.execute("CREATE TABLE t (x)"))),
+        Migration(2, "fill", lambda ctx: (calls.append(2), ctx.cursor.execute("INSERT INTO t VALUES (1)"))),
+    )
+
+    assert db_migrations.run_migrations(conn, db=None) == [1, 2]
+    assert db_migrations.run_migrations(conn, db=None) == []
+    assert calls == [1, 2]
+    assert db_migrations.get_schema_version(conn) == 2
+    assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 1
+
+
+def test_failed_migration_is_rolled_back_and_retried(conn, monkeypatch):
+    def broken(ctx):
+        ctx.cursor.execute("CREATE TABLE half (x)")
+        raise RuntimeError("boom")
+
+    _use_migrations(monkeypatch, Migration(1, "ok", lambda ctx: None), Migration(2, "broken", broken))
+    with pytest.raises(RuntimeError):
+        db_migrations.run_migrations(conn, db=None)
+
+    assert db_migrations.get_schema_version(conn) == 1
+    assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'half'").fetchone() is None
+
+    _use_migrations(monkeypatch, Migration(1, "ok", lambda ctx: None),
+                    Migration(2, "fixed", lambda ctx: ctx.cursor.execute("CREATE TABLE half (x)")))
+    assert db_migrations.run_migrations(conn, db=None) == [2]
+
+
+def test_newer_schema_is_left_untouched(conn, monkeypatch):
+    _use_migrations(monkeypatch, Migration(1, "a", lambda ctx: None), Migration(2, "b", lambda ctx: None))
+    db_migrations.run_migrations(conn, db=None)
+
+    _use_migrations(monkeypatch, Migration(1, "a", lambda ctx: None))
+    assert db_migrations.run_migrations(conn, db=None) == []
+
+
+def test_backfill_commits_batches_until_done(conn, monkeypatch):
+    from config import config
+    monkeypatch.setattr(config, "DB_MIGRATION_BATCH_PAUSE_SECONDS", 0)
+
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, done INTEGER DEFAULT 0)")
+    conn.executemany("INSERT INTO items (id) VALUES (?)", [(i,) for i in range(7)])
+    conn.commit()
+    batches = []
+
+    def apply_batch(cursor, keys):
+        batches.append(keys)
+        cursor.executemany("UPDATE items SET done = 1 WHERE id = ?", [(key,) for key in keys])
+
+    conn.execute("BEGIN IMMEDIATE")
+    ctx = MigrationContext(conn, db=None)
+    total = ctx.backfill("SELECT id FROM items WHERE done = 0 ORDER BY id", apply_batch, batch_size=3)
+    conn.commit()
+
+    assert total == 7
+    assert [len(keys) for keys in batches] == [3, 3, 1]
+    assert conn.execute("SELECT COUNT(*) FROM items WHERE done = 0").fetchone()[0] == 0
+
+
+def test_backfill_stops_when_rows_do_not_progress(conn):
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+    conn.executemany("INSERT INTO items (id) VALUES (?)", [(i,) for i in range(3)])
+    conn.commit()
+
+    conn.execute("BEGIN IMMEDIATE")
+    total = MigrationContext(conn, db=None).backfill("SELECT id FROM items", lambda cursor, keys: None, batch_size=2)
+    conn.commit()
+    assert total == 2
+
+
+def test_schema_migrations_do_not_enqueue_reindexing(db):
+    db.save_stt_to_db([{"speaker": 1, "start_time": 0.0, "text": "안건", "confidence": 0.9}],
+                      "a.wav", "회의", meeting_id="m1", index_vectors=False)
+    conn = db._get_connection()
+    try:
+        conn.execute("DELETE FROM schema_version WHERE version >= 2")
+        conn.commit()
+        assert db_migrations.run_migrations(conn, db) == [m.version for m in db_migrations.MIGRATIONS[1:]]
+        assert conn.execute("SELECT COUNT(*) FROM vector_outbox").fetchone()[0] == 0
+    finally:
+        conn.close()
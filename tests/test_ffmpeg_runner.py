@@ -0,0 +1,189 @@
+"""utils/ffmpeg_runner.py 테스트 (PATH에 가짜 ffmpeg 실행 파일을 두고 실행)"""
+import io
+import os
+import sys
+import textwrap
+import threading
+import time
+
+import pytest
+
+from config import config
+from utils.ffmpeg_runner import FFmpegCancelled, FFmpegRunner
+
+# 가짜 ffmpeg: FAKE_FFMPEG_MODE 환경 변수에 따라 동작, 마지막 인자는 출력 경로
+FAKE_FFMPEG = textwrap.dedent("""\
+    import os, sys, time
+
+    mode = os.environ.get("FAKE_FFMPEG_MODE", "progress")
+    output = sys.argv[-1]
+    workdir = os.environ["FAKE_FFMPEG_DIR"]
+
+    def progress(out_time_us, state):
+        sys.stdout.write(f"out_time_us={out_time_us}\\nspeed=1.5x\\nprogress={state}\\n")
+        sys.stdout.flush()
+
+    if mode == "progress":
+        sys.stderr.write("Input #0, wav\\n  Duration: 00:00:10.00, bitrate: 256 kb/s\\n")
+        sys.stderr.flush()
+        time.sleep(0.2)  # stderr의 Duration이 먼저 파싱되도록
+        progress(2500000, "continue")
+        progress(5000000, "continue")
+        progress(10000000, "end")
+    elif mode == "stdin":
+        with open(output, "wb") as f:
+            f.write(sys.stdin.buffer.read())
+        progress(0, "end")
+    elif mode == "fail":
+        sys.stderr.write("Invalid data found when processing input\\n")
+        sys.exit(1)
+    elif mode == "hold":
+        # 시작 표시 파일을 만들고 release 파일이 생길 때까지 대기
+        name = os.path.basename(output)
+        open(os.path.join(workdir, name + ".started"), "w").close()
+        while not os.path.exists(os.path.join(workdir, "release")):
+            time.sleep(0.01)
+        progress(0, "end")
+""")
+
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    """PATH 맨 앞에 가짜 ffmpeg를 두고 작업 디렉터리를 반환"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    script = bin_dir / "ffmpeg"
+    script.write_text(f"#!{sys.executable}\n" + FAKE_FFMPEG)
+    script.chmod(0o755)
+
+    workdir = tmp_path / "work"
+    workdir.mkdir()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}")
+    monkeypatch.setenv("FAKE_FFMPEG_DIR", str(workdir))
+    return workdir
+
+
+@pytest.fixture
+def runner(fake_ffmpeg, monkeypatch):
+    """동시 실행 1개로 제한한 FFmpegRunner (Singleton을 테스트마다 초기화)"""
+    monkeypatch.setattr(config, "FFMPEG_MAX_PROCESSES", 1)
+    monkeypatch.setattr(config, "FFMPEG_NICENESS", 0)
+    monkeypatch.setattr(FFmpegRunner, "_instance", None)
+    monkeypatch.setattr(FFmpegRunner, "_initialized", False)
+    return FFmpegRunner()
+
+
+def _wait_until(predicate, timeout=10):
+    deadline = time.time() + timeout
+    while not predicate():
+        if time.time() > deadline:
+            raise AssertionError("조건이 충족되지 않았습니다")
+        time.sleep(0.01)
+
+
+def _run_in_thread(runner, args, **kwargs):
+    """백그라운드에서 runner.run을 실행하고 결과/예외를 outcome에 담음"""
+    outcome = {}
+
+    def target():
+        try:
+            outcome["result"] = runner.run(args, **kwargs)
+        except Exception as e:
+            outcome["error"] = e
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread, outcome
+
+
+def test_progress_is_parsed_with_duration_from_stderr(runner):
+    events = []
+
+    result = runner.run(["-i", "in.wav", "out.wav"], on_progress=events.append, timeout=10)
+
+    assert result.returncode == 0
+    assert "Duration: 00:00:10.00" in result.stderr
+    assert events == [
+        {"out_seconds": 2.5, "percent": 25.0, "speed": "1.5x"},
+        {"out_seconds": 5.0, "percent": 50.0, "speed": "1.5x"},
+        {"out_seconds": 10.0, "percent": 100.0, "speed": "1.5x"},
+    ]
+
+
+def test_explicit_duration_and_failing_callback(runner, monkeypatch):
+    monkeypatch.setenv("FAKE_FFMPEG_MODE", "progress")
+    percents = []
+
+    def on_progress(event):
+        percents.append(event["percent"])
+        raise ValueError("콜백 오류는 실행을 중단시키지 않음")
+
+    result = runner.run(["-i", "in.wav", "out.wav"], duration=20, on_progress=on_progress, timeout=10)
+
+    assert result.returncode == 0
+    assert percents == [12.5, 25.0, 100.0]
+
+
+def test_nonzero_exit_returns_code_and_stderr(runner, monkeypatch):
+    monkeypatch.setenv("FAKE_FFMPEG_MODE", "fail")
+
+    result = runner.run(["-i", "broken.wav", "out.wav"], timeout=10)
+
+    assert result.returncode == 1
+    assert "Invalid data" in result.stderr
+
+
+def test_stdin_stream_is_fed_in_chunks(runner, fake_ffmpeg, monkeypatch):
+    monkeypatch.setenv("FAKE_FFMPEG_MODE", "stdin")
+    payload = os.urandom(300 * 1024)  # _STDIN_CHUNK_SIZE보다 큰 입력
+    output = fake_ffmpeg / "out.wav"
+
+    result = runner.run(["-i", "pipe:0", str(output)], stdin_stream=io.BytesIO(payload), timeout=10)
+
+    assert result.returncode == 0
+    assert output.read_bytes() == payload
+
+
+def test_semaphore_limits_concurrent_processes(runner, fake_ffmpeg, monkeypatch):
+    monkeypatch.setenv("FAKE_FFMPEG_MODE", "hold")
+
+    first, first_outcome = _run_in_thread(runner, ["-i", "a.wav", "first"], timeout=10)
+    _wait_until(lambda: (fake_ffmpeg / "first.started").exists())
+    second, second_outcome = _run_in_thread(runner, ["-i", "b.wav", "second"], timeout=10)
+    _wait_until(lambda: runner.get_stats()["waiting"] == 1)
+
+    # 슬롯이 하나뿐이므로 두 번째 프로세스는 아직 시작되지 않음
+    assert runner.get_stats()["running"] == 1
+    assert not (fake_ffmpeg / "second.started").exists()
+
+    (fake_ffmpeg / "release").touch()
+    first.join(10)
+    second.join(10)
+
+    assert first_outcome["result"].returncode == 0
+    assert second_outcome["result"].returncode == 0
+    assert runner.get_stats() == {"max_processes": 1, "running": 0, "waiting": 0, "jobs": []}
+
+
+def test_cancel_by_job_id_terminates_running_process(runner, fake_ffmpeg, monkeypatch):
+    monkeypatch.setenv("FAKE_FFMPEG_MODE", "hold")
+
+    thread, outcome = _run_in_thread(runner, ["-i", "a.wav", "job"], job_id="meeting-1", timeout=10)
+    _wait_until(lambda: (fake_ffmpeg / "job.started").exists())
+    assert runner.get_stats()["jobs"] == ["meeting-1"]
+
+    assert runner.cancel("meeting-1") is True
+    thread.join(10)
+
+    assert isinstance(outcome.get("error"), FFmpegCancelled)
+    assert runner.get_stats()["jobs"] == []
+
+
+def test_cancelled_job_is_not_started(runner, fake_ffmpeg, monkeypatch):
+    monkeypatch.setenv("FAKE_FFMPEG_MODE", "hold")
+
+    assert runner.cancel("meeting-2") is False  # 실행 중인 프로세스 없음
+    with pytest.raises(FFmpegCancelled):
+        runner.run(["-i", "a.wav", "job"], job_id="meeting-2", timeout=10)
+
+    assert not (fake_ffmpeg / "job.started").exists()
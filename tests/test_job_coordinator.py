@@ -0,0 +1,82 @@
+"""utils/job_coordinator.py 리스 인계/진행 중 응답 테스트"""
+import time
+
+import pytest
+
+from utils.job_coordinator import JobCoordinator, JobInProgress
+
+
+@pytest.fixture
+def coordinator(db, monkeypatch):
+    """테스트 DB를 사용하는 JobCoordinator (Singleton을 테스트마다 초기화, 폴링 간격 단축)"""
+    monkeypatch.setattr(JobCoordinator, "_instance", None)
+    monkeypatch.setattr(JobCoordinator, "_initialized", False)
+    coordinator = JobCoordinator(db)
+    coordinator.poll_interval = 0.01
+    coordinator.wait_timeout = 5
+    return coordinator
+
+
+def _hold_lease(coordinator, key_parts, expires_in):
+    """다른 워커 프로세스가 리스를 잡고 실행 중인 상태를 만듦"""
+    now = time.time()
+    conn = coordinator.db._get_connection()
+    try:
+        conn.execute("""
+            INSERT INTO job_leases
+            (job_key, meeting_id, job_type, content_version, owner_token, status, expires_at, updated_at)
+            VALUES (?, ?, ?, ?, 'other-worker', 'running', ?, ?)
+        """, (coordinator._make_key(*key_parts), *key_parts, now + expires_in, now))
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _finish_lease(coordinator, key_parts, result):
+    conn = coordinator.db._get_connection()
+    try:
+        conn.execute(
+            "UPDATE job_leases SET status = 'done', result = ? WHERE job_key = ?",
+            (f'"{result}"', coordinator._make_key(*key_parts))
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_expired_lease_is_taken_over(coordinator):
+    key_parts = ("m1", "summary", "v1")
+    _hold_lease(coordinator, key_parts, expires_in=-1)
+
+    assert coordinator.run(*key_parts, lambda: "요약", wait=False) == "요약"
+    assert coordinator.get_status(*key_parts) == {"status": "done", "result": "요약", "error": None}
+
+
+def test_waiting_follower_takes_over_when_leader_lease_expires(coordinator):
+    key_parts = ("m1", "summary", "v1")
+    _hold_lease(coordinator, key_parts, expires_in=0.1)
+
+    calls = []
+    assert coordinator.run(*key_parts, lambda: calls.append(1) or "요약") == "요약"
+    assert calls == [1]
+
+
+def test_request_follower_gets_poll_handle_instead_of_waiting(coordinator):
+    key_parts = ("m1", "minutes", "v1")
+    _hold_lease(coordinator, key_parts, expires_in=60)
+
+    with pytest.raises(JobInProgress) as exc_info:
+        coordinator.run(*key_parts, lambda: pytest.fail("리더가 실행 중이면 실행하지 않음"), wait=False)
+    assert (exc_info.value.meeting_id, exc_info.value.job_type, exc_info.value.content_version) == key_parts
+    assert coordinator.get_status(*key_parts)["status"] == "running"
+
+    _finish_lease(coordinator, key_parts, "회의록")
+    assert coordinator.get_status(*key_parts)["result"] == "회의록"
+
+
+def test_status_of_abandoned_lease_is_expired(coordinator):
+    key_parts = ("m1", "minutes", "v1")
+    _hold_lease(coordinator, key_parts, expires_in=-1)
+
+    assert coordinator.get_status(*key_parts)["status"] == "expired"
+    assert coordinator.get_status("m1", "minutes", "v2") is None
@@ -0,0 +1,60 @@
+"""services/media_service.py 원본 파일 보관 스토리지 이동/정리 테스트"""
+import os
+
+import pytest
+
+
+@pytest.fixture
+def media(db, tmp_path, monkeypatch):
+    """임시 폴더를 uploads/보관 스토리지로 사용하는 MediaService (회의 m1, 원본 a.wav)"""
+    from config import config
+    from services.media_service import MediaService
+
+    for name in ("UPLOAD_FOLDER", "COLD_STORAGE_FOLDER"):
+        folder = tmp_path / name.lower()
+        folder.mkdir()
+        monkeypatch.setattr(config, name, folder)
+
+    db.save_stt_to_db([{"speaker": 1, "start_time": 0.0, "text": "문장", "confidence": 0.9}],
+                      "a.wav", "회의", meeting_id="m1")
+    db.save_meeting_media("m1", original_file="a.wav")
+    (config.UPLOAD_FOLDER / "a.wav").write_bytes(b"audio")
+    return MediaService()
+
+
+def test_move_original_to_cold_records_storage(media):
+    from config import config
+
+    media.move_original_to_cold("m1")
+
+    assert (config.COLD_STORAGE_FOLDER / "a.wav").exists()
+    assert not (config.UPLOAD_FOLDER / "a.wav").exists()
+    assert media.db.get_meeting_media("m1")["original_storage"] == "cold"
+
+
+def test_meeting_deleted_during_move_leaves_no_cold_copy(media, monkeypatch):
+    from config import config
+    from services import media_service as module
+
+    real_move = module.shutil.move
+
+    def move_then_delete(src, dst):
+        real_move(src, dst)
+        # 이동 중에 다른 요청이 회의를 삭제하고 정리 작업까지 끝난 경우
+        assert media.db.delete_meeting_by_id("m1")
+
+    monkeypatch.setattr(module.shutil, "move", move_then_delete)
+    media.move_original_to_cold("m1")
+
+    assert not os.listdir(config.COLD_STORAGE_FOLDER)
+    assert media.db.get_meeting_media("m1") is None
+
+
+def test_delete_media_files_checks_cold_storage_even_if_recorded_hot(media):
+    from config import config
+
+    (config.COLD_STORAGE_FOLDER / "a.wav").write_bytes(b"audio")
+
+    media.delete_media_files({"original_file": "a.wav", "original_storage": "hot"})
+
+    assert not (config.COLD_STORAGE_FOLDER / "a.wav").exists()
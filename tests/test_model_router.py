@@ -0,0 +1,178 @@
+"""utils/model_router.py 서킷 브레이커 상태 전이 및 폴백 테스트"""
+import pytest
+
+from utils.model_router import (
+    MODEL_FLASH, MODEL_PRO, CircuitBreaker, ModelRouter, _other_model,
+)
+
+
+class FakeClock:
+    """수동으로 시간을 진행시키는 시계"""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+class FakeClient:
+    """failing에 들어 있는 모델은 예외를 던지는 가짜 API 클라이언트"""
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+
+    def __call__(self, model):
+        self.calls.append(model)
+        if model in self.failing:
+            raise ConnectionError(f"{model} unavailable")
+        return f"ok:{model}"
+
+
+def _breaker(clock, min_requests=2, cooldown=30):
+    return CircuitBreaker(
+        name="test", window=4, min_requests=min_requests,
+        failure_rate_threshold=0.5, cooldown_seconds=cooldown, clock=clock,
+    )
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def router(clock, monkeypatch):
+    """주입한 시계를 쓰는 서킷 브레이커로 구성된 ModelRouter (Singleton을 테스트마다 초기화)"""
+    monkeypatch.setattr(ModelRouter, "_instance", None)
+    monkeypatch.setattr(ModelRouter, "_initialized", False)
+    router = ModelRouter()
+    router.enabled = True
+    router.breakers = {model: _breaker(clock) for model in (MODEL_FLASH, MODEL_PRO)}
+    return router
+
+
+def test_other_model_swaps_flash_and_pro():
+    assert _other_model(MODEL_FLASH) == MODEL_PRO
+    assert _other_model(MODEL_PRO) == MODEL_FLASH
+
+
+def test_breaker_opens_only_after_min_requests(clock):
+    breaker = _breaker(clock, min_requests=3)
+
+    breaker.record(healthy=False)
+    breaker.record(healthy=False)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.record(healthy=True)  # 2/3 실패 ≥ 0.5
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened_at == clock.now
+
+
+def test_breaker_blocks_during_cooldown_then_allows_single_trial(clock):
+    breaker = _breaker(clock)
+    breaker.record(healthy=False)
+    breaker.record(healthy=False)
+
+    assert breaker.is_open()
+    assert not breaker.allow()
+
+    clock.advance(29)
+    assert not breaker.allow()
+
+    clock.advance(1)
+    assert not breaker.is_open()
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # 시험 요청이 끝나기 전에는 추가 요청을 막음
+    assert not breaker.allow()
+
+
+def test_half_open_success_closes_and_clears_history(clock):
+    breaker = _breaker(clock)
+    breaker.record(healthy=False)
+    breaker.record(healthy=False)
+    clock.advance(30)
+    assert breaker.allow()
+
+    breaker.record(healthy=True)
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.snapshot()["recent_requests"] == 0
+    assert breaker.allow()
+    # 이전 실패 기록이 지워졌으므로 한 번의 실패로는 다시 열리지 않음
+    breaker.record(healthy=False)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_failure_reopens_with_new_cooldown(clock):
+    breaker = _breaker(clock)
+    breaker.record(healthy=False)
+    breaker.record(healthy=False)
+    clock.advance(30)
+    assert breaker.allow()
+
+    breaker.record(healthy=False)
+
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.opened_at == clock.now
+    clock.advance(29)
+    assert not breaker.allow()
+
+
+def test_call_falls_back_to_other_model_on_failure(router):
+    client = FakeClient(failing={MODEL_FLASH})
+
+    # 짧은 chat 입력 → flash가 주 모델
+    assert router.call("chat", 100, client) == f"ok:{MODEL_PRO}"
+
+    assert client.calls == [MODEL_FLASH, MODEL_PRO]
+    assert router.breakers[MODEL_FLASH].snapshot()["recent_failure_rate"] == 1.0
+    assert router.breakers[MODEL_PRO].snapshot()["recent_failure_rate"] == 0.0
+    recent = router.get_stats()["recent_decisions"]
+    assert [(d["model_used"], d["ok"]) for d in recent] == [(MODEL_FLASH, False), (MODEL_PRO, True)]
+
+
+def test_open_breaker_routes_to_fallback_first_and_recovers(router, clock):
+    client = FakeClient(failing={MODEL_FLASH})
+    router.call("chat", 100, client)
+    router.call("chat", 100, client)
+    assert router.breakers[MODEL_FLASH].state == CircuitBreaker.OPEN
+
+    decision = router.decide("chat", 100)
+    assert (decision.primary, decision.fallback) == (MODEL_PRO, MODEL_FLASH)
+
+    # OPEN 동안에는 flash를 호출하지 않음
+    client.calls.clear()
+    assert router.call("chat", 100, client) == f"ok:{MODEL_PRO}"
+    assert client.calls == [MODEL_PRO]
+
+    # cooldown 후 flash가 회복되면 시험 요청 한 건으로 CLOSED
+    clock.advance(30)
+    client.failing.clear()
+    assert router.decide("chat", 100).primary == MODEL_FLASH
+    assert router.call("chat", 100, client) == f"ok:{MODEL_FLASH}"
+    assert router.breakers[MODEL_FLASH].state == CircuitBreaker.CLOSED
+
+
+def test_call_raises_when_every_breaker_is_open(router):
+    for breaker in router.breakers.values():
+        breaker.record(healthy=False)
+        breaker.record(healthy=False)
+    client = FakeClient()
+
+    with pytest.raises(RuntimeError):
+        router.call("chat", 100, client)
+    assert client.calls == []
+
+
+def test_call_reraises_last_error_when_both_models_fail(router):
+    client = FakeClient(failing={MODEL_FLASH, MODEL_PRO})
+
+    with pytest.raises(ConnectionError, match=MODEL_PRO):
+        router.call("chat", 100, client)
+    assert client.calls == [MODEL_FLASH, MODEL_PRO]
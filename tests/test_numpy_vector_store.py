@@ -0,0 +1,110 @@
+"""utils/numpy_vector_store.py 필터/압축(compaction)/압축 인덱스 테스트"""
+import numpy as np
+import pytest
+
+from config import config
+from utils.numpy_vector_store import NumpyVectorStore
+
+DIM = 16
+
+
+@pytest.fixture
+def open_store(tmp_path):
+    """같은 폴더를 다시 열 수 있는 저장소 생성 함수"""
+    return lambda: NumpyVectorStore(tmp_path / "chunks", "chunks", embedding_function=None)
+
+
+def _vectors(count, seed=0):
+    return np.random.default_rng(seed).normal(size=(count, DIM)).astype(np.float32)
+
+
+def _add(store, count, seed=0):
+    ids = [f"c{i}" for i in range(count)]
+    metadatas = [{"meeting_id": f"m{i % 3}", "chunk_index": i, "speaker": "A" if i % 2 else "B"} for i in range(count)]
+    store.add(ids, [f"문서 {i}" for i in range(count)], metadatas, embeddings=_vectors(count, seed))
+    return ids
+
+
+def test_where_filters(open_store):
+    store = open_store()
+    _add(store, 9)
+
+    def ids(where):
+        return store.get(where=where)["ids"]
+
+    assert ids({"meeting_id": "m1"}) == ["c1", "c4", "c7"]
+    assert ids({"meeting_id": {"$in": ["m0", "m2"]}, "chunk_index": {"$gte": 6}}) == ["c6", "c8"]
+    assert ids({"$and": [{"meeting_id": {"$ne": "m0"}}, {"speaker": "A"}]}) == ["c1", "c5", "c7"]
+    assert ids({"$or": [{"chunk_index": {"$lt": 1}}, {"chunk_index": {"$gt": 7}}]}) == ["c0", "c8"]
+    assert ids({"speaker": {"$nin": ["A"]}, "meeting_id": "m1"}) == ["c4"]
+    # 필드가 없는 문서는 $ne에도 맞지 않음
+    assert ids({"missing": {"$ne": "x"}}) == []
+    with pytest.raises(ValueError):
+        ids({"chunk_index": {"$like": 1}})
+
+
+def test_search_respects_where_and_replaces_same_id(open_store):
+    store = open_store()
+    _add(store, 9)
+    vectors = _vectors(9)
+
+    top, _ = store.similarity_search_by_vector_with_score(vectors[4], k=1)[0]
+    assert top.id == "c4"
+    results = store.similarity_search_by_vector_with_score(vectors[4], k=3, where={"meeting_id": "m0"})
+    assert {doc.metadata["meeting_id"] for doc, _ in results} == {"m0"}
+
+    store.add(["c4"], ["바뀐 문서"], [{"meeting_id": "m2"}], embeddings=vectors[:1])
+    assert store.count() == 9
+    assert store.get(ids=["c4"])["documents"] == ["바뀐 문서"]
+    assert "c4" not in store.get(where={"meeting_id": "m1"})["ids"]
+
+
+def test_compaction_rewrites_rows_and_survives_reopen(open_store, monkeypatch):
+    monkeypatch.setattr(config, "NUMPY_COMPACT_MIN_DEAD_ROWS", 3)
+    store = open_store()
+    _add(store, 6)
+    vectors = _vectors(6)
+
+    assert store.delete(ids=["c0", "c1", "c2"]) == 3
+    assert store.index_stats()["rows"] == 3
+    assert sorted(path.name for path in store.directory.glob("vectors.*.f32")) == ["vectors.1.f32"]
+
+    reopened = open_store()
+    assert reopened.get()["ids"] == ["c3", "c4", "c5"]
+    assert reopened.get(where={"meeting_id": "m2"})["ids"] == ["c5"]
+    top, _ = reopened.similarity_search_by_vector_with_score(vectors[4], k=1)[0]
+    assert top.id == "c4" and top.page_content == "문서 4"
+
+
+@pytest.mark.parametrize("codec", ["float16", "int8", "pca", "truncate"])
+def test_compressed_index_search_and_reopen(open_store, monkeypatch, codec):
+    monkeypatch.setattr(config, "NUMPY_RESCORE_CANDIDATES", 8)
+    monkeypatch.setattr(config, "NUMPY_VECTOR_COMPRESSION", codec)
+    store = open_store()
+    _add(store, 60)
+
+    stats = store.build_compressed_index(codec, dimensions=8)
+    assert stats["codec"] == codec and stats["search_bytes"] < stats["full_bytes"]
+    assert store.evaluate_recall(queries=20, k=2)["recall"] >= 0.8
+
+    # 압축 인덱스가 있는 상태에서 추가한 행도 검색됨
+    extra = _vectors(1, seed=99)
+    store.add(["new"], ["새 문서"], [{"meeting_id": "m9"}], embeddings=extra)
+    assert store.similarity_search_by_vector_with_score(extra[0], k=1)[0][0].id == "new"
+
+    reopened = open_store()
+    assert reopened.index_stats()["codec"] == codec
+    assert reopened.similarity_search_by_vector_with_score(extra[0], k=1)[0][0].id == "new"
+
+    assert reopened.build_compressed_index("none")["codec"] == "none"
+    assert not list(reopened.directory.glob("compressed.*.bin"))
+
+
+def test_compressed_index_rejects_bad_arguments(open_store):
+    store = open_store()
+    _add(store, 4)
+
+    with pytest.raises(ValueError):
+        store.build_compressed_index("zip")
+    with pytest.raises(ValueError):
+        store.build_compressed_index("pca", dimensions=DIM)
@@ -0,0 +1,48 @@
+"""utils/query_filter.py 규칙 기반 필터 추출 테스트"""
+import datetime
+
+import pytest
+
+from utils.query_filter import MeetingTitleIndex, parse_dates, parse_query_filter
+
+TODAY = datetime.date(2025, 3, 10)
+
+
+@pytest.fixture
+def title_index(db):
+    for meeting_id, title, meeting_date in (("m1", "주간 업무 회의", "2025-03-03 10:00:00"),
+                                            ("m2", "예산 심의", "2025-03-07 14:00:00")):
+        db.save_stt_to_db([{"speaker": 1, "start_time": 0.0, "text": "문장", "confidence": 0.9}],
+                          "a.wav", title, meeting_date, meeting_id=meeting_id)
+    return MeetingTitleIndex(db, ttl_seconds=60)
+
+
+def test_parse_dates_formats():
+    assert parse_dates("2025-11-07 회의", TODAY) == ["2025-11-07"]
+    assert parse_dates("2025.11.7이랑 2025년 11월 7일", TODAY) == ["2025-11-07"]
+    assert parse_dates("2025-13-40 회의", TODAY) == []
+
+
+def test_parse_dates_month_day_and_relative_words():
+    # 연도가 없으면 올해, 기준일보다 미래면 작년
+    assert parse_dates("3월 1일이랑 12월 24일", TODAY) == ["2025-03-01", "2024-12-24"]
+    assert parse_dates("어제 회의", TODAY) == ["2025-03-09"]
+
+
+def test_parse_query_filter_finds_quoted_and_contained_titles(title_index):
+    quoted = parse_query_filter("'예산' 회의에서 결정한 내용", title_index, TODAY)
+    assert quoted.source == "rule" and quoted.titles == ("예산",)
+
+    contained = parse_query_filter("주간 업무 회의 결론은?", title_index, TODAY)
+    assert contained.titles == ("주간 업무 회의",)
+    assert title_index.ids_for_title(contained.titles[0]) == {"m1"}
+
+
+def test_parse_query_filter_dates_and_no_condition(title_index):
+    dated = parse_query_filter("3월 7일에 뭐라고 했어?", title_index, TODAY)
+    assert dated.dates == ("2025-03-07",) and dated.titles == ()
+    assert title_index.ids_for_date(dated.dates[0]) == {"m2"}
+
+    # 따옴표로 묶었어도 일치하는 회의가 없으면 제목 조건이 아님
+    plain = parse_query_filter("'날씨' 어때?", title_index, TODAY)
+    assert plain.source == "none" and plain.query == "'날씨' 어때?"
@@ -0,0 +1,33 @@
+"""utils/reranker.py MMR 선택 테스트"""
+import numpy as np
+
+from utils.reranker import mmr_select
+
+# 0: 질문과 가장 관련, 1: 0과 거의 같은 내용, 2: 다른 주제, 3: 0과 2의 중간
+VECTORS = np.array([[1.0, 0.0], [0.999, 0.045], [0.0, 1.0], [0.7, 0.7]])
+VECTORS = VECTORS / np.linalg.norm(VECTORS, axis=1, keepdims=True)
+RELEVANCE = np.array([0.9, 0.89, 0.5, 0.6])
+
+
+def _select(costs=(1, 1, 1, 1), budget=10, groups=(0, 0, 0, 0), limits=(10,)):
+    return mmr_select(
+        RELEVANCE, VECTORS, lambda_mult=0.5, duplicate_threshold=0.95,
+        costs=np.array(costs), budget=budget, groups=np.array(groups), limits=list(limits),
+    )
+
+
+def test_mmr_drops_near_duplicates_and_prefers_diverse_candidates():
+    # 1은 0과 중복이라 제외, 2는 관련도가 낮아도 0과 달라서 3보다 먼저
+    assert _select() == [0, 2, 3]
+
+
+def test_mmr_respects_token_budget_but_always_takes_first():
+    assert _select(costs=(5, 1, 8, 3), budget=6) == [0]
+    assert _select(costs=(5, 1, 8, 1), budget=6) == [0, 3]
+    # 첫 후보가 예산을 다 쓰면 이후 후보는 고르지 않음
+    assert _select(costs=(50, 1, 1, 1), budget=6) == [0]
+
+
+def test_mmr_respects_group_limits():
+    assert _select(groups=(0, 0, 1, 1), limits=(1, 1)) == [0, 2]
+    assert _select(groups=(0, 0, 1, 1), limits=(0, 2)) == [3, 2]
@@ -0,0 +1,189 @@
+"""utils/db_manager.py 화자별 발언 통계(meeting_speaker_stats) 테스트"""
+import pytest
+
+# (화자, 시작 시각, 글자 수) — 말하기 속도 6자/초, 침묵 상한 30초 기준
+# - 2번 화자가 5초에 끼어듦 (1번의 60자 발화는 10초까지로 추정)
+# - 20초 발화는 다음 발화(100초)까지 80초이지만 30초로 잘림
+# - 마지막 발화는 글자 수로 추정 (6자 → 1초)
+SEGMENTS = [
+    ("1", 0.0, 60),
+    ("2", 5.0, 12),
+    ("2", 8.0, 6),
+    ("1", 20.0, 30),
+    ("2", 100.0, 6),
+]
+
+
+@pytest.fixture(autouse=True)
+def speaker_stats_config(monkeypatch):
+    from config import config
+
+    monkeypatch.setattr(config, "SPEAKER_STATS_CHARS_PER_SECOND", 6.0)
+    monkeypatch.setattr(config, "SPEAKER_STATS_MAX_SEGMENT_SECONDS", 30.0)
+
+
+def _save(db, meeting_id, segments, meeting_date="2025-01-01 10:00:00", audio_file="a.wav"):
+    db.save_stt_to_db(
+        [{"speaker": speaker, "start_time": start, "text": "가" * chars, "confidence": 0.9}
+         for speaker, start, chars in segments],
+        audio_file, "회의", meeting_date, meeting_id=meeting_id, index_vectors=False,
+    )
+
+
+def _stored(db, meeting_id):
+    conn = db._get_connection()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM meeting_speaker_stats WHERE meeting_id = ?", (meeting_id,)).fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _summary(stats):
+    return {
+        stat["speaker_label"]: (stat["segment_count"], stat["char_count"], stat["talk_seconds"],
+                                stat["turn_count"], stat["interruptions"])
+        for stat in stats
+    }
+
+
+@pytest.fixture
+def read_only(db, monkeypatch):
+    """이후 조회가 쓰기를 시도하면 실패하도록 연결을 query_only로 엶"""
+    get_connection = db._get_connection
+
+    def read_only_connection():
+        conn = get_connection()
+        conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def enable():
+        monkeypatch.setattr(db, "_get_connection", read_only_connection)
+
+    return enable
+
+
+def test_stats_are_computed_when_transcript_is_saved(db, read_only):
+    _save(db, "m1", SEGMENTS)
+    assert _stored(db, "m1") == 2
+
+    read_only()
+    stats = db.get_speaker_stats("m1")
+
+    assert _summary(stats) == {
+        "1": (2, 90, 35.0, 2, 0),
+        "2": (3, 24, 16.0, 2, 1),
+    }
+    assert [stat["speaker_label"] for stat in stats] == ["1", "2"]  # 글자 수 내림차순
+    assert [(stat["first_start"], stat["last_start"]) for stat in stats] == [(0.0, 20.0), (5.0, 100.0)]
+
+
+def test_streamed_flushes_recompute_across_boundary(db):
+    # 중간 저장 경계를 넘는 끼어들기와 발화 간격도 전체 전사 기준으로 계산
+    _save(db, "m1", SEGMENTS[:2])
+    _save(db, "m1", SEGMENTS[2:])
+
+    assert _summary(db.get_speaker_stats("m1")) == {
+        "1": (2, 90, 35.0, 2, 0),
+        "2": (3, 24, 16.0, 2, 1),
+    }
+
+
+def test_edited_segment_invalidates_and_is_recomputed_on_read(db, read_only):
+    _save(db, "m1", SEGMENTS)
+    conn = db._get_connection()
+    try:
+        # 5초 발화의 화자를 1번으로 수정 → 끼어들기가 아니라 같은 화자의 이어진 발화
+        conn.execute("UPDATE meeting_dialogues SET speaker_label = '1' WHERE meeting_id = 'm1' AND start_time = 5.0")
+        conn.commit()
+    finally:
+        conn.close()
+    assert _stored(db, "m1") == 0
+
+    read_only()
+    assert _summary(db.get_speaker_stats("m1")) == {
+        "1": (3, 102, 38.0, 2, 0),
+        "2": (2, 12, 13.0, 2, 0),
+    }
+    # 조회는 저장하지 않음
+    assert _stored(db, "m1") == 0
+
+
+def test_read_does_not_write_for_meeting_without_segments(db, read_only):
+    read_only()
+
+    assert db.get_speaker_stats("missing") == []
+    assert db.get_speaker_stats("missing") == []
+
+
+def test_partial_segment_delete_recomputes_in_same_transaction(db):
+    _save(db, "m1", SEGMENTS[:3], audio_file="a.wav")
+    _save(db, "m1", SEGMENTS[3:], audio_file="b.wav")
+
+    assert db.delete_meeting_data(audio_file="b.wav") == 2
+
+    assert _stored(db, "m1") == 2
+    # 남은 발화: 1(0초, 60자), 2(5초, 12자), 2(8초, 6자 → 마지막 발화 1초)
+    assert _summary(db.get_speaker_stats("m1")) == {
+        "1": (1, 60, 5.0, 1, 0),
+        "2": (2, 18, 4.0, 1, 1),
+    }
+
+
+@pytest.fixture
+def dated_meetings(db):
+    # 회의마다 1번 화자 1초(6자), 2번 화자 2초(12자 마지막 발화)
+    for meeting_id, meeting_date in [
+        ("d1", "2025-01-01 10:00:00"),
+        ("d2", "2025-01-01 15:00:00"),
+        ("d3", "2025-01-15 09:00:00"),
+        ("d4", "2025-02-03 09:00:00"),
+    ]:
+        _save(db, meeting_id, [("1", 0.0, 6), ("2", 1.0, 12)], meeting_date=meeting_date)
+
+
+def _periods(rows, speaker="1"):
+    return {row["period"]: (row["meeting_count"], row["talk_seconds"]) for row in rows if row["speaker_label"] == speaker}
+
+
+def test_aggregate_buckets_by_day_and_month(db, dated_meetings, read_only):
+    read_only()
+
+    assert _periods(db.aggregate_speaker_stats(interval="day")) == {
+        "2025-01-01": (2, 2.0),
+        "2025-01-15": (1, 1.0),
+        "2025-02-03": (1, 1.0),
+    }
+    assert _periods(db.aggregate_speaker_stats(interval="month")) == {
+        "2025-01": (3, 3.0),
+        "2025-02": (1, 1.0),
+    }
+    assert _periods(db.aggregate_speaker_stats(), speaker="2") == {None: (4, 8.0)}
+
+
+def test_aggregate_filters_by_date_range_and_access(db, dated_meetings):
+    # date_to는 해당 날짜 전체를 포함
+    rows = db.aggregate_speaker_stats(date_from="2025-01-01", date_to="2025-01-15", interval="month")
+    assert _periods(rows) == {"2025-01": (3, 3.0)}
+
+    rows = db.aggregate_speaker_stats(accessible_meeting_ids=["d1", "d4"], interval="month")
+    assert _periods(rows) == {"2025-01": (1, 1.0), "2025-02": (1, 1.0)}
+
+    assert db.aggregate_speaker_stats(accessible_meeting_ids=[]) == []
+
+
+def test_aggregate_includes_invalidated_meetings_without_writing(db, dated_meetings, read_only):
+    conn = db._get_connection()
+    try:
+        conn.execute("UPDATE meeting_dialogues SET segment = '가가가가가가가가가가가가' WHERE meeting_id = 'd4' AND speaker_label = '1'")
+        conn.commit()
+    finally:
+        conn.close()
+    assert _stored(db, "d4") == 0
+
+    read_only()
+    rows = db.aggregate_speaker_stats(interval="month")
+
+    # 1번 화자의 발화가 길어져(12자) 2번 화자의 발화(1초)가 끼어들기가 됨
+    feb = {row["speaker_label"]: (row["char_count"], row["interruptions"]) for row in rows if row["period"] == "2025-02"}
+    assert feb == {"1": (12, 0), "2": (12, 1)}
+    assert _stored(db, "d4") == 0
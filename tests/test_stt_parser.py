@@ -0,0 +1,100 @@
+"""utils/stt_parser.py 관용 증분 JSON 파서 테스트"""
+import json
+
+from utils.stt_parser import TolerantSegmentParser, parse_segments
+
+
+def _segments(count):
+    return [
+        {"speaker": 1, "start_time_mmss": f"00:{i:02d}:000", "text": f"문장 {i}"}
+        for i in range(count)
+    ]
+
+
+def _feed_chunks(text, size):
+    parser = TolerantSegmentParser()
+    segments = []
+    for i in range(0, len(text), size):
+        segments.extend(parser.feed(text[i:i + size]))
+    segments.extend(parser.finish())
+    return segments, parser
+
+
+def test_valid_array_in_code_block():
+    text = "```json\n" + json.dumps(_segments(3), ensure_ascii=False) + "\n```"
+    segments, parser = parse_segments(text)
+    assert [s["text"] for s in segments] == ["문장 0", "문장 1", "문장 2"]
+    assert parser.lost_ranges == []
+
+
+def test_inner_quote_followed_by_comma_keeps_following_segments():
+    items = [json.dumps(s, ensure_ascii=False) for s in _segments(6)]
+    items[2] = '{"speaker": 1, "start_time_mmss": "00:02:000", "text": "he said "no", really"}'
+    text = "[" + ",\n".join(items) + "]"
+
+    segments, parser = parse_segments(text)
+
+    assert len(segments) == 6
+    assert segments[2]["text"] == 'he said "no", really'
+    assert parser.lost_ranges == []
+
+
+def test_streaming_char_by_char_matches_whole_input():
+    items = [json.dumps(s, ensure_ascii=False) for s in _segments(4)]
+    items[1] = '{"speaker": 2, "start_time_mmss": "00:01:000", "text": "줄\n바꿈 "인용", 끝"}'
+    text = "[" + ",".join(items) + ",]"
+
+    whole, _ = parse_segments(text)
+    streamed, parser = _feed_chunks(text, 1)
+
+    assert streamed == whole
+    assert len(streamed) == 4
+    assert parser.repaired_count == 1
+
+
+def test_broken_objects_are_reported_and_scanning_resyncs():
+    items = [json.dumps(s, ensure_ascii=False) for s in _segments(6)]
+    items[1] = '{"speaker": 1, "start_time_mmss": "00:01:000", "text": broken}'
+    items[4] = '{"speaker": 1 "start_time_mmss": "00:04:000", "text": "x"}'
+    text = "[" + ",".join(items) + "]"
+
+    segments, parser = parse_segments(text)
+
+    assert [s["start_time_mmss"] for s in segments] == ["00:00:000", "00:02:000", "00:03:000", "00:05:000"]
+    assert len(parser.lost_ranges) == 2
+    first, second = parser.lost_ranges
+    assert text[first["start_offset"]:first["end_offset"]] == items[1]
+    assert (first["prev_start_time_mmss"], first["next_start_time_mmss"]) == ("00:00:000", "00:02:000")
+    assert (second["prev_start_time_mmss"], second["next_start_time_mmss"]) == ("00:03:000", "00:05:000")
+
+
+def test_truncated_last_object_is_recovered():
+    text = json.dumps(_segments(2), ensure_ascii=False)[:-1] + ', {"speaker": 1, "start_time_mmss": "00:09:000", "text": "잘린 문'
+    segments, parser = parse_segments(text)
+
+    assert len(segments) == 3
+    assert segments[2]["text"] == "잘린 문"
+    assert parser.repaired_count == 1
+    assert parser.lost_ranges == []
+
+
+def test_missing_required_key_is_lost():
+    text = '[{"speaker": 1, "start_time_mmss": "00:00:000"}, {"text": "ok"}]'
+    segments, parser = parse_segments(text)
+
+    assert segments == [{"text": "ok"}]
+    assert parser.lost_ranges[0]["reason"] == "필수 키 누락"
+
+
+def test_record_interrupted_marks_partial_transcript():
+    parser = TolerantSegmentParser()
+    segments = parser.feed(json.dumps(_segments(2), ensure_ascii=False)[:-1] + ",")
+    segments.extend(parser.finish())
+    parser.record_interrupted("STT 스트림 중단: reset")
+
+    report = parser.report()
+    assert report["parsed"] == 2
+    assert report["lost"] == 1
+    lost = report["lost_ranges"][0]
+    assert lost["end_offset"] is None
+    assert lost["prev_start_time_mmss"] == "00:01:000"
@@ -0,0 +1,68 @@
+"""utils/tokenizer.py 임베딩 요청 묶음, 인코딩 캐시 테스트"""
+import sys
+
+from utils import tokenizer
+from utils.tokenizer import pack_batches
+
+
+def test_pack_batches_respects_token_and_item_limits():
+    assert pack_batches([3, 3, 3, 3, 3], max_tokens=7, max_items=10) == [(0, 2), (2, 4), (4, 5)]
+    assert pack_batches([1, 1, 1, 1, 1], max_tokens=100, max_items=2) == [(0, 2), (2, 4), (4, 5)]
+
+
+def test_pack_batches_keeps_oversized_item_alone():
+    assert pack_batches([2, 50, 2, 2], max_tokens=10, max_items=10) == [(0, 1), (1, 2), (2, 4)]
+    assert pack_batches([], max_tokens=10, max_items=10) == []
+
+
+def test_counts_fall_back_to_characters_without_encoding(monkeypatch):
+    monkeypatch.setattr(tokenizer, "get_encoding", lambda name=None: None)
+
+    assert tokenizer.count_tokens("회의록") == 3
+    assert tokenizer.count_tokens_batch(["ab", "cde"]) == [2, 3]
+
+
+class FlakyTiktoken:
+    """처음 failures번은 실패하고 이후에는 인코딩을 돌려주는 가짜 tiktoken 모듈"""
+
+    def __init__(self, failures):
+        self.failures = failures
+        self.calls = 0
+
+    def get_encoding(self, name):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OSError("BPE 파일 다운로드 실패")
+        return f"encoding:{name}"
+
+
+def _use_tiktoken(monkeypatch, fake, retry_seconds):
+    monkeypatch.setitem(sys.modules, "tiktoken", fake)
+    monkeypatch.setattr(tokenizer, "_encodings", {})
+    monkeypatch.setattr(tokenizer, "_failed_at", {})
+    monkeypatch.setattr(tokenizer, "_RETRY_SECONDS", retry_seconds)
+
+
+def test_failed_encoding_is_not_cached(monkeypatch):
+    fake = FlakyTiktoken(failures=1)
+    _use_tiktoken(monkeypatch, fake, retry_seconds=0)
+
+    assert tokenizer.get_encoding("cl100k_base") is None
+    assert tokenizer.get_encoding("cl100k_base") == "encoding:cl100k_base"
+    # 성공한 인코딩은 다시 불러오지 않음
+    assert tokenizer.get_encoding("cl100k_base") == "encoding:cl100k_base"
+    assert fake.calls == 2
+
+
+def test_failed_encoding_is_retried_after_wait(monkeypatch):
+    fake = FlakyTiktoken(failures=1)
+    _use_tiktoken(monkeypatch, fake, retry_seconds=60)
+
+    assert tokenizer.get_encoding("cl100k_base") is None
+    # 대기 시간 동안은 글자 수로 계산하고 다시 불러오지 않음
+    assert tokenizer.get_encoding("cl100k_base") is None
+    assert fake.calls == 1
+
+    tokenizer._failed_at["cl100k_base"] -= 60
+    assert tokenizer.get_encoding("cl100k_base") == "encoding:cl100k_base"
+    assert fake.calls == 2
@@ -0,0 +1,108 @@
+"""utils/db_manager.py get_transcript_window 키셋 페이지네이션 테스트"""
+import pytest
+
+# 두 번째 저장에 앞선 시각(15초)의 세그먼트가 포함되고, 20초에는 세그먼트가 두 개 있음
+FLUSHES = [[0.0, 10.0, 20.0, 20.0, 30.0], [40.0, 50.0, 15.0]]
+
+
+@pytest.fixture
+def order(db):
+    """회의 m1의 세그먼트를 저장하고 (start_time, segment_id) 순서의 segment_id 목록을 반환"""
+    for times in FLUSHES:
+        db.save_stt_to_db(
+            [{"speaker": 1, "start_time": t, "text": f"{t}초 발언", "confidence": 0.9} for t in times],
+            "a.wav", "회의", "2025-01-01 10:00:00", meeting_id="m1", index_vectors=False,
+        )
+    db.save_stt_to_db([{"speaker": 1, "start_time": 0.0, "text": "다른 회의", "confidence": 0.9}],
+                      "b.wav", "다른 회의", "2025-01-01 10:00:00", meeting_id="m2", index_vectors=False)
+
+    conn = db._get_connection()
+    try:
+        return [row[0] for row in conn.execute(
+            "SELECT segment_id FROM meeting_dialogues WHERE meeting_id = 'm1' ORDER BY start_time, segment_id"
+        )]
+    finally:
+        conn.close()
+
+
+def _window(db, **kwargs):
+    window = db.get_transcript_window("m1", **kwargs)
+    return [row[0] for row in window["rows"]], window["has_before"], window["has_after"]
+
+
+def test_first_window(db, order):
+    assert _window(db, limit=3) == (order[:3], False, True)
+    assert _window(db, limit=len(order)) == (order, False, False)
+
+
+def test_rows_are_ordered_by_time_then_id(db, order):
+    rows = db.get_transcript_window("m1", limit=100)["rows"]
+
+    assert [row[1] for row in rows] == [0.0, 10.0, 15.0, 20.0, 20.0, 30.0, 40.0, 50.0]
+    assert [row[0] for row in rows] == order
+    assert rows[2][3] == "15.0초 발언"
+
+
+def test_forward_paging_visits_every_segment_once(db, order):
+    ids, has_before, has_after = _window(db, limit=3)
+    pages = [ids]
+    while has_after:
+        ids, has_before, has_after = _window(db, after_id=pages[-1][-1], limit=3)
+        assert has_before
+        pages.append(ids)
+
+    assert pages == [order[0:3], order[3:6], order[6:8]]
+
+
+def test_forward_page_ending_exactly_at_last_segment(db, order):
+    # 남은 세그먼트 수와 limit이 같으면 다음 페이지 없음
+    assert _window(db, after_id=order[4], limit=3) == (order[5:8], True, False)
+    assert _window(db, after_id=order[-1], limit=3) == ([], True, False)
+
+
+def test_forward_paging_across_equal_start_times(db, order):
+    # 같은 시각(20초)의 첫 세그먼트 다음은 두 번째 세그먼트
+    assert _window(db, after_id=order[3], limit=1) == ([order[4]], True, True)
+
+
+def test_backward_paging(db, order):
+    assert _window(db, before_id=order[5], limit=2) == (order[3:5], True, True)
+    assert _window(db, before_id=order[4], limit=1) == ([order[3]], True, True)
+    # 처음까지 남은 세그먼트가 limit보다 적으면 has_before False
+    assert _window(db, before_id=order[2], limit=5) == (order[0:2], False, True)
+    assert _window(db, before_id=order[2], limit=2) == (order[0:2], False, True)
+    assert _window(db, before_id=order[0], limit=2) == ([], False, True)
+
+
+def test_backward_paging_visits_every_segment_once(db, order):
+    ids, has_before, _ = _window(db, after_id=order[4], limit=3)
+    pages = [ids]
+    while True:
+        ids, has_before, has_after = _window(db, before_id=pages[0][0], limit=2)
+        assert has_after
+        pages.insert(0, ids)
+        if not has_before:
+            break
+
+    assert [segment_id for page in pages for segment_id in page] == order
+
+
+def test_seek_starts_at_segment_containing_time(db, order):
+    # 25초를 포함하는 세그먼트 = 시작 시각이 25초 이하인 마지막 세그먼트 (20초의 두 번째)
+    assert _window(db, from_time=25.0, limit=2) == (order[4:6], True, True)
+    assert _window(db, from_time=15.0, limit=10) == (order[2:], True, False)
+    assert _window(db, from_time=12.5, limit=1) == ([order[1]], True, True)
+
+
+def test_seek_before_first_and_after_last_segment(db, order):
+    assert _window(db, from_time=-5.0, limit=2) == (order[0:2], False, True)
+    assert _window(db, from_time=0.0, limit=2) == (order[0:2], False, True)
+    assert _window(db, from_time=1000.0, limit=2) == ([order[-1]], True, False)
+
+
+def test_unknown_anchor_returns_empty_window(db, order):
+    other = db.get_transcript_window("m2")["rows"][0][0]
+
+    for kwargs in ({"after_id": 99999}, {"before_id": 99999}, {"after_id": other}, {"before_id": other}):
+        assert _window(db, **kwargs) == ([], False, False)
+    assert db.get_transcript_window("missing") == {"rows": [], "has_before": False, "has_after": False}
@@ -0,0 +1,74 @@
+"""utils/user_manager.py 노트 목록 커서 페이지네이션 테스트"""
+import pytest
+
+from config import config
+from utils import user_manager
+from utils.user_manager import _decode_cursor, _encode_cursor, list_meetings, normalize_since
+
+MEETINGS = (
+    ("m1", "주간 회의", "2025-03-01 10:00:00"),
+    ("m2", "주간 보고", "2025-03-02 10:00:00"),
+    ("m3", "100% 달성 회고", "2025-03-02 10:00:00"),  # m2와 같은 시각 → meeting_id로 순서 결정
+    ("m4", "예산 심의", "2025-03-03 09:00:00"),
+    ("m5", "주간 회의", "2025-03-04 18:00:00"),
+)
+
+
+@pytest.fixture
+def owner(db, monkeypatch):
+    """회의 5개를 가진 일반 사용자 (user_manager가 테스트 DB를 사용하도록 경로 교체)"""
+    monkeypatch.setattr(config, "DATABASE_PATH", db.db_path)
+    monkeypatch.setattr(user_manager, "DB_PATH", db.db_path)
+    user_manager.access_control.invalidate()
+
+    conn = db._get_connection()
+    try:
+        conn.execute("INSERT INTO users (id, google_id, email, name, role) VALUES (1, 'g1', 'owner@x', 'owner', 'user')")
+        conn.commit()
+    finally:
+        conn.close()
+    for meeting_id, title, meeting_date in MEETINGS:
+        db.save_stt_to_db([{"speaker": 1, "start_time": 0.0, "text": "문장", "confidence": 0.9}],
+                          "a.wav", title, meeting_date, owner_id=1, meeting_id=meeting_id, index_vectors=False)
+    yield 1
+    user_manager.access_control.invalidate()
+
+
+def _all_pages(user_id, **options):
+    ids, cursor = [], None
+    while True:
+        page = list_meetings(user_id, cursor=cursor, limit=2, **options)
+        ids += [meeting["meeting_id"] for meeting in page["meetings"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_cursor_round_trip_and_invalid_cursor():
+    cursor = _encode_cursor("2025-03-02 10:00:00", "회의-1")
+    assert "=" not in cursor
+    assert _decode_cursor(cursor) == ("2025-03-02 10:00:00", "회의-1")
+
+    for bad in ("not-a-cursor", _encode_cursor("only", "x")[:-3]):
+        with pytest.raises(ValueError):
+            _decode_cursor(bad)
+
+
+def test_normalize_since():
+    assert normalize_since("2025-03-10T09:00:00+09:00") == "2025-03-10 00:00:00.000"
+    assert normalize_since("2025-03-10T00:00:00.123456Z") == "2025-03-10 00:00:00.123"
+    with pytest.raises(ValueError):
+        normalize_since("어제")
+
+
+def test_keyset_pages_cover_all_meetings_in_order(owner):
+    assert _all_pages(owner) == ["m5", "m4", "m3", "m2", "m1"]
+    assert _all_pages(owner, order="asc") == ["m1", "m2", "m3", "m4", "m5"]
+
+
+def test_keyset_pages_with_filters(owner):
+    assert _all_pages(owner, title_prefix="주간") == ["m5", "m2", "m1"]
+    # LIKE 특수 문자는 글자 그대로 비교
+    assert _all_pages(owner, title_prefix="100%") == ["m3"]
+    assert _all_pages(owner, title_prefix="1%") == []
+    assert _all_pages(owner, date_from="2025-03-02", date_to="2025-03-03") == ["m4", "m3", "m2"]
@@ -0,0 +1,280 @@
+"""services/vector_sync_service.py 반영 대기열(outbox)/정합성 검사 테스트 (가짜 벡터 DB 사용)"""
+import time
+
+import pytest
+
+from config import config
+
+
+class FakeVectorStore:
+    """vdb_manager 대신 사용하는 메모리 벡터 DB (컬렉션별 {벡터 id: (meeting_id, title, meeting_date)})"""
+
+    def __init__(self):
+        self.collections = {"chunks": {}, "subtopic": {}}
+        self.legacy = set()
+        self.calls = []
+        self.error = None
+
+    def ids(self, db_type, meeting_id):
+        return sorted(vid for vid, meta in self.collections[db_type].items() if meta[0] == meeting_id)
+
+    def add_meeting_as_chunk(self, meeting_id, title, meeting_date, audio_file, segments):
+        self.calls.append(("add_chunks", meeting_id))
+        if self.error:
+            raise self.error
+        # 세그먼트 2개당 청크 1개, id는 내용에서 결정되므로 다시 실행해도 같은 id
+        ids = [f"{meeting_id}_child_{i}" for i in range((len(segments) + 1) // 2)]
+        for vid in ids:
+            self.collections["chunks"][vid] = (meeting_id, title, meeting_date)
+        return ids
+
+    def add_meeting_as_subtopic(self, meeting_id, title, meeting_date, audio_file, summary_content):
+        self.calls.append(("add_subtopic", meeting_id))
+        self.collections["subtopic"][f"{meeting_id}_subtopic_0"] = (meeting_id, title, meeting_date)
+
+    def delete_meeting_vectors(self, meeting_id, db_types=("chunks", "subtopic"), keep_ids=None):
+        self.calls.append(("delete", meeting_id))
+        keep = set(keep_ids or ())
+        deleted = {}
+        for db_type in db_types:
+            stale = [vid for vid in self.ids(db_type, meeting_id) if vid not in keep]
+            for vid in stale:
+                del self.collections[db_type][vid]
+            deleted[db_type] = len(stale)
+        return deleted
+
+    def update_meeting_metadata(self, meeting_id, title, meeting_date):
+        self.calls.append(("update_metadata", meeting_id))
+        for collection in self.collections.values():
+            for vid, meta in collection.items():
+                if meta[0] == meeting_id:
+                    collection[vid] = (meeting_id, title, meeting_date)
+        return {"success": True}
+
+    def scan_meeting_metadata(self, db_type):
+        self.calls.append(("scan", db_type))
+        meetings = {}
+        for meeting_id, title, meeting_date in self.collections[db_type].values():
+            meetings.setdefault(meeting_id, set()).add((title, meeting_date))
+        return meetings
+
+    def scan_legacy_chunk_meetings(self):
+        return set(self.legacy)
+
+
+class FakeCleanupService:
+    def __init__(self):
+        self.woken = 0
+
+    def wake(self):
+        self.woken += 1
+
+
+@pytest.fixture
+def store():
+    return FakeVectorStore()
+
+
+@pytest.fixture
+def sync(db, store, monkeypatch):
+    """테스트 DB와 가짜 벡터 DB를 사용하는 VectorSyncService"""
+    from services import vector_sync_service as module
+
+    monkeypatch.setattr(module, "vdb_manager", store)
+    monkeypatch.setattr(module, "cleanup_service", FakeCleanupService())
+    service = module.VectorSyncService()
+    assert service.db is db
+    return service
+
+
+def _save_meeting(db, meeting_id, segment_count=3, title="회의", index_vectors=True):
+    segments = [
+        {"speaker": 1, "start_time": float(i), "text": f"{meeting_id} 발언 {i}", "confidence": 0.9}
+        for i in range(segment_count)
+    ]
+    db.save_stt_to_db(segments, f"{meeting_id}.wav", title, "2025-01-01 10:00:00",
+                      meeting_id=meeting_id, index_vectors=index_vectors)
+
+
+def _outbox(db):
+    conn = db._get_connection()
+    try:
+        return [tuple(row) for row in conn.execute(
+            "SELECT meeting_id, operation, version, attempts FROM vector_outbox ORDER BY id"
+        )]
+    finally:
+        conn.close()
+
+
+def test_enqueue_coalesces_and_drain_applies(db, sync, store):
+    _save_meeting(db, "m1", segment_count=3)
+    db.update_meeting_title("m1", "새 제목")
+    db.update_meeting_title("m1", "더 새 제목")
+
+    assert _outbox(db) == [("m1", "index_chunks", 1, 0), ("m1", "sync_metadata", 2, 0)]
+
+    assert sync.drain() == 2
+    assert _outbox(db) == []
+    assert store.ids("chunks", "m1") == ["m1_child_0", "m1_child_1"]
+    assert {meta[1] for meta in store.collections["chunks"].values()} == {"더 새 제목"}
+    assert sync.drain() == 0
+
+
+def test_replayed_entry_is_noop(db, sync, store):
+    _save_meeting(db, "m1", segment_count=3)
+    entry = db.claim_vector_sync(10, 60)[0]
+
+    sync.apply(entry)
+    after_first = {name: dict(collection) for name, collection in store.collections.items()}
+
+    # 완료 기록 전에 작업자가 종료되어 같은 항목이 다시 실행된 경우
+    sync.apply(entry)
+    assert store.collections == after_first
+
+    db.complete_vector_sync(entry["id"], entry["version"])
+    assert sync.drain() == 0
+    assert store.collections == after_first
+
+
+def test_entry_for_deleted_meeting_is_skipped(db, sync, store):
+    _save_meeting(db, "m1")
+    entry = db.claim_vector_sync(10, 60)[0]
+    db.delete_meeting_by_id("m1")
+
+    sync.apply(entry)
+
+    assert store.calls == []
+
+
+def test_reindex_removes_stale_chunk_ids(db, sync, store):
+    _save_meeting(db, "m1", segment_count=4)
+    assert sync.drain() == 1
+    # 이전 방식 청크와 더 길었던 전사의 청크가 남아 있는 상태
+    store.collections["chunks"]["m1_legacy_0"] = ("m1", "회의", "2025-01-01 10:00:00")
+    store.collections["chunks"]["m1_child_5"] = ("m1", "회의", "2025-01-01 10:00:00")
+    store.collections["chunks"]["m2_child_0"] = ("m2", "다른 회의", "2025-01-02 10:00:00")
+
+    db.enqueue_vector_sync([("m1", "index_chunks")])
+    assert sync.drain() == 1
+
+    assert store.ids("chunks", "m1") == ["m1_child_0", "m1_child_1"]
+    assert store.ids("chunks", "m2") == ["m2_child_0"]
+    # 새 청크를 먼저 저장한 뒤 이전 청크를 삭제
+    assert store.calls[-2:] == [("add_chunks", "m1"), ("delete", "m1")]
+
+
+def test_requeued_while_processing_runs_again(db, sync, store):
+    _save_meeting(db, "m1", segment_count=2)
+    entry = db.claim_vector_sync(10, 60)[0]
+    sync.apply(entry)
+
+    # 처리 중에 전사가 추가되어 같은 작업이 다시 등록됨
+    _save_meeting(db, "m1", segment_count=2)
+    db.complete_vector_sync(entry["id"], entry["version"])
+
+    assert _outbox(db) == [("m1", "index_chunks", 2, 0)]
+    assert sync.drain() == 1
+    assert store.ids("chunks", "m1") == ["m1_child_0", "m1_child_1"]
+
+
+def test_failed_entry_is_retried_with_backoff(db, sync, store):
+    _save_meeting(db, "m1")
+    store.error = ConnectionError("chroma down")
+    started = time.time()
+
+    assert sync.drain() == 1
+
+    assert _outbox(db) == [("m1", "index_chunks", 1, 1)]
+    assert db.count_vector_sync() == {"pending": 1, "failing": 1}
+    conn = db._get_connection()
+    try:
+        next_attempt_at = conn.execute("SELECT next_attempt_at FROM vector_outbox").fetchone()[0]
+    finally:
+        conn.close()
+    assert next_attempt_at >= started + config.VECTOR_SYNC_RETRY_BASE_SECONDS
+    assert sync.drain() == 0
+
+
+def test_reconcile_enqueues_orphans_and_keeps_existing_meetings(db, sync, store, monkeypatch):
+    monkeypatch.setattr(config, "VECTOR_RECONCILE_GRACE_SECONDS", 0)
+    _save_meeting(db, "m1")
+    _save_meeting(db, "m2", index_vectors=False)
+    assert sync.drain() == 1
+    # SQLite에서는 이미 삭제되고 벡터만 남은 회의
+    store.collections["chunks"]["gone_child_0"] = ("gone", "삭제된 회의", "2024-12-31 10:00:00")
+    store.collections["subtopic"]["gone_subtopic_0"] = ("gone", "삭제된 회의", "2024-12-31 10:00:00")
+    time.sleep(0.01)  # created_at(밀리초)이 grace 기준보다 이전이 되도록
+
+    result = sync.reconcile()
+
+    assert (result["orphans"], result["index_chunks"], result["sync_metadata"]) == (1, 1, 0)
+    assert _outbox(db) == [("m2", "index_chunks", 1, 0)]
+    assert sync.db.get_vector_sync_snapshot(0)["tombstoned"] == {"gone"}
+
+    # 정리 대기열을 처리하면 고아 벡터만 삭제되고 SQLite에 있는 회의의 벡터는 유지됨
+    from services import cleanup_service as cleanup_module
+    monkeypatch.setattr(cleanup_module, "vdb_manager", store)
+    monkeypatch.setattr(cleanup_module.media_service, "delete_media_files", lambda media: None)
+    assert cleanup_module.CleanupService().drain() == 1
+
+    assert store.ids("chunks", "gone") == [] and store.ids("subtopic", "gone") == []
+    assert store.ids("chunks", "m1") == ["m1_child_0", "m1_child_1"]
+
+    # 이미 등록된 항목은 다시 등록하지 않음
+    again = sync.reconcile()
+    assert (again["orphans"], again["index_chunks"]) == (0, 0)
+
+
+def test_reconcile_reads_vectors_before_sqlite(db, sync, store, monkeypatch):
+    """벡터 스캔 도중 새로 생성되어 색인된 회의를 고아로 판단하지 않음"""
+    scan = store.scan_meeting_metadata
+    order = []
+
+    def scan_while_new_meeting_is_indexed(db_type):
+        order.append(("vectors", db_type))
+        if db_type == "chunks":
+            _save_meeting(db, "fresh", index_vectors=False)
+            store.collections["chunks"]["fresh_child_0"] = ("fresh", "회의", "2025-01-01 10:00:00")
+        return scan(db_type)
+
+    snapshot = db.get_vector_sync_snapshot
+
+    def snapshot_in_order(grace_seconds):
+        order.append(("sqlite", None))
+        return snapshot(grace_seconds)
+
+    monkeypatch.setattr(store, "scan_meeting_metadata", scan_while_new_meeting_is_indexed)
+    monkeypatch.setattr(db, "get_vector_sync_snapshot", snapshot_in_order)
+
+    result = sync.reconcile()
+
+    assert order == [("vectors", "chunks"), ("vectors", "subtopic"), ("sqlite", None)]
+    assert result["orphans"] == 0
+    assert db.count_tombstones() == 0
+
+
+def test_reconcile_detects_stale_metadata(db, sync, store, monkeypatch):
+    monkeypatch.setattr(config, "VECTOR_RECONCILE_GRACE_SECONDS", 0)
+    _save_meeting(db, "m1")
+    assert sync.drain() == 1
+    store.collections["chunks"]["m1_child_0"] = ("m1", "예전 제목", "2025-01-01 10:00:00")
+
+    assert sync.reconcile()["sync_metadata"] == 1
+    assert sync.drain() == 1
+    assert {meta[1] for meta in store.collections["chunks"].values()} == {"회의"}
+
+
+def test_legacy_reindex_is_capped_per_request(db, sync, store, monkeypatch):
+    monkeypatch.setattr(config, "CHILD_REINDEX_BATCH_LIMIT", 2)
+    for i in range(5):
+        _save_meeting(db, f"m{i}", index_vectors=False)
+    # SQLite에 없는 회의는 재색인 대상이 아님
+    store.legacy = {f"m{i}" for i in range(5)} | {"gone"}
+
+    first = sync.reindex_legacy_chunks(limit=10)
+    assert first == {"legacy_meetings": 5, "pending": 0, "enqueued": 2, "remaining": 3}
+    assert [row[0] for row in _outbox(db)] == ["m0", "m1"]
+
+    second = sync.reindex_legacy_chunks()
+    assert second == {"legacy_meetings": 5, "pending": 2, "enqueued": 2, "remaining": 1}
+    assert [row[0] for row in _outbox(db)] == ["m0", "m1", "m2", "m3"]
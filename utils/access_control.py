@@ -0,0 +1,218 @@
+"""
+권한 확인 모듈
+- 사용자의 역할(admin/user)과 접근 가능한 회의 목록을 한 번에 조회해 캐시합니다.
+- 같은 요청 안에서는 flask.g에 보관하여 다시 조회하지 않습니다 (is_admin, can_access_meeting, context processor 등).
+- 요청 간에는 짧은 TTL 캐시를 사용하며, 공유/공유 해제/삭제 시 무효화합니다.
+  다른 프로세스(gunicorn 워커)에서 권한이 줄어든 경우를 위해 캐시를 쓰기 전에 DB의 사용자별 권한 버전
+  (access_versions, 트리거가 증가)을 기본키로 확인하고, 바뀌었으면 다시 조회합니다.
+- 회의 권한은 meeting_access 테이블의 (user_id, meeting_id) 기본키 조회로 확인합니다.
+"""
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from flask import g, has_request_context
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# 캐시 항목이 이 수를 넘으면 만료된 항목을 정리
+_CACHE_PRUNE_THRESHOLD = 1024
+
+
+@dataclass
+class UserAccess:
+    """사용자 권한 정보 (역할 + 회의별 권한)"""
+    user_id: int
+    role: Optional[str]
+    permissions: Dict[str, str] = field(default_factory=dict)  # meeting_id -> 'owner' / 'read'
+    version: int = 0  # 조회 시점의 access_versions.version
+
+    @property
+    def is_admin(self) -> bool:
+        return self.role == 'admin'
+
+
+class AccessControl:
+    """요청 단위 + TTL 캐시를 사용하는 권한 확인기 (Singleton 패턴)"""
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.ttl = config.ACCESS_CACHE_TTL_SECONDS
+        self._cache = {}  # user_id -> (만료 시각, UserAccess)
+        self._lock = threading.Lock()
+
+        self._initialized = True
+        logger.info(f"✅ AccessControl 초기화 완료 (캐시 TTL: {self.ttl}초)")
+
+    def _get_connection(self):
+        conn = sqlite3.connect(str(config.DATABASE_PATH))
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # ==================== 조회 ====================
+
+    def get(self, user_id: int) -> UserAccess:
+        """
+        사용자 권한 정보 조회 (요청 캐시 → TTL 캐시(권한 버전 확인) → DB 순서)
+
+        Args:
+            user_id: 사용자 ID
+
+        Returns:
+            UserAccess: 역할과 회의별 권한
+        """
+        request_cache = self._request_cache()
+        if request_cache is not None and user_id in request_cache:
+            return request_cache[user_id]
+
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(user_id)
+        if cached and cached[0] > now and cached[1].version == self._current_version(user_id):
+            access = cached[1]
+        else:
+            access = self._load(user_id)
+            with self._lock:
+                if len(self._cache) >= _CACHE_PRUNE_THRESHOLD:
+                    self._cache = {key: value for key, value in self._cache.items() if value[0] > now}
+                self._cache[user_id] = (now + self.ttl, access)
+
+        if request_cache is not None:
+            request_cache[user_id] = access
+        return access
+
+    def is_admin(self, user_id: int) -> bool:
+        return self.get(user_id).is_admin
+
+    def get_permission(self, user_id: int, meeting_id: str) -> Optional[str]:
+        """
+        회의에 대한 사용자 권한 조회
+
+        Returns:
+            'admin' / 'owner' / 'read' 또는 None (접근 불가)
+        """
+        access = self.get(user_id)
+        if access.is_admin:
+            return 'admin'
+
+        permission = access.permissions.get(meeting_id)
+        if permission:
+            return permission
+
+        # 캐시 이후 새로 생성/공유된 회의일 수 있으므로 기본키로 한 번 더 확인 (접근 불가 결과는 캐시하지 않음)
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                "SELECT permission FROM meeting_access WHERE user_id = ? AND meeting_id = ?",
+                (user_id, meeting_id)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        if row:
+            access.permissions[meeting_id] = row['permission']
+            return row['permission']
+        return None
+
+    def can_access(self, user_id: int, meeting_id: str) -> bool:
+        return self.get_permission(user_id, meeting_id) is not None
+
+    def can_edit(self, user_id: int, meeting_id: str) -> bool:
+        return self.get_permission(user_id, meeting_id) in ('admin', 'owner')
+
+    def get_accessible_meeting_ids(self, user_id: int) -> List[str]:
+        """
+        접근 가능한 meeting_id 목록 (Admin은 전체 회의)
+
+        검색 범위는 방금 생성/공유된 회의도 포함해야 하므로 일반 사용자는 DB에서 다시 읽어 캐시를 갱신합니다.
+        """
+        if self.get(user_id).is_admin:
+            conn = self._get_connection()
+            try:
+                return [row['meeting_id'] for row in conn.execute("SELECT meeting_id FROM meetings")]
+            finally:
+                conn.close()
+
+        self.invalidate(user_id)
+        return list(self.get(user_id).permissions)
+
+    # ==================== 무효화 ====================
+
+    def invalidate(self, user_id: int = None):
+        """
+        권한 캐시 무효화
+
+        Args:
+            user_id: 특정 사용자만 무효화 (None이면 전체)
+        """
+        with self._lock:
+            if user_id is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(user_id, None)
+
+        request_cache = self._request_cache()
+        if request_cache is not None:
+            if user_id is None:
+                request_cache.clear()
+            else:
+                request_cache.pop(user_id, None)
+
+    # ==================== 내부 구현 ====================
+
+    @staticmethod
+    def _request_cache():
+        if not has_request_context():
+            return None
+        if not hasattr(g, '_access_cache'):
+            g._access_cache = {}
+        return g._access_cache
+
+    @staticmethod
+    def _read_version(conn, user_id: int) -> int:
+        row = conn.execute("SELECT version FROM access_versions WHERE user_id = ?", (user_id,)).fetchone()
+        return row['version'] if row else 0
+
+    def _current_version(self, user_id: int) -> int:
+        """DB의 사용자별 권한 버전 (다른 프로세스에서 권한이 줄었는지 확인)"""
+        conn = self._get_connection()
+        try:
+            return self._read_version(conn, user_id)
+        finally:
+            conn.close()
+
+    def _load(self, user_id: int) -> UserAccess:
+        """연결 1개로 권한 버전, 역할, 회의별 권한을 함께 조회 (버전을 먼저 읽어 그 뒤의 변경은 다음 확인에서 반영)"""
+        conn = self._get_connection()
+        try:
+            version = self._read_version(conn, user_id)
+            user = conn.execute("SELECT role FROM users WHERE id = ?", (user_id,)).fetchone()
+            access = UserAccess(user_id=user_id, role=user['role'] if user else None, version=version)
+            if user and not access.is_admin:
+                access.permissions = {
+                    row['meeting_id']: row['permission']
+                    for row in conn.execute(
+                        "SELECT meeting_id, permission FROM meeting_access WHERE user_id = ?", (user_id,)
+                    )
+                }
+            return access
+        finally:
+            conn.close()
+
+
+# 싱글톤 인스턴스
+access_control = AccessControl()
@@ -1,48 +1,22 @@
-import sqlite3
-from collections import defaultdict
-import os
-import logging
-
-logger = logging.getLogger(__name__)
-
-basedir = os.path.abspath(os.path.dirname(__file__))
-DB_PATH = os.path.join(basedir, "..", "database", "minute_ai.db")
-
-def calculate_speaker_share(meeting_id):
-    """특정 회의의 화자별 발언 점유율을 계산합니다 (글자 수 기반)."""
-    try:
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.cursor()
-            cursor.execute("SELECT speaker_label, segment FROM meeting_dialogues WHERE meeting_id = ?", (meeting_id,))
-            rows = cursor.fetchall()
-
-        if not rows:
-            return None
-
-        speaker_text_lengths = defaultdict(int)
-        total_length = 0
-
-        for row in rows:
-            speaker = row['speaker_label']
-            text = row['segment'] if row['segment'] is not None else ""
-            text_length = len(text)
-            speaker_text_lengths[speaker] += text_length
-            total_length += text_length
-
-        if total_length == 0:
-            return None
-
-        speaker_percentages = {speaker: (length / total_length) * 100 for speaker, length in speaker_text_lengths.items()}
-        sorted_speakers = sorted(speaker_percentages.items(), key=lambda item: item[1], reverse=True)
+def build_speaker_share(speaker_stats):
+    """
+    화자별 발언 통계로 발언 점유율 차트 데이터를 만듭니다 (글자 수 기반).
+
+    Args:
+        speaker_stats (list): DatabaseManager.get_speaker_stats() 결과
+
+    Returns:
+        dict: {"labels": [...], "data": [...]} (점유율 내림차순), 발언이 없으면 None
+    """
+    total_length = sum(stat['char_count'] for stat in speaker_stats)
+    if total_length == 0:
+        return None
 
-        chart_data = {
-            "labels": [item[0] for item in sorted_speakers],
-            "data": [round(item[1], 2) for item in sorted_speakers]
-        }
+    sorted_stats = sorted(speaker_stats, key=lambda stat: stat['char_count'], reverse=True)
 
-        return chart_data
+    chart_data = {
+        "labels": [stat['speaker_label'] for stat in sorted_stats],
+        "data": [round(stat['char_count'] / total_length * 100, 2) for stat in sorted_stats]
+    }
 
-    except Exception as e:
-        logger.error(f"Error in calculate_speaker_share: {e}")
-        return None
+    return chart_data
@@ -0,0 +1,320 @@
+"""
+STT 전 오디오 전처리 모듈
+- 모든 업로드 형식(wav/mp3/m4a/flac/mp4)을 STT 전에 한 번 가공합니다.
+- 앞/뒤 무음과 긴 중간 무음을 잘라내고, 음량을 정규화한 뒤 음성용 코덱(Opus, 모노)으로 재인코딩합니다.
+- 잘라낸 구간은 OffsetMap에 기록하여 STT 결과의 start_time을 원본 오디오 기준으로 되돌립니다.
+"""
+import bisect
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+
+from config import config
+from utils.ffmpeg_runner import ffmpeg_runner
+
+logger = logging.getLogger(__name__)
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?\d+(?:\.\d+)?)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*(-?\d+(?:\.\d+)?)")
+
+
+class OffsetMap:
+    """
+    전처리된 오디오의 시간 → 원본 오디오의 시간 변환표
+
+    구간 리스트 [(processed_start, original_start, length), ...]를 보관하며,
+    처리된 오디오의 t초가 어느 유지 구간에 속하는지 찾아 원본 시간으로 변환합니다.
+    """
+
+    def __init__(self, spans=None):
+        self.spans = sorted(spans or [], key=lambda span: span[0])
+        self._starts = [span[0] for span in self.spans]
+
+    @classmethod
+    def identity(cls):
+        """변환이 필요 없는 경우 (무음 제거를 하지 않음)"""
+        return cls()
+
+    def to_original(self, processed_seconds: float) -> float:
+        """
+        전처리 오디오 기준 시간을 원본 기준 시간으로 변환합니다.
+
+        Args:
+            processed_seconds (float): 전처리된 오디오에서의 시간(초)
+
+        Returns:
+            float: 원본 오디오에서의 시간(초)
+        """
+        if not self.spans:
+            return processed_seconds
+
+        idx = bisect.bisect_right(self._starts, processed_seconds) - 1
+        if idx < 0:
+            idx = 0
+        processed_start, original_start, length = self.spans[idx]
+        delta = min(max(processed_seconds - processed_start, 0.0), length)
+        return round(original_start + delta, 3)
+
+    def to_dict(self):
+        return {"spans": [list(span) for span in self.spans]}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls([tuple(span) for span in (data or {}).get("spans", [])])
+
+
+@dataclass
+class PreprocessResult:
+    """전처리 결과"""
+    output_path: str
+    offset_map: OffsetMap
+    original_duration: float
+    processed_duration: float
+    original_bytes: int
+    processed_bytes: int
+    removed_silences: list = field(default_factory=list)
+
+
+class AudioPreprocessor:
+    """ffmpeg 기반 STT 전처리기"""
+
+    def __init__(self):
+        self.silence_threshold_db = config.AUDIO_SILENCE_THRESHOLD_DB
+        self.min_silence_seconds = config.AUDIO_SILENCE_MIN_SECONDS
+        self.keep_silence_seconds = config.AUDIO_SILENCE_KEEP_SECONDS
+        self.sample_rate = config.AUDIO_TARGET_SAMPLE_RATE
+        self.bitrate = config.AUDIO_TARGET_BITRATE
+
+    def preprocess(self, input_path: str, job_id=None, on_progress=None, input_stream=None) -> PreprocessResult:
+        """
+        오디오/비디오 파일을 STT용으로 전처리합니다.
+
+        Args:
+            input_path (str): 원본 파일 경로
+            job_id (str, optional): ffmpeg 작업 취소 단위 (meeting_id)
+            on_progress (callable, optional): 진행 상황 콜백 (dict: phase, percent, out_seconds)
+            input_stream (file-like, optional): 무음 탐지 단계에서 파일 대신 읽을 스트림
+                                                (업로드 스트림을 저장과 동시에 분석할 때 사용)
+                                                스트림이 끝나면 input_path에 원본이 모두 기록되어 있어야 합니다.
+
+        Returns:
+            PreprocessResult: 전처리된 파일 경로와 시간 변환표
+
+        Raises:
+            RuntimeError: ffmpeg 실행 실패 시
+            FFmpegCancelled: 작업이 취소된 경우
+        """
+        output_path = os.path.splitext(input_path)[0] + "_stt.ogg"
+
+        # 1. 무음 구간 탐지 (디코딩만 수행, 출력 없음) - 진행률 0~40%
+        duration, silences = self.detect_silences(
+            input_path,
+            job_id=job_id,
+            on_progress=self._phase_progress(on_progress, "analyze", 0, 40),
+            input_stream=input_stream,
+        )
+
+        # 2. 유지할 구간 계산
+        keep_intervals = self.compute_keep_intervals(duration, silences)
+
+        # 3. 무음 제거 + 음량 정규화 + Opus 모노 인코딩 - 진행률 40~100%
+        self._encode(
+            input_path, output_path, keep_intervals, duration,
+            job_id=job_id,
+            on_progress=self._phase_progress(on_progress, "encode", 40, 100),
+        )
+
+        offset_map = self.build_offset_map(keep_intervals)
+        processed_duration = sum(end - start for start, end in keep_intervals) if keep_intervals else duration
+
+        result = PreprocessResult(
+            output_path=output_path,
+            offset_map=offset_map,
+            original_duration=duration,
+            processed_duration=processed_duration,
+            original_bytes=os.path.getsize(input_path),
+            processed_bytes=os.path.getsize(output_path),
+            removed_silences=silences,
+        )
+
+        logger.info(
+            f"🎚️ 오디오 전처리 완료: {duration:.1f}초 → {processed_duration:.1f}초, "
+            f"{result.original_bytes / 1024 / 1024:.1f}MB → {result.processed_bytes / 1024 / 1024:.1f}MB"
+        )
+        return result
+
+    @staticmethod
+    def _phase_progress(on_progress, phase, start, end):
+        """단계별 진행률(0~100)을 전체 진행률 구간(start~end)으로 변환하는 콜백 생성"""
+        if on_progress is None:
+            return None
+
+        def callback(progress):
+            percent = progress.get("percent")
+            on_progress({
+                "phase": phase,
+                "percent": None if percent is None else round(start + (end - start) * percent / 100, 1),
+                "out_seconds": progress.get("out_seconds"),
+            })
+        return callback
+
+    def detect_silences(self, input_path: str, job_id=None, on_progress=None, input_stream=None):
+        """
+        ffmpeg silencedetect 필터로 무음 구간을 찾습니다.
+
+        Returns:
+            (duration, silences): 전체 길이(초)와 [(start, end), ...] 무음 구간 목록
+        """
+        args = [
+            "-i", "pipe:0" if input_stream is not None else input_path,
+            "-vn",
+            "-af", f"silencedetect=noise={self.silence_threshold_db}dB:d={self.min_silence_seconds}",
+            "-f", "null", "-",
+        ]
+        result = ffmpeg_runner.run(args, job_id=job_id, on_progress=on_progress, stdin_stream=input_stream)
+        if result.returncode != 0:
+            raise RuntimeError(f"무음 탐지 실패: {result.stderr[-500:]}")
+
+        duration, silences = self.parse_silencedetect(result.stderr)
+        if input_stream is not None and duration <= 0:
+            # 파이프 입력은 Duration이 표시되지 않으므로 저장된 원본에서 다시 확인
+            duration = self.probe_duration(input_path, job_id=job_id)
+            if silences and silences[-1][1] is None:
+                silences[-1] = (silences[-1][0], duration)
+        return duration, [(start, end) for start, end in silences if end is not None]
+
+    def probe_duration(self, input_path: str, job_id=None) -> float:
+        """파일 헤더에서 전체 길이(초)를 읽습니다."""
+        result = ffmpeg_runner.run(["-i", input_path, "-t", "0", "-f", "null", "-"], job_id=job_id)
+        duration, _ = self.parse_silencedetect(result.stderr)
+        return duration
+
+    @staticmethod
+    def parse_silencedetect(stderr: str):
+        """
+        silencedetect 로그를 파싱합니다.
+
+        Returns:
+            (duration, silences): 전체 길이(초)와 [(start, end), ...] 무음 구간 목록
+        """
+        duration = 0.0
+        match = _DURATION_RE.search(stderr)
+        if match:
+            hours, minutes, seconds = match.groups()
+            duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+        silences = []
+        current_start = None
+        for line in stderr.splitlines():
+            start_match = _SILENCE_START_RE.search(line)
+            if start_match:
+                current_start = max(float(start_match.group(1)), 0.0)
+                continue
+            end_match = _SILENCE_END_RE.search(line)
+            if end_match and current_start is not None:
+                silences.append((current_start, float(end_match.group(1))))
+                current_start = None
+
+        # 파일 끝까지 이어지는 무음은 silence_end가 출력되지 않음 (길이를 모르면 None으로 남김)
+        if current_start is not None:
+            if duration > current_start:
+                silences.append((current_start, duration))
+            elif duration <= 0:
+                silences.append((current_start, None))
+
+        return duration, silences
+
+    def compute_keep_intervals(self, duration: float, silences: list) -> list:
+        """
+        유지할 오디오 구간을 계산합니다.
+        앞/뒤 무음은 완전히 제거하고, 중간 무음은 keep_silence_seconds만 남겨 발화 경계를 보존합니다.
+
+        Returns:
+            list: [(start, end), ...] 원본 기준 유지 구간
+        """
+        if duration <= 0:
+            return []
+
+        pad = self.keep_silence_seconds / 2.0
+        intervals = []
+        cursor = 0.0
+
+        for start, end in silences:
+            start = max(start, 0.0)
+            end = min(end, duration)
+            if end <= start:
+                continue
+
+            if start <= 0.0:
+                # 앞쪽 무음: 전부 제거
+                cursor = end
+                continue
+
+            if end >= duration:
+                # 뒤쪽 무음: 전부 제거
+                if start > cursor:
+                    intervals.append((cursor, start))
+                cursor = duration
+                break
+
+            # 중간 무음: 양쪽에 pad만 남기고 제거
+            cut_start = start + pad
+            cut_end = end - pad
+            if cut_end > cut_start and cut_start > cursor:
+                intervals.append((cursor, cut_start))
+                cursor = cut_end
+
+        if cursor < duration:
+            intervals.append((cursor, duration))
+
+        return [(round(start, 3), round(end, 3)) for start, end in intervals if end - start > 0.01]
+
+    @staticmethod
+    def build_offset_map(keep_intervals: list) -> OffsetMap:
+        """유지 구간 목록으로부터 시간 변환표를 만듭니다."""
+        spans = []
+        processed_cursor = 0.0
+        for start, end in keep_intervals:
+            length = end - start
+            spans.append((round(processed_cursor, 3), start, round(length, 3)))
+            processed_cursor += length
+        return OffsetMap(spans)
+
+    def build_filter(self, keep_intervals: list, duration: float) -> str:
+        """ffmpeg 오디오 필터 문자열 생성 (구간 선택 → 타임스탬프 재생성 → 음량 정규화)"""
+        filters = []
+
+        trimmed = keep_intervals and keep_intervals != [(0.0, round(duration, 3))]
+        if trimmed:
+            expression = "+".join(f"between(t,{start},{end})" for start, end in keep_intervals)
+            filters.append(f"aselect='{expression}'")
+            filters.append("asetpts=N/SR/TB")
+
+        filters.append(f"loudnorm=I={config.AUDIO_LOUDNORM_TARGET_LUFS}:TP=-1.5:LRA=11")
+        return ",".join(filters)
+
+    def _encode(self, input_path, output_path, keep_intervals, duration, job_id=None, on_progress=None):
+        """무음 제거/정규화 후 Opus 모노로 인코딩합니다."""
+        args = [
+            "-y",
+            "-i", input_path,
+            "-vn",
+            "-af", self.build_filter(keep_intervals, duration),
+            "-ac", "1",
+            "-ar", str(self.sample_rate),
+            "-c:a", "libopus",
+            "-b:a", self.bitrate,
+            "-application", "voip",
+            output_path,
+        ]
+        # 진행률은 출력 기준 시간이므로 무음 제거 후 길이를 기준으로 계산
+        processed_duration = sum(end - start for start, end in keep_intervals) if keep_intervals else duration
+        result = ffmpeg_runner.run(args, job_id=job_id, duration=processed_duration or None, on_progress=on_progress)
+        if result.returncode != 0:
+            raise RuntimeError(f"오디오 인코딩 실패: {result.stderr[-500:]}")
+
+
+# 전역 인스턴스
+audio_preprocessor = AudioPreprocessor()
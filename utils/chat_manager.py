@@ -1,9 +1,17 @@
 import os
 import re
+import time
+import functools
 import logging
-from google import genai
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
 
 from config import config
+from utils.chunking import format_segment, expand_within_budget
+from utils.db_manager import DatabaseManager
+from utils.model_router import model_router
+from utils.reranker import Reranker
+from utils.tokenizer import count_tokens, count_tokens_batch
 
 logger = logging.getLogger(__name__)
 
@@ -12,7 +20,7 @@ class ChatManager:
     """
     회의록 기반 챗봇 매니저
     SelfQueryRetriever를 사용하여 관련 문서를 검색하고,
-    Gemini 2.5 Flash로 답변을 생성합니다.
+    Gemini(기본 2.5 Flash, 긴 컨텍스트는 모델 라우터가 Pro로 전환)로 답변을 생성합니다.
     """
     _instance = None
     _initialized = False
@@ -40,14 +48,31 @@ class ChatManager:
 
         self.vdb_manager = vector_db_manager
         self.retriever_type = retriever_type
+        # 자식 청크 → 부모 구간(앞뒤 세그먼트) 조회용
+        self.db = DatabaseManager(str(config.DATABASE_PATH))
+
+        # 검색 소스: 결과 키 -> search(query, embedding, where, k, with_embeddings) -> [Document, ...]
+        # (with_embeddings=True이면 재순위용 [(Document, 임베딩), ...])
+        # (회의록/키워드 검색 등 새 소스는 여기에 추가하고 RETRIEVAL_SOURCE_QUOTAS에 할당량 지정)
+        self.retrieval_sources = {
+            "chunks": functools.partial(self._search_collection, "chunks"),
+            "subtopics": functools.partial(self._search_collection, "subtopic"),
+        }
+        # 요청 간 공유하는 검색 스레드 풀 (소스별 검색을 동시에 실행)
+        self._executor = ThreadPoolExecutor(max_workers=config.RETRIEVAL_MAX_WORKERS, thread_name_prefix="retrieval")
+        # 소스별 실행 중인 검색 수 / 시간 초과로 버린 검색 수 (실행 중인 스레드는 중단할 수 없으므로 소스별 상한으로 제한)
+        self._retrieval_stats = {}
+        self._stats_lock = threading.Lock()
+        # 검색 후보 재순위 (MMR, 중복 제거, 선택적 cross-encoder, 토큰 예산)
+        self.reranker = Reranker()
 
         # Gemini API 클라이언트 초기화
         api_key = config.GOOGLE_API_KEY
         if not api_key:
             raise ValueError("GOOGLE_API_KEY가 .env 파일에 설정되지 않았습니다.")
 
+        from google import genai
         self.gemini_client = genai.Client(api_key=api_key)
-        self.model_name = "gemini-2.5-flash"
 
         logger.info(f"✅ ChatManager 초기화 완료: retriever_type='{self.retriever_type}'")
 
@@ -55,7 +80,12 @@ class ChatManager:
 
     def search_documents(self, query: str, meeting_id: str = None, accessible_meeting_ids: list = None) -> dict:
         """
-        meeting_chunks와 meeting_subtopic에서 각각 3개씩 검색
+        검색 소스(retrieval_sources)를 동시에 검색하고 소스별 할당량(RETRIEVAL_SOURCE_QUOTAS)만큼 결과를 모읍니다.
+        query 임베딩은 한 번만 계산해 모든 벡터 컬렉션에 전달하며,
+        RETRIEVAL_DEADLINE_SECONDS 안에 끝나지 않은 소스는 건너뜁니다. (검색 시간 = 가장 느린 소스 하나)
+        시간 초과된 검색은 스레드에서 끝까지 실행되므로, 소스별 동시 실행 수(RETRIEVAL_MAX_INFLIGHT_PER_SOURCE)를
+        넘으면 그 소스는 바로 건너뛰어 느린 소스 하나가 공유 스레드 풀을 모두 차지하지 않게 합니다.
+        RERANK_ENABLED이면 할당량의 RERANK_CANDIDATE_MULTIPLIER배를 가져와 Reranker로 다시 고릅니다.
 
         Args:
             query (str): 사용자 질문
@@ -69,180 +99,257 @@ class ChatManager:
                 "total_count": int
             }
         """
-        # title 키워드 필터링 비활성화
-        # 이유: Similarity search가 이미 의미론적으로 관련된 문서를 찾아주므로,
-        #       단순한 키워드 추출로 오히려 좋은 결과를 제거할 수 있음
-        title_keywords = []
-
-        # (참고) 필요시 특정 패턴만 추출하도록 개선 가능:
-        # - 고유명사 (예: "사자회담")
-        # - 따옴표로 묶인 단어
-        # - NLP 기반 주제어 추출
-
+        # 접근 범위는 검색 필터로 전달 (저장소에서 먼저 거르므로 넉넉하게 가져와 버릴 필요 없음)
         if meeting_id:
-            # 특정 노트로 제한 (검색 후 필터링)
-            pass  # filter_criteria는 None으로 유지, 검색 후 meeting_id로 필터링
+            where = {"meeting_id": meeting_id}
         elif accessible_meeting_ids:
-            # 접근 가능한 노트들로 제한 (여러 노트에서 검색)
-            # Vector DB가 $in 연산자를 지원하지 않을 수 있으므로, 각 노트별로 검색 후 결합
             logger.info(f"🔍 {len(accessible_meeting_ids)}개 노트에서 검색 중...")
-            all_chunks = []
-            all_subtopics = []
+            where = {"meeting_id": {"$in": list(accessible_meeting_ids)}}
+        else:
+            where = None
 
-            # 설정된 retriever_type 사용
-            try:
-                chunk_result = self.vdb_manager.search(
-                    db_type="chunks",
-                    query=query,
-                    k=len(accessible_meeting_ids) * 10,  # 넉넉하게 검색
-                    retriever_type=self.retriever_type,
-                    filter_criteria=None
-                )
-                # 접근 가능한 meeting_id로 필터링
-                all_chunks = [doc for doc in chunk_result
-                             if doc.metadata.get('meeting_id') in accessible_meeting_ids]
-
-                subtopic_result = self.vdb_manager.search(
-                    db_type="subtopic",
-                    query=query,
-                    k=len(accessible_meeting_ids) * 10,  # 넉넉하게 검색
-                    retriever_type=self.retriever_type,
-                    filter_criteria=None
+        results = {name: [] for name in self.retrieval_sources}
+        try:
+            embedding = self.vdb_manager.embed_query(query)
+        except Exception as e:
+            logger.error(f"❌ 문서 검색 중 오류 (query 임베딩 실패): {e}")
+            results["total_count"] = 0
+            return results
+
+        quotas = {
+            name: config.RETRIEVAL_SOURCE_QUOTAS.get(name, config.SEARCH_RESULTS_PER_COLLECTION)
+            for name in self.retrieval_sources
+        }
+        rerank = config.RERANK_ENABLED
+        futures = {}
+        for name, search in self.retrieval_sources.items():
+            # 이전 요청에서 시간 초과된 검색이 아직 스레드를 잡고 있으면 기다리지 않고 이 소스만 건너뜀
+            if not self._acquire_source(name):
+                logger.warning(
+                    f"⚠️ 검색 건너뜀: {name} (실행 중인 검색이 상한 {config.RETRIEVAL_MAX_INFLIGHT_PER_SOURCE}개에 도달)"
                 )
-                # 접근 가능한 meeting_id로 필터링
-                all_subtopics = [doc for doc in subtopic_result
-                                if doc.metadata.get('meeting_id') in accessible_meeting_ids]
-
-                # title 키워드로 부분 일치 필터링
-                if title_keywords:
-                    logger.info(f"📌 title 필터링 적용: {title_keywords}")
-                    filtered_chunks = []
-                    for doc in all_chunks:
-                        doc_title = doc.metadata.get('title', '').lower()
-                        if any(keyword.lower() in doc_title for keyword in title_keywords):
-                            filtered_chunks.append(doc)
-
-                    filtered_subtopics = []
-                    for doc in all_subtopics:
-                        doc_title = doc.metadata.get('meeting_title', '').lower()
-                        if any(keyword.lower() in doc_title for keyword in title_keywords):
-                            filtered_subtopics.append(doc)
-
-                    logger.debug(f"   필터링 전: chunks={len(all_chunks)}, subtopic={len(all_subtopics)}")
-                    logger.debug(f"   필터링 후: chunks={len(filtered_chunks)}, subtopic={len(filtered_subtopics)}")
-
-                    all_chunks = filtered_chunks
-                    all_subtopics = filtered_subtopics
+                continue
+            k = quotas[name] * config.RERANK_CANDIDATE_MULTIPLIER if rerank else quotas[name]
+            futures[self._executor.submit(self._run_source, name, search, query, embedding, where, k, rerank)] = name
+        done, not_done = wait(futures, timeout=config.RETRIEVAL_DEADLINE_SECONDS) if futures else (set(), set())
+
+        for future in not_done:
+            name = futures[future]
+            if future.cancel():
+                # 시작 전에 취소됨 (_run_source가 실행되지 않으므로 여기서 반환)
+                self._release_source(name)
+            else:
+                # 실행 중인 검색은 중단할 수 없으므로 끝날 때까지 소스별 상한에 포함 (끝나면 소요 시간 기록)
+                self._abandon_source(name, future)
+            logger.warning(f"⚠️ 검색 시간 초과로 건너뜀: {name} ({config.RETRIEVAL_DEADLINE_SECONDS}초)")
+        for future in done:
+            name = futures[future]
+            try:
+                # 소스별 할당량만 사용 (자식 청크는 부모 구간으로 넓히며 겹치는 구간이 합쳐지므로 조금 더 많이)
+                results[name] = future.result() if rerank else future.result()[:quotas[name]]
+            except Exception as e:
+                logger.warning(f"⚠️ 검색 실패: {name} - {e}")
 
+        if rerank:
+            candidates = {name: results[name] for name in self.retrieval_sources}
+            try:
+                results.update(self.reranker.rerank(query, embedding, candidates, quotas))
             except Exception as e:
-                # 검색 실패 시 빈 결과 반환
-                logger.warning(f"⚠️ 검색 실패: {e}")
-                all_chunks = []
-                all_subtopics = []
+                # 재순위 실패 시 소스별 상위 결과 사용
+                logger.warning(f"⚠️ 재순위 실패 (소스별 상위 결과 사용): {e}")
+                results.update({name: [doc for doc, _ in found[:quotas[name]]] for name, found in candidates.items()})
+
+        results["total_count"] = sum(len(results[name]) for name in self.retrieval_sources)
+        logger.info("✅ 검색 완료: " + ", ".join(f"{name}={len(results[name])}개" for name in self.retrieval_sources))
+        return results
+
+    # ==================== 검색 소스 실행 제한 ====================
+
+    def _source_stats(self, name):
+        # _stats_lock 보유 상태에서 호출
+        return self._retrieval_stats.setdefault(
+            name, {"running": 0, "abandoned": 0, "abandoned_running": 0, "skipped": 0}
+        )
+
+    def _acquire_source(self, name) -> bool:
+        """소스별 동시 실행 수가 RETRIEVAL_MAX_INFLIGHT_PER_SOURCE 미만이면 1 늘리고 True"""
+        with self._stats_lock:
+            stats = self._source_stats(name)
+            if stats["running"] >= config.RETRIEVAL_MAX_INFLIGHT_PER_SOURCE:
+                stats["skipped"] += 1
+                return False
+            stats["running"] += 1
+            return True
+
+    def _release_source(self, name):
+        with self._stats_lock:
+            self._source_stats(name)["running"] -= 1
+
+    def _run_source(self, name, search, *args):
+        """검색 스레드에서 소스 1개 실행 (끝나면 실행 수 반환)"""
+        try:
+            return search(*args)
+        finally:
+            self._release_source(name)
+
+    def _abandon_source(self, name, future):
+        """시간 초과로 결과를 버린 검색 기록 (스레드가 끝날 때 소요 시간을 로그로 남김)"""
+        abandoned_at = time.monotonic()
+        with self._stats_lock:
+            stats = self._source_stats(name)
+            stats["abandoned"] += 1
+            stats["abandoned_running"] += 1
+
+        def finished(_):
+            with self._stats_lock:
+                self._source_stats(name)["abandoned_running"] -= 1
+            logger.info(f"ℹ️ 시간 초과된 검색 종료: {name} (제한 시간 후 {time.monotonic() - abandoned_at:.1f}초 더 실행)")
+
+        future.add_done_callback(finished)
+
+    def get_retrieval_stats(self) -> dict:
+        """
+        검색 소스별 실행 현황 (관리자 모니터링용)
 
-            # 상위 3개씩만 선택
-            chunks_results = all_chunks[:3]
-            subtopic_results = all_subtopics[:3]
+        Returns:
+            dict: 소스 이름 -> {running, abandoned(누적), abandoned_running, skipped(상한으로 건너뜀, 누적)}
+        """
+        with self._stats_lock:
+            return {name: dict(stats) for name, stats in self._retrieval_stats.items()}
+
+    def _search_collection(self, db_type, query, embedding, where, k, with_embeddings=False):
+        """벡터 컬렉션 검색 소스 (미리 계산한 query 임베딩 사용)"""
+        return self.vdb_manager.search(
+            db_type=db_type,
+            query=query,
+            k=k,
+            retriever_type=self.retriever_type,
+            filter_criteria=where,
+            query_embedding=embedding,
+            return_embeddings=with_embeddings
+        )
+
+    @staticmethod
+    def _parent_from_document(doc) -> dict:
+        """청크 문서를 그대로 컨텍스트 구간으로 사용 (이전 방식 청크, 부모 구간 조회 실패 시)"""
+        metadata = doc.metadata
+        return {
+            "meeting_id": metadata.get("meeting_id"),
+            "title": metadata.get("title"),
+            "meeting_date": metadata.get("meeting_date"),
+            "start_time": metadata.get("start_time", 0),
+            "end_time": metadata.get("end_time", 0),
+            "content": doc.page_content,
+            "token_count": metadata.get("token_count") or count_tokens(doc.page_content)
+        }
 
-            logger.info(f"✅ 검색 완료: chunks={len(chunks_results)}개, subtopic={len(subtopic_results)}개")
+    def expand_to_parents(self, chunks: list) -> list:
+        """
+        검색된 자식 청크를 부모 구간(앞뒤 PARENT_CONTEXT_SEGMENTS개 세그먼트 포함)으로 넓히고,
+        같은 회의에서 겹치거나 맞닿은 구간은 하나로 합칩니다.
+        부모 구간이 PARENT_MAX_TOKENS를 넘으면 자식 청크는 남기고 앞뒤 문맥을 줄입니다.
+        chunk_level 메타데이터가 없는 이전 방식 청크는 그대로 사용합니다. (재색인 전)
 
-            return {
-                "chunks": chunks_results,
-                "subtopics": subtopic_results,
-                "total_count": len(chunks_results) + len(subtopic_results)
-            }
+        Args:
+            chunks (list): search_documents()의 "chunks" (관련도 순서)
 
-        try:
-            # 단일 노트 검색 또는 전체 검색
-            # 설정된 retriever_type 사용
-            chunks_results = self.vdb_manager.search(
-                db_type="chunks",
-                query=query,
-                k=20 if meeting_id else 10,  # 넉넉하게 검색 후 필터링
-                retriever_type=self.retriever_type,
-                filter_criteria=None
-            )
+        Returns:
+            list: [{'meeting_id', 'title', 'meeting_date', 'start_time', 'end_time', 'content', 'token_count'}, ...]
+                  구간에 포함된 가장 관련도 높은 자식 청크 순서
+        """
+        ranked = []
+        children_by_meeting = {}
+        for rank, doc in enumerate(chunks):
+            if doc.metadata.get("chunk_level") == "child":
+                children_by_meeting.setdefault(doc.metadata.get("meeting_id"), []).append((rank, doc))
+            else:
+                ranked.append((rank, self._parent_from_document(doc)))
+
+        for meeting_id, children in children_by_meeting.items():
+            try:
+                windows = self.db.expand_dialogue_spans(
+                    meeting_id,
+                    [(doc.metadata.get("start_time", 0), doc.metadata.get("end_time", 0)) for _, doc in children],
+                    config.PARENT_CONTEXT_SEGMENTS
+                )
 
-            subtopic_results = self.vdb_manager.search(
-                db_type="subtopic",
-                query=query,
-                k=20 if meeting_id else 10,  # 넉넉하게 검색 후 필터링
-                retriever_type=self.retriever_type,
-                filter_criteria=None
+                # 시작 시간순으로 겹치는 구간 합치기: [rank, start, end, 대표 문서, 자식 청크 시작, 자식 청크 끝]
+                merged = []
+                for (start, end), (rank, doc) in sorted(zip(windows, children), key=lambda item: item[0]):
+                    core_start = doc.metadata.get("start_time", 0)
+                    core_end = doc.metadata.get("end_time", 0)
+                    if merged and start <= merged[-1][2]:
+                        last = merged[-1]
+                        last[2] = max(last[2], end)
+                        last[4] = min(last[4], core_start)
+                        last[5] = max(last[5], core_end)
+                        if rank < last[0]:
+                            last[0], last[3] = rank, doc
+                    else:
+                        merged.append([rank, start, end, doc, core_start, core_end])
+
+                rows_per_window = self.db.get_dialogue_ranges(
+                    meeting_id, [(start, end) for _, start, end, *_ in merged], config.PARENT_MAX_SEGMENTS
+                )
+            except Exception as e:
+                logger.warning(f"⚠️ 부모 구간 조회 실패, 자식 청크를 그대로 사용: {meeting_id} - {e}")
+                ranked.extend((rank, self._parent_from_document(doc)) for rank, doc in children)
+                continue
+
+            for (rank, _, _, doc, core_start, core_end), rows in zip(merged, rows_per_window):
+                parent = self._parent_from_document(doc)
+                if rows:
+                    # rows: (segment_id, start_time, speaker_label, segment)
+                    lines = [
+                        format_segment({'speaker_label': speaker, 'start_time': start_time, 'segment': text})
+                        for _, start_time, speaker, text in rows
+                    ]
+                    token_counts = [count + 1 for count in count_tokens_batch(lines)]
+                    core = [i for i, row in enumerate(rows) if core_start <= row[1] <= core_end] or [0, len(rows) - 1]
+                    begin, end = expand_within_budget(token_counts, core[0], core[-1] + 1, config.PARENT_MAX_TOKENS)
+                    parent.update(
+                        start_time=rows[begin][1],
+                        end_time=rows[end - 1][1],
+                        content="\n".join(lines[begin:end]),
+                        token_count=sum(token_counts[begin:end])
+                    )
+                ranked.append((rank, parent))
+
+        parents = [parent for _, parent in sorted(ranked, key=lambda item: item[0])]
+        if parents:
+            logger.info(
+                f"🧩 자식 청크 {len(chunks)}개 → 부모 구간 {len(parents)}개 "
+                f"({sum(parent['token_count'] for parent in parents)} 토큰)"
             )
+        return parents
 
-            # meeting_id가 지정된 경우, 해당 노트로 필터링
-            if meeting_id:
-                chunks_results = [doc for doc in chunks_results
-                                 if doc.metadata.get('meeting_id') == meeting_id]
-                subtopic_results = [doc for doc in subtopic_results
-                                   if doc.metadata.get('meeting_id') == meeting_id]
-
-            # title 키워드로 부분 일치 필터링
-            if title_keywords:
-                logger.info(f"📌 title 필터링 적용: {title_keywords}")
-                filtered_chunks = []
-                for doc in chunks_results:
-                    doc_title = doc.metadata.get('title', '').lower()
-                    # 키워드 중 하나라도 title에 포함되면 선택
-                    if any(keyword.lower() in doc_title for keyword in title_keywords):
-                        filtered_chunks.append(doc)
-
-                filtered_subtopics = []
-                for doc in subtopic_results:
-                    doc_title = doc.metadata.get('meeting_title', '').lower()
-                    if any(keyword.lower() in doc_title for keyword in title_keywords):
-                        filtered_subtopics.append(doc)
-
-                logger.debug(f"   필터링 전: chunks={len(chunks_results)}, subtopic={len(subtopic_results)}")
-                logger.debug(f"   필터링 후: chunks={len(filtered_chunks)}, subtopic={len(filtered_subtopics)}")
-
-                chunks_results = filtered_chunks
-                subtopic_results = filtered_subtopics
-
-            # 상위 3개만 선택
-            chunks_results = chunks_results[:3]
-            subtopic_results = subtopic_results[:3]
-
-            logger.info(f"✅ 검색 완료: chunks={len(chunks_results)}개, subtopic={len(subtopic_results)}개")
-
-            return {
-                "chunks": chunks_results,
-                "subtopics": subtopic_results,
-                "total_count": len(chunks_results) + len(subtopic_results)
-            }
-
-        except Exception as e:
-            logger.error(f"❌ 문서 검색 중 오류: {e}")
-            return {
-                "chunks": [],
-                "subtopics": [],
-                "total_count": 0
-            }
-
-    def format_context(self, search_results: dict) -> str:
+    def format_context(self, search_results: dict, parents: list = None) -> str:
         """
         검색된 문서들을 컨텍스트 문자열로 포맷팅
+        대화 내용은 자식 청크 대신 겹치는 구간을 합친 부모 구간을 사용합니다.
 
         Args:
             search_results (dict): search_documents()의 반환값
+            parents (list, optional): expand_to_parents() 결과 (None이면 여기서 계산)
 
         Returns:
             str: 포맷팅된 컨텍스트
         """
         context_parts = []
 
-        # Chunks 추가
-        if search_results["chunks"]:
+        if parents is None:
+            parents = self.expand_to_parents(search_results["chunks"])
+
+        # 대화 구간 추가
+        if parents:
             context_parts.append("=== 회의 대화 내용 ===")
-            for i, doc in enumerate(search_results["chunks"], 1):
-                metadata = doc.metadata
+            for i, parent in enumerate(parents, 1):
                 context_parts.append(
                     f"\n[문서 {i}]\n"
-                    f"회의: {metadata.get('title', 'N/A')}\n"
-                    f"일시: {metadata.get('meeting_date', 'N/A')}\n"
-                    f"시간: {metadata.get('start_time', 0):.0f}초 - {metadata.get('end_time', 0):.0f}초\n"
-                    f"내용:\n{doc.page_content}\n"
+                    f"회의: {parent['title'] or 'N/A'}\n"
+                    f"일시: {parent['meeting_date'] or 'N/A'}\n"
+                    f"시간: {parent['start_time'] or 0:.0f}초 - {parent['end_time'] or 0:.0f}초\n"
+                    f"내용:\n{parent['content']}\n"
                 )
 
         # Subtopics 추가
@@ -270,7 +377,7 @@ class ChatManager:
 
     def generate_answer(self, query: str, context: str) -> dict:
         """
-        Gemini 2.5 Flash를 사용하여 답변 생성
+        Gemini를 사용하여 답변 생성 (모델은 model_router가 컨텍스트 길이로 선택)
 
         Args:
             query (str): 사용자 질문
@@ -310,10 +417,14 @@ class ChatManager:
 """
 
         try:
-            # Gemini 2.5 Flash로 답변 생성
-            response = self.gemini_client.models.generate_content(
-                model=self.model_name,
-                contents=prompt
+            # 라우팅된 Gemini 모델로 답변 생성 (실패 시 다른 모델로 폴백)
+            response = model_router.call(
+                task="chat",
+                units=len(context) + len(query),
+                fn=lambda model: self.gemini_client.models.generate_content(
+                    model=model,
+                    contents=prompt
+                ),
             )
 
             answer = response.text.strip()
@@ -362,8 +473,9 @@ class ChatManager:
                 "sources": []
             }
 
-        # 2. 컨텍스트 포맷팅
-        context = self.format_context(search_results)
+        # 2. 자식 청크 → 부모 구간 확장 후 컨텍스트 포맷팅
+        parents = self.expand_to_parents(search_results["chunks"])
+        context = self.format_context(search_results, parents)
 
         # 3. 답변 생성
         result = self.generate_answer(query, context)
@@ -374,16 +486,15 @@ class ChatManager:
         # 4. 출처 정보 추가
         sources = []
 
-        # Chunks 출처
-        for doc in search_results["chunks"]:
-            meta = doc.metadata
+        # Chunks 출처 (합쳐진 부모 구간 단위)
+        for parent in parents:
             sources.append({
                 "type": "chunk",
-                "meeting_id": meta.get("meeting_id"),
-                "title": meta.get("title"),
-                "meeting_date": meta.get("meeting_date"),
-                "start_time": meta.get("start_time"),
-                "end_time": meta.get("end_time")
+                "meeting_id": parent["meeting_id"],
+                "title": parent["title"],
+                "meeting_date": parent["meeting_date"],
+                "start_time": parent["start_time"],
+                "end_time": parent["end_time"]
             })
 
         # Subtopics 출처
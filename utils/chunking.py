@@ -0,0 +1,172 @@
+"""
+회의 대화 세그먼트 청킹
+- child_chunk_ranges: 연속된 세그먼트를 세그먼트 수/토큰 수/시간 간격 기준으로 묶음 (임베딩 불필요)
+- semantic_chunk_ranges: 인접 세그먼트 임베딩의 코사인 거리가 튀는 곳(주제 전환)에서 분리
+  거리 계산과 분리 후보(봉우리) 선택은 numpy로 한 번에 계산하고, 크기 제한 안에서 앞에서부터 구간을 나눕니다.
+
+두 함수 모두 세그먼트별 크기(토큰 수)를 한 번 세어 받아 합산만으로 청크 크기를 늘려가며,
+[(begin, end), ...] 세그먼트 인덱스 구간(end 미포함)을 반환합니다. 청크 텍스트와 메타데이터는 VectorDBManager가 만듭니다.
+"""
+
+# numpy는 semantic 청킹에서만 필요하므로 함수 안에서 import합니다. (서버 시작 시간)
+
+CHUNKING_STRATEGIES = ("child", "semantic")
+
+
+def format_segment(segment):
+    """
+    세그먼트를 "[Speaker X, MM:SS] 내용" 한 줄로 포맷팅
+
+    Args:
+        segment (dict): {'speaker_label', 'start_time', 'segment', ...}
+
+    Returns:
+        str: 포맷팅된 한 줄
+    """
+    start_time = segment.get('start_time', 0) or 0
+    minutes = int(start_time // 60)
+    seconds = int(start_time % 60)
+    return f"[Speaker {segment.get('speaker_label', 'Unknown')}, {minutes:02d}:{seconds:02d}] {segment.get('segment', '')}"
+
+
+def child_chunk_ranges(lengths, start_times, max_segments, max_size, time_gap_threshold):
+    """
+    연속된 세그먼트를 max_segments개 이하, 크기 합 max_size 이하로 묶습니다.
+    (max_size보다 큰 세그먼트 하나는 단독 구간)
+
+    Args:
+        lengths (list): 세그먼트별 크기 (토큰 수, utils/tokenizer.py)
+        start_times (list): 세그먼트별 시작 시간 (초)
+        max_segments (int): 구간당 최대 세그먼트 수
+        max_size (int): 구간 크기 합 상한
+        time_gap_threshold (float): 이 시간(초) 넘게 떨어진 세그먼트는 다른 구간으로 분리
+
+    Returns:
+        list: [(begin, end), ...] (end 미포함)
+    """
+    ranges = []
+    begin = 0
+    size = 0
+    for i, length in enumerate(lengths):
+        if i > begin and (
+            i - begin >= max_segments
+            or size + length > max_size
+            or start_times[i] - start_times[i - 1] > time_gap_threshold
+        ):
+            ranges.append((begin, i))
+            begin, size = i, 0
+        size += length
+    if begin < len(lengths):
+        ranges.append((begin, len(lengths)))
+    return ranges
+
+
+def segment_distances(vectors):
+    """
+    인접 세그먼트 임베딩 사이의 코사인 거리 (1 - 코사인 유사도)
+
+    Args:
+        vectors (array-like): (세그먼트 수, 차원) 임베딩
+
+    Returns:
+        numpy.ndarray: 길이 (세그먼트 수 - 1), i번째 값은 세그먼트 i와 i+1 사이 거리
+    """
+    import numpy as np
+
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors = vectors / np.maximum(norms, 1e-12)
+    return 1.0 - np.einsum('ij,ij->i', vectors[:-1], vectors[1:])
+
+
+def semantic_chunk_ranges(vectors, lengths, start_times, min_segments, max_segments, max_size,
+                          breakpoint_percentile, time_gap_threshold):
+    """
+    인접 세그먼트 임베딩 거리가 봉우리인 곳에서 분리하는 semantic 청킹
+
+    분리 후보: 거리가 회의 안에서 breakpoint_percentile 백분위 이상이고 양옆보다 큰 위치 (주제 전환)
+    1. 현재 위치에서 크기 제한(max_segments, max_size)과 시간 간격 안에서 가장 긴 구간을 잡고
+    2. min_segments 이후의 첫 분리 후보에서 자름
+    3. 후보가 없는데 크기 제한에 걸렸으면, 구간 안에서 거리가 가장 큰 위치에서 자름
+
+    Args:
+        vectors (array-like): (세그먼트 수, 차원) 세그먼트 임베딩
+        lengths (list): 세그먼트별 크기 (토큰 수, utils/tokenizer.py)
+        start_times (list): 세그먼트별 시작 시간 (초)
+        min_segments (int): 분리 후보에서 자를 때 구간의 최소 세그먼트 수
+        max_segments (int): 구간당 최대 세그먼트 수
+        max_size (int): 구간 크기 합 상한
+        breakpoint_percentile (float): 분리 후보 거리 백분위 (0~100, 클수록 적게 분리)
+        time_gap_threshold (float): 이 시간(초) 넘게 떨어진 세그먼트는 항상 분리
+
+    Returns:
+        list: [(begin, end), ...] (end 미포함)
+    """
+    import numpy as np
+
+    count = len(lengths)
+    if count <= 1:
+        return [(0, count)] if count else []
+
+    distances = segment_distances(vectors)
+    threshold = np.percentile(distances, breakpoint_percentile)
+    left = np.concatenate(([-np.inf], distances[:-1]))
+    right = np.concatenate((distances[1:], [-np.inf]))
+    peaks = (distances >= threshold) & (distances >= left) & (distances >= right)
+    gaps = np.diff(np.asarray(start_times, dtype=np.float64)) > time_gap_threshold
+
+    ranges = []
+    begin = 0
+    while begin < count:
+        # 1. 크기 제한/시간 간격 안에서 가장 긴 구간 [begin, end]
+        end = begin
+        size = lengths[begin]
+        while (end + 1 < count and not gaps[end] and end - begin + 1 < max_segments
+               and size + lengths[end + 1] <= max_size):
+            end += 1
+            size += lengths[end]
+
+        # 2. 첫 분리 후보 (구간 안에서 p 다음을 자름)
+        first = begin + min_segments - 1
+        candidates = np.flatnonzero(peaks[first:end]) + first if first < end else []
+        if len(candidates):
+            split = int(candidates[0]) + 1
+        elif end + 1 >= count or gaps[end] or first >= end:
+            split = end + 1
+        else:
+            # 3. 크기 제한에 걸림 → 거리가 가장 큰 위치
+            split = first + int(np.argmax(distances[first:end + 1])) + 1
+
+        ranges.append((begin, split))
+        begin = split
+    return ranges
+
+
+def expand_within_budget(lengths, core_begin, core_end, max_size):
+    """
+    핵심 구간 [core_begin, core_end)를 항상 포함하고, 크기 합이 max_size를 넘지 않는 동안 앞뒤로 한 칸씩 번갈아 넓힙니다.
+    (부모 구간에서 검색된 자식 청크는 남기고 앞뒤 문맥만 줄일 때 사용)
+
+    Args:
+        lengths (list): 항목별 크기 (토큰 수)
+        core_begin (int): 핵심 구간 시작
+        core_end (int): 핵심 구간 끝 (미포함)
+        max_size (int): 크기 합 상한 (핵심 구간만으로 넘으면 핵심 구간만 반환)
+
+    Returns:
+        tuple: (begin, end) (end 미포함)
+    """
+    begin, end = core_begin, core_end
+    size = sum(lengths[begin:end])
+    grew = True
+    while grew:
+        grew = False
+        if begin > 0 and size + lengths[begin - 1] <= max_size:
+            begin -= 1
+            size += lengths[begin]
+            grew = True
+        if end < len(lengths) and size + lengths[end] <= max_size:
+            size += lengths[end]
+            end += 1
+            grew = True
+    return begin, end
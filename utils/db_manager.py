@@ -1,11 +1,45 @@
 
+import re
 import sqlite3
 import uuid
 import datetime
 import logging
 
+from utils import db_migrations
+
 logger = logging.getLogger(__name__)
 
+# 전문 검색 인덱스의 단어 (unicode61 토크나이저와 같은 기준: 문자/숫자 연속, 밑줄은 구분자)
+_FTS_WORD = re.compile(r"[^\W_]+")
+
+
+def fts_bigrams(text):
+    """
+    전문 검색 인덱스용 2-gram 문자열을 만듭니다. (SQLite 함수 fts_bigrams로 등록되어 트리거에서 사용)
+    한국어는 띄어쓰기 단위가 길어 단어 단위로는 부분 일치가 되지 않으므로, 단어마다 두 글자씩 겹쳐서 색인합니다.
+
+    예: "정기회의 시작" → "정기 기회 회의 시작"
+
+    Args:
+        text (str): 원문
+
+    Returns:
+        str: 공백으로 구분된 2-gram (한 글자 단어는 그대로)
+    """
+    if not text:
+        return ""
+    grams = []
+    for word in _FTS_WORD.findall(text):
+        if len(word) == 1:
+            grams.append(word)
+        else:
+            grams.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return " ".join(grams)
+
+
+class MeetingDeletedError(RuntimeError):
+    """처리 중에 회의가 삭제되어 세그먼트를 저장할 수 없는 경우"""
+
 
 class DatabaseManager:
     """SQLite 데이터베이스 관리 (Singleton 패턴)"""
@@ -35,12 +69,17 @@ class DatabaseManager:
     def _get_connection(self):
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
+        # 회의 헤더(meetings) 삭제 시 하위 테이블 연쇄 삭제 (SQLite는 연결마다 활성화 필요)
+        conn.execute("PRAGMA foreign_keys = ON")
+        # 전문 검색 인덱스 동기화 트리거가 사용하는 함수 (연결마다 등록 필요)
+        conn.create_function("fts_bigrams", 1, fts_bigrams, deterministic=True)
         return conn
 
     def _initialize_tables(self):
         """
-        데이터베이스 테이블을 자동으로 생성합니다.
-        app.py 시작 시 자동으로 호출되어 필요한 모든 테이블을 생성합니다.
+        데이터베이스 스키마를 최신 버전으로 맞춥니다.
+        app.py 시작 시 자동으로 호출되며, schema_version 기준으로 아직 적용되지 않은 마이그레이션만 실행합니다.
+        (스키마가 시작 시점에 보장되므로 개별 메서드에서는 테이블 존재 여부를 확인하지 않음)
         """
         import os
 
@@ -50,84 +89,22 @@ class DatabaseManager:
             os.makedirs(db_dir, exist_ok=True)
 
         conn = self._get_connection()
-        cursor = conn.cursor()
+        # 테이블 재생성(외래 키 추가) 중에는 연쇄 삭제가 일어나지 않도록 비활성화
+        conn.execute("PRAGMA foreign_keys = OFF")
 
         try:
-            # 1. meeting_dialogues 테이블 (음성인식 결과)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS meeting_dialogues (
-                    segment_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    meeting_id TEXT NOT NULL,
-                    meeting_date TEXT,
-                    speaker_label TEXT,
-                    start_time REAL,
-                    segment TEXT,
-                    confidence REAL,
-                    audio_file TEXT,
-                    title TEXT,
-                    owner_id INTEGER
-                )
-            """)
-
-            # 2. meeting_minutes 테이블 (회의록)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS meeting_minutes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    meeting_id TEXT UNIQUE NOT NULL,
-                    title TEXT,
-                    meeting_date TEXT,
-                    minutes_content TEXT NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    owner_id INTEGER
-                )
-            """)
-
-            # 3. meeting_mindmap 테이블 (마인드맵)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS meeting_mindmap (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    meeting_id TEXT UNIQUE NOT NULL,
-                    mindmap_content TEXT NOT NULL,
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
+            # 1. 스키마 마이그레이션 (utils/db_migrations.py)
+            db_migrations.run_migrations(conn, self)
+            cursor = conn.cursor()
 
-            # 4. users 테이블 (사용자 정보)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    google_id TEXT UNIQUE NOT NULL,
-                    email TEXT UNIQUE NOT NULL,
-                    name TEXT,
-                    profile_picture TEXT,
-                    role TEXT DEFAULT 'user',
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-
-            # 5. meeting_shares 테이블 (공유 정보)
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS meeting_shares (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    meeting_id TEXT NOT NULL,
-                    owner_id INTEGER NOT NULL,
-                    shared_with_user_id INTEGER NOT NULL,
-                    permission TEXT DEFAULT 'read',
-                    created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                    FOREIGN KEY (owner_id) REFERENCES users(id),
-                    FOREIGN KEY (shared_with_user_id) REFERENCES users(id),
-                    UNIQUE(meeting_id, shared_with_user_id)
-                )
-            """)
-
-            # 6. 인덱스 생성 (성능 최적화)
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_meeting_id ON meeting_dialogues(meeting_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_owner_id ON meeting_dialogues(owner_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_shares_meeting ON meeting_shares(meeting_id)")
-
-            # 7. Admin 사용자 자동 생성
+            # 2. 보관 기간이 지난 삭제 기록 정리 (그보다 오래된 since로 요청하면 전체 목록을 다시 받음)
             from config import config
+            cursor.execute(
+                "DELETE FROM meeting_deletions WHERE deleted_at < strftime('%Y-%m-%d %H:%M:%f', 'now', ?)",
+                (f"-{config.NOTES_DELETION_RETENTION_DAYS} days",)
+            )
+
+            # 3. Admin 사용자 자동 생성
             admin_emails = config.ADMIN_EMAILS
 
             if admin_emails:
@@ -144,17 +121,684 @@ class DatabaseManager:
                             pass
 
             conn.commit()
-            logger.info("✅ 데이터베이스 테이블 초기화 완료")
+            logger.info(f"✅ 데이터베이스 초기화 완료 (스키마 v{db_migrations.get_schema_version(conn)})")
 
         except Exception as e:
             conn.rollback()
-            logger.error(f"❌ 데이터베이스 테이블 초기화 실패: {e}")
+            logger.error(f"❌ 데이터베이스 초기화 실패: {e}")
             raise
 
         finally:
             conn.close()
 
-    def save_stt_to_db(self, segments, audio_filename, title, meeting_date=None, owner_id=None):
+    def get_schema_version(self):
+        """적용된 스키마 버전 (schema_version 최대값)"""
+        conn = self._get_connection()
+        try:
+            return db_migrations.get_schema_version(conn)
+        finally:
+            conn.close()
+
+    def _create_base_schema(self, cursor):
+        """
+        기준 스키마(v1)를 생성합니다. (마이그레이션 v1에서 호출, 이미 있는 객체는 건너뜀)
+        schema_version 도입 이전 버전의 DB는 여기서 외래 키 추가, 헤더/권한 테이블 채우기 등이 함께 처리됩니다.
+
+        Args:
+            cursor: 마이그레이션 트랜잭션의 커서
+        """
+        # 1. meeting_dialogues 테이블 (음성인식 결과)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meeting_dialogues (
+                segment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                meeting_id TEXT NOT NULL REFERENCES meetings(meeting_id) ON DELETE CASCADE,
+                meeting_date TEXT,
+                speaker_label TEXT,
+                start_time REAL,
+                segment TEXT,
+                confidence REAL,
+                audio_file TEXT,
+                title TEXT,
+                owner_id INTEGER
+            )
+        """)
+
+        # 2. meeting_minutes 테이블 (회의록)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meeting_minutes (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                meeting_id TEXT UNIQUE NOT NULL REFERENCES meetings(meeting_id) ON DELETE CASCADE,
+                title TEXT,
+                meeting_date TEXT,
+                minutes_content TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                owner_id INTEGER
+            )
+        """)
+
+        # 3. meeting_mindmap 테이블 (마인드맵)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meeting_mindmap (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                meeting_id TEXT UNIQUE NOT NULL REFERENCES meetings(meeting_id) ON DELETE CASCADE,
+                mindmap_content TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # 4. users 테이블 (사용자 정보)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                google_id TEXT UNIQUE NOT NULL,
+                email TEXT UNIQUE NOT NULL,
+                name TEXT,
+                profile_picture TEXT,
+                role TEXT DEFAULT 'user',
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # 5. meeting_shares 테이블 (공유 정보)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meeting_shares (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                meeting_id TEXT NOT NULL REFERENCES meetings(meeting_id) ON DELETE CASCADE,
+                owner_id INTEGER NOT NULL,
+                shared_with_user_id INTEGER NOT NULL,
+                permission TEXT DEFAULT 'read',
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (owner_id) REFERENCES users(id),
+                FOREIGN KEY (shared_with_user_id) REFERENCES users(id),
+                UNIQUE(meeting_id, shared_with_user_id)
+            )
+        """)
+
+        # 6. job_leases 테이블 (LLM 작업 중복 실행 방지용 리스)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS job_leases (
+                job_key TEXT PRIMARY KEY,
+                meeting_id TEXT NOT NULL,
+                job_type TEXT NOT NULL,
+                content_version TEXT NOT NULL,
+                owner_token TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'running',
+                result TEXT,
+                error TEXT,
+                expires_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+
+        # 7. meeting_media 테이블 (재생용 미디어 정보: ETag, 파형 peaks)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meeting_media (
+                meeting_id TEXT PRIMARY KEY REFERENCES meetings(meeting_id) ON DELETE CASCADE,
+                original_file TEXT,
+                original_etag TEXT,
+                original_bytes INTEGER,
+                mime_type TEXT,
+                duration REAL,
+                peaks_file TEXT,
+                rendition_file TEXT,
+                rendition_etag TEXT,
+                rendition_mime TEXT,
+                rendition_bytes INTEGER,
+                hls_playlist TEXT,
+                original_storage TEXT DEFAULT 'hot',
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        # 이전 버전에서 생성된 meeting_media 테이블에 재생용 변환본 컬럼 추가
+        self._ensure_columns(cursor, "meeting_media", {
+            "rendition_file": "TEXT",
+            "rendition_etag": "TEXT",
+            "rendition_mime": "TEXT",
+            "rendition_bytes": "INTEGER",
+            "hls_playlist": "TEXT",
+            "original_storage": "TEXT DEFAULT 'hot'",
+        })
+
+        # 8. meeting_summaries 테이블 (문단 요약 원문, 전문 검색용)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meeting_summaries (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                meeting_id TEXT UNIQUE NOT NULL REFERENCES meetings(meeting_id) ON DELETE CASCADE,
+                summary_content TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # 9. meetings 헤더 테이블 (회의당 1행, 노트 목록 페이지네이션/변경분 조회/연쇄 삭제 기준)
+        self._initialize_meeting_headers(cursor)
+
+        # 10. 이전 버전 테이블에 meetings 외래 키(ON DELETE CASCADE) 추가 (테이블 재생성)
+        rebuilt_tables = self._migrate_cascade_foreign_keys(cursor)
+
+        # 11. meetings 헤더 동기화 트리거
+        self._create_meeting_header_triggers(cursor)
+
+        # 12. 전문 검색(FTS5) 인덱스: 전사 세그먼트, 문단 요약, 회의록
+        self._initialize_search_index(cursor, rebuilt_tables)
+
+        # 13. meeting_access 테이블 (사용자별 접근 가능 회의, 권한 확인용)
+        self._initialize_meeting_access(cursor)
+
+        # 14. vector_outbox 테이블 (벡터 DB 반영 대기열, 원본 변경과 같은 트랜잭션에 기록)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS vector_outbox (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                meeting_id TEXT NOT NULL REFERENCES meetings(meeting_id) ON DELETE CASCADE,
+                operation TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 1,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                locked_until REAL NOT NULL DEFAULT 0,
+                created_at TEXT DEFAULT (datetime('now', 'localtime')),
+                UNIQUE(meeting_id, operation)
+            )
+        """)
+
+        # 15. meeting_speaker_stats 테이블 (화자별 발언 통계, 전사 저장 시 계산)
+        self._initialize_speaker_stats(cursor)
+
+        # 16. 인덱스 생성 (성능 최적화)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_meeting_id ON meeting_dialogues(meeting_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_owner_id ON meeting_dialogues(owner_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_dialogues_meeting_time ON meeting_dialogues(meeting_id, start_time, segment_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_shares_meeting ON meeting_shares(meeting_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_meetings_date ON meetings(meeting_date, meeting_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_meetings_owner_date ON meetings(owner_id, meeting_date, meeting_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_meetings_updated ON meetings(updated_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_meeting_deletions_at ON meeting_deletions(deleted_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_meeting_tombstones_due ON meeting_tombstones(next_attempt_at)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_vector_outbox_due ON vector_outbox(next_attempt_at)")
+
+    # 전문 검색 대상: (FTS 테이블, 원본 테이블, 원본 rowid 컬럼, 본문 컬럼)
+    SEARCH_SOURCES = {
+        "segment": ("segments_fts", "meeting_dialogues", "segment_id", "segment"),
+        "summary": ("summaries_fts", "meeting_summaries", "id", "summary_content"),
+        "minutes": ("minutes_fts", "meeting_minutes", "id", "minutes_content"),
+    }
+
+    def _initialize_search_index(self, cursor, rebuilt_tables=()):
+        """
+        2-gram 전문 검색(FTS5) 테이블과 동기화 트리거를 생성합니다.
+        - 본문은 원본 테이블에만 두고(contentless) 인덱스에는 fts_bigrams()로 만든 2-gram만 저장합니다.
+          두 글자 검색어도 인덱스로 찾을 수 있습니다. (trigram은 세 글자 미만을 색인하지 못함)
+        - 처음 생성되거나 원본 테이블이 재생성된 경우에는 원본 데이터로 인덱스를 다시 채웁니다.
+        """
+        for fts_table, content_table, rowid_column, text_column in self.SEARCH_SOURCES.values():
+            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (fts_table,))
+            is_new = cursor.fetchone() is None
+
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5(
+                    {text_column},
+                    content='',
+                    tokenize='unicode61'
+                )
+            """)
+
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {content_table} BEGIN
+                    INSERT INTO {fts_table}(rowid, {text_column}) VALUES (new.{rowid_column}, fts_bigrams(new.{text_column}));
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {content_table} BEGIN
+                    INSERT INTO {fts_table}({fts_table}, rowid, {text_column}) VALUES ('delete', old.{rowid_column}, fts_bigrams(old.{text_column}));
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE OF {text_column} ON {content_table} BEGIN
+                    INSERT INTO {fts_table}({fts_table}, rowid, {text_column}) VALUES ('delete', old.{rowid_column}, fts_bigrams(old.{text_column}));
+                    INSERT INTO {fts_table}(rowid, {text_column}) VALUES (new.{rowid_column}, fts_bigrams(new.{text_column}));
+                END
+            """)
+
+            if is_new or content_table in rebuilt_tables:
+                cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('delete-all')")
+                cursor.execute(f"""
+                    INSERT INTO {fts_table}(rowid, {text_column})
+                    SELECT {rowid_column}, fts_bigrams({text_column}) FROM {content_table}
+                """)
+                logger.info(f"✅ 전문 검색 인덱스 생성: {fts_table} (2-gram, {cursor.rowcount}개 행)")
+
+    def _rebuild_search_index_as_bigrams(self, cursor):
+        """이전 버전의 trigram(원본 참조) 인덱스를 삭제하고 2-gram 인덱스로 다시 만듭니다."""
+        for fts_table, content_table, _, _ in self.SEARCH_SOURCES.values():
+            row = cursor.execute(
+                "SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (fts_table,)
+            ).fetchone()
+            if row and "content=''" in row[0]:
+                continue
+            for suffix in ("ai", "ad", "au"):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {fts_table}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {fts_table}")
+        self._initialize_search_index(cursor)
+
+    # 밀리초 단위 타임스탬프 (변경분 조회 기준값, 문자열 비교로 정렬 가능)
+    NOW_MS = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+    def _initialize_meeting_headers(self, cursor):
+        """
+        회의 헤더 테이블(meetings)과 삭제 기록 테이블(meeting_deletions)을 생성합니다.
+
+        meeting_dialogues는 세그먼트 단위이므로 목록 조회마다 GROUP BY가 필요했습니다.
+        헤더 테이블은 트리거로 meeting_dialogues와 동기화되며, updated_at으로 변경분을 조회합니다.
+        """
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meetings'")
+        is_new = cursor.fetchone() is None
+
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS meetings (
+                meeting_id TEXT PRIMARY KEY,
+                title TEXT,
+                meeting_date TEXT NOT NULL DEFAULT '',
+                owner_id INTEGER,
+                audio_file TEXT,
+                created_at TEXT DEFAULT ({self.NOW_MS}),
+                updated_at TEXT DEFAULT ({self.NOW_MS})
+            )
+        """)
+
+        # 삭제된 회의 기록 (user_id가 NULL이면 회의 삭제, 값이 있으면 해당 사용자의 공유 해제)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS meeting_deletions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                meeting_id TEXT NOT NULL,
+                owner_id INTEGER,
+                user_id INTEGER,
+                deleted_at TEXT DEFAULT ({self.NOW_MS})
+            )
+        """)
+
+        if is_new:
+            cursor.execute("""
+                INSERT INTO meetings (meeting_id, title, meeting_date, owner_id, audio_file)
+                SELECT meeting_id, MAX(title), COALESCE(MAX(meeting_date), ''), MIN(owner_id), MIN(audio_file)
+                FROM meeting_dialogues
+                GROUP BY meeting_id
+            """)
+            logger.info(f"✅ meetings 헤더 테이블 생성: 기존 회의 {cursor.rowcount}개 등록")
+
+        # 삭제된 회의의 정리 대기열 (벡터/파일/캐시 정리는 백그라운드 GC가 처리)
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS meeting_tombstones (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                meeting_id TEXT NOT NULL,
+                audio_file TEXT,
+                media TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                next_attempt_at REAL NOT NULL DEFAULT 0,
+                created_at TEXT DEFAULT ({self.NOW_MS})
+            )
+        """)
+
+    # meetings 헤더를 참조하는 하위 테이블 (헤더 삭제 시 연쇄 삭제)
+    CASCADE_TABLES = (
+        "meeting_dialogues", "meeting_minutes", "meeting_mindmap", "meeting_shares",
+        "meeting_summaries", "meeting_media", "meeting_access",
+    )
+
+    # 삭제 시점의 미디어 파일 정보 (meeting_media는 연쇄 삭제되므로 정리 대기열에 보관)
+    TOMBSTONE_MEDIA_JSON = """
+        (SELECT json_object(
+            'original_file', original_file, 'original_storage', original_storage,
+            'peaks_file', peaks_file, 'rendition_file', rendition_file, 'hls_playlist', hls_playlist)
+         FROM meeting_media WHERE meeting_id = {ref})
+    """
+
+    def _migrate_cascade_foreign_keys(self, cursor):
+        """
+        이전 버전에서 외래 키 없이 생성된 하위 테이블을 meetings(meeting_id) ON DELETE CASCADE로 재생성합니다.
+        헤더가 없는 고아 행은 복사하지 않고, 해당 회의는 정리 대기열에 등록합니다.
+
+        Returns:
+            set: 재생성된 테이블 이름
+        """
+        rebuilt = set()
+        cursor.execute("PRAGMA legacy_alter_table = ON")
+        try:
+            for table in self.CASCADE_TABLES:
+                cursor.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,))
+                row = cursor.fetchone()
+                if not row:
+                    continue
+                cursor.execute(f"PRAGMA foreign_key_list({table})")
+                if any(fk['table'] == 'meetings' for fk in cursor.fetchall()):
+                    continue
+
+                new_sql, replaced = re.subn(
+                    r"(\bmeeting_id\s+TEXT\b[^,\n]*)",
+                    r"\1 REFERENCES meetings(meeting_id) ON DELETE CASCADE",
+                    row['sql'], count=1
+                )
+                if not replaced:
+                    logger.warning(f"⚠️ {table}: meeting_id 컬럼을 찾지 못해 외래 키를 추가하지 않습니다.")
+                    continue
+                new_sql = re.sub(rf"^CREATE TABLE\s+\"?{table}\"?", f"CREATE TABLE {table}__new", new_sql, count=1)
+
+                cursor.execute(f"""
+                    INSERT INTO meeting_tombstones (meeting_id, media)
+                    SELECT DISTINCT t.meeting_id, {self.TOMBSTONE_MEDIA_JSON.format(ref="t.meeting_id")}
+                    FROM {table} t
+                    WHERE t.meeting_id NOT IN (SELECT meeting_id FROM meetings)
+                """)
+                orphans = cursor.rowcount
+
+                cursor.execute(new_sql)
+                cursor.execute(f"INSERT INTO {table}__new SELECT * FROM {table} WHERE meeting_id IN (SELECT meeting_id FROM meetings)")
+                cursor.execute(f"DROP TABLE {table}")
+                cursor.execute(f"ALTER TABLE {table}__new RENAME TO {table}")
+                rebuilt.add(table)
+                logger.info(f"✅ {table}: 외래 키(ON DELETE CASCADE) 추가 완료 (헤더 없는 회의 {orphans}개 정리 대기열 등록)")
+        finally:
+            cursor.execute("PRAGMA legacy_alter_table = OFF")
+        return rebuilt
+
+    def _create_meeting_header_triggers(self, cursor):
+        """meetings 헤더를 meeting_dialogues/meeting_shares와 동기화하는 트리거를 생성합니다."""
+        # 세그먼트 추가 → 헤더 생성 (이어서 추가되는 세그먼트는 헤더를 건드리지 않음,
+        # STT 중간 저장마다 변경분에 나타나지 않도록 updated_at은 save_stt_to_db의 마지막 저장에서 갱신)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS meetings_dialogue_ai AFTER INSERT ON meeting_dialogues BEGIN
+                INSERT INTO meetings (meeting_id, title, meeting_date, owner_id, audio_file)
+                VALUES (new.meeting_id, new.title, COALESCE(new.meeting_date, ''), new.owner_id, new.audio_file)
+                ON CONFLICT(meeting_id) DO NOTHING;
+            END
+        """)
+        # 제목/날짜 변경 → 헤더 갱신 (회의의 모든 세그먼트가 갱신되므로 값이 바뀌는 첫 행에서만 기록)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS meetings_dialogue_au AFTER UPDATE OF title, meeting_date ON meeting_dialogues
+            WHEN new.title IS NOT old.title OR new.meeting_date IS NOT old.meeting_date BEGIN
+                UPDATE meetings
+                SET title = new.title,
+                    meeting_date = COALESCE(new.meeting_date, ''),
+                    updated_at = {self.NOW_MS}
+                WHERE meeting_id = new.meeting_id
+                  AND (title IS NOT new.title OR meeting_date IS NOT COALESCE(new.meeting_date, ''));
+            END
+        """)
+        # 마지막 세그먼트 삭제 → 헤더 삭제
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS meetings_dialogue_ad AFTER DELETE ON meeting_dialogues
+            WHEN NOT EXISTS (SELECT 1 FROM meeting_dialogues WHERE meeting_id = old.meeting_id) BEGIN
+                DELETE FROM meetings WHERE meeting_id = old.meeting_id;
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS meetings_ad AFTER DELETE ON meetings BEGIN
+                INSERT INTO meeting_deletions (meeting_id, owner_id, user_id) VALUES (old.meeting_id, old.owner_id, NULL);
+            END
+        """)
+        # 공유 추가 → 공유받은 사용자의 변경분에 나타나도록 updated_at 갱신
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS meetings_share_ai AFTER INSERT ON meeting_shares BEGIN
+                UPDATE meetings SET updated_at = {self.NOW_MS} WHERE meeting_id = new.meeting_id;
+            END
+        """)
+        # 공유 해제 → 해당 사용자에게만 삭제로 전달
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS meetings_share_ad AFTER DELETE ON meeting_shares BEGIN
+                INSERT INTO meeting_deletions (meeting_id, owner_id, user_id) VALUES (old.meeting_id, old.owner_id, old.shared_with_user_id);
+            END
+        """)
+
+        # 헤더 삭제 → 정리 대기열 등록 (하위 테이블은 연쇄 삭제되므로 미디어 정보는 삭제 전에 기록)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS meetings_tombstone_bd BEFORE DELETE ON meetings BEGIN
+                INSERT INTO meeting_tombstones (meeting_id, audio_file, media)
+                VALUES (old.meeting_id, old.audio_file, {self.TOMBSTONE_MEDIA_JSON.format(ref="old.meeting_id")});
+            END
+        """)
+
+    # 삭제된 회의에 세그먼트를 추가하려 할 때 트리거가 발생시키는 오류 메시지
+    DELETED_MEETING_ERROR = "meeting deleted"
+
+    def _create_deleted_meeting_guard(self, cursor):
+        """
+        삭제된 회의의 헤더가 세그먼트 추가 트리거로 다시 만들어지지 않도록 막는 트리거를 생성합니다.
+        (다른 프로세스에서 STT가 진행 중인 회의를 삭제한 경우, 이후 중간 저장이 트랜잭션째 실패)
+        헤더가 없는 첫 세그먼트에서만 삭제 기록(meeting_deletions)을 확인합니다.
+        """
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_meeting_deletions_meeting ON meeting_deletions(meeting_id)")
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS meetings_dialogue_deleted_bi BEFORE INSERT ON meeting_dialogues
+            WHEN NOT EXISTS (SELECT 1 FROM meetings WHERE meeting_id = new.meeting_id)
+             AND EXISTS (SELECT 1 FROM meeting_deletions WHERE meeting_id = new.meeting_id AND user_id IS NULL) BEGIN
+                SELECT RAISE(ABORT, '{self.DELETED_MEETING_ERROR}');
+            END
+        """)
+
+    def _recreate_dialogue_insert_trigger(self, cursor):
+        """세그먼트 추가 트리거(meetings_dialogue_ai)를 현재 정의로 다시 만듭니다. (이어서 추가되는 세그먼트는 updated_at을 갱신하지 않음)"""
+        cursor.execute("DROP TRIGGER IF EXISTS meetings_dialogue_ai")
+        self._create_meeting_header_triggers(cursor)
+
+    def _create_access_versions(self, cursor):
+        """
+        사용자별 권한 버전(access_versions)과 버전 증가 트리거를 생성합니다.
+        권한이 줄어드는 변경(공유 해제, 회의 삭제로 인한 meeting_access 삭제, 권한/역할 변경)마다 버전이 올라가며,
+        AccessControl은 캐시된 권한을 쓰기 전에 버전을 비교하므로 다른 프로세스의 캐시도 바로 무효화됩니다.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS access_versions (
+                user_id INTEGER PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        bump = """
+                INSERT INTO access_versions (user_id, version) VALUES ({ref}, 1)
+                ON CONFLICT(user_id) DO UPDATE SET version = version + 1;
+        """
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS access_versions_access_ad AFTER DELETE ON meeting_access BEGIN
+                {bump.format(ref="old.user_id")}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS access_versions_access_au AFTER UPDATE ON meeting_access BEGIN
+                {bump.format(ref="old.user_id")}
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS access_versions_role_au AFTER UPDATE OF role ON users
+            WHEN new.role IS NOT old.role BEGIN
+                {bump.format(ref="old.id")}
+            END
+        """)
+
+    def _initialize_meeting_access(self, cursor):
+        """
+        사용자별 접근 가능한 회의를 미리 계산해 둔 meeting_access 테이블을 생성합니다.
+
+        권한 확인 시 세그먼트 행을 훑는 대신 (user_id, meeting_id) 기본키로 바로 조회합니다.
+        소유자(permission='owner')는 meetings, 공유받은 사용자는 meeting_shares 트리거로 동기화됩니다.
+        Admin은 역할로 판단하므로 행을 두지 않습니다.
+        """
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_access'")
+        is_new = cursor.fetchone() is None
+
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meeting_access (
+                user_id INTEGER NOT NULL,
+                meeting_id TEXT NOT NULL REFERENCES meetings(meeting_id) ON DELETE CASCADE,
+                permission TEXT NOT NULL,
+                PRIMARY KEY (user_id, meeting_id)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_meeting_access_meeting ON meeting_access(meeting_id)")
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS meeting_access_owner_ai AFTER INSERT ON meetings
+            WHEN new.owner_id IS NOT NULL BEGIN
+                INSERT OR REPLACE INTO meeting_access (user_id, meeting_id, permission)
+                VALUES (new.owner_id, new.meeting_id, 'owner');
+            END
+        """)
+        # 회의 삭제 시 권한 행은 외래 키로 연쇄 삭제됨
+        cursor.execute("DROP TRIGGER IF EXISTS meeting_access_owner_ad")
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS meeting_access_share_ai AFTER INSERT ON meeting_shares BEGIN
+                INSERT OR IGNORE INTO meeting_access (user_id, meeting_id, permission)
+                VALUES (new.shared_with_user_id, new.meeting_id, COALESCE(new.permission, 'read'));
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS meeting_access_share_ad AFTER DELETE ON meeting_shares BEGIN
+                DELETE FROM meeting_access
+                WHERE user_id = old.shared_with_user_id AND meeting_id = old.meeting_id AND permission != 'owner';
+            END
+        """)
+
+        if is_new:
+            cursor.execute("""
+                INSERT OR IGNORE INTO meeting_access (user_id, meeting_id, permission)
+                SELECT owner_id, meeting_id, 'owner' FROM meetings WHERE owner_id IS NOT NULL
+            """)
+            cursor.execute("""
+                INSERT OR IGNORE INTO meeting_access (user_id, meeting_id, permission)
+                SELECT s.shared_with_user_id, s.meeting_id, COALESCE(s.permission, 'read')
+                FROM meeting_shares s
+                JOIN meetings m ON m.meeting_id = s.meeting_id
+            """)
+            logger.info("✅ meeting_access 테이블 생성 및 기존 권한 등록 완료")
+
+    # 화자별 통계 계산 SQL (세그먼트를 시간순으로 정렬하여 앞/뒤 발화와 비교)
+    # - talk_seconds: 다음 발화 시작까지의 간격 (마지막 발화는 글자 수로 추정, 긴 침묵은 상한으로 자름)
+    # - turn_count: 직전 발화와 화자가 바뀐 횟수 (첫 발화 포함)
+    # - interruptions: 직전 화자의 발화가 끝나기 전(글자 수로 추정)에 시작한 발화 수
+    SPEAKER_STATS_SQL = """
+        SELECT meeting_id, speaker_label,
+               SUM(chars) AS char_count,
+               COUNT(*) AS segment_count,
+               ROUND(SUM(MIN(MAX(COALESCE(next_start - start_time, chars / :cps), 0), :max_gap)), 3) AS talk_seconds,
+               SUM(prev_speaker IS NULL OR prev_speaker <> speaker_label) AS turn_count,
+               COALESCE(SUM(prev_speaker <> speaker_label AND start_time - prev_start < prev_chars / :cps), 0) AS interruptions,
+               MIN(start_time) AS first_start,
+               MAX(start_time) AS last_start
+        FROM (
+            SELECT meeting_id,
+                   COALESCE(speaker_label, 'Unknown') AS speaker_label,
+                   COALESCE(start_time, 0) AS start_time,
+                   LENGTH(COALESCE(segment, '')) AS chars,
+                   LEAD(COALESCE(start_time, 0)) OVER w AS next_start,
+                   LAG(COALESCE(speaker_label, 'Unknown')) OVER w AS prev_speaker,
+                   LAG(COALESCE(start_time, 0)) OVER w AS prev_start,
+                   LAG(LENGTH(COALESCE(segment, ''))) OVER w AS prev_chars
+            FROM meeting_dialogues
+            {where}
+            WINDOW w AS (PARTITION BY meeting_id ORDER BY start_time, segment_id)
+        )
+        GROUP BY meeting_id, speaker_label
+    """
+
+    SPEAKER_STATS_COLUMNS = (
+        "meeting_id, speaker_label, char_count, segment_count, talk_seconds, "
+        "turn_count, interruptions, first_start, last_start"
+    )
+
+    # 통계가 없는 회의 (세그먼트가 직접 수정되어 무효화되었거나 세그먼트가 없는 회의)
+    SPEAKER_STATS_MISSING_WHERE = """
+        WHERE meeting_id IN (
+            SELECT meeting_id FROM meetings
+            WHERE meeting_id NOT IN (SELECT meeting_id FROM meeting_speaker_stats)
+        )
+    """
+
+    def _initialize_speaker_stats(self, cursor):
+        """
+        화자별 발언 통계 테이블(meeting_speaker_stats)을 생성합니다.
+
+        전사 저장(save_stt_to_db), 세그먼트 삭제(delete_meeting_data) 시 같은 트랜잭션에서 계산합니다.
+        그 밖의 경로로 세그먼트가 수정/삭제되면 트리거가 해당 회의의 통계를 지우고,
+        조회 시에는 저장하지 않고 바로 계산합니다. (조회 요청에서 쓰기 트랜잭션을 만들지 않음)
+        (행 단위 트리거에서 전체를 다시 계산하면 여러 행 수정 시 비용이 커지므로 무효화만 수행)
+        기존 회의의 통계는 마이그레이션 v3이 배치 단위로 채웁니다.
+        """
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS meeting_speaker_stats (
+                meeting_id TEXT NOT NULL REFERENCES meetings(meeting_id) ON DELETE CASCADE,
+                speaker_label TEXT NOT NULL,
+                char_count INTEGER NOT NULL DEFAULT 0,
+                segment_count INTEGER NOT NULL DEFAULT 0,
+                talk_seconds REAL NOT NULL DEFAULT 0,
+                turn_count INTEGER NOT NULL DEFAULT 0,
+                interruptions INTEGER NOT NULL DEFAULT 0,
+                first_start REAL,
+                last_start REAL,
+                PRIMARY KEY (meeting_id, speaker_label)
+            ) WITHOUT ROWID
+        """)
+
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS speaker_stats_dialogue_au
+            AFTER UPDATE OF speaker_label, segment, start_time, meeting_id ON meeting_dialogues
+            BEGIN
+                DELETE FROM meeting_speaker_stats WHERE meeting_id IN (OLD.meeting_id, NEW.meeting_id);
+            END
+        """)
+        cursor.execute("""
+            CREATE TRIGGER IF NOT EXISTS speaker_stats_dialogue_ad
+            AFTER DELETE ON meeting_dialogues
+            BEGIN
+                DELETE FROM meeting_speaker_stats WHERE meeting_id = OLD.meeting_id;
+            END
+        """)
+
+    @staticmethod
+    def _speaker_stats_params():
+        from config import config
+        return {
+            "cps": float(config.SPEAKER_STATS_CHARS_PER_SECOND),
+            "max_gap": float(config.SPEAKER_STATS_MAX_SEGMENT_SECONDS),
+        }
+
+    def _refresh_speaker_stats(self, cursor, meeting_ids=None):
+        """
+        화자별 통계를 다시 계산합니다. (호출한 쪽의 트랜잭션 안에서 실행)
+
+        Args:
+            cursor: DB 커서
+            meeting_ids (list, optional): 계산할 회의 ID 목록 (None이면 통계가 없는 회의 전체)
+        """
+        import json
+
+        params = self._speaker_stats_params()
+        if meeting_ids is not None:
+            params["meeting_ids"] = json.dumps(list(meeting_ids))
+            cursor.execute(
+                "DELETE FROM meeting_speaker_stats WHERE meeting_id IN (SELECT value FROM json_each(:meeting_ids))",
+                params
+            )
+            where = "WHERE meeting_id IN (SELECT value FROM json_each(:meeting_ids))"
+        else:
+            where = self.SPEAKER_STATS_MISSING_WHERE
+        cursor.execute(
+            f"INSERT INTO meeting_speaker_stats ({self.SPEAKER_STATS_COLUMNS}) "
+            + self.SPEAKER_STATS_SQL.format(where=where),
+            params
+        )
+
+    @staticmethod
+    def _ensure_columns(cursor, table, columns):
+        """테이블에 없는 컬럼을 추가합니다. (기존 DB 호환용)"""
+        cursor.execute(f"PRAGMA table_info({table})")
+        existing = {row['name'] for row in cursor.fetchall()}
+        for name, definition in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+                logger.info(f"✅ {table}.{name} 컬럼 추가")
+
+    def save_stt_to_db(self, segments, audio_filename, title, meeting_date=None, owner_id=None, meeting_id=None,
+                       index_vectors=True):
         """
         음성 인식 결과를 데이터베이스에 저장합니다.
 
@@ -165,29 +809,53 @@ class DatabaseManager:
             meeting_date (str, optional): 회의 일시 (형식: "YYYY-MM-DD HH:MM:SS")
                                           제공되지 않으면 현재 시간 사용
             owner_id (int, optional): 회의 소유자 ID
+            meeting_id (str, optional): 기존 회의 ID (지정하면 해당 회의에 세그먼트를 이어서 추가)
+                                        제공되지 않으면 새로 생성
+            index_vectors (bool): 벡터 DB 청크 생성을 대기열에 등록할지 여부
+                                  (STT 중간 저장은 False, 마지막 저장에서 True)
 
         Returns:
-            str: 생성된 meeting_id
+            str: 저장된 meeting_id
+
+        Raises:
+            MeetingDeletedError: 처리 중에 회의가 삭제된 경우 (헤더를 다시 만들지 않고 아무것도 저장하지 않음)
         """
-        meeting_id = str(uuid.uuid4())
+        if meeting_id is None:
+            meeting_id = str(uuid.uuid4())
 
         # meeting_date가 제공되지 않으면 현재 시간 사용
         if meeting_date is None:
             meeting_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         conn = self._get_connection()
-        cursor = conn.cursor()
-        for segment in segments:
-            cursor.execute("""
-                INSERT INTO meeting_dialogues
-                (meeting_id, meeting_date, speaker_label, start_time, segment, confidence, audio_file, title, owner_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                meeting_id, meeting_date, str(segment['speaker']), segment['start_time'],
-                segment['text'], segment['confidence'], audio_filename, title, owner_id
-            ))
-        conn.commit()
-        conn.close()
+        try:
+            cursor = conn.cursor()
+            for segment in segments:
+                cursor.execute("""
+                    INSERT INTO meeting_dialogues
+                    (meeting_id, meeting_date, speaker_label, start_time, segment, confidence, audio_file, title, owner_id)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (
+                    meeting_id, meeting_date, str(segment['speaker']), segment['start_time'],
+                    segment['text'], segment['confidence'], audio_filename, title, owner_id
+                ))
+            if segments:
+                self._refresh_speaker_stats(cursor, [meeting_id])
+            if index_vectors:
+                # 마지막 저장에서만 updated_at 갱신 (변경분 조회에 완성된 회의로 한 번 나타남)
+                # 세그먼트 없이 마지막 저장만 하는 경우에도 삭제된 회의는 대기열에 등록하지 않음
+                cursor.execute(f"UPDATE meetings SET updated_at = {self.NOW_MS} WHERE meeting_id = ?", (meeting_id,))
+                if cursor.rowcount == 0:
+                    raise MeetingDeletedError(f"삭제된 회의입니다: {meeting_id}")
+                self._enqueue_vector_sync(cursor, meeting_id, 'index_chunks')
+            conn.commit()
+        except sqlite3.IntegrityError as e:
+            # meetings_dialogue_deleted_bi 트리거: 삭제된 회의의 헤더를 다시 만들려는 경우
+            if self.DELETED_MEETING_ERROR in str(e):
+                raise MeetingDeletedError(f"삭제된 회의입니다: {meeting_id}") from e
+            raise
+        finally:
+            conn.close()
         logger.info(f"✅ DB 저장 완료: meeting_id={meeting_id}, owner_id={owner_id}, meeting_date={meeting_date}")
         return meeting_id
 
@@ -221,6 +889,259 @@ class DatabaseManager:
         conn.close()
         return [dict(row) for row in rows]
 
+    # 전사 구간 조회 결과 컬럼 (뷰어에 배열의 배열로 전달)
+    TRANSCRIPT_WINDOW_COLUMNS = ("segment_id", "start_time", "speaker_label", "segment")
+
+    def get_transcript_window(self, meeting_id, after_id=None, before_id=None, from_time=None, limit=200):
+        """
+        전사 세그먼트를 시간순으로 한 구간만 조회합니다. ((start_time, segment_id) 키셋 페이지네이션)
+
+        Args:
+            meeting_id (str): 회의 ID
+            after_id (int, optional): 이 세그먼트 다음부터 조회 (아래로 스크롤)
+            before_id (int, optional): 이 세그먼트 이전까지 조회 (위로 스크롤)
+            from_time (float, optional): 이 시간(초)을 포함하는 세그먼트부터 조회 (재생 위치 이동)
+            limit (int): 최대 세그먼트 수
+
+        Returns:
+            dict: {'rows': [(segment_id, start_time, speaker_label, segment), ...],
+                   'has_before': bool, 'has_after': bool}
+        """
+        columns = ", ".join(self.TRANSCRIPT_WINDOW_COLUMNS)
+        empty = {'rows': [], 'has_before': False, 'has_after': False}
+
+        conn = self._get_connection()
+        try:
+            def find_anchor(sql, params):
+                row = conn.execute(sql, params).fetchone()
+                return (row['start_time'], row['segment_id']) if row else None
+
+            def exists(operator, key):
+                return conn.execute(f"""
+                    SELECT 1 FROM meeting_dialogues
+                    WHERE meeting_id = ? AND (start_time, segment_id) {operator} (?, ?)
+                    LIMIT 1
+                """, (meeting_id, *key)).fetchone() is not None
+
+            by_id = "SELECT start_time, segment_id FROM meeting_dialogues WHERE meeting_id = ? AND segment_id = ?"
+
+            if before_id is not None:
+                anchor = find_anchor(by_id, (meeting_id, before_id))
+                if anchor is None:
+                    return empty
+                rows = conn.execute(f"""
+                    SELECT {columns} FROM meeting_dialogues
+                    WHERE meeting_id = ? AND (start_time, segment_id) < (?, ?)
+                    ORDER BY start_time DESC, segment_id DESC
+                    LIMIT ?
+                """, (meeting_id, *anchor, limit + 1)).fetchall()
+                return {
+                    'rows': [tuple(row) for row in reversed(rows[:limit])],
+                    'has_before': len(rows) > limit,
+                    'has_after': True,
+                }
+
+            anchor, operator = None, ">="
+            if after_id is not None:
+                anchor, operator = find_anchor(by_id, (meeting_id, after_id)), ">"
+                if anchor is None:
+                    return empty
+            elif from_time is not None:
+                # 재생 위치를 포함하는 세그먼트 = 시작 시간이 from_time 이하인 마지막 세그먼트
+                anchor = find_anchor("""
+                    SELECT start_time, segment_id FROM meeting_dialogues
+                    WHERE meeting_id = ? AND start_time <= ?
+                    ORDER BY start_time DESC, segment_id DESC
+                    LIMIT 1
+                """, (meeting_id, from_time))
+
+            condition, params = "", [meeting_id]
+            if anchor is not None:
+                condition = f"AND (start_time, segment_id) {operator} (?, ?)"
+                params += list(anchor)
+
+            rows = conn.execute(f"""
+                SELECT {columns} FROM meeting_dialogues
+                WHERE meeting_id = ? {condition}
+                ORDER BY start_time, segment_id
+                LIMIT ?
+            """, params + [limit + 1]).fetchall()
+
+            has_before = False
+            if after_id is not None:
+                has_before = True
+            elif anchor is not None and rows:
+                has_before = exists("<", (rows[0]['start_time'], rows[0]['segment_id']))
+
+            return {
+                'rows': [tuple(row) for row in rows[:limit]],
+                'has_before': has_before,
+                'has_after': len(rows) > limit,
+            }
+        finally:
+            conn.close()
+
+    def expand_dialogue_spans(self, meeting_id, spans, context_segments):
+        """
+        검색된 구간(자식 청크)을 앞뒤 세그먼트 수만큼 넓힌 시간 구간을 계산합니다. (부모-자식 검색)
+        (meeting_id, start_time) 인덱스에서 구간 경계 앞뒤로 최대 context_segments개만 읽습니다.
+
+        Args:
+            meeting_id (str): 회의 ID
+            spans (list): [(start_time, end_time), ...] 자식 청크의 첫/마지막 세그먼트 시작 시간
+            context_segments (int): 앞뒤로 붙일 세그먼트 수
+
+        Returns:
+            list: [(start_time, end_time), ...] 넓힌 구간 (spans와 같은 순서)
+        """
+        conn = self._get_connection()
+        try:
+            expanded = []
+            for start_time, end_time in spans:
+                lower = conn.execute("""
+                    SELECT MIN(start_time) FROM (
+                        SELECT start_time FROM meeting_dialogues
+                        WHERE meeting_id = ? AND start_time < ?
+                        ORDER BY start_time DESC
+                        LIMIT ?
+                    )
+                """, (meeting_id, start_time, context_segments)).fetchone()[0]
+                upper = conn.execute("""
+                    SELECT MAX(start_time) FROM (
+                        SELECT start_time FROM meeting_dialogues
+                        WHERE meeting_id = ? AND start_time > ?
+                        ORDER BY start_time
+                        LIMIT ?
+                    )
+                """, (meeting_id, end_time, context_segments)).fetchone()[0]
+                expanded.append((
+                    start_time if lower is None else lower,
+                    end_time if upper is None else upper,
+                ))
+            return expanded
+        finally:
+            conn.close()
+
+    def get_dialogue_ranges(self, meeting_id, ranges, limit):
+        """
+        시간 구간별 전사 세그먼트를 시간순으로 조회합니다.
+
+        Args:
+            meeting_id (str): 회의 ID
+            ranges (list): [(start_time, end_time), ...] (양 끝 포함)
+            limit (int): 구간당 최대 세그먼트 수
+
+        Returns:
+            list: 구간별 [(segment_id, start_time, speaker_label, segment), ...] (ranges와 같은 순서)
+        """
+        columns = ", ".join(self.TRANSCRIPT_WINDOW_COLUMNS)
+        conn = self._get_connection()
+        try:
+            return [
+                [tuple(row) for row in conn.execute(f"""
+                    SELECT {columns} FROM meeting_dialogues
+                    WHERE meeting_id = ? AND start_time BETWEEN ? AND ?
+                    ORDER BY start_time, segment_id
+                    LIMIT ?
+                """, (meeting_id, start_time, end_time, limit))]
+                for start_time, end_time in ranges
+            ]
+        finally:
+            conn.close()
+
+    def get_speaker_stats(self, meeting_id):
+        """
+        회의의 화자별 발언 통계를 조회합니다. (수정으로 무효화된 경우 저장하지 않고 바로 계산)
+
+        Args:
+            meeting_id (str): 회의 ID
+
+        Returns:
+            list: [{'speaker_label', 'char_count', 'segment_count', 'talk_seconds', 'turn_count',
+                    'interruptions', 'first_start', 'last_start'}, ...] (발언 글자 수 내림차순)
+        """
+        query = """
+            SELECT speaker_label, char_count, segment_count, talk_seconds, turn_count,
+                   interruptions, first_start, last_start
+            FROM ({source})
+            WHERE meeting_id = :meeting_id
+            ORDER BY char_count DESC, speaker_label
+        """
+        params = {"meeting_id": meeting_id, **self._speaker_stats_params()}
+        conn = self._get_connection()
+        try:
+            rows = conn.execute(query.format(source="meeting_speaker_stats"), params).fetchall()
+            if not rows:
+                rows = conn.execute(
+                    query.format(source=self.SPEAKER_STATS_SQL.format(where="WHERE meeting_id = :meeting_id")),
+                    params
+                ).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
+    # 기간별 집계 단위 → meeting_date 앞부분 길이 ('YYYY-MM-DD' / 'YYYY-MM')
+    SPEAKER_STATS_INTERVALS = {"day": 10, "month": 7}
+
+    def aggregate_speaker_stats(self, accessible_meeting_ids=None, date_from=None, date_to=None, interval=None):
+        """
+        여러 회의에 걸친 화자별 발언 통계를 SQL 집계로 조회합니다.
+
+        Args:
+            accessible_meeting_ids (list, optional): 집계 대상 meeting_id 목록 (None이면 전체, Admin용)
+            date_from (str, optional): 시작 날짜 (YYYY-MM-DD, 포함)
+            date_to (str, optional): 종료 날짜 (YYYY-MM-DD, 포함)
+            interval (str, optional): 'day' / 'month'이면 기간별로 나누어 집계
+
+        Returns:
+            list: [{'speaker_label', 'period', 'meeting_count', 'talk_seconds', 'char_count',
+                    'segment_count', 'turn_count', 'interruptions'}, ...]
+        """
+        import json
+
+        conditions = []
+        params = self._speaker_stats_params()
+        if accessible_meeting_ids is not None:
+            conditions.append("m.meeting_id IN (SELECT value FROM json_each(:meeting_ids))")
+            params["meeting_ids"] = json.dumps(list(accessible_meeting_ids))
+        if date_from:
+            conditions.append("m.meeting_date >= :date_from")
+            params["date_from"] = date_from
+        if date_to:
+            conditions.append("m.meeting_date < date(:date_to, '+1 day')")
+            params["date_to"] = date_to
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        period = "NULL"
+        if interval:
+            period = f"substr(m.meeting_date, 1, {self.SPEAKER_STATS_INTERVALS[interval]})"
+
+        conn = self._get_connection()
+        try:
+            # 수정으로 무효화된 회의의 통계는 저장하지 않고 집계 쿼리 안에서 계산
+            rows = conn.execute(f"""
+                SELECT s.speaker_label,
+                       {period} AS period,
+                       COUNT(DISTINCT s.meeting_id) AS meeting_count,
+                       ROUND(SUM(s.talk_seconds), 3) AS talk_seconds,
+                       SUM(s.char_count) AS char_count,
+                       SUM(s.segment_count) AS segment_count,
+                       SUM(s.turn_count) AS turn_count,
+                       SUM(s.interruptions) AS interruptions
+                FROM (
+                    SELECT {self.SPEAKER_STATS_COLUMNS} FROM meeting_speaker_stats
+                    UNION ALL
+                    {self.SPEAKER_STATS_SQL.format(where=self.SPEAKER_STATS_MISSING_WHERE)}
+                ) s
+                JOIN meetings m ON m.meeting_id = s.meeting_id
+                {where}
+                GROUP BY s.speaker_label, period
+                ORDER BY period, talk_seconds DESC
+            """, params).fetchall()
+            return [dict(row) for row in rows]
+        finally:
+            conn.close()
+
     def save_minutes(self, meeting_id, title, meeting_date, minutes_content, owner_id=None):
         """
         생성된 회의록을 데이터베이스에 저장합니다.
@@ -238,45 +1159,166 @@ class DatabaseManager:
         conn = self._get_connection()
         cursor = conn.cursor()
 
-        # meeting_minutes 테이블이 없으면 생성
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS meeting_minutes (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                meeting_id TEXT UNIQUE NOT NULL,
-                title TEXT,
-                meeting_date TEXT,
-                minutes_content TEXT NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                owner_id INTEGER
-            )
-        """)
-
         created_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         # 기존 회의록이 있는지 확인
         cursor.execute("SELECT meeting_id FROM meeting_minutes WHERE meeting_id = ?", (meeting_id,))
         existing = cursor.fetchone()
 
-        if existing:
-            # 기존 회의록 업데이트
-            cursor.execute("""
-                UPDATE meeting_minutes
-                SET title = ?, meeting_date = ?, minutes_content = ?, updated_at = ?, owner_id = ?
-                WHERE meeting_id = ?
-            """, (title, meeting_date, minutes_content, created_at, owner_id, meeting_id))
-            logger.info(f"✅ 회의록 업데이트 완료: meeting_id={meeting_id}, owner_id={owner_id}")
-        else:
-            # 새 회의록 저장
-            cursor.execute("""
-                INSERT INTO meeting_minutes (meeting_id, title, meeting_date, minutes_content, created_at, updated_at, owner_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """, (meeting_id, title, meeting_date, minutes_content, created_at, created_at, owner_id))
-            logger.info(f"✅ 회의록 저장 완료: meeting_id={meeting_id}, owner_id={owner_id}")
+        if existing:
+            # 기존 회의록 업데이트
+            cursor.execute("""
+                UPDATE meeting_minutes
+                SET title = ?, meeting_date = ?, minutes_content = ?, updated_at = ?, owner_id = ?
+                WHERE meeting_id = ?
+            """, (title, meeting_date, minutes_content, created_at, owner_id, meeting_id))
+            logger.info(f"✅ 회의록 업데이트 완료: meeting_id={meeting_id}, owner_id={owner_id}")
+        else:
+            # 새 회의록 저장
+            cursor.execute("""
+                INSERT INTO meeting_minutes (meeting_id, title, meeting_date, minutes_content, created_at, updated_at, owner_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (meeting_id, title, meeting_date, minutes_content, created_at, created_at, owner_id))
+            logger.info(f"✅ 회의록 저장 완료: meeting_id={meeting_id}, owner_id={owner_id}")
+
+        conn.commit()
+        conn.close()
+        return True
+
+    def save_summary(self, meeting_id, summary_content):
+        """
+        문단 요약 원문을 저장합니다.
+        - 전문 검색 인덱스는 트리거로 갱신
+        - 벡터 DB(meeting_subtopic) 반영은 같은 트랜잭션에서 대기열에 등록
+
+        Args:
+            meeting_id (str): 회의 ID
+            summary_content (str): 문단 요약 내용 (마크다운 형식)
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                INSERT INTO meeting_summaries (meeting_id, summary_content)
+                VALUES (?, ?)
+                ON CONFLICT(meeting_id) DO UPDATE SET
+                    summary_content = excluded.summary_content,
+                    updated_at = CURRENT_TIMESTAMP
+            """, (meeting_id, summary_content))
+            self._enqueue_vector_sync(cursor, meeting_id, 'index_subtopic')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_summary_by_meeting_id(self, meeting_id):
+        """저장된 문단 요약 원문 조회 (없으면 None)"""
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                "SELECT summary_content FROM meeting_summaries WHERE meeting_id = ?", (meeting_id,)
+            ).fetchone()
+            return row['summary_content'] if row else None
+        finally:
+            conn.close()
+
+    def search_notes(self, query, accessible_meeting_ids=None, meeting_id=None, sources=None, limit=20):
+        """
+        전사 세그먼트, 문단 요약, 회의록을 키워드로 검색합니다. (FTS5, 모델 호출 없음)
+
+        두 글자 이상 검색어는 2-gram 인덱스(MATCH, 검색어의 2-gram을 연속으로 포함)로 후보를 좁히고,
+        본문 부분 일치(instr)로 확인합니다. 한 글자 검색어는 본문 부분 일치로만 찾습니다.
+
+        Args:
+            query (str): 검색어 (공백으로 구분된 모든 단어를 포함하는 결과)
+            accessible_meeting_ids (list, optional): 검색 허용 회의 ID 목록 (None이면 제한 없음 - Admin)
+            meeting_id (str, optional): 특정 회의로 한정
+            sources (list, optional): 검색 대상 ('segment', 'summary', 'minutes'), 기본값은 전체
+            limit (int): 최대 결과 수
+
+        Returns:
+            list: 검색 결과 dict 목록 (source_type, meeting_id, source_id, start_time, content, rank, title, meeting_date)
+        """
+        import json
+
+        terms = [term for term in query.split() if term]
+        if not terms:
+            return []
+
+        # 검색어 → 단어별 2-gram 구문 ("회의록" → "회의 의록"), 한 글자 단어만 있는 검색어는 인덱스 사용 안 함
+        phrases = []
+        for term in terms:
+            for word in _FTS_WORD.findall(term):
+                if len(word) >= 2:
+                    phrases.append('"' + fts_bigrams(word) + '"')
+        match_expr = " AND ".join(phrases)
 
-        conn.commit()
-        conn.close()
-        return True
+        selects = []
+        params = []
+        for source_type in (sources or self.SEARCH_SOURCES.keys()):
+            fts_table, content_table, rowid_column, text_column = self.SEARCH_SOURCES[source_type]
+            start_time = "c.start_time" if source_type == "segment" else "NULL"
+
+            conditions = []
+            source_params = []
+            if match_expr:
+                conditions.append(f"{fts_table} MATCH ?")
+                source_params.append(match_expr)
+            # 2-gram이 단어 경계를 넘어 이어진 경우 등을 걸러내도록 원문에서 다시 확인 (대소문자 무시)
+            for term in terms:
+                conditions.append(f"instr(lower(c.{text_column}), lower(?)) > 0")
+                source_params.append(term)
+            if meeting_id:
+                conditions.append("c.meeting_id = ?")
+                source_params.append(meeting_id)
+            if accessible_meeting_ids is not None:
+                conditions.append("c.meeting_id IN (SELECT value FROM json_each(?))")
+                source_params.append(json.dumps(list(accessible_meeting_ids)))
+
+            if match_expr:
+                from_clause = f"{fts_table} JOIN {content_table} c ON c.{rowid_column} = {fts_table}.rowid"
+                rank = f"bm25({fts_table})"
+            else:
+                from_clause = f"{content_table} c"
+                rank = "0.0"
+
+            selects.append(f"""
+                SELECT * FROM (
+                    SELECT '{source_type}' AS source_type, c.meeting_id, c.{rowid_column} AS source_id,
+                           {start_time} AS start_time, c.{text_column} AS content, {rank} AS rank
+                    FROM {from_clause}
+                    WHERE {" AND ".join(conditions)}
+                    ORDER BY rank
+                    LIMIT ?
+                )
+            """)
+            params.extend(source_params + [limit])
+
+        conn = self._get_connection()
+        try:
+            rows = conn.execute(
+                " UNION ALL ".join(selects) + " ORDER BY rank LIMIT ?",
+                params + [limit]
+            ).fetchall()
+            results = [dict(row) for row in rows]
+
+            # 회의 제목/날짜 (결과에 포함된 회의만 조회)
+            meeting_ids = list({row['meeting_id'] for row in results})
+            headers = {}
+            if meeting_ids:
+                for row in conn.execute("""
+                    SELECT meeting_id, title, meeting_date
+                    FROM meetings
+                    WHERE meeting_id IN (SELECT value FROM json_each(?))
+                """, (json.dumps(meeting_ids),)):
+                    headers[row['meeting_id']] = row
+        finally:
+            conn.close()
+
+        for result in results:
+            header = headers.get(result['meeting_id'])
+            result['title'] = header['title'] if header else None
+            result['meeting_date'] = header['meeting_date'] if header else None
+        return results
 
     def get_minutes_by_meeting_id(self, meeting_id):
         """
@@ -292,12 +1334,6 @@ class DatabaseManager:
         conn = self._get_connection()
         cursor = conn.cursor()
 
-        # meeting_minutes 테이블이 없으면 None 반환
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_minutes'")
-        if not cursor.fetchone():
-            conn.close()
-            return None
-
         cursor.execute("""
             SELECT meeting_id, title, meeting_date, minutes_content, created_at, updated_at
             FROM meeting_minutes
@@ -336,8 +1372,13 @@ class DatabaseManager:
         if conditions:
             query += " WHERE " + " AND ".join(conditions)
 
+        # 세그먼트 일부만 삭제된 회의의 화자별 통계를 같은 트랜잭션에서 다시 계산
+        cursor.execute(query.replace("DELETE", "SELECT DISTINCT meeting_id", 1), tuple(params))
+        affected = [row['meeting_id'] for row in cursor.fetchall()]
+
         cursor.execute(query, tuple(params))
         deleted_rows = cursor.rowcount
+        self._refresh_speaker_stats(cursor, affected)
         conn.commit()
         conn.close()
 
@@ -346,138 +1387,326 @@ class DatabaseManager:
 
     def delete_meeting_by_id(self, meeting_id):
         """
-        meeting_id로 회의와 관련된 모든 데이터를 삭제합니다.
-        - meeting_dialogues 테이블에서 세그먼트 삭제
-        - meeting_minutes 테이블에서 회의록 삭제
-        - meeting_shares 테이블에서 공유 관계 삭제
+        meeting_id로 회의를 삭제합니다. (단일 DELETE, 하나의 트랜잭션)
+        - meetings 헤더 삭제 → 세그먼트, 회의록, 마인드맵, 공유, 요약, 미디어 정보, 권한은 외래 키로 연쇄 삭제
+        - 벡터 DB, 파일 정리는 트리거가 등록한 정리 대기열(meeting_tombstones)을 백그라운드 GC가 처리
 
         Args:
             meeting_id (str): 삭제할 회의 ID
 
         Returns:
-            dict: 삭제 전후 항목 수 정보
+            bool: 회의가 존재하여 삭제되었는지 여부
         """
         conn = self._get_connection()
-        cursor = conn.cursor()
+        try:
+            cursor = conn.execute("DELETE FROM meetings WHERE meeting_id = ?", (meeting_id,))
+            conn.commit()
+            deleted = cursor.rowcount > 0
+        finally:
+            conn.close()
 
-        logger.info(f"\n📊 [SQLite DB 삭제 검증 시작] meeting_id = {meeting_id}")
-        logger.info("=" * 70)
-
-        # 1. meeting_dialogues 삭제 전 개수 확인
-        cursor.execute("SELECT COUNT(*) as count FROM meeting_dialogues WHERE meeting_id = ?", (meeting_id,))
-        before_dialogues = cursor.fetchone()['count']
-        logger.info(f"[삭제 전] meeting_dialogues: {before_dialogues}개")
-
-        # 2. meeting_minutes 삭제 전 개수 확인
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_minutes'")
-        before_minutes = 0
-        if cursor.fetchone():
-            cursor.execute("SELECT COUNT(*) as count FROM meeting_minutes WHERE meeting_id = ?", (meeting_id,))
-            before_minutes = cursor.fetchone()['count']
-            logger.info(f"[삭제 전] meeting_minutes: {before_minutes}개")
-        else:
-            logger.info(f"[삭제 전] meeting_minutes: 테이블 없음")
-
-        # 3. meeting_shares 삭제 전 개수 확인
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_shares'")
-        before_shares = 0
-        if cursor.fetchone():
-            cursor.execute("SELECT COUNT(*) as count FROM meeting_shares WHERE meeting_id = ?", (meeting_id,))
-            before_shares = cursor.fetchone()['count']
-            logger.info(f"[삭제 전] meeting_shares: {before_shares}개")
-        else:
-            logger.info(f"[삭제 전] meeting_shares: 테이블 없음")
-
-        # 4. meeting_mindmap 삭제 전 개수 확인
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_mindmap'")
-        before_mindmap = 0
-        if cursor.fetchone():
-            cursor.execute("SELECT COUNT(*) as count FROM meeting_mindmap WHERE meeting_id = ?", (meeting_id,))
-            before_mindmap = cursor.fetchone()['count']
-            logger.info(f"[삭제 전] meeting_mindmap: {before_mindmap}개")
-        else:
-            logger.info(f"[삭제 전] meeting_mindmap: 테이블 없음")
-
-        logger.info("-" * 70)
-
-        # 4. meeting_dialogues에서 삭제 수행
-        cursor.execute("DELETE FROM meeting_dialogues WHERE meeting_id = ?", (meeting_id,))
-        deleted_dialogues = cursor.rowcount
-
-        # 5. meeting_minutes에서 삭제 수행
-        deleted_minutes = 0
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_minutes'")
-        if cursor.fetchone():
-            cursor.execute("DELETE FROM meeting_minutes WHERE meeting_id = ?", (meeting_id,))
-            deleted_minutes = cursor.rowcount
-
-        # 6. meeting_shares에서 삭제 수행
-        deleted_shares = 0
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_shares'")
-        if cursor.fetchone():
-            cursor.execute("DELETE FROM meeting_shares WHERE meeting_id = ?", (meeting_id,))
-            deleted_shares = cursor.rowcount
-
-        # 7. meeting_mindmap에서 삭제 수행
-        deleted_mindmap = 0
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_mindmap'")
-        if cursor.fetchone():
-            cursor.execute("DELETE FROM meeting_mindmap WHERE meeting_id = ?", (meeting_id,))
-            deleted_mindmap = cursor.rowcount
+        # 삭제된 회의가 캐시된 권한에 남지 않도록 무효화 (공유받은 사용자 전체)
+        from utils.access_control import access_control
+        access_control.invalidate()
 
-        conn.commit()
+        if deleted:
+            logger.info(f"🗑️ 회의 삭제 완료: meeting_id={meeting_id} (벡터/파일은 백그라운드 정리 대기)")
+        return deleted
+
+    def claim_tombstones(self, limit, lease_seconds):
+        """
+        처리 시각이 된 정리 대기열 항목을 가져옵니다.
+        가져간 항목은 lease_seconds 동안 다른 프로세스가 가져가지 않으며, 처리 중 종료되면 그 뒤에 다시 시도됩니다.
 
-        logger.info(f"[삭제 수행] meeting_dialogues: {deleted_dialogues}개 삭제")
-        logger.info(f"[삭제 수행] meeting_minutes: {deleted_minutes}개 삭제")
-        logger.info(f"[삭제 수행] meeting_shares: {deleted_shares}개 삭제")
-        logger.info(f"[삭제 수행] meeting_mindmap: {deleted_mindmap}개 삭제")
-
-        logger.info("-" * 70)
-
-        # 7. 삭제 후 검증
-        cursor.execute("SELECT COUNT(*) as count FROM meeting_dialogues WHERE meeting_id = ?", (meeting_id,))
-        after_dialogues = cursor.fetchone()['count']
-        logger.info(f"[삭제 후] meeting_dialogues: {after_dialogues}개 남음")
-
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_minutes'")
-        after_minutes = 0
-        if cursor.fetchone():
-            cursor.execute("SELECT COUNT(*) as count FROM meeting_minutes WHERE meeting_id = ?", (meeting_id,))
-            after_minutes = cursor.fetchone()['count']
-            logger.info(f"[삭제 후] meeting_minutes: {after_minutes}개 남음")
-
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_shares'")
-        after_shares = 0
-        if cursor.fetchone():
-            cursor.execute("SELECT COUNT(*) as count FROM meeting_shares WHERE meeting_id = ?", (meeting_id,))
-            after_shares = cursor.fetchone()['count']
-            logger.info(f"[삭제 후] meeting_shares: {after_shares}개 남음")
-
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_mindmap'")
-        after_mindmap = 0
-        if cursor.fetchone():
-            cursor.execute("SELECT COUNT(*) as count FROM meeting_mindmap WHERE meeting_id = ?", (meeting_id,))
-            after_mindmap = cursor.fetchone()['count']
-            logger.info(f"[삭제 후] meeting_mindmap: {after_mindmap}개 남음")
+        Args:
+            limit (int): 최대 항목 수
+            lease_seconds (float): 처리 예약 시간(초)
 
-        conn.close()
+        Returns:
+            list: [{'id', 'meeting_id', 'audio_file', 'media', 'attempts'}, ...]
+        """
+        import time
 
-        # 검증 결과
-        if after_dialogues == 0 and after_minutes == 0 and after_shares == 0 and after_mindmap == 0:
-            logger.info(f"✅ SQLite DB 삭제 검증 성공: 모든 데이터가 삭제되었습니다.")
-        else:
-            logger.warning(f"⚠️ SQLite DB 삭제 검증 실패: 일부 데이터가 남아있습니다!")
+        now = time.time()
+        conn = self._get_connection()
+        try:
+            rows = conn.execute("""
+                SELECT id, meeting_id, audio_file, media, attempts
+                FROM meeting_tombstones
+                WHERE next_attempt_at <= ?
+                ORDER BY id
+                LIMIT ?
+            """, (now, limit)).fetchall()
+
+            claimed = []
+            for row in rows:
+                cursor = conn.execute(
+                    "UPDATE meeting_tombstones SET next_attempt_at = ? WHERE id = ? AND next_attempt_at <= ?",
+                    (now + lease_seconds, row['id'], now)
+                )
+                if cursor.rowcount:
+                    claimed.append(dict(row))
+            conn.commit()
+            return claimed
+        finally:
+            conn.close()
+
+    def complete_tombstone(self, tombstone_id):
+        """정리가 끝난 대기열 항목 삭제"""
+        conn = self._get_connection()
+        try:
+            conn.execute("DELETE FROM meeting_tombstones WHERE id = ?", (tombstone_id,))
+            conn.commit()
+        finally:
+            conn.close()
 
-        logger.info("=" * 70)
+    def fail_tombstone(self, tombstone_id, error, retry_at):
+        """
+        정리에 실패한 대기열 항목의 재시도 시각을 기록합니다.
 
-        return {
-            "dialogues": deleted_dialogues,
-            "minutes": deleted_minutes,
-            "shares": deleted_shares,
-            "mindmap": deleted_mindmap,
-            "before": {"dialogues": before_dialogues, "minutes": before_minutes, "shares": before_shares, "mindmap": before_mindmap},
-            "after": {"dialogues": after_dialogues, "minutes": after_minutes, "shares": after_shares, "mindmap": after_mindmap}
-        }
+        Args:
+            tombstone_id (int): 대기열 항목 ID
+            error (str): 오류 메시지
+            retry_at (float): 다음 시도 시각 (epoch seconds)
+        """
+        conn = self._get_connection()
+        try:
+            conn.execute("""
+                UPDATE meeting_tombstones
+                SET attempts = attempts + 1, last_error = ?, next_attempt_at = ?
+                WHERE id = ?
+            """, (str(error)[:1000], retry_at, tombstone_id))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def count_tombstones(self):
+        """정리 대기 중인 항목 수"""
+        conn = self._get_connection()
+        try:
+            return conn.execute("SELECT COUNT(*) AS count FROM meeting_tombstones").fetchone()['count']
+        finally:
+            conn.close()
+
+    # ==================== 벡터 DB 반영 대기열 (outbox) ====================
+
+    # 대기열 작업 종류 (모두 SQLite의 현재 상태를 읽어 반영하므로 여러 번 실행해도 결과가 같음)
+    # - index_chunks: 전사 세그먼트로 meeting_chunks 재생성
+    # - index_subtopic: 문단 요약으로 meeting_subtopic 재생성
+    # - sync_metadata: 제목/날짜 메타데이터 갱신
+    VECTOR_SYNC_OPERATIONS = ('index_chunks', 'index_subtopic', 'sync_metadata')
+
+    def _enqueue_vector_sync(self, cursor, meeting_id, operation):
+        """
+        호출한 쪽의 트랜잭션 안에서 벡터 DB 반영 작업을 등록합니다.
+        같은 회의/작업이 이미 대기 중이면 하나로 합치고 version을 올립니다.
+        (처리 중에 다시 등록되면 version이 달라져 완료 처리 후에도 한 번 더 실행됨)
+        """
+        if operation not in self.VECTOR_SYNC_OPERATIONS:
+            raise ValueError(f"Unknown vector sync operation: {operation}")
+        cursor.execute("""
+            INSERT INTO vector_outbox (meeting_id, operation)
+            VALUES (?, ?)
+            ON CONFLICT(meeting_id, operation) DO UPDATE SET
+                version = version + 1,
+                attempts = 0,
+                last_error = NULL,
+                next_attempt_at = 0
+        """, (meeting_id, operation))
+
+    def enqueue_vector_sync(self, entries):
+        """
+        벡터 DB 반영 작업을 등록합니다. (정합성 검사에서 발견한 불일치 복구용)
+
+        Args:
+            entries (list): [(meeting_id, operation), ...]
+
+        Returns:
+            int: 등록한 작업 수
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.cursor()
+            for meeting_id, operation in entries:
+                self._enqueue_vector_sync(cursor, meeting_id, operation)
+            conn.commit()
+            return len(entries)
+        finally:
+            conn.close()
+
+    def claim_vector_sync(self, limit, lease_seconds, meeting_id=None):
+        """
+        처리 시각이 된 벡터 DB 반영 작업을 가져옵니다.
+        가져간 작업은 lease_seconds 동안 다른 작업자가 가져가지 않습니다.
+
+        Args:
+            limit (int): 최대 작업 수
+            lease_seconds (float): 처리 예약 시간(초)
+            meeting_id (str, optional): 특정 회의의 작업만 가져오기 (업로드 직후 바로 반영할 때)
+
+        Returns:
+            list: [{'id', 'meeting_id', 'operation', 'version', 'attempts'}, ...]
+        """
+        import time
+
+        now = time.time()
+        conditions = ["next_attempt_at <= ?", "locked_until <= ?"]
+        params = [now, now]
+        if meeting_id is not None:
+            conditions.append("meeting_id = ?")
+            params.append(meeting_id)
+
+        conn = self._get_connection()
+        try:
+            rows = conn.execute(f"""
+                SELECT id, meeting_id, operation, version, attempts
+                FROM vector_outbox
+                WHERE {' AND '.join(conditions)}
+                ORDER BY id
+                LIMIT ?
+            """, params + [limit]).fetchall()
+
+            claimed = []
+            for row in rows:
+                cursor = conn.execute(
+                    "UPDATE vector_outbox SET locked_until = ? WHERE id = ? AND locked_until <= ?",
+                    (now + lease_seconds, row['id'], now)
+                )
+                if cursor.rowcount:
+                    claimed.append(dict(row))
+            conn.commit()
+            return claimed
+        finally:
+            conn.close()
+
+    def complete_vector_sync(self, entry_id, version):
+        """
+        반영이 끝난 작업을 삭제합니다.
+        처리 중에 같은 작업이 다시 등록되었으면(version 변경) 삭제하지 않고 바로 다시 처리되도록 둡니다.
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute("DELETE FROM vector_outbox WHERE id = ? AND version = ?", (entry_id, version))
+            if not cursor.rowcount:
+                conn.execute("UPDATE vector_outbox SET locked_until = 0 WHERE id = ?", (entry_id,))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def fail_vector_sync(self, entry_id, error, retry_at):
+        """
+        반영에 실패한 작업의 재시도 시각을 기록합니다.
+
+        Args:
+            entry_id (int): 작업 ID
+            error (str): 오류 메시지
+            retry_at (float): 다음 시도 시각 (epoch seconds)
+        """
+        conn = self._get_connection()
+        try:
+            conn.execute("""
+                UPDATE vector_outbox
+                SET attempts = attempts + 1, last_error = ?, next_attempt_at = ?, locked_until = 0
+                WHERE id = ?
+            """, (str(error)[:1000], retry_at, entry_id))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def count_vector_sync(self, meeting_id=None):
+        """반영 대기 중인 작업 수와 재시도 중인 작업 수 (meeting_id를 지정하면 해당 회의만)"""
+        conn = self._get_connection()
+        try:
+            row = conn.execute("""
+                SELECT COUNT(*) AS pending, COALESCE(SUM(attempts > 0), 0) AS failing
+                FROM vector_outbox
+                WHERE ? IS NULL OR meeting_id = ?
+            """, (meeting_id, meeting_id)).fetchone()
+            return dict(row)
+        finally:
+            conn.close()
+
+    def get_meeting_header(self, meeting_id):
+        """meetings 헤더 조회 (meeting_id, title, meeting_date, owner_id, audio_file), 없으면 None"""
+        conn = self._get_connection()
+        try:
+            row = conn.execute("""
+                SELECT meeting_id, title, meeting_date, owner_id, audio_file
+                FROM meetings
+                WHERE meeting_id = ?
+            """, (meeting_id,)).fetchone()
+            return dict(row) if row else None
+        finally:
+            conn.close()
+
+    def get_meeting_headers(self):
+        """모든 회의의 (meeting_id, title, meeting_date) 튜플 리스트 (셀프 쿼리 제목 인덱스용)"""
+        conn = self._get_connection()
+        try:
+            rows = conn.execute("SELECT meeting_id, title, meeting_date FROM meetings").fetchall()
+            return [tuple(row) for row in rows]
+        finally:
+            conn.close()
+
+    def get_vector_sync_snapshot(self, grace_seconds):
+        """
+        벡터 DB 정합성 검사에 필요한 SQLite 상태를 한 번에 조회합니다.
+
+        Args:
+            grace_seconds (float): 최근 생성된 회의 제외 기준(초) (STT 저장이 진행 중일 수 있음)
+
+        Returns:
+            dict: {
+                'meetings': {meeting_id: (title, meeting_date)},
+                'settled': 생성 후 grace_seconds가 지난 meeting_id 집합,
+                'summarized': 문단 요약이 있는 meeting_id 집합,
+                'pending': 대기 중인 (meeting_id, operation) 집합,
+                'tombstoned': 정리 대기 중인 meeting_id 집합
+            }
+        """
+        conn = self._get_connection()
+        try:
+            meetings = {}
+            settled = set()
+            for row in conn.execute("""
+                SELECT meeting_id, title, meeting_date,
+                       created_at <= strftime('%Y-%m-%d %H:%M:%f', 'now', ?) AS settled
+                FROM meetings
+            """, (f"-{int(grace_seconds)} seconds",)):
+                meetings[row['meeting_id']] = (row['title'] or "", row['meeting_date'] or "")
+                if row['settled']:
+                    settled.add(row['meeting_id'])
+
+            return {
+                'meetings': meetings,
+                'settled': settled,
+                'summarized': {row[0] for row in conn.execute("SELECT meeting_id FROM meeting_summaries")},
+                'pending': {(row[0], row[1]) for row in conn.execute("SELECT meeting_id, operation FROM vector_outbox")},
+                'tombstoned': {row[0] for row in conn.execute("SELECT meeting_id FROM meeting_tombstones")},
+            }
+        finally:
+            conn.close()
+
+    def enqueue_orphan_tombstones(self, meeting_ids):
+        """
+        SQLite에는 없고 벡터 DB에만 남은 회의를 정리 대기열에 등록합니다.
+
+        Args:
+            meeting_ids (list): 회의 ID 목록
+
+        Returns:
+            int: 등록한 항목 수
+        """
+        conn = self._get_connection()
+        try:
+            conn.executemany(
+                "INSERT INTO meeting_tombstones (meeting_id) VALUES (?)",
+                [(meeting_id,) for meeting_id in meeting_ids]
+            )
+            conn.commit()
+            return len(meeting_ids)
+        finally:
+            conn.close()
 
     def get_audio_file_by_meeting_id(self, meeting_id):
         """
@@ -499,165 +1728,147 @@ class DatabaseManager:
             return row['audio_file']
         return None
 
-    def update_meeting_title(self, meeting_id, new_title):
+    def get_meeting_id_by_audio_file(self, audio_file):
         """
-        회의 제목을 업데이트합니다.
-        - ChromaDB: meeting_chunk, meeting_subtopic 컬렉션 메타데이터 업데이트
-        - meeting_dialogues: 해당 meeting_id의 모든 행 업데이트
-        - meeting_minutes: 해당 meeting_id의 제목 업데이트
+        오디오 파일명으로 meeting_id를 조회합니다. (/uploads 권한 확인용)
 
         Args:
-            meeting_id (str): 회의 ID
-            new_title (str): 새로운 제목
+            audio_file (str): 오디오 파일명
 
         Returns:
-            dict: 업데이트 결과 {'success': bool, 'updated_dialogues': int, 'updated_minutes': int, 'updated_vector': dict}
+            str or None: 회의 ID, 없으면 None
         """
-        # ChromaDB 업데이트 먼저 수행 (순환 참조 방지를 위한 lazy import)
-        from utils.vector_db_manager import vdb_manager
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT meeting_id FROM meeting_dialogues WHERE audio_file = ? LIMIT 1", (audio_file,))
+        row = cursor.fetchone()
+        conn.close()
 
-        # 1. ChromaDB 메타데이터 업데이트
-        vector_result = vdb_manager.update_metadata_title(meeting_id, new_title)
+        if row:
+            return row['meeting_id']
+        return None
 
-        if not vector_result['success']:
-            # ChromaDB 업데이트 실패 시 전체 실패 처리
-            logger.warning(f"⚠️ ChromaDB 업데이트 실패로 인해 SQLite 업데이트를 건너뜁니다.")
-            return {
-                'success': False,
-                'error': f"ChromaDB 업데이트 실패: {vector_result.get('error', '알 수 없는 오류')}",
-                'updated_dialogues': 0,
-                'updated_minutes': 0,
-                'updated_vector': vector_result
-            }
+    def save_meeting_media(self, meeting_id, **fields):
+        """
+        회의 미디어 정보를 저장(없으면 생성, 있으면 지정한 항목만 갱신)합니다.
 
-        # 2. SQLite 업데이트 (ChromaDB 성공 후)
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        Args:
+            meeting_id (str): 회의 ID
+            **fields: meeting_media 컬럼 값 (original_file, original_etag, peaks_file 등)
+        """
+        columns = [key for key in fields if key not in ("meeting_id", "created_at", "updated_at")]
+        if not columns:
+            return
+
+        placeholders = ", ".join("?" for _ in columns)
+        updates = ", ".join(f"{key} = excluded.{key}" for key in columns)
 
+        conn = self._get_connection()
         try:
-            # 2-1. meeting_dialogues 테이블 업데이트
-            cursor.execute("""
-                UPDATE meeting_dialogues
-                SET title = ?
-                WHERE meeting_id = ?
-            """, (new_title, meeting_id))
-            updated_dialogues = cursor.rowcount
+            conn.execute(f"""
+                INSERT INTO meeting_media (meeting_id, {", ".join(columns)})
+                VALUES (?, {placeholders})
+                ON CONFLICT(meeting_id) DO UPDATE SET {updates}, updated_at = CURRENT_TIMESTAMP
+            """, [meeting_id] + [fields[key] for key in columns])
+            conn.commit()
+        finally:
+            conn.close()
 
-            # 2-2. meeting_minutes 테이블 업데이트 (테이블이 존재하는 경우)
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_minutes'")
-            updated_minutes = 0
-            if cursor.fetchone():
-                cursor.execute("""
-                    UPDATE meeting_minutes
-                    SET title = ?,
-                        updated_at = ?
-                    WHERE meeting_id = ?
-                """, (new_title, datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"), meeting_id))
-                updated_minutes = cursor.rowcount
+    def get_meeting_media(self, meeting_id):
+        """
+        회의 미디어 정보를 조회합니다.
 
-            conn.commit()
+        Args:
+            meeting_id (str): 회의 ID
 
-            logger.info(f"✅ SQLite 제목 업데이트 완료: meeting_id={meeting_id}, dialogues={updated_dialogues}개, minutes={updated_minutes}개")
+        Returns:
+            dict or None: meeting_media 행, 없으면 None
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("SELECT * FROM meeting_media WHERE meeting_id = ?", (meeting_id,))
+        row = cursor.fetchone()
+        conn.close()
+        return dict(row) if row else None
 
-            return {
-                'success': True,
-                'updated_dialogues': updated_dialogues,
-                'updated_minutes': updated_minutes,
-                'updated_vector': vector_result
-            }
+    def update_meeting_title(self, meeting_id, new_title):
+        """
+        회의 제목을 업데이트합니다. (하나의 트랜잭션)
+        - meeting_dialogues: 해당 meeting_id의 모든 행 업데이트 (meetings 헤더는 트리거로 갱신)
+        - meeting_minutes: 해당 meeting_id의 제목 업데이트
+        - ChromaDB 메타데이터: 같은 트랜잭션에서 vector_outbox에 등록 → 백그라운드 작업이 반영
 
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"❌ SQLite 제목 업데이트 실패: {e}")
-            logger.warning(f"⚠️ ChromaDB는 이미 업데이트되었습니다. 데이터 불일치 발생!")
-            return {
-                'success': False,
-                'error': str(e),
-                'updated_dialogues': 0,
-                'updated_minutes': 0,
-                'updated_vector': vector_result
-            }
+        Args:
+            meeting_id (str): 회의 ID
+            new_title (str): 새로운 제목
 
-        finally:
-            conn.close()
+        Returns:
+            dict: 업데이트 결과 {'success': bool, 'updated_dialogues': int, 'updated_minutes': int, 'vector_sync': str}
+        """
+        return self._update_meeting_field(meeting_id, 'title', new_title, "제목")
 
     def update_meeting_date(self, meeting_id, new_date):
         """
-        회의 날짜를 업데이트합니다.
-        - ChromaDB: meeting_chunk, meeting_subtopic 컬렉션 메타데이터 업데이트
-        - meeting_dialogues: 해당 meeting_id의 모든 행 업데이트
+        회의 날짜를 업데이트합니다. (하나의 트랜잭션)
+        - meeting_dialogues: 해당 meeting_id의 모든 행 업데이트 (meetings 헤더는 트리거로 갱신)
         - meeting_minutes: 해당 meeting_id의 날짜 업데이트
+        - ChromaDB 메타데이터: 같은 트랜잭션에서 vector_outbox에 등록 → 백그라운드 작업이 반영
 
         Args:
             meeting_id (str): 회의 ID
             new_date (str): 새로운 날짜 (형식: "YYYY-MM-DD HH:MM:SS")
 
         Returns:
-            dict: 업데이트 결과 {'success': bool, 'updated_dialogues': int, 'updated_minutes': int, 'updated_vector': dict}
+            dict: 업데이트 결과 {'success': bool, 'updated_dialogues': int, 'updated_minutes': int, 'vector_sync': str}
         """
-        # ChromaDB 업데이트 먼저 수행 (순환 참조 방지를 위한 lazy import)
-        from utils.vector_db_manager import vdb_manager
-
-        # 1. ChromaDB 메타데이터 업데이트
-        vector_result = vdb_manager.update_metadata_date(meeting_id, new_date)
-
-        if not vector_result['success']:
-            # ChromaDB 업데이트 실패 시 전체 실패 처리
-            logger.warning(f"⚠️ ChromaDB 업데이트 실패로 인해 SQLite 업데이트를 건너뜁니다.")
-            return {
-                'success': False,
-                'error': f"ChromaDB 업데이트 실패: {vector_result.get('error', '알 수 없는 오류')}",
-                'updated_dialogues': 0,
-                'updated_minutes': 0,
-                'updated_vector': vector_result
-            }
+        return self._update_meeting_field(meeting_id, 'meeting_date', new_date, "날짜")
 
-        # 2. SQLite 업데이트 (ChromaDB 성공 후)
+    def _update_meeting_field(self, meeting_id, column, value, label):
+        """회의 제목/날짜 변경 공통 처리 (column은 'title' 또는 'meeting_date')"""
         conn = self._get_connection()
         cursor = conn.cursor()
 
         try:
-            # 2-1. meeting_dialogues 테이블 업데이트
-            cursor.execute("""
+            # 1. meeting_dialogues 테이블 업데이트
+            cursor.execute(f"""
                 UPDATE meeting_dialogues
-                SET meeting_date = ?
+                SET {column} = ?
                 WHERE meeting_id = ?
-            """, (new_date, meeting_id))
+            """, (value, meeting_id))
             updated_dialogues = cursor.rowcount
 
-            # 2-2. meeting_minutes 테이블 업데이트 (테이블이 존재하는 경우)
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_minutes'")
-            updated_minutes = 0
-            if cursor.fetchone():
-                cursor.execute("""
-                    UPDATE meeting_minutes
-                    SET meeting_date = ?,
-                        updated_at = ?
-                    WHERE meeting_id = ?
-                """, (new_date, datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"), meeting_id))
-                updated_minutes = cursor.rowcount
+            # 2. meeting_minutes 테이블 업데이트
+            cursor.execute(f"""
+                UPDATE meeting_minutes
+                SET {column} = ?,
+                    updated_at = ?
+                WHERE meeting_id = ?
+            """, (value, datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"), meeting_id))
+            updated_minutes = cursor.rowcount
+
+            # 3. ChromaDB 메타데이터 반영 예약 (SQLite 변경과 함께 커밋되므로 불일치가 남지 않음)
+            if updated_dialogues:
+                self._enqueue_vector_sync(cursor, meeting_id, 'sync_metadata')
 
             conn.commit()
 
-            logger.info(f"✅ SQLite 날짜 업데이트 완료: meeting_id={meeting_id}, dialogues={updated_dialogues}개, minutes={updated_minutes}개")
+            logger.info(f"✅ {label} 업데이트 완료: meeting_id={meeting_id}, dialogues={updated_dialogues}개, minutes={updated_minutes}개 (벡터 DB 반영 대기)")
 
             return {
                 'success': True,
                 'updated_dialogues': updated_dialogues,
                 'updated_minutes': updated_minutes,
-                'updated_vector': vector_result
+                'vector_sync': 'queued' if updated_dialogues else 'skipped'
             }
 
         except Exception as e:
             conn.rollback()
-            logger.error(f"❌ SQLite 날짜 업데이트 실패: {e}")
-            logger.warning(f"⚠️ ChromaDB는 이미 업데이트되었습니다. 데이터 불일치 발생!")
+            logger.error(f"❌ {label} 업데이트 실패: {e}")
             return {
                 'success': False,
                 'error': str(e),
                 'updated_dialogues': 0,
-                'updated_minutes': 0,
-                'updated_vector': vector_result
+                'updated_minutes': 0
             }
 
         finally:
@@ -677,16 +1888,6 @@ class DatabaseManager:
         conn = self._get_connection()
         cursor = conn.cursor()
 
-        # meeting_mindmap 테이블이 없으면 생성
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS meeting_mindmap (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                meeting_id TEXT UNIQUE NOT NULL,
-                mindmap_content TEXT NOT NULL,
-                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-
         created_at = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         # 기존 마인드맵이 있는지 확인
@@ -726,12 +1927,6 @@ class DatabaseManager:
         conn = self._get_connection()
         cursor = conn.cursor()
 
-        # 테이블 존재 여부 확인
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_mindmap'")
-        if not cursor.fetchone():
-            conn.close()
-            return None
-
         cursor.execute("SELECT mindmap_content FROM meeting_mindmap WHERE meeting_id = ?", (meeting_id,))
         row = cursor.fetchone()
         conn.close()
@@ -753,12 +1948,6 @@ class DatabaseManager:
         conn = self._get_connection()
         cursor = conn.cursor()
 
-        # 테이블 존재 여부 확인
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='meeting_mindmap'")
-        if not cursor.fetchone():
-            conn.close()
-            return 0
-
         cursor.execute("DELETE FROM meeting_mindmap WHERE meeting_id = ?", (meeting_id,))
         deleted_count = cursor.rowcount
         conn.commit()
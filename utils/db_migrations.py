@@ -0,0 +1,209 @@
+"""
+SQLite 스키마 마이그레이션
+- schema_version 테이블에 적용된 버전을 기록하고, 시작 시 아직 적용되지 않은 마이그레이션만 버전 순서대로 실행합니다.
+- 각 마이그레이션은 BEGIN IMMEDIATE 트랜잭션에서 실행되고 버전 기록과 함께 커밋됩니다.
+  여러 프로세스가 동시에 시작해도 먼저 쓰기 잠금을 잡은 프로세스만 적용하고, 나머지는 적용된 버전을 확인하고 건너뜁니다.
+- 대량 데이터 채우기는 MigrationContext.backfill()로 배치마다 커밋하여 쓰기 잠금을 오래 잡지 않습니다.
+  배치는 '아직 처리되지 않은 행'을 다시 조회하므로 중간에 중단되어도 다음 시작 때 이어서 처리됩니다.
+
+새 마이그레이션 추가 방법:
+    MIGRATIONS 끝에 다음 버전 번호로 Migration을 추가합니다. (적용된 마이그레이션은 수정하지 않음)
+    중단 후 다시 실행될 수 있으므로 IF NOT EXISTS 등으로 여러 번 실행해도 안전하게 작성합니다.
+"""
+import time
+import logging
+from dataclasses import dataclass
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class MigrationContext:
+    """마이그레이션 실행 환경 (연결, 커서, DatabaseManager)"""
+
+    def __init__(self, conn, db):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.db = db
+
+    def backfill(self, select_sql, apply_batch, params=(), batch_size=None):
+        """
+        대량 데이터를 배치 단위로 채웁니다. (배치마다 커밋하여 쓰기 잠금을 짧게 유지)
+
+        Args:
+            select_sql (str): 아직 처리되지 않은 행의 키를 조회하는 SQL (LIMIT는 자동으로 붙음)
+            apply_batch (callable): (cursor, keys) → 한 배치 처리
+            params (tuple): select_sql 파라미터
+            batch_size (int, optional): 배치 크기 (기본값: DB_MIGRATION_BATCH_SIZE)
+
+        Returns:
+            int: 처리한 키 수
+        """
+        from config import config
+        batch_size = batch_size or config.DB_MIGRATION_BATCH_SIZE
+
+        total = 0
+        previous = None
+        while True:
+            keys = [row[0] for row in self.conn.execute(f"{select_sql} LIMIT ?", (*params, batch_size))]
+            if not keys:
+                break
+            if keys == previous:
+                # 처리해도 조회 결과가 바뀌지 않는 행 (무한 반복 방지)
+                logger.warning(f"⚠️ 데이터 채우기가 진행되지 않아 중단합니다: {keys[:5]}")
+                break
+            previous = keys
+
+            apply_batch(self.cursor, keys)
+            self.conn.commit()
+            total += len(keys)
+
+            if len(keys) < batch_size:
+                break
+            # 배치 사이에 다른 요청의 쓰기가 잠금을 얻을 수 있도록 잠시 양보
+            time.sleep(config.DB_MIGRATION_BATCH_PAUSE_SECONDS)
+            self.conn.execute("BEGIN IMMEDIATE")
+
+        return total
+
+
+@dataclass(frozen=True)
+class Migration:
+    """버전이 붙은 스키마 변경 1건"""
+    version: int
+    name: str
+    apply: Callable[[MigrationContext], None]
+
+
+# ==================== 마이그레이션 목록 ====================
+
+def _baseline(ctx):
+    """
+    v1 기준 스키마: 테이블, 트리거, 전문 검색 인덱스, 기본 인덱스
+    schema_version 도입 이전의 DB도 이 단계부터 적용되며, 이미 있는 객체는 그대로 두고 빠진 것만 만듭니다.
+    """
+    ctx.db._create_base_schema(ctx.cursor)
+
+
+def _add_lookup_indexes(ctx):
+    """회의록 조회(meeting_id), 공유받은 회의 조회(shared_with_user_id) 인덱스"""
+    ctx.cursor.execute("CREATE INDEX IF NOT EXISTS idx_minutes_meeting ON meeting_minutes(meeting_id)")
+    ctx.cursor.execute("CREATE INDEX IF NOT EXISTS idx_shares_shared_with ON meeting_shares(shared_with_user_id)")
+
+
+def _backfill_speaker_stats(ctx):
+    """화자별 통계가 없는 회의의 통계를 배치 단위로 계산"""
+    ctx.backfill(
+        """
+        SELECT meeting_id FROM meetings
+        WHERE meeting_id NOT IN (SELECT meeting_id FROM meeting_speaker_stats)
+        ORDER BY meeting_id
+        """,
+        ctx.db._refresh_speaker_stats
+    )
+
+
+def _guard_deleted_meetings(ctx):
+    """처리 중에 삭제된 회의가 STT 중간 저장으로 되살아나지 않도록 세그먼트 추가 트리거 앞에 검사 추가"""
+    ctx.db._create_deleted_meeting_guard(ctx.cursor)
+
+
+def _rebuild_search_index_as_bigrams(ctx):
+    """전문 검색 인덱스를 trigram에서 2-gram으로 교체 (두 글자 검색어도 인덱스로 검색)"""
+    ctx.db._rebuild_search_index_as_bigrams(ctx.cursor)
+
+
+def _add_access_versions(ctx):
+    """권한 캐시를 프로세스 간에 무효화하기 위한 사용자별 권한 버전"""
+    ctx.db._create_access_versions(ctx.cursor)
+
+
+def _bump_updated_at_on_ingest_finish(ctx):
+    """STT 중간 저장마다 회의가 변경분에 다시 나타나지 않도록 세그먼트 추가 트리거에서 updated_at 갱신 제거"""
+    ctx.db._recreate_dialogue_insert_trigger(ctx.cursor)
+
+
+MIGRATIONS = (
+    Migration(1, "baseline", _baseline),
+    Migration(2, "add_minutes_and_shares_lookup_indexes", _add_lookup_indexes),
+    Migration(3, "backfill_speaker_stats", _backfill_speaker_stats),
+    Migration(4, "guard_deleted_meetings", _guard_deleted_meetings),
+    Migration(5, "rebuild_search_index_as_bigrams", _rebuild_search_index_as_bigrams),
+    Migration(6, "add_access_versions", _add_access_versions),
+    Migration(7, "bump_updated_at_on_ingest_finish", _bump_updated_at_on_ingest_finish),
+)
+
+
+# ==================== 실행 ====================
+
+def _ensure_version_table(conn):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            applied_at TEXT DEFAULT (datetime('now', 'localtime')),
+            duration_ms INTEGER
+        )
+    """)
+    conn.commit()
+
+
+def get_schema_version(conn):
+    """
+    적용된 최신 스키마 버전을 조회합니다.
+
+    Returns:
+        int: 적용된 최대 버전 (없으면 0)
+    """
+    _ensure_version_table(conn)
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def run_migrations(conn, db):
+    """
+    아직 적용되지 않은 마이그레이션을 버전 순서대로 실행합니다.
+
+    Args:
+        conn: SQLite 연결 (외래 키 검사는 호출한 쪽에서 비활성화)
+        db: DatabaseManager 인스턴스 (기준 스키마 생성 등 내부 메서드 사용)
+
+    Returns:
+        list: 이번에 적용한 버전 목록
+    """
+    current = get_schema_version(conn)
+    latest = MIGRATIONS[-1].version
+    if current > latest:
+        logger.warning(f"⚠️ DB 스키마 버전(v{current})이 코드가 아는 최신 버전(v{latest})보다 높습니다. 새 버전의 코드로 실행하세요.")
+        return []
+
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version <= current:
+            continue
+
+        # 쓰기 잠금을 먼저 잡고 다시 확인 (다른 프로세스가 이미 적용했을 수 있음)
+        conn.execute("BEGIN IMMEDIATE")
+        already = conn.execute(
+            "SELECT 1 FROM schema_version WHERE version = ?", (migration.version,)
+        ).fetchone()
+        if already:
+            conn.rollback()
+            continue
+
+        started = time.monotonic()
+        try:
+            migration.apply(MigrationContext(conn, db))
+            conn.execute(
+                "INSERT INTO schema_version (version, name, duration_ms) VALUES (?, ?, ?)",
+                (migration.version, migration.name, int((time.monotonic() - started) * 1000))
+            )
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"❌ 마이그레이션 실패: v{migration.version} {migration.name} - {e}")
+            raise
+
+        applied.append(migration.version)
+        logger.info(f"✅ 마이그레이션 적용: v{migration.version} {migration.name} ({time.monotonic() - started:.2f}초)")
+
+    return applied
@@ -0,0 +1,311 @@
+"""
+ffmpeg 실행 관리 모듈
+- 동시에 실행되는 ffmpeg 프로세스 수를 제한합니다 (CPU 과점유 방지).
+- `-progress pipe:1` 출력을 파싱해 진행률 콜백을 호출합니다 (SSE 진행 상황 표시용).
+- 프로세스 우선순위(nice)와 스레드 수를 제한합니다.
+- job_id(meeting_id) 단위로 실행 중인 프로세스를 취소할 수 있습니다 (클라이언트 연결 종료, 회의 삭제).
+- 파일 경로 대신 스트림(업로드 파일 등)을 stdin으로 전달할 수 있습니다.
+"""
+import logging
+import os
+import re
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_STDIN_CHUNK_SIZE = 64 * 1024
+
+
+class FFmpegError(RuntimeError):
+    """ffmpeg 실행 실패 (대기열 초과 포함)"""
+
+
+class FFmpegCancelled(RuntimeError):
+    """ffmpeg 작업이 취소된 경우 (클라이언트 연결 종료, 회의 삭제 등)"""
+
+
+@dataclass
+class FFmpegResult:
+    """ffmpeg 실행 결과"""
+    returncode: int
+    stderr: str
+    elapsed: float
+
+
+class FFmpegRunner:
+    """제한된 프로세스 풀로 ffmpeg를 실행하는 관리자 (Singleton 패턴)"""
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.max_processes = config.FFMPEG_MAX_PROCESSES
+        self.threads_per_process = config.FFMPEG_THREADS_PER_PROCESS
+        self.niceness = config.FFMPEG_NICENESS
+        self.queue_timeout = config.FFMPEG_QUEUE_TIMEOUT_SECONDS
+
+        self._slots = threading.BoundedSemaphore(self.max_processes)
+        self._lock = threading.Lock()
+        self._processes = {}   # job_id -> set(Popen)
+        self._cancelled = {}   # job_id -> 취소 시각
+        self._waiting = 0
+        self._running = 0
+
+        self._initialized = True
+        logger.info(f"✅ FFmpegRunner 초기화 완료 (최대 동시 실행: {self.max_processes}, "
+                    f"프로세스당 스레드: {self.threads_per_process}, nice: {self.niceness})")
+
+    def run(self, args, job_id=None, duration=None, on_progress=None, stdin_stream=None, timeout=None) -> FFmpegResult:
+        """
+        ffmpeg를 실행하고 완료될 때까지 기다립니다.
+
+        Args:
+            args (list): ffmpeg 인자 (마지막 요소는 출력 경로 또는 '-')
+            job_id (str, optional): 취소 단위 ID (보통 meeting_id)
+            duration (float, optional): 입력 길이(초). 없으면 ffmpeg 로그의 Duration으로 추정
+            on_progress (callable, optional): 진행 상황 콜백 (dict: out_seconds, percent, speed)
+            stdin_stream (file-like, optional): 입력으로 전달할 스트림 (args에서 '-i pipe:0' 사용)
+            timeout (float, optional): 최대 실행 시간(초). 기본값은 UPLOAD_TIMEOUT_SECONDS
+
+        Returns:
+            FFmpegResult: 종료 코드와 stderr
+
+        Raises:
+            FFmpegError: 대기열 대기 시간 초과
+            FFmpegCancelled: 작업이 취소된 경우
+            subprocess.TimeoutExpired: 실행 시간 초과
+        """
+        timeout = timeout or config.UPLOAD_TIMEOUT_SECONDS
+        command = self._build_command(args)
+
+        with self._lock:
+            self._waiting += 1
+        try:
+            acquired = self._slots.acquire(timeout=self.queue_timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        if not acquired:
+            raise FFmpegError("ffmpeg 작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+
+        try:
+            if self.is_cancelled(job_id):
+                raise FFmpegCancelled(f"취소된 작업입니다: {job_id}")
+            return self._execute(command, job_id, duration, on_progress, stdin_stream, timeout)
+        finally:
+            self._slots.release()
+
+    def cancel(self, job_id) -> bool:
+        """
+        job_id로 실행 중인(또는 대기 중인) ffmpeg 작업을 취소합니다.
+
+        Args:
+            job_id (str): 작업 ID (meeting_id)
+
+        Returns:
+            bool: 실행 중인 프로세스를 종료했는지 여부
+        """
+        if not job_id:
+            return False
+
+        with self._lock:
+            self._prune_cancelled()
+            self._cancelled[job_id] = time.time()
+            processes = list(self._processes.get(job_id, ()))
+
+        for process in processes:
+            if process.poll() is None:
+                process.terminate()
+
+        if processes:
+            logger.info(f"🛑 ffmpeg 작업 취소: {job_id} ({len(processes)}개 프로세스)")
+        return bool(processes)
+
+    def is_cancelled(self, job_id) -> bool:
+        if not job_id:
+            return False
+        with self._lock:
+            return job_id in self._cancelled
+
+    def get_stats(self) -> dict:
+        """현재 실행/대기 중인 ffmpeg 작업 수 (관리자 모니터링용)"""
+        with self._lock:
+            return {
+                "max_processes": self.max_processes,
+                "running": self._running,
+                "waiting": self._waiting,
+                "jobs": sorted(job_id for job_id, procs in self._processes.items() if procs),
+            }
+
+    # ==================== 내부 구현 ====================
+
+    def _build_command(self, args):
+        """진행률 출력, 스레드 제한 옵션을 붙인 ffmpeg 명령어 생성"""
+        args = list(args)
+        output = args.pop() if args else "-"
+        return (
+            ["ffmpeg", "-hide_banner", "-nostats", "-progress", "pipe:1",
+             "-filter_threads", str(self.threads_per_process)]
+            + args
+            + ["-threads", str(self.threads_per_process), output]
+        )
+
+    def _preexec(self):
+        # 자식 프로세스에서 실행: 웹 요청 처리보다 낮은 우선순위
+        try:
+            os.nice(self.niceness)
+        except OSError:
+            pass
+
+    def _execute(self, command, job_id, duration, on_progress, stdin_stream, timeout):
+        started = time.time()
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE if stdin_stream is not None else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            preexec_fn=self._preexec if os.name == "posix" and self.niceness else None,
+        )
+        self._register(job_id, process)
+
+        stderr_lines = []
+        state = {"duration": duration, "timed_out": False}
+
+        def drain_stderr():
+            for raw in process.stderr:
+                line = raw.decode("utf-8", errors="ignore")
+                stderr_lines.append(line)
+                if state["duration"] is None:
+                    match = _DURATION_RE.search(line)
+                    if match:
+                        hours, minutes, seconds = match.groups()
+                        state["duration"] = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+        def feed_stdin():
+            try:
+                while True:
+                    chunk = stdin_stream.read(_STDIN_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    process.stdin.write(chunk)
+            except (BrokenPipeError, ValueError, OSError):
+                # ffmpeg가 먼저 종료된 경우 (오류/취소)
+                pass
+            finally:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+
+        def on_timeout():
+            state["timed_out"] = True
+            process.kill()
+
+        helpers = [threading.Thread(target=drain_stderr, daemon=True)]
+        if stdin_stream is not None:
+            helpers.append(threading.Thread(target=feed_stdin, daemon=True))
+        for helper in helpers:
+            helper.start()
+
+        watchdog = threading.Timer(timeout, on_timeout)
+        watchdog.daemon = True
+        watchdog.start()
+
+        try:
+            self._read_progress(process, state, on_progress)
+            returncode = process.wait()
+        finally:
+            watchdog.cancel()
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            for helper in helpers:
+                helper.join(timeout=5)
+            self._unregister(job_id, process)
+
+        stderr = "".join(stderr_lines)
+
+        if state["timed_out"]:
+            raise subprocess.TimeoutExpired(command, timeout, stderr=stderr)
+        if self.is_cancelled(job_id):
+            raise FFmpegCancelled(f"취소된 작업입니다: {job_id}")
+
+        return FFmpegResult(returncode=returncode, stderr=stderr, elapsed=time.time() - started)
+
+    @staticmethod
+    def _read_progress(process, state, on_progress):
+        """`-progress pipe:1`의 key=value 블록을 읽어 진행 상황 콜백을 호출합니다."""
+        block = {}
+        for raw in process.stdout:
+            line = raw.decode("utf-8", errors="ignore").strip()
+            if "=" not in line:
+                continue
+            key, value = line.split("=", 1)
+            block[key] = value
+
+            if key != "progress":
+                continue
+
+            if on_progress:
+                # out_time_us와 out_time_ms 모두 마이크로초 단위 (ffmpeg 호환성)
+                raw_time = block.get("out_time_us") or block.get("out_time_ms") or "0"
+                try:
+                    out_seconds = max(int(raw_time), 0) / 1_000_000
+                except ValueError:
+                    out_seconds = 0.0
+
+                total = state["duration"]
+                percent = None
+                if value == "end":
+                    percent = 100.0
+                elif total:
+                    percent = round(min(out_seconds / total * 100, 99.9), 1)
+
+                try:
+                    on_progress({
+                        "out_seconds": round(out_seconds, 1),
+                        "percent": percent,
+                        "speed": block.get("speed", "").strip(),
+                    })
+                except Exception as e:
+                    logger.warning(f"⚠️ ffmpeg 진행률 콜백 오류: {e}")
+            block = {}
+
+    def _register(self, job_id, process):
+        with self._lock:
+            self._running += 1
+            if job_id:
+                self._processes.setdefault(job_id, set()).add(process)
+
+    def _unregister(self, job_id, process):
+        with self._lock:
+            self._running -= 1
+            if job_id:
+                procs = self._processes.get(job_id)
+                if procs is not None:
+                    procs.discard(process)
+                    if not procs:
+                        del self._processes[job_id]
+
+    def _prune_cancelled(self):
+        # 오래된 취소 기록 정리 (lock 보유 상태에서 호출)
+        cutoff = time.time() - config.UPLOAD_TIMEOUT_SECONDS
+        for job_id in [job_id for job_id, ts in self._cancelled.items() if ts < cutoff]:
+            del self._cancelled[job_id]
+
+
+# 싱글톤 인스턴스
+ffmpeg_runner = FFmpegRunner()
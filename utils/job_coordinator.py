@@ -0,0 +1,352 @@
+"""
+LLM 작업 중복 실행 방지 (Single-flight) 모듈
+- 동일한 (meeting_id, job_type, content_version) 작업이 동시에 요청되면 하나만 실행합니다.
+- 요청 스레드의 후속 요청(wait=False)은 기다리지 않고 JobInProgress를 받아 202 응답 후 get_status()로 결과를 폴링합니다.
+  백그라운드 처리(wait=True)는 진행 중인 작업의 결과를 그대로 기다립니다.
+- SQLite 리스(lease) 테이블을 사용하므로 여러 워커 프로세스 사이에서도 동작합니다.
+- DB 연결은 처음 사용할 때 만듭니다. (services 컨테이너에 지연 초기화 서비스로 등록)
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+import uuid
+
+from config import config
+from utils.service_container import services
+
+logger = logging.getLogger(__name__)
+
+
+class JobFailedError(RuntimeError):
+    """다른 요청(리더)이 실행한 작업이 실패한 경우"""
+
+
+class JobWaitTimeout(TimeoutError):
+    """진행 중인 작업의 결과를 기다리다 시간이 초과된 경우"""
+
+
+class JobInProgress(RuntimeError):
+    """동일한 작업이 다른 요청에서 진행 중인 경우 (wait=False, 결과는 get_status()로 폴링)"""
+
+    def __init__(self, meeting_id, job_type, content_version):
+        super().__init__(f"진행 중인 작업이 있습니다: {meeting_id}:{job_type}:{content_version}")
+        self.meeting_id = meeting_id
+        self.job_type = job_type
+        self.content_version = content_version
+
+
+def make_content_version(*parts) -> str:
+    """
+    작업 입력 내용으로부터 버전 문자열을 생성합니다.
+    입력(제목, 스크립트 등)이 바뀌면 다른 작업으로 취급됩니다.
+
+    Args:
+        *parts: 버전 계산에 사용할 값들
+
+    Returns:
+        str: 16자리 해시 문자열
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(str(part if part is not None else "").encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()[:16]
+
+
+class _Flight:
+    """프로세스 내부에서 진행 중인 작업 하나 (리더의 결과를 팔로워에게 전달)"""
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._result = None
+        self._error = None
+
+    def set_result(self, result):
+        self._result = result
+        self._event.set()
+
+    def set_error(self, error):
+        self._error = error
+        self._event.set()
+
+    def wait(self, timeout):
+        if not self._event.wait(timeout):
+            raise JobWaitTimeout("진행 중인 작업의 결과를 기다리다 시간이 초과되었습니다.")
+        if self._error is not None:
+            raise JobFailedError(str(self._error))
+        return self._result
+
+
+class JobCoordinator:
+    """SQLite 리스 기반 Single-flight 작업 조정자 (Singleton 패턴)"""
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self, db_manager=None):
+        if self._initialized:
+            return
+
+        if db_manager is None:
+            from utils.db_manager import DatabaseManager
+            db_manager = DatabaseManager(str(config.DATABASE_PATH))
+
+        self.db = db_manager
+        self.lease_seconds = config.JOB_LEASE_SECONDS
+        self.wait_timeout = config.JOB_WAIT_TIMEOUT_SECONDS
+        self.poll_interval = config.JOB_POLL_INTERVAL_SECONDS
+        self.retention_seconds = config.JOB_RESULT_RETENTION_SECONDS
+
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+        self._initialized = True
+        logger.info("✅ JobCoordinator 초기화 완료")
+
+    @staticmethod
+    def _make_key(meeting_id, job_type, content_version):
+        return f"{meeting_id}:{job_type}:{content_version}"
+
+    def run(self, meeting_id: str, job_type: str, content_version: str, fn, wait: bool = True):
+        """
+        작업을 실행하거나, 이미 진행 중인 동일 작업이 있으면 그 결과를 기다립니다.
+
+        Args:
+            meeting_id (str): 회의 ID
+            job_type (str): 작업 종류 (예: 'summary', 'minutes')
+            content_version (str): 입력 내용 버전 (make_content_version 결과)
+            fn (callable): 실제 작업 함수 (인자 없음, JSON 직렬화 가능한 값 반환)
+            wait (bool): 진행 중인 작업이 있을 때 결과를 기다릴지 여부
+                         (요청 스레드에서는 False로 호출해 스레드를 붙잡지 않고 JobInProgress를 받음)
+
+        Returns:
+            fn의 반환값 (리더) 또는 리더가 저장한 결과 (팔로워)
+
+        Raises:
+            JobInProgress: wait=False이고 동일한 작업이 진행 중인 경우
+            JobFailedError: 리더의 작업이 실패한 경우
+            JobWaitTimeout: 결과 대기 시간이 초과된 경우
+        """
+        key = self._make_key(meeting_id, job_type, content_version)
+
+        # 1. 같은 프로세스 안의 중복 요청은 메모리에서 바로 합류
+        with self._lock:
+            flight = self._inflight.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight()
+                self._inflight[key] = flight
+
+        if not is_leader:
+            if not wait:
+                raise JobInProgress(meeting_id, job_type, content_version)
+            logger.info(f"🔗 진행 중인 작업에 합류합니다: {key}")
+            return flight.wait(self.wait_timeout)
+
+        try:
+            result = self._run_with_lease(key, meeting_id, job_type, content_version, fn, wait)
+            flight.set_result(result)
+            return result
+        except Exception as e:
+            flight.set_error(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def _run_with_lease(self, key, meeting_id, job_type, content_version, fn, wait):
+        """프로세스 간 리스를 획득해 실행하거나, 다른 프로세스의 결과를 기다립니다."""
+        deadline = time.time() + self.wait_timeout
+
+        while True:
+            acquired, token = self._try_acquire(key, meeting_id, job_type, content_version)
+
+            if acquired:
+                return self._execute_as_leader(key, token, fn)
+            if not wait:
+                raise JobInProgress(meeting_id, job_type, content_version)
+
+            logger.info(f"⏳ 다른 워커가 실행 중인 작업을 기다립니다: {key}")
+            outcome, value = self._wait_for_leader(key, token, deadline)
+            if outcome == "done":
+                return value
+            # outcome == "retry": 리스가 만료되었거나 교체됨 → 다시 획득 시도
+
+    def get_status(self, meeting_id: str, job_type: str, content_version: str):
+        """
+        작업 상태 조회 (JobInProgress를 받은 요청의 결과 폴링용)
+
+        Args:
+            meeting_id (str): 회의 ID
+            job_type (str): 작업 종류
+            content_version (str): 입력 내용 버전
+
+        Returns:
+            dict or None: {'status': 'running'/'done'/'failed'/'expired', 'result', 'error'}
+                          (기록이 없으면 None, 'expired'는 리더가 중단된 경우로 다시 요청해야 함)
+        """
+        conn = self.db._get_connection()
+        try:
+            row = conn.execute(
+                "SELECT status, result, error, expires_at FROM job_leases WHERE job_key = ?",
+                (self._make_key(meeting_id, job_type, content_version),)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        if not row:
+            return None
+
+        status = row['status']
+        if status == 'running' and row['expires_at'] <= time.time():
+            status = 'expired'
+        return {
+            "status": status,
+            "result": json.loads(row['result']) if status == 'done' and row['result'] is not None else None,
+            "error": row['error'],
+        }
+
+    def _try_acquire(self, key, meeting_id, job_type, content_version):
+        """
+        리스 획득 시도
+
+        Returns:
+            (acquired, owner_token): 획득 여부와 현재 리스 소유자 토큰
+        """
+        now = time.time()
+        conn = self.db._get_connection()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+
+            # 오래된 완료/실패 기록 정리
+            conn.execute(
+                "DELETE FROM job_leases WHERE status != 'running' AND updated_at < ?",
+                (now - self.retention_seconds,)
+            )
+
+            row = conn.execute(
+                "SELECT owner_token, status, expires_at FROM job_leases WHERE job_key = ?",
+                (key,)
+            ).fetchone()
+
+            if row and row['status'] == 'running' and row['expires_at'] > now:
+                conn.commit()
+                return False, row['owner_token']
+
+            token = uuid.uuid4().hex
+            conn.execute("""
+                INSERT OR REPLACE INTO job_leases
+                (job_key, meeting_id, job_type, content_version, owner_token, status, result, error, expires_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, 'running', NULL, NULL, ?, ?)
+            """, (key, meeting_id, job_type, content_version, token, now + self.lease_seconds, now))
+            conn.commit()
+            return True, token
+
+        except Exception:
+            conn.rollback()
+            raise
+
+        finally:
+            conn.close()
+
+    def _execute_as_leader(self, key, token, fn):
+        """리스를 보유한 상태로 작업을 실행하고 결과를 기록합니다."""
+        logger.info(f"🚀 작업 실행 (리더): {key}")
+
+        stop_event = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat,
+            args=(key, token, stop_event),
+            name=f"job-lease-{token[:8]}",
+            daemon=True
+        )
+        heartbeat.start()
+
+        try:
+            result = fn()
+        except Exception as e:
+            stop_event.set()
+            self._finish(key, token, status='failed', error=str(e))
+            raise
+        else:
+            stop_event.set()
+            self._finish(key, token, status='done', result=json.dumps(result, ensure_ascii=False))
+            return result
+
+    def _heartbeat(self, key, token, stop_event):
+        """작업이 끝날 때까지 리스 만료 시간을 주기적으로 연장합니다."""
+        interval = max(self.lease_seconds / 3.0, 1.0)
+        while not stop_event.wait(interval):
+            try:
+                conn = self.db._get_connection()
+                try:
+                    conn.execute(
+                        "UPDATE job_leases SET expires_at = ? WHERE job_key = ? AND owner_token = ? AND status = 'running'",
+                        (time.time() + self.lease_seconds, key, token)
+                    )
+                    conn.commit()
+                finally:
+                    conn.close()
+            except Exception as e:
+                logger.warning(f"⚠️ 작업 리스 연장 실패 ({key}): {e}")
+
+    def _finish(self, key, token, status, result=None, error=None):
+        """작업 결과를 리스 테이블에 기록합니다."""
+        try:
+            conn = self.db._get_connection()
+            try:
+                conn.execute("""
+                    UPDATE job_leases
+                    SET status = ?, result = ?, error = ?, updated_at = ?
+                    WHERE job_key = ? AND owner_token = ?
+                """, (status, result, error, time.time(), key, token))
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.warning(f"⚠️ 작업 결과 기록 실패 ({key}): {e}")
+
+    def _wait_for_leader(self, key, token, deadline):
+        """
+        다른 프로세스(리더)의 작업 완료를 폴링합니다.
+
+        Returns:
+            ('done', result) 또는 ('retry', None)
+        """
+        while time.time() < deadline:
+            time.sleep(self.poll_interval)
+
+            conn = self.db._get_connection()
+            try:
+                row = conn.execute(
+                    "SELECT owner_token, status, result, error, expires_at FROM job_leases WHERE job_key = ?",
+                    (key,)
+                ).fetchone()
+            finally:
+                conn.close()
+
+            if not row or row['owner_token'] != token:
+                return "retry", None
+
+            if row['status'] == 'done':
+                logger.info(f"✅ 다른 워커의 작업 결과를 재사용합니다: {key}")
+                return "done", json.loads(row['result']) if row['result'] is not None else None
+
+            if row['status'] == 'failed':
+                raise JobFailedError(row['error'] or "작업이 실패했습니다.")
+
+            if row['expires_at'] <= time.time():
+                logger.warning(f"⚠️ 작업 리스가 만료되었습니다. 작업을 인계받습니다: {key}")
+                return "retry", None
+
+        raise JobWaitTimeout("진행 중인 작업의 결과를 기다리다 시간이 초과되었습니다.")
+
+
+# 싱글톤 인스턴스 (처음 사용할 때 생성)
+job_coordinator = services.register("job_coordinator", JobCoordinator)
@@ -0,0 +1,352 @@
+"""
+Gemini 모델 라우팅 모듈
+- 작업(task)별 입력 크기와 지연시간 SLO를 기준으로 gemini-2.5-flash / gemini-2.5-pro 중 하나를 선택합니다.
+- 모델별 서킷 브레이커가 오류율/지연 급증을 감지하면 다른 모델로 자동 폴백합니다.
+- 모든 라우팅 결정은 예상 지연시간과 상대 비용과 함께 로그로 남깁니다.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+MODEL_FLASH = "gemini-2.5-flash"
+MODEL_PRO = "gemini-2.5-pro"
+
+# 입력 100만 토큰당 가격 (USD, 비용 비교용)
+MODEL_INPUT_COST = {
+    MODEL_FLASH: 0.30,
+    MODEL_PRO: 1.25,
+}
+
+# 작업별 정책
+# - unit: 입력 크기 단위 ('audio_seconds' 또는 'chars')
+# - default_model: 라우팅 비활성화 시 사용할 모델 (기존 동작)
+# - seconds_per_unit: 초기 지연시간 추정치 (관측값으로 갱신됨)
+TASK_POLICIES = {
+    "stt": {
+        "unit": "audio_seconds",
+        "default_model": MODEL_PRO,
+        "flash_max_units": config.ROUTING_STT_FLASH_MAX_AUDIO_SECONDS,
+        "slo_seconds": config.ROUTING_SLO_SECONDS["stt"],
+        "seconds_per_unit": {MODEL_FLASH: 0.05, MODEL_PRO: 0.15},
+    },
+    "summary": {
+        "unit": "chars",
+        "default_model": MODEL_PRO,
+        "flash_max_units": config.ROUTING_SUMMARY_FLASH_MAX_CHARS,
+        "slo_seconds": config.ROUTING_SLO_SECONDS["summary"],
+        "seconds_per_unit": {MODEL_FLASH: 0.0008, MODEL_PRO: 0.0025},
+    },
+    "minutes": {
+        "unit": "chars",
+        "default_model": MODEL_PRO,
+        "flash_max_units": config.ROUTING_MINUTES_FLASH_MAX_CHARS,
+        "slo_seconds": config.ROUTING_SLO_SECONDS["minutes"],
+        "seconds_per_unit": {MODEL_FLASH: 0.0008, MODEL_PRO: 0.0025},
+    },
+    "chat": {
+        "unit": "chars",
+        "default_model": MODEL_FLASH,
+        "flash_max_units": config.ROUTING_CHAT_FLASH_MAX_CHARS,
+        "slo_seconds": config.ROUTING_SLO_SECONDS["chat"],
+        "seconds_per_unit": {MODEL_FLASH: 0.0005, MODEL_PRO: 0.0015},
+    },
+}
+
+# 관측 지연시간 반영 비율 (EWMA)
+_EWMA_ALPHA = 0.3
+
+
+def _other_model(model: str) -> str:
+    return MODEL_FLASH if model == MODEL_PRO else MODEL_PRO
+
+
+class CircuitBreaker:
+    """
+    모델 하나에 대한 서킷 브레이커
+
+    최근 window 건 중 실패 또는 SLO 초과 비율이 임계값을 넘으면 OPEN 상태가 되어
+    cooldown 동안 요청을 차단합니다. cooldown 후에는 HALF_OPEN 상태로 한 건을 시험합니다.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name, window, min_requests, failure_rate_threshold, cooldown_seconds, clock=time.time):
+        self.name = name
+        self.min_requests = min_requests
+        self.failure_rate_threshold = failure_rate_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self._clock = clock  # 테스트에서 시계를 주입할 수 있도록 분리
+
+        self.state = self.CLOSED
+        self.opened_at = 0.0
+        self._outcomes = deque(maxlen=window)  # True = 정상, False = 실패/지연
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """현재 요청을 이 모델로 보내도 되는지 여부"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+
+            if self.state == self.OPEN:
+                if self._clock() - self.opened_at < self.cooldown_seconds:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+                logger.info(f"🟡 [서킷 브레이커] {self.name}: HALF_OPEN (시험 요청 허용)")
+
+            # HALF_OPEN: 한 번에 한 건만 시험
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def is_open(self) -> bool:
+        """cooldown 중인 OPEN 상태인지 여부 (상태 변경 없음)"""
+        with self._lock:
+            return self.state == self.OPEN and self._clock() - self.opened_at < self.cooldown_seconds
+
+    def record(self, healthy: bool):
+        """요청 결과 기록 (healthy=False: 오류 또는 SLO 초과)"""
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._trial_in_flight = False
+                if healthy:
+                    self.state = self.CLOSED
+                    self._outcomes.clear()
+                    logger.info(f"🟢 [서킷 브레이커] {self.name}: CLOSED (정상 복구)")
+                else:
+                    self._open()
+                return
+
+            self._outcomes.append(healthy)
+            if len(self._outcomes) >= self.min_requests:
+                failures = self._outcomes.count(False)
+                if failures / len(self._outcomes) >= self.failure_rate_threshold:
+                    self._open()
+
+    def _open(self):
+        self.state = self.OPEN
+        self.opened_at = self._clock()
+        logger.warning(f"🔴 [서킷 브레이커] {self.name}: OPEN ({self.cooldown_seconds}초 동안 차단)")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            total = len(self._outcomes)
+            return {
+                "state": self.state,
+                "recent_requests": total,
+                "recent_failure_rate": round(self._outcomes.count(False) / total, 3) if total else 0.0,
+            }
+
+
+@dataclass
+class RoutingDecision:
+    """라우팅 결정 결과 (로그 및 통계용)"""
+    task: str
+    primary: str
+    fallback: str
+    reason: str
+    units: float
+    unit: str
+    slo_seconds: float
+    estimated_seconds: float
+    relative_cost: float  # pro 대비 입력 비용 비율
+
+
+class ModelRouter:
+    """작업별 Gemini 모델 선택 및 폴백 관리 (Singleton 패턴)"""
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        self.enabled = config.MODEL_ROUTING_ENABLED
+        self.breakers = {
+            model: CircuitBreaker(
+                name=model,
+                window=config.CIRCUIT_BREAKER_WINDOW,
+                min_requests=config.CIRCUIT_BREAKER_MIN_REQUESTS,
+                failure_rate_threshold=config.CIRCUIT_BREAKER_FAILURE_RATE,
+                cooldown_seconds=config.CIRCUIT_BREAKER_COOLDOWN_SECONDS,
+            )
+            for model in (MODEL_FLASH, MODEL_PRO)
+        }
+
+        # (task, model) → 단위당 지연시간 추정치 (초)
+        self._seconds_per_unit = {
+            (task, model): value
+            for task, policy in TASK_POLICIES.items()
+            for model, value in policy["seconds_per_unit"].items()
+        }
+        self._recent_decisions = deque(maxlen=100)
+        self._lock = threading.Lock()
+
+        self._initialized = True
+        logger.info(f"✅ ModelRouter 초기화 완료 (라우팅 {'활성화' if self.enabled else '비활성화'})")
+
+    def estimate_seconds(self, task: str, model: str, units: float) -> float:
+        """관측 기반 예상 지연시간 (초)"""
+        with self._lock:
+            return self._seconds_per_unit[(task, model)] * max(units, 0)
+
+    def decide(self, task: str, units: float) -> RoutingDecision:
+        """
+        작업과 입력 크기로 주 모델/폴백 모델을 결정합니다.
+
+        Args:
+            task (str): 'stt', 'summary', 'minutes', 'chat'
+            units (float): 입력 크기 (stt: 오디오 길이(초), 나머지: 문자 수)
+
+        Returns:
+            RoutingDecision: 라우팅 결정
+        """
+        policy = TASK_POLICIES[task]
+        slo = policy["slo_seconds"]
+
+        if not self.enabled:
+            primary = policy["default_model"]
+            reason = "라우팅 비활성화 (기본 모델)"
+        elif units <= policy["flash_max_units"]:
+            primary = MODEL_FLASH
+            reason = f"짧은 입력 ({units:.0f} ≤ {policy['flash_max_units']} {policy['unit']})"
+        else:
+            primary = MODEL_PRO
+            reason = f"긴 입력 ({units:.0f} > {policy['flash_max_units']} {policy['unit']})"
+
+            # pro의 예상 지연이 SLO를 넘고 flash는 SLO 안이면 flash 선택
+            if (self.estimate_seconds(task, MODEL_PRO, units) > slo
+                    and self.estimate_seconds(task, MODEL_FLASH, units) <= slo):
+                primary = MODEL_FLASH
+                reason += f", pro 예상 지연이 SLO({slo}s) 초과 → flash"
+
+        fallback = _other_model(primary)
+
+        # 주 모델의 서킷이 열려 있으면 폴백 모델을 먼저 사용
+        if self.breakers[primary].is_open() and not self.breakers[fallback].is_open():
+            primary, fallback = fallback, primary
+            reason += f", {fallback} 서킷 OPEN → {primary}"
+
+        decision = RoutingDecision(
+            task=task,
+            primary=primary,
+            fallback=fallback,
+            reason=reason,
+            units=round(units, 1),
+            unit=policy["unit"],
+            slo_seconds=slo,
+            estimated_seconds=round(self.estimate_seconds(task, primary, units), 1),
+            relative_cost=round(MODEL_INPUT_COST[primary] / MODEL_INPUT_COST[MODEL_PRO], 2),
+        )
+
+        logger.info(
+            f"🧭 [모델 라우팅] task={task} → {decision.primary} (폴백: {decision.fallback}) | "
+            f"{decision.reason} | 예상 {decision.estimated_seconds}s / SLO {slo}s | "
+            f"입력 비용 pro 대비 ×{decision.relative_cost}"
+        )
+        return decision
+
+    def call(self, task: str, units: float, fn):
+        """
+        라우팅된 모델로 fn(model)을 호출하고, 실패 시 폴백 모델로 재시도합니다.
+
+        Args:
+            task (str): 작업 종류
+            units (float): 입력 크기
+            fn (callable): 모델 이름을 받아 API를 호출하는 함수
+
+        Returns:
+            fn의 반환값
+
+        Raises:
+            Exception: 모든 모델 호출이 실패한 경우 마지막 예외
+        """
+        decision = self.decide(task, units)
+        last_error = None
+
+        for model in (decision.primary, decision.fallback):
+            breaker = self.breakers[model]
+            if not breaker.allow():
+                logger.warning(f"⚠️ [모델 라우팅] {model} 서킷 차단 중 → 건너뜀")
+                continue
+
+            started = time.time()
+            try:
+                result = fn(model)
+            except Exception as e:
+                elapsed = time.time() - started
+                breaker.record(healthy=False)
+                self._record(decision, model, elapsed, ok=False)
+                logger.warning(f"⚠️ [모델 라우팅] {model} 호출 실패 ({elapsed:.1f}s): {e}")
+                last_error = e
+                continue
+
+            elapsed = time.time() - started
+            breaker.record(healthy=elapsed <= decision.slo_seconds)
+            self._learn_latency(task, model, units, elapsed)
+            self._record(decision, model, elapsed, ok=True)
+
+            logger.info(
+                f"⏱️ [모델 라우팅] task={task} model={model} 완료: {elapsed:.1f}s "
+                f"(예상 {decision.estimated_seconds}s, SLO {decision.slo_seconds}s)"
+            )
+            return result
+
+        if last_error is None:
+            last_error = RuntimeError(f"사용 가능한 모델이 없습니다 (task={task}, 모든 서킷 차단)")
+        raise last_error
+
+    def _learn_latency(self, task, model, units, elapsed):
+        """관측된 지연시간으로 단위당 지연 추정치 갱신"""
+        if units <= 0:
+            return
+        with self._lock:
+            key = (task, model)
+            observed = elapsed / units
+            self._seconds_per_unit[key] = (1 - _EWMA_ALPHA) * self._seconds_per_unit[key] + _EWMA_ALPHA * observed
+
+    def _record(self, decision, model, elapsed, ok):
+        entry = asdict(decision)
+        entry.update({
+            "model_used": model,
+            "elapsed_seconds": round(elapsed, 2),
+            "ok": ok,
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+        })
+        with self._lock:
+            self._recent_decisions.append(entry)
+
+    def get_stats(self) -> dict:
+        """서킷 상태, 지연 추정치, 최근 라우팅 결정 (관리자 확인용)"""
+        with self._lock:
+            estimates = {
+                f"{task}:{model}": round(value, 5)
+                for (task, model), value in self._seconds_per_unit.items()
+            }
+            recent = list(self._recent_decisions)
+
+        return {
+            "enabled": self.enabled,
+            "breakers": {model: breaker.snapshot() for model, breaker in self.breakers.items()},
+            "seconds_per_unit": estimates,
+            "recent_decisions": recent,
+        }
+
+
+# 싱글톤 인스턴스
+model_router = ModelRouter()
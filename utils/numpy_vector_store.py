@@ -0,0 +1,851 @@
+"""
+NumPy 벡터 저장소 (VECTOR_STORE_BACKEND=numpy)
+- 컬렉션마다 float32 행렬 파일 1개를 메모리 매핑(np.memmap)하고, 문서/메타데이터는 같은 폴더의 SQLite 파일에 저장합니다.
+- 임베딩은 저장할 때 정규화하므로 검색은 행렬-벡터 곱 한 번(코사인 유사도)이며, 수백~수천 개 청크는 1ms 안에 계산됩니다.
+- 행은 파티션 키(NUMPY_PARTITION_KEY, 기본값: meeting_id)별로 묶여 있어 회의로 제한한 검색은 해당 회의의 행만 계산합니다.
+- 메타데이터 필터(Chroma where 문법: $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte, $and, $or)는
+  메타데이터 필드별 정수 코드 배열을 만들어 NumPy 비교로 처리합니다.
+- 후보 행이 NUMPY_IVF_MIN_ROWS 이상이면 IVF(k-means 클러스터 중 쿼리와 가까운 NUMPY_IVF_NPROBE개만 탐색)로 근사 검색합니다.
+- 삭제된 행은 비워 두었다가(tombstone) 일정 수 이상 쌓이면 새 행렬 파일로 압축합니다.
+- 압축 인덱스(migrate_vector_index.py로 생성): float16/int8 양자화 또는 PCA/앞부분 차원(Matryoshka) 축소 행렬로 후보를 고르고,
+  상위 후보만 원본 float32 행으로 다시 계산합니다. 검색 중 메모리에 올라오는 것은 압축 행렬과 후보 행뿐입니다.
+- embedded Chroma와 마찬가지로 한 프로세스에서만 열어야 합니다. (여러 워커는 chroma 백엔드 + VECTOR_DB_MODE=http)
+"""
+import json
+import math
+import os
+import sqlite3
+import threading
+import time
+import logging
+from pathlib import Path
+
+import numpy as np
+
+from config import config
+from utils.vector_db_manager import VectorStore
+
+logger = logging.getLogger(__name__)
+
+DTYPE = np.float32
+ASSIGN_BATCH_ROWS = 65536  # IVF 클러스터 배정/압축 시 한 번에 읽는 행 수
+SCORE_BATCH_ROWS = 32768  # 압축 행렬을 float32로 풀어 계산할 때 한 번에 푸는 행 수
+FIT_SAMPLE_ROWS = 20000  # int8 범위/PCA 학습에 사용하는 최대 행 수
+
+# 압축 방식: 'none'(원본 float32만), 'float16', 'int8', 'pca'(학습한 주성분으로 축소), 'truncate'(앞 N차원, text-embedding-3 계열용)
+CODECS = ('none', 'float16', 'int8', 'pca', 'truncate')
+
+
+def _normalize(matrix):
+    """행(또는 벡터)을 단위 길이로 정규화 (길이 0인 행은 그대로)"""
+    matrix = np.asarray(matrix, dtype=DTYPE)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _relevance(cosine):
+    """
+    코사인 유사도 → relevance 점수
+    정규화된 임베딩에서 Chroma 기본 거리(l2 제곱 = 2 - 2cos)를 LangChain이 변환하는 값과 같은 척도입니다.
+    (백엔드를 바꿔도 score_threshold 설정을 그대로 사용)
+    """
+    return 1.0 - (2.0 - 2.0 * np.asarray(cosine, dtype=np.float64)) / math.sqrt(2)
+
+
+def _vocab_key(value):
+    # True == 1 이므로 bool은 따로 구분
+    return (isinstance(value, bool), value)
+
+
+def maximal_marginal_relevance(query, candidates, k, lambda_mult=0.5):
+    """
+    MMR 선택 (쿼리와 유사하면서 이미 고른 문서와는 덜 겹치는 순서)
+
+    Args:
+        query (np.ndarray): 정규화된 쿼리 벡터
+        candidates (np.ndarray): 정규화된 후보 행렬 (n x dim)
+        k (int): 선택할 개수
+        lambda_mult (float): 1에 가까울수록 유사도, 0에 가까울수록 다양성 우선
+
+    Returns:
+        list: 선택된 후보 인덱스 (선택 순서)
+    """
+    if len(candidates) == 0 or k <= 0:
+        return []
+
+    relevance = candidates @ query
+    selected = [int(np.argmax(relevance))]
+    max_similarity = candidates @ candidates[selected[0]]
+    while len(selected) < min(k, len(candidates)):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity
+        scores[selected] = -np.inf
+        index = int(np.argmax(scores))
+        selected.append(index)
+        max_similarity = np.maximum(max_similarity, candidates @ candidates[index])
+    return selected
+
+
+class NumpyVectorStore(VectorStore):
+    """메모리 매핑 행렬 기반 벡터 저장소 (컬렉션 1개 = 폴더 1개)"""
+    backend = 'numpy'
+
+    def __init__(self, directory, name, embedding_function, partition_key=None):
+        super().__init__(name, embedding_function)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.partition_key = partition_key or config.NUMPY_PARTITION_KEY
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.directory / "rows.sqlite3"), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rows (
+                row INTEGER PRIMARY KEY,
+                id TEXT NOT NULL UNIQUE,
+                document TEXT,
+                metadata TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS store_info (key TEXT PRIMARY KEY, value TEXT)")
+        self._conn.commit()
+
+        self._load()
+
+    # ==================== 로드 / 저장 ====================
+
+    def _load(self):
+        """SQLite에서 행 정보를 읽고 행렬 파일을 메모리 매핑"""
+        info = dict(self._conn.execute("SELECT key, value FROM store_info"))
+        self.dim = int(info['dim']) if 'dim' in info else None
+        self._vectors_file = info.get('vectors_file', 'vectors.0.f32')
+        # 행렬 파일에 기록이 끝난 행 수 (파일이 이보다 길면 커밋되지 않은 추가분이므로 무시)
+        self._row_count = int(info.get('row_count', 0))
+
+        self._ids = [None] * self._row_count
+        self._metadatas = [None] * self._row_count
+        self._id_to_row = {}
+        self._partitions = {}
+        for row, doc_id, metadata in self._conn.execute("SELECT row, id, metadata FROM rows ORDER BY row"):
+            self._set_row(row, doc_id, json.loads(metadata))
+
+        self._vectors = None
+        self._reset_ivf()
+        self._invalidate()
+        self._load_codec(info)
+
+        # 압축 도중 중단되어 남은 이전/미완성 파일 정리
+        current = {self._vectors_file, self._compressed_file, self._codec_params_file}
+        for pattern in ("vectors.*.f32", "compressed.*.bin", "codec.*.npz"):
+            for path in self.directory.glob(pattern):
+                if path.name not in current:
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+
+        logger.info(f"✅ NumpyVectorStore 로드: {self.name} ({len(self._id_to_row)}개, dim={self.dim}, 압축={self._codec})")
+        if self._codec != config.NUMPY_VECTOR_COMPRESSION:
+            logger.warning(
+                f"⚠️ {self.name}: 압축 설정({config.NUMPY_VECTOR_COMPRESSION})과 인덱스({self._codec})가 다릅니다. "
+                f"python migrate_vector_index.py로 변환하세요."
+            )
+
+    def _load_codec(self, info):
+        """압축 인덱스 정보 로드 (파일이 없으면 원본 행렬만 사용)"""
+        self._codec = info.get('codec', 'none')
+        self._compressed_file = info.get('compressed_file')
+        self._codec_params_file = info.get('codec_params_file')
+        self._codec_params = {}
+        self._compressed = None
+        if self._codec == 'none':
+            return
+
+        compressed_path = self.directory / (self._compressed_file or "")
+        params_path = self.directory / (self._codec_params_file or "")
+        if not compressed_path.is_file() or not params_path.is_file():
+            logger.warning(f"⚠️ {self.name}: 압축 인덱스 파일이 없어 원본 행렬로 검색합니다. (migrate_vector_index.py로 다시 생성)")
+            self._codec = 'none'
+            return
+        with np.load(params_path) as params:
+            self._codec_params = {key: params[key] for key in params.files}
+
+    def _set_row(self, row, doc_id, metadata):
+        self._ids[row] = doc_id
+        self._metadatas[row] = metadata
+        self._id_to_row[doc_id] = row
+        self._partitions.setdefault(metadata.get(self.partition_key), set()).add(row)
+
+    def _clear_row(self, row):
+        doc_id = self._ids[row]
+        metadata = self._metadatas[row]
+        self._ids[row] = None
+        self._metadatas[row] = None
+        self._id_to_row.pop(doc_id, None)
+        partition = metadata.get(self.partition_key)
+        rows = self._partitions.get(partition)
+        if rows is not None:
+            rows.discard(row)
+            if not rows:
+                del self._partitions[partition]
+
+    def _invalidate(self):
+        """쓰기 후 검색용 캐시(살아 있는 행, 파티션 배열, 필터 열) 초기화"""
+        self._alive = None
+        self._partition_arrays = {}
+        self._columns = {}
+
+    def _reset_ivf(self):
+        self._ivf_centroids = None
+        self._ivf_assign = None
+        self._ivf_trained_rows = 0
+
+    def _matrix(self):
+        """기록된 행 전체의 메모리 매핑 행렬 (처음 사용할 때 매핑)"""
+        if self._vectors is None and self._row_count:
+            self._vectors = np.memmap(
+                self.directory / self._vectors_file, dtype=DTYPE, mode='r', shape=(self._row_count, self.dim)
+            )
+        return self._vectors
+
+    @staticmethod
+    def _write_rows(path, start, rows):
+        """행 파일의 start번째 행 위치부터 기록 (이전에 커밋되지 않은 추가분은 덮어씀)"""
+        rows = np.ascontiguousarray(rows)
+        with open(path, 'r+b' if path.exists() else 'wb') as f:
+            f.seek(start * rows[0].nbytes)
+            f.write(rows.tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _save_info(self, **values):
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO store_info (key, value) VALUES (?, ?)",
+            [(key, str(value)) for key, value in values.items()]
+        )
+
+    # ==================== 쓰기 ====================
+
+    def add(self, ids, texts, metadatas=None, embeddings=None):
+        ids = list(ids)
+        if not ids:
+            return []
+        if len(set(ids)) != len(ids):
+            raise ValueError("같은 id가 중복되어 있습니다.")
+        texts = list(texts)
+        metadatas = [dict(metadata or {}) for metadata in (metadatas or [None] * len(ids))]
+        if embeddings is None:
+            embeddings = self.embedding_function.embed_documents(texts)
+        matrix = _normalize(embeddings)
+        if matrix.ndim != 2 or len(matrix) != len(ids):
+            raise ValueError(f"임베딩 개수가 문서 수와 다릅니다: {matrix.shape} (문서 {len(ids)}개)")
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = matrix.shape[1]
+            elif matrix.shape[1] != self.dim:
+                raise ValueError(f"임베딩 차원이 다릅니다: {matrix.shape[1]} (저장소: {self.dim})")
+
+            # 1. 행렬 파일 끝(기록된 행 다음)에 추가 (매핑을 해제한 뒤 쓰기)
+            start = self._row_count
+            self._vectors = None
+            path = self.directory / self._vectors_file
+            self._write_rows(path, start, matrix)
+            if self._codec != 'none':
+                self._compressed = None
+                self._write_rows(self.directory / self._compressed_file, start, self._encode(matrix))
+
+            # 2. 행 정보와 기록된 행 수를 한 트랜잭션으로 커밋 (같은 id가 있으면 이전 행을 교체)
+            replaced = [self._id_to_row[doc_id] for doc_id in ids if doc_id in self._id_to_row]
+            with self._conn:
+                self._conn.executemany("DELETE FROM rows WHERE row = ?", [(row,) for row in replaced])
+                self._conn.executemany(
+                    "INSERT INTO rows (row, id, document, metadata) VALUES (?, ?, ?, ?)",
+                    [
+                        (start + i, doc_id, text, json.dumps(metadata, ensure_ascii=False))
+                        for i, (doc_id, text, metadata) in enumerate(zip(ids, texts, metadatas))
+                    ]
+                )
+                self._save_info(dim=self.dim, vectors_file=self._vectors_file, row_count=start + len(ids))
+
+            # 3. 메모리 상태 반영
+            for row in replaced:
+                self._clear_row(row)
+            self._row_count = start + len(ids)
+            self._ids.extend([None] * len(ids))
+            self._metadatas.extend([None] * len(ids))
+            for i, (doc_id, metadata) in enumerate(zip(ids, metadatas)):
+                self._set_row(start + i, doc_id, metadata)
+            self._invalidate()
+            self._maybe_compact()
+
+        return ids
+
+    def delete(self, ids=None, where=None):
+        with self._lock:
+            rows = self._select_rows(ids, where)
+            if not rows.size:
+                return 0
+
+            with self._conn:
+                self._conn.executemany("DELETE FROM rows WHERE row = ?", [(int(row),) for row in rows])
+            for row in rows:
+                self._clear_row(int(row))
+            self._invalidate()
+            self._maybe_compact()
+            return int(rows.size)
+
+    def update_metadata(self, ids, metadatas):
+        with self._lock:
+            updates = []
+            for doc_id, metadata in zip(ids, metadatas):
+                row = self._id_to_row.get(doc_id)
+                if row is None:
+                    logger.warning(f"⚠️ 메타데이터를 업데이트할 문서가 없습니다: {doc_id}")
+                    continue
+                updates.append((row, doc_id, dict(metadata)))
+
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE rows SET metadata = ? WHERE row = ?",
+                    [(json.dumps(metadata, ensure_ascii=False), row) for row, _, metadata in updates]
+                )
+            for row, doc_id, metadata in updates:
+                self._clear_row(row)
+                self._set_row(row, doc_id, metadata)
+            self._invalidate()
+
+    def _maybe_compact(self):
+        """삭제된 행이 NUMPY_COMPACT_MIN_DEAD_ROWS 이상이고 전체의 절반을 넘으면 살아 있는 행만 새 파일로 복사"""
+        dead = self._row_count - len(self._id_to_row)
+        if dead < config.NUMPY_COMPACT_MIN_DEAD_ROWS or dead * 2 < self._row_count:
+            return
+
+        alive = self._alive_rows()
+        generation = int(self._vectors_file.split('.')[1]) + 1
+        new_file = f"vectors.{generation}.f32"
+        self._copy_rows(self._matrix(), alive, self.directory / new_file)
+        compressed_info = {}
+        if self._codec != 'none':
+            new_compressed = f"compressed.{os.urandom(4).hex()}.bin"
+            self._copy_rows(self._compressed_matrix(), alive, self.directory / new_compressed)
+            compressed_info['compressed_file'] = new_compressed
+
+        # 행 번호를 앞으로 당김 (오름차순으로 옮기면 새 번호가 항상 비어 있음)
+        with self._conn:
+            self._conn.executemany(
+                "UPDATE rows SET row = ? WHERE row = ?",
+                [(new_row, int(old_row)) for new_row, old_row in enumerate(alive) if new_row != old_row]
+            )
+            self._save_info(vectors_file=new_file, row_count=alive.size, **compressed_info)
+
+        old_files = [self._vectors_file]
+        self._vectors = None
+        self._vectors_file = new_file
+        if compressed_info:
+            old_files.append(self._compressed_file)
+            self._compressed = None
+            self._compressed_file = compressed_info['compressed_file']
+        self._row_count = int(alive.size)
+        self._ids = [self._ids[row] for row in alive]
+        self._metadatas = [self._metadatas[row] for row in alive]
+        self._id_to_row = {}
+        self._partitions = {}
+        for row, (doc_id, metadata) in enumerate(zip(self._ids, self._metadatas)):
+            self._set_row(row, doc_id, metadata)
+        self._reset_ivf()
+        self._invalidate()
+
+        self._remove_files(old_files)
+        logger.info(f"🗜️ NumpyVectorStore 압축: {self.name} (삭제된 행 {dead}개 제거, {self._row_count}개 유지)")
+
+    @staticmethod
+    def _copy_rows(source, rows, path):
+        """source 행렬에서 rows만 골라 새 파일로 저장"""
+        with open(path, 'wb') as f:
+            for begin in range(0, rows.size, ASSIGN_BATCH_ROWS):
+                f.write(np.ascontiguousarray(source[rows[begin:begin + ASSIGN_BATCH_ROWS]]).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _remove_files(self, names):
+        for name in names:
+            if not name:
+                continue
+            try:
+                (self.directory / name).unlink()
+            except OSError:
+                pass  # 다른 곳에서 아직 매핑 중이면 다음 로드 때 정리
+
+    # ==================== 압축 인덱스 ====================
+
+    def build_compressed_index(self, codec, dimensions=None):
+        """
+        압축 인덱스를 (다시) 만듭니다. 원본 float32 행렬은 재계산용으로 그대로 유지됩니다.
+
+        Args:
+            codec (str): CODECS 중 하나 ('none'이면 압축 인덱스 삭제)
+            dimensions (int, optional): pca/truncate의 축소 차원 (기본값: NUMPY_REDUCED_DIMENSIONS)
+
+        Returns:
+            dict: index_stats() 결과
+
+        Raises:
+            ValueError: 알 수 없는 방식이거나 축소 차원이 원본 이상인 경우
+        """
+        if codec not in CODECS:
+            raise ValueError(f"알 수 없는 압축 방식: {codec} ({', '.join(CODECS)})")
+
+        with self._lock:
+            old_files = [self._compressed_file, self._codec_params_file]
+            if codec == 'none' or self.dim is None:
+                with self._conn:
+                    self._save_info(codec='none', compressed_file='', codec_params_file='')
+                self._compressed = None
+                self._load_codec({'codec': 'none'})
+                self._remove_files(old_files)
+                return self.index_stats()
+
+            dimensions = dimensions or config.NUMPY_REDUCED_DIMENSIONS
+            if codec in ('pca', 'truncate') and dimensions >= self.dim:
+                raise ValueError(f"축소 차원({dimensions})은 원본 차원({self.dim})보다 작아야 합니다.")
+
+            params = self._fit_codec(codec, dimensions)
+            token = os.urandom(4).hex()
+            compressed_file = f"compressed.{token}.bin"
+            params_file = f"codec.{token}.npz"
+            np.savez(self.directory / params_file, **params)
+
+            # 원본 행 순서 그대로 (삭제된 행 포함) 인코딩해서 행 번호를 맞춤
+            matrix = self._matrix()
+            with open(self.directory / compressed_file, 'wb') as f:
+                for begin in range(0, self._row_count, ASSIGN_BATCH_ROWS):
+                    block = np.asarray(matrix[begin:begin + ASSIGN_BATCH_ROWS])
+                    f.write(np.ascontiguousarray(self._encode(block, codec, params)).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+
+            with self._conn:
+                self._save_info(codec=codec, compressed_file=compressed_file, codec_params_file=params_file)
+            self._compressed = None
+            self._vectors = None  # 인코딩하며 읽은 원본 페이지 매핑 해제
+            self._load_codec({'codec': codec, 'compressed_file': compressed_file, 'codec_params_file': params_file})
+            self._remove_files(old_files)
+
+            stats = self.index_stats()
+            logger.info(f"✅ {self.name}: 압축 인덱스 생성 ({codec}, 검색 행렬 {stats['search_bytes'] / 1e6:.1f}MB)")
+            return stats
+
+    def _fit_codec(self, codec, dimensions):
+        """살아 있는 행 표본으로 압축 파라미터 학습"""
+        alive = self._alive_rows()
+        rng = np.random.default_rng(0)
+        sample_rows = alive if alive.size <= FIT_SAMPLE_ROWS else np.sort(rng.choice(alive, FIT_SAMPLE_ROWS, replace=False))
+        sample = np.asarray(self._matrix()[sample_rows]) if sample_rows.size else np.zeros((1, self.dim), DTYPE)
+
+        if codec == 'int8':
+            # 차원별 대칭 범위 (범위를 벗어나는 새 값은 ±127로 잘림)
+            scale = np.abs(sample).max(axis=0) / 127.0
+            return {'scale': np.maximum(scale, 1e-8).astype(DTYPE)}
+        if codec == 'pca':
+            # 중심화하지 않은 주성분 (dim x dim 그람 행렬의 고유벡터): 내적(코사인)을 가장 잘 보존하는 축
+            gram = sample.T.astype(np.float64) @ sample
+            _, eigenvectors = np.linalg.eigh(gram)
+            components = eigenvectors[:, ::-1][:, :dimensions]
+            return {'components': np.ascontiguousarray(components, dtype=DTYPE)}
+        if codec == 'truncate':
+            return {'dimensions': np.array(dimensions)}
+        return {}
+
+    def _encode(self, matrix, codec=None, params=None):
+        """정규화된 원본 행 → 압축 행"""
+        codec = codec or self._codec
+        params = self._codec_params if params is None else params
+        if codec == 'float16':
+            return matrix.astype(np.float16)
+        if codec == 'int8':
+            return np.clip(np.rint(matrix / params['scale']), -127, 127).astype(np.int8)
+        if codec == 'pca':
+            return (matrix @ params['components']).astype(DTYPE)
+        if codec == 'truncate':
+            return _normalize(matrix[:, :int(params['dimensions'])])
+        raise ValueError(f"압축 인덱스가 없습니다: {codec}")
+
+    def _encode_query(self, query):
+        """정규화된 쿼리 → 압축 행과 곱할 벡터 (int8은 차원별 범위를 쿼리 쪽에 곱함)"""
+        if self._codec == 'float16':
+            return query
+        if self._codec == 'int8':
+            return (query * self._codec_params['scale']).astype(DTYPE)
+        if self._codec == 'pca':
+            return (query @ self._codec_params['components']).astype(DTYPE)
+        return _normalize(query[:int(self._codec_params['dimensions'])])
+
+    def _compressed_layout(self):
+        if self._codec == 'float16':
+            return np.float16, self.dim
+        if self._codec == 'int8':
+            return np.int8, self.dim
+        if self._codec == 'pca':
+            return DTYPE, self._codec_params['components'].shape[1]
+        return DTYPE, int(self._codec_params['dimensions'])
+
+    def _compressed_matrix(self):
+        if self._compressed is None and self._row_count:
+            dtype, width = self._compressed_layout()
+            self._compressed = np.memmap(
+                self.directory / self._compressed_file, dtype=dtype, mode='r', shape=(self._row_count, width)
+            )
+        return self._compressed
+
+    def _approx_scores(self, rows, query):
+        """압축 행렬로 계산한 근사 유사도 (블록 단위로 float32로 풀어 계산)"""
+        data = self._compressed_matrix()
+        encoded = self._encode_query(query)
+        if rows.size * 2 > self._row_count:
+            # 후보가 대부분이면 연속 구간을 그대로 풀어 계산 (행 선택 복사 생략)
+            scores = np.empty(self._row_count, dtype=DTYPE)
+            for begin in range(0, self._row_count, SCORE_BATCH_ROWS):
+                scores[begin:begin + SCORE_BATCH_ROWS] = data[begin:begin + SCORE_BATCH_ROWS].astype(DTYPE) @ encoded
+            return scores[rows]
+
+        scores = np.empty(rows.size, dtype=DTYPE)
+        for begin in range(0, rows.size, SCORE_BATCH_ROWS):
+            batch = rows[begin:begin + SCORE_BATCH_ROWS]
+            scores[begin:begin + SCORE_BATCH_ROWS] = data[batch].astype(DTYPE, copy=False) @ encoded
+        return scores
+
+    def index_stats(self):
+        """
+        인덱스 크기 정보
+
+        Returns:
+            dict: {'codec', 'rows', 'alive', 'dim', 'search_bytes'(검색 시 훑는 행렬), 'full_bytes'(원본 float32 행렬)}
+        """
+        with self._lock:
+            full_bytes = self._row_count * (self.dim or 0) * DTYPE().itemsize
+            if self._codec == 'none':
+                search_bytes = full_bytes
+            else:
+                dtype, width = self._compressed_layout()
+                search_bytes = self._row_count * width * np.dtype(dtype).itemsize
+            return {
+                'codec': self._codec,
+                'rows': self._row_count,
+                'alive': len(self._id_to_row),
+                'dim': self.dim,
+                'search_bytes': int(search_bytes),
+                'full_bytes': int(full_bytes),
+            }
+
+    def evaluate_recall(self, queries=200, k=5, seed=0):
+        """
+        현재 인덱스 검색 결과의 recall@k (원본 행렬 전체 비교 대비)
+        저장된 문서 벡터에 작은 잡음을 더한 쿼리를 사용합니다.
+
+        Returns:
+            dict: {'recall', 'queries', 'k', 'avg_ms'}
+        """
+        with self._lock:
+            alive = self._alive_rows()
+            if not alive.size:
+                return {'recall': 1.0, 'queries': 0, 'k': k, 'avg_ms': 0.0}
+
+            rng = np.random.default_rng(seed)
+            picked = rng.choice(alive, min(queries, alive.size), replace=False)
+            noisy = np.asarray(self._matrix()[np.sort(picked)]) + 0.02 * rng.normal(size=(picked.size, self.dim))
+            exact = np.asarray(self._matrix()[alive])
+
+            hits = 0
+            elapsed = 0.0
+            for query in _normalize(noisy):
+                truth = set(alive[np.argsort(-(exact @ query))[:k]].tolist())
+                started = time.perf_counter()
+                rows, _, _ = self._query(query, k)
+                elapsed += time.perf_counter() - started
+                hits += len(truth & set(rows.tolist()))
+            self._vectors = None  # 전체 비교로 읽은 원본 페이지 매핑 해제
+            return {
+                'recall': hits / (picked.size * min(k, alive.size)),
+                'queries': int(picked.size),
+                'k': k,
+                'avg_ms': elapsed / picked.size * 1000,
+            }
+
+    # ==================== 조회 ====================
+
+    def get(self, ids=None, where=None, include=("documents", "metadatas"), limit=None, offset=0):
+        with self._lock:
+            rows = self._select_rows(ids, where)
+            offset = offset or 0
+            rows = rows[offset:offset + limit] if limit is not None else rows[offset:]
+
+            result = {'ids': [self._ids[row] for row in rows]}
+            if 'metadatas' in include:
+                result['metadatas'] = [dict(self._metadatas[row]) for row in rows]
+            if 'documents' in include:
+                result['documents'] = self._documents(rows)
+            if 'embeddings' in include:
+                result['embeddings'] = self._matrix()[rows] if rows.size else np.empty((0, self.dim or 0), DTYPE)
+            return result
+
+    def count(self):
+        return len(self._id_to_row)
+
+    def heartbeat(self):
+        with self._lock:
+            self._conn.execute("SELECT 1").fetchone()
+
+    def _documents(self, rows):
+        """행 번호 순서대로 문서 본문 조회 (본문은 메모리에 두지 않고 SQLite에서 읽음)"""
+        documents = {}
+        rows = [int(row) for row in rows]
+        for begin in range(0, len(rows), 500):
+            batch = rows[begin:begin + 500]
+            placeholders = ",".join("?" * len(batch))
+            documents.update(self._conn.execute(
+                f"SELECT row, document FROM rows WHERE row IN ({placeholders})", batch
+            ))
+        return [documents.get(row) for row in rows]
+
+    def _alive_rows(self):
+        if self._alive is None:
+            self._alive = np.fromiter(sorted(self._id_to_row.values()), dtype=np.int64, count=len(self._id_to_row))
+        return self._alive
+
+    def _partition_rows(self, partition):
+        rows = self._partition_arrays.get(partition)
+        if rows is None:
+            members = self._partitions.get(partition, ())
+            rows = self._partition_arrays[partition] = np.fromiter(sorted(members), dtype=np.int64, count=len(members))
+        return rows
+
+    def _select_rows(self, ids=None, where=None):
+        """ids/where 조건에 맞는 살아 있는 행 번호 (오름차순)"""
+        if ids is not None:
+            rows = np.array(sorted(self._id_to_row[doc_id] for doc_id in set(ids) if doc_id in self._id_to_row), dtype=np.int64)
+        else:
+            partitions = self._where_partitions(where)
+            if partitions is None:
+                rows = self._alive_rows()
+            else:
+                arrays = [self._partition_rows(partition) for partition in partitions if partition in self._partitions]
+                rows = np.sort(np.concatenate(arrays)) if arrays else np.empty(0, dtype=np.int64)
+        if where and rows.size:
+            rows = rows[self._where_mask(where, rows)]
+        return rows
+
+    def _where_partitions(self, where):
+        """
+        where에서 파티션 키 조건($eq, $in)을 찾아 검색할 파티션 목록을 반환합니다.
+
+        Returns:
+            list or None: 파티션 값 목록 (파티션 키 조건이 없으면 None → 전체 행)
+        """
+        if not where:
+            return None
+        clause = where.get(self.partition_key)
+        if clause is None:
+            for sub in where.get('$and', ()):
+                partitions = self._where_partitions(sub)
+                if partitions is not None:
+                    return partitions
+            return None
+        if isinstance(clause, dict):
+            if '$eq' in clause:
+                return [clause['$eq']]
+            if '$in' in clause:
+                return list(clause['$in'])
+            return None
+        return [clause]
+
+    def _column(self, key):
+        """
+        메타데이터 필드의 열 배열 (쓰기 전까지 재사용)
+
+        Returns:
+            tuple: (vocab {값: 코드}, codes 정수 배열 (값 없음 -1), numbers 실수 배열 (숫자가 아니면 NaN))
+        """
+        column = self._columns.get(key)
+        if column is None:
+            vocab = {}
+            codes = np.full(self._row_count, -1, dtype=np.int32)
+            numbers = np.full(self._row_count, np.nan)
+            for row, metadata in enumerate(self._metadatas):
+                if metadata is None or key not in metadata:
+                    continue
+                value = metadata[key]
+                codes[row] = vocab.setdefault(_vocab_key(value), len(vocab))
+                if isinstance(value, (int, float)) and not isinstance(value, bool):
+                    numbers[row] = value
+            column = self._columns[key] = (vocab, codes, numbers)
+        return column
+
+    def _where_mask(self, where, rows):
+        """where 조건을 rows에 적용한 bool 배열"""
+        mask = np.ones(rows.size, dtype=bool)
+        for key, clause in where.items():
+            if key == '$and':
+                for sub in clause:
+                    mask &= self._where_mask(sub, rows)
+            elif key == '$or':
+                matched = np.zeros(rows.size, dtype=bool)
+                for sub in clause:
+                    matched |= self._where_mask(sub, rows)
+                mask &= matched
+            else:
+                mask &= self._field_mask(key, clause, rows)
+        return mask
+
+    def _field_mask(self, key, clause, rows):
+        vocab, codes, numbers = self._column(key)
+        codes = codes[rows]
+        # 필드가 없는 문서는 어떤 조건에도 맞지 않음 (Chroma와 동일)
+        mask = codes >= 0
+        if not isinstance(clause, dict):
+            clause = {'$eq': clause}
+
+        for op, value in clause.items():
+            if op in ('$eq', '$ne'):
+                matched = codes == vocab.get(_vocab_key(value), -2)
+                mask &= matched if op == '$eq' else ~matched
+            elif op in ('$in', '$nin'):
+                wanted = [vocab[_vocab_key(item)] for item in value if _vocab_key(item) in vocab]
+                matched = np.isin(codes, wanted)
+                mask &= matched if op == '$in' else ~matched
+            elif op in ('$gt', '$gte', '$lt', '$lte'):
+                selected = numbers[rows]
+                if op == '$gt':
+                    mask &= selected > value
+                elif op == '$gte':
+                    mask &= selected >= value
+                elif op == '$lt':
+                    mask &= selected < value
+                else:
+                    mask &= selected <= value
+            else:
+                raise ValueError(f"지원하지 않는 필터 연산자: {op}")
+        return mask
+
+    # ==================== 검색 ====================
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4, where=None):
+        with self._lock:
+            rows, scores, _ = self._query(embedding, k, where)
+            documents = self._to_documents(rows)
+        return list(zip(documents, _relevance(scores).tolist()))
+
+    def similarity_search_by_vector_with_embeddings(self, embedding, k=4, where=None):
+        with self._lock:
+            rows, scores, vectors = self._query(embedding, k, where, with_vectors=True)
+            if not rows.size:
+                return []
+            documents = self._to_documents(rows)
+        return list(zip(documents, _relevance(scores).tolist(), np.array(vectors)))
+
+    def max_marginal_relevance_search_by_vector(self, embedding, k=4, fetch_k=20, lambda_mult=0.5, where=None):
+        with self._lock:
+            rows, _, vectors = self._query(embedding, max(k, fetch_k), where, with_vectors=True)
+            if not rows.size:
+                return []
+            selected = maximal_marginal_relevance(_normalize(embedding), vectors, k, lambda_mult)
+            return self._to_documents(rows[selected])
+
+    def _to_documents(self, rows):
+        from langchain_core.documents import Document
+
+        return [
+            Document(page_content=document or "", metadata=dict(self._metadatas[row]), id=self._ids[row])
+            for row, document in zip(rows, self._documents(rows))
+        ]
+
+    def _query(self, embedding, k, where=None, with_vectors=False):
+        """
+        코사인 유사도 상위 k개 행 (호출한 쪽에서 잠금 보유)
+
+        Returns:
+            tuple: (rows, scores, vectors) 점수 내림차순, vectors는 with_vectors=True일 때만
+        """
+        empty = (np.empty(0, dtype=np.int64), np.empty(0, dtype=DTYPE), None)
+        if self.dim is None or not self._id_to_row or k <= 0:
+            return empty
+
+        query = _normalize(np.asarray(embedding, dtype=DTYPE).reshape(-1))
+        if query.shape[0] != self.dim:
+            raise ValueError(f"쿼리 임베딩 차원이 다릅니다: {query.shape[0]} (저장소: {self.dim})")
+
+        rows = self._select_rows(where=where)
+        if rows.size >= config.NUMPY_IVF_MIN_ROWS:
+            rows = self._ivf_probe(query, rows)
+        if not rows.size:
+            return empty
+
+        rescore = max(config.NUMPY_RESCORE_CANDIDATES, 4 * k)
+        if self._codec != 'none' and rows.size > rescore:
+            # 압축 행렬로 후보를 고르고, 후보만 원본 행으로 다시 계산
+            approx = self._approx_scores(rows, query)
+            rows = np.sort(rows[np.argpartition(-approx, rescore - 1)[:rescore]])
+
+        matrix = self._matrix()
+        if self._codec == 'none' and rows.size * 2 > self._row_count:
+            # 후보가 대부분이면 연속된 행렬 전체를 곱하는 편이 빠름
+            scores = (matrix @ query)[rows]
+        else:
+            scores = matrix[rows] @ query
+
+        if k < rows.size:
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top], kind='stable')]
+        else:
+            top = np.argsort(-scores, kind='stable')
+
+        rows = rows[top]
+        vectors = matrix[rows] if with_vectors else None
+        return rows, scores[top], vectors
+
+    def _ivf_probe(self, query, rows):
+        """IVF: 쿼리와 가까운 클러스터에 속한 행만 남김"""
+        self._ensure_ivf()
+        nlist = len(self._ivf_centroids)
+        nprobe = min(config.NUMPY_IVF_NPROBE, nlist)
+        similarity = self._ivf_centroids @ query
+        probes = np.argpartition(-similarity, nprobe - 1)[:nprobe] if nprobe < nlist else np.arange(nlist)
+        return rows[np.isin(self._ivf_assign[rows], probes)]
+
+    def _ensure_ivf(self):
+        """IVF 클러스터 준비 (처음 사용 시 학습, 행 수가 학습 시점의 2배가 되면 다시 학습)"""
+        matrix = self._matrix()
+        alive = self._alive_rows()
+
+        if self._ivf_centroids is not None and alive.size < 2 * self._ivf_trained_rows:
+            # 학습 이후 추가된 행은 가장 가까운 클러스터에 배정
+            assigned = len(self._ivf_assign)
+            if assigned < self._row_count:
+                new_assign = np.argmax(matrix[assigned:] @ self._ivf_centroids.T, axis=1).astype(np.int32)
+                self._ivf_assign = np.concatenate([self._ivf_assign, new_assign])
+            return
+
+        rng = np.random.default_rng(0)
+        nlist = int(min(4096, max(16, math.sqrt(alive.size))))
+        sample = alive if alive.size <= nlist * 64 else np.sort(rng.choice(alive, nlist * 64, replace=False))
+        data = np.asarray(matrix[sample])
+
+        # 구면 k-means (정규화된 벡터 → 내적으로 배정, 평균을 다시 정규화)
+        centroids = data[rng.choice(len(data), nlist, replace=False)].copy()
+        for _ in range(config.NUMPY_IVF_TRAIN_ITERATIONS):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, data)
+            nonempty = np.bincount(labels, minlength=nlist) > 0
+            centroids[nonempty] = _normalize(sums[nonempty])
+
+        assign = np.full(self._row_count, -1, dtype=np.int32)
+        for begin in range(0, alive.size, ASSIGN_BATCH_ROWS):
+            batch = alive[begin:begin + ASSIGN_BATCH_ROWS]
+            assign[batch] = np.argmax(matrix[batch] @ centroids.T, axis=1)
+
+        self._ivf_centroids = centroids
+        self._ivf_assign = assign
+        self._ivf_trained_rows = int(alive.size)
+        self._vectors = None  # 학습하며 읽은 원본 페이지 매핑 해제 (압축 인덱스 사용 시 상주 메모리 유지)
+        logger.info(f"✅ NumpyVectorStore IVF 학습: {self.name} ({alive.size}개 행, {nlist}개 클러스터)")
@@ -0,0 +1,304 @@
+"""
+셀프 쿼리 필터 추출
+- 질문에서 회의 제목/날짜 조건을 찾아 벡터 검색 필터(where)로 바꿉니다.
+- 먼저 규칙으로 찾고 (날짜 표현, 따옴표로 묶은 제목, 메모리에 올려 둔 회의 제목 목록과 일치하는 부분),
+  찾지 못했고 질문에 회의/날짜를 가리키는 표현이 있을 때만 LLM(query constructor)을 호출합니다.
+- LLM 결과는 (컬렉션, 질문) 단위로 캐시하고, query constructor는 컬렉션별로 한 번만 만듭니다.
+- 제목/날짜 조건은 SQLite의 회의 목록으로 meeting_id 목록을 구해 {"meeting_id": {"$in": [...]}}로 검색합니다.
+  (메타데이터 문자열은 정확히 일치해야만 필터되므로 부분 일치 제목, 시간이 붙은 날짜도 찾을 수 있도록)
+"""
+import datetime
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# 제목/날짜 조건으로 보고 meeting_id 목록으로 바꾸는 메타데이터 필드
+TITLE_FIELDS = ("title", "meeting_title")
+DATE_FIELDS = ("meeting_date",)
+
+_QUOTED = re.compile(r'["“”\'‘’「『]([^"“”\'‘’」』]{2,})["“”\'‘’」』]')
+_FULL_DATE = re.compile(r'(\d{4})\s*(?:[-./]|년)\s*(\d{1,2})\s*(?:[-./]|월)\s*(\d{1,2})\s*일?')
+_MONTH_DAY = re.compile(r'(?<!\d)(\d{1,2})\s*월\s*(\d{1,2})\s*일')
+_RELATIVE_DAYS = {"오늘": 0, "어제": 1, "그저께": 2, "그제": 2}
+
+
+def _normalize(text):
+    return re.sub(r"\s+", " ", (text or "").strip().lower())
+
+
+@dataclass(frozen=True)
+class QueryFilter:
+    """질문에서 추출한 검색 조건"""
+    query: str  # 벡터 검색에 사용할 질문 (LLM이 조건을 뺀 질문으로 바꿀 수 있음)
+    titles: Tuple[str, ...] = ()  # 회의 제목 (부분 일치)
+    dates: Tuple[str, ...] = ()  # 회의 날짜 (YYYY-MM-DD)
+    where: Optional[dict] = None  # LLM이 만든 Chroma 필터 (제목/날짜 조건 포함 가능)
+    source: str = "none"  # rule, llm, none
+
+
+class MeetingTitleIndex:
+    """meetings 테이블의 제목/날짜 → meeting_id 인메모리 인덱스 (TTL이 지나면 다시 읽음)"""
+
+    def __init__(self, db, ttl_seconds):
+        self.db = db
+        self.ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._by_title = {}  # 정규화된 제목 -> {meeting_id}
+        self._by_date = {}  # YYYY-MM-DD -> {meeting_id}
+
+    def _snapshot(self):
+        with self._lock:
+            if self._loaded_at is None or time.monotonic() - self._loaded_at > self.ttl:
+                by_title, by_date = {}, {}
+                for meeting_id, title, meeting_date in self.db.get_meeting_headers():
+                    by_title.setdefault(_normalize(title), set()).add(meeting_id)
+                    by_date.setdefault((meeting_date or "")[:10], set()).add(meeting_id)
+                self._by_title, self._by_date = by_title, by_date
+                self._loaded_at = time.monotonic()
+            return self._by_title, self._by_date
+
+    def titles_in(self, query, min_chars):
+        """
+        질문에 그대로 들어 있는 회의 제목 (긴 제목 우선, 다른 일치 제목에 포함된 짧은 제목은 제외)
+
+        Returns:
+            list: 정규화된 제목
+        """
+        by_title, _ = self._snapshot()
+        normalized = _normalize(query)
+        found = []
+        for title in sorted(by_title, key=len, reverse=True):
+            if len(title) >= min_chars and title in normalized and not any(title in longer for longer in found):
+                found.append(title)
+        return found
+
+    def ids_for_title(self, text, partial=True):
+        """제목(부분 일치)에 해당하는 meeting_id 집합"""
+        by_title, _ = self._snapshot()
+        text = _normalize(text)
+        if not partial:
+            return set(by_title.get(text, ()))
+        return {meeting_id for title, ids in by_title.items() if text in title for meeting_id in ids}
+
+    def ids_for_date(self, date):
+        """날짜(YYYY-MM-DD로 시작하는 값)에 해당하는 meeting_id 집합"""
+        _, by_date = self._snapshot()
+        return set(by_date.get((date or "")[:10], ()))
+
+
+def parse_dates(query, today=None):
+    """
+    질문의 날짜 표현 → YYYY-MM-DD 목록
+    2025-11-07, 2025.11.7, 2025년 11월 7일, 11월 7일(올해, 미래면 작년), 오늘/어제/그제
+
+    Returns:
+        list: 날짜 문자열 (질문에 나온 순서)
+    """
+    today = today or datetime.date.today()
+    dates = []
+
+    def add(year, month, day):
+        try:
+            value = datetime.date(int(year), int(month), int(day)).isoformat()
+        except ValueError:
+            return
+        if value not in dates:
+            dates.append(value)
+
+    for match in _FULL_DATE.finditer(query):
+        add(*match.groups())
+    remaining = _FULL_DATE.sub(" ", query)
+    for match in _MONTH_DAY.finditer(remaining):
+        month, day = int(match.group(1)), int(match.group(2))
+        year = today.year
+        try:
+            if datetime.date(year, month, day) > today:
+                year -= 1
+        except ValueError:
+            continue
+        add(year, month, day)
+    for word, days_ago in _RELATIVE_DAYS.items():
+        if word in query:
+            add(*(today - datetime.timedelta(days=days_ago)).timetuple()[:3])
+    return dates
+
+
+def parse_query_filter(query, title_index, today=None):
+    """
+    규칙 기반 필터 추출 (LLM 호출 없음)
+
+    Args:
+        query (str): 사용자 질문
+        title_index (MeetingTitleIndex): 회의 제목 인덱스
+        today (datetime.date, optional): 상대 날짜 기준일
+
+    Returns:
+        QueryFilter: 조건이 없으면 source='none'
+    """
+    titles = [
+        quoted.strip() for quoted in _QUOTED.findall(query)
+        if title_index.ids_for_title(quoted.strip())
+    ]
+    titles += [
+        title for title in title_index.titles_in(query, config.SELF_QUERY_MIN_TITLE_CHARS)
+        if not any(_normalize(quoted) in title for quoted in titles)
+    ]
+    dates = parse_dates(query, today)
+    if not titles and not dates:
+        return QueryFilter(query=query)
+    return QueryFilter(query=query, titles=tuple(titles), dates=tuple(dates), source="rule")
+
+
+class QueryFilterExtractor:
+    """규칙 → LLM 순서로 필터를 추출하고 LLM 결과를 캐시 (VectorDBManager가 소유)"""
+
+    def __init__(self, llm, metadata_field_infos, document_content_descriptions, db=None):
+        """
+        Args:
+            llm: query constructor에 사용할 LangChain 채팅 모델
+            metadata_field_infos (dict): 컬렉션별 AttributeInfo 목록
+            document_content_descriptions (dict): 컬렉션별 문서 설명
+            db (DatabaseManager, optional): 회의 목록 조회용 (None이면 기본 DB)
+        """
+        if db is None:
+            from utils.db_manager import DatabaseManager
+            db = DatabaseManager(str(config.DATABASE_PATH))
+
+        self.llm = llm
+        self.metadata_field_infos = metadata_field_infos
+        self.document_content_descriptions = document_content_descriptions
+        self.title_index = MeetingTitleIndex(db, config.SELF_QUERY_TITLE_INDEX_TTL_SECONDS)
+
+        self._constructors = {}  # db_type -> query constructor runnable
+        self._translator = None
+        self._cache = OrderedDict()  # (db_type, query) -> (만료 시각, QueryFilter)
+        self._lock = threading.Lock()
+
+    # ==================== 추출 ====================
+
+    def extract(self, db_type, query):
+        """
+        질문 → QueryFilter (규칙 → 캐시 → LLM 순서)
+
+        Args:
+            db_type (str): 컬렉션 ('chunks', 'subtopic')
+            query (str): 사용자 질문
+
+        Returns:
+            QueryFilter
+        """
+        query_filter = parse_query_filter(query, self.title_index)
+        if query_filter.source != "none":
+            logger.info(f"🔎 규칙으로 필터 추출: titles={list(query_filter.titles)}, dates={list(query_filter.dates)}")
+            return query_filter
+
+        if not config.SELF_QUERY_LLM_FALLBACK or not any(cue in query for cue in config.SELF_QUERY_LLM_CUES):
+            return query_filter
+
+        key = (db_type, query)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > now:
+                self._cache.move_to_end(key)
+                return cached[1]
+
+        try:
+            query_filter = self._extract_with_llm(db_type, query)
+        except Exception as e:
+            # 실패한 질문은 캐시하지 않음 (일시적인 LLM 오류일 수 있음)
+            logger.warning(f"⚠️ LLM 필터 추출 실패 (필터 없이 검색): {e}")
+            return query_filter
+
+        with self._lock:
+            self._cache[key] = (now + config.SELF_QUERY_CACHE_TTL_SECONDS, query_filter)
+            self._cache.move_to_end(key)
+            while len(self._cache) > config.SELF_QUERY_CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return query_filter
+
+    def _constructor(self, db_type):
+        """컬렉션별 query constructor (처음 사용할 때 한 번만 생성)"""
+        with self._lock:
+            if db_type not in self._constructors:
+                from langchain_classic.chains.query_constructor.base import load_query_constructor_runnable
+                self._constructors[db_type] = load_query_constructor_runnable(
+                    self.llm,
+                    self.document_content_descriptions[db_type],
+                    self.metadata_field_infos[db_type],
+                )
+            if self._translator is None:
+                from langchain_community.query_constructors.chroma import ChromaTranslator
+                self._translator = ChromaTranslator()
+            return self._constructors[db_type], self._translator
+
+    def _extract_with_llm(self, db_type, query):
+        constructor, translator = self._constructor(db_type)
+        structured_query = constructor.invoke({"query": query})
+        new_query, search_kwargs = translator.visit_structured_query(structured_query)
+        where = search_kwargs.get("filter")
+        logger.info(f"🔎 LLM으로 필터 추출: query='{new_query}', filter={where}")
+        return QueryFilter(query=new_query or query, where=where, source="llm" if where else "none")
+
+    # ==================== where 변환 ====================
+
+    def to_where(self, query_filter, base_filter=None):
+        """
+        QueryFilter → 저장소 where (제목/날짜 조건은 meeting_id 목록으로 변환, base_filter와 $and)
+
+        Args:
+            query_filter (QueryFilter): extract() 결과
+            base_filter (dict, optional): 호출한 쪽이 지정한 필터
+
+        Returns:
+            dict or None
+        """
+        clauses = [base_filter] if base_filter else []
+
+        if query_filter.source == "rule":
+            meeting_ids = None
+            if query_filter.titles:
+                meeting_ids = set().union(*(self.title_index.ids_for_title(title) for title in query_filter.titles))
+            if query_filter.dates:
+                by_date = set().union(*(self.title_index.ids_for_date(date) for date in query_filter.dates))
+                meeting_ids = by_date if meeting_ids is None else meeting_ids & by_date
+            if meeting_ids:
+                clauses.append({"meeting_id": {"$in": sorted(meeting_ids)}})
+            else:
+                logger.info("ℹ️ 조건에 맞는 회의가 없어 필터 없이 검색합니다.")
+        elif query_filter.where:
+            resolved = self._resolve(query_filter.where)
+            if resolved:
+                clauses.append(resolved)
+
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    def _resolve(self, where):
+        """LLM 필터의 제목/날짜 비교를 meeting_id 목록으로 바꿈 (맞는 회의가 없는 조건은 제외)"""
+        for operator in ("$and", "$or"):
+            if operator in where:
+                parts = [part for part in (self._resolve(part) for part in where[operator]) if part]
+                if not parts:
+                    return None
+                return parts[0] if len(parts) == 1 else {operator: parts}
+
+        (field, condition), = where.items()
+        if field not in TITLE_FIELDS and field not in DATE_FIELDS:
+            return where
+
+        value = condition.get("$eq") if isinstance(condition, dict) else condition
+        if not isinstance(value, str):
+            return None
+        ids = self.title_index.ids_for_title(value) if field in TITLE_FIELDS else self.title_index.ids_for_date(value)
+        return {"meeting_id": {"$in": sorted(ids)}} if ids else None
@@ -0,0 +1,215 @@
+"""
+챗봇 검색 결과 재순위(rerank)
+- 검색 소스별로 할당량보다 넉넉하게(RERANK_CANDIDATE_MULTIPLIER배) 가져온 후보를 한 번에 다시 고릅니다. (컬렉션 간 비교)
+- 관련도: 저장소가 돌려준 후보 임베딩과 query 임베딩의 코사인 유사도
+  (RERANK_CROSS_ENCODER를 설정하면 CPU cross-encoder 점수, 0~1로 정규화)
+- 선택: MMR (관련도 - 이미 고른 후보와의 최대 유사도)로 한 개씩 고르고,
+  고른 후보와 코사인 유사도가 RERANK_DUPLICATE_THRESHOLD 이상인 후보는 거의 같은 내용으로 보고 제외합니다.
+  후보끼리의 유사도 행렬을 한 번 계산한 뒤 선택마다 벡터 연산 한 번으로 갱신합니다. (후보 수십 개, 1ms 미만)
+- 소스별 할당량(RETRIEVAL_SOURCE_QUOTAS)과 토큰 예산(RERANK_TOKEN_BUDGET) 안에서 고릅니다.
+
+cross-encoder는 CROSS_ENCODERS에 등록된 이름으로 고르며, score(query, texts) -> 점수 리스트만 구현하면 됩니다.
+기본 제공 'onnx'는 Hugging Face Hub의 ONNX cross-encoder를 onnxruntime(CPU)으로 실행합니다.
+"""
+import logging
+import threading
+
+from config import config
+from utils.tokenizer import count_tokens
+
+logger = logging.getLogger(__name__)
+
+
+class CrossEncoder:
+    """cross-encoder 인터페이스 (query-문서 쌍을 함께 읽어 관련도 점수 계산)"""
+
+    def score(self, query, texts):
+        """
+        Args:
+            query (str): 사용자 질문
+            texts (list): 후보 문서 텍스트
+
+        Returns:
+            list: 후보별 점수 (클수록 관련, 척도는 모델마다 다름)
+        """
+        raise NotImplementedError
+
+
+class OnnxCrossEncoder(CrossEncoder):
+    """Hugging Face Hub의 ONNX cross-encoder (onnxruntime CPU, tokenizers)"""
+
+    def __init__(self, model_id, onnx_file="onnx/model.onnx", max_length=512):
+        import onnxruntime
+        from huggingface_hub import hf_hub_download
+        from tokenizers import Tokenizer
+
+        self.tokenizer = Tokenizer.from_file(hf_hub_download(model_id, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = config.RERANK_CROSS_ENCODER_THREADS
+        self.session = onnxruntime.InferenceSession(
+            hf_hub_download(model_id, onnx_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {item.name for item in self.session.get_inputs()}
+
+    def score(self, query, texts):
+        import numpy as np
+
+        encodings = self.tokenizer.encode_batch([(query, text) for text in texts])
+        inputs = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        logits = self.session.run(None, {name: value for name, value in inputs.items() if name in self.input_names})[0]
+        return logits.reshape(len(texts), -1)[:, 0].tolist()
+
+
+# 이름 -> 생성 함수 (RERANK_CROSS_ENCODER에서 선택)
+CROSS_ENCODERS = {
+    "onnx": lambda: OnnxCrossEncoder(config.RERANK_CROSS_ENCODER_MODEL, config.RERANK_CROSS_ENCODER_ONNX_FILE),
+}
+
+
+def register_cross_encoder(name, factory):
+    """
+    cross-encoder 구현 등록 (RERANK_CROSS_ENCODER=name으로 사용)
+
+    Args:
+        name (str): 설정 이름
+        factory (callable): 인자 없이 CrossEncoder를 반환하는 함수
+    """
+    CROSS_ENCODERS[name] = factory
+
+
+def mmr_select(relevance, vectors, lambda_mult, duplicate_threshold, costs, budget, groups, limits):
+    """
+    MMR + 중복 제거 + 그룹별 할당량 + 비용 예산으로 후보를 순서대로 고릅니다.
+    예산을 넘는 후보는 건너뛰고 더 작은 후보를 계속 찾습니다. (첫 후보는 예산과 관계없이 선택)
+
+    Args:
+        relevance (np.ndarray): 후보별 관련도 (n)
+        vectors (np.ndarray): 정규화된 후보 임베딩 (n x dim)
+        lambda_mult (float): 1에 가까울수록 관련도, 0에 가까울수록 다양성 우선
+        duplicate_threshold (float): 고른 후보와 코사인 유사도가 이 값 이상이면 제외
+        costs (np.ndarray): 후보별 비용 (토큰 수)
+        budget (float): 비용 합 상한
+        groups (np.ndarray): 후보별 그룹 번호 (검색 소스)
+        limits (list): 그룹별 최대 선택 수
+
+    Returns:
+        list: 선택된 후보 인덱스 (선택 순서)
+    """
+    import numpy as np
+
+    count = len(relevance)
+    similarity = vectors @ vectors.T
+    max_similarity = np.zeros(count)
+    available = np.ones(count, dtype=bool)
+    for group, limit in enumerate(limits):
+        if limit <= 0:
+            available[groups == group] = False
+    taken = [0] * len(limits)
+
+    selected = []
+    remaining = budget
+    while available.any():
+        scores = np.where(available, lambda_mult * relevance - (1 - lambda_mult) * max_similarity, -np.inf)
+        index = int(np.argmax(scores))
+        available[index] = False
+        if selected and costs[index] > remaining:
+            continue
+
+        selected.append(index)
+        remaining -= costs[index]
+        group = groups[index]
+        taken[group] += 1
+        if taken[group] >= limits[group]:
+            available[groups == group] = False
+        max_similarity = np.maximum(max_similarity, similarity[index])
+        available &= similarity[index] < duplicate_threshold
+    return selected
+
+
+class Reranker:
+    """검색 후보 재순위 (ChatManager가 소유, cross-encoder는 처음 사용할 때 한 번만 로딩)"""
+
+    def __init__(self):
+        self._cross_encoder = None
+        self._cross_encoder_loaded = False
+        self._lock = threading.Lock()
+
+    def _get_cross_encoder(self):
+        with self._lock:
+            if not self._cross_encoder_loaded:
+                self._cross_encoder_loaded = True
+                name = config.RERANK_CROSS_ENCODER
+                if name:
+                    try:
+                        self._cross_encoder = CROSS_ENCODERS[name]()
+                        logger.info(f"✅ cross-encoder 로딩 완료: {name} ({config.RERANK_CROSS_ENCODER_MODEL})")
+                    except Exception as e:
+                        # 모델/패키지가 없으면 임베딩 유사도만 사용
+                        logger.warning(f"⚠️ cross-encoder를 불러올 수 없어 임베딩 유사도로 재순위합니다: {name} - {e}")
+            return self._cross_encoder
+
+    def rerank(self, query, query_embedding, candidates, quotas):
+        """
+        소스별 후보를 합쳐 다시 고르고, 소스별로 선택 순서대로 나눠 반환합니다.
+
+        Args:
+            query (str): 사용자 질문
+            query_embedding (list): query 임베딩
+            candidates (dict): 소스 이름 -> [(Document, 임베딩), ...]
+            quotas (dict): 소스 이름 -> 최대 선택 수
+
+        Returns:
+            dict: 소스 이름 -> [Document, ...] (재순위 순서)
+        """
+        import numpy as np
+
+        names = list(candidates)
+        docs, vectors, groups = [], [], []
+        for group, name in enumerate(names):
+            for doc, vector in candidates[name]:
+                docs.append(doc)
+                vectors.append(vector)
+                groups.append(group)
+        if not docs:
+            return {name: [] for name in names}
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        vectors /= np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        query_vector = np.asarray(query_embedding, dtype=np.float32)
+        relevance = vectors @ (query_vector / max(float(np.linalg.norm(query_vector)), 1e-12))
+
+        cross_encoder = self._get_cross_encoder()
+        if cross_encoder is not None:
+            try:
+                scores = np.asarray(cross_encoder.score(query, [doc.page_content for doc in docs]), dtype=np.float64)
+                spread = scores.max() - scores.min()
+                relevance = (scores - scores.min()) / spread if spread > 0 else np.ones(len(docs))
+            except Exception as e:
+                logger.warning(f"⚠️ cross-encoder 점수 계산 실패 (임베딩 유사도 사용): {e}")
+
+        costs = np.array([doc.metadata.get("token_count") or count_tokens(doc.page_content) for doc in docs])
+        selected = mmr_select(
+            relevance, vectors,
+            lambda_mult=config.RERANK_MMR_LAMBDA,
+            duplicate_threshold=config.RERANK_DUPLICATE_THRESHOLD,
+            costs=costs,
+            budget=config.RERANK_TOKEN_BUDGET,
+            groups=np.array(groups),
+            limits=[quotas[name] for name in names],
+        )
+
+        results = {name: [] for name in names}
+        for index in selected:
+            results[names[groups[index]]].append(docs[index])
+        logger.info(
+            f"🔀 재순위: 후보 {len(docs)}개 → {len(selected)}개 "
+            f"(토큰 {int(costs[selected].sum())}/{config.RERANK_TOKEN_BUDGET})"
+        )
+        return results
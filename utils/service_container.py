@@ -0,0 +1,128 @@
+"""
+지연 초기화 서비스 컨테이너
+- 외부 클라이언트(ChromaDB, OpenAI, Gemini 등)를 만드는 싱글톤은 모듈 import 시점이 아니라 처음 사용할 때 생성합니다.
+- 모듈 수준 이름(vdb_manager, upload_service, chat_manager)은 LazyService 프록시로 유지되므로
+  기존 import 문과 호출 코드(vdb_manager.search(...) 등)는 그대로 동작합니다.
+- 서버 시작 직후 미리 만들어 둘 서비스는 WARMUP_SERVICES 설정으로 지정합니다 (백그라운드 스레드에서 생성).
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LazyService:
+    """처음 속성에 접근할 때 factory로 인스턴스를 만드는 프록시"""
+    __slots__ = ("_name", "_factory", "_instance", "_lock", "_init_seconds")
+
+    def __init__(self, name: str, factory: Callable[[], object]):
+        self._name = name
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+        self._init_seconds = None
+
+    def get(self):
+        """
+        인스턴스 반환 (없으면 생성, 여러 스레드가 동시에 접근해도 한 번만 생성)
+
+        Returns:
+            object: 서비스 인스턴스
+        """
+        instance = self._instance
+        if instance is not None:
+            return instance
+
+        with self._lock:
+            if self._instance is None:
+                started = time.perf_counter()
+                self._instance = self._factory()
+                self._init_seconds = time.perf_counter() - started
+                logger.info(f"✅ 서비스 생성: {self._name} ({self._init_seconds:.2f}초)")
+            return self._instance
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def __getattr__(self, attr):
+        return getattr(self.get(), attr)
+
+    def __repr__(self):
+        state = "initialized" if self.initialized else "lazy"
+        return f"<LazyService {self._name} ({state})>"
+
+
+class ServiceContainer:
+    """이름으로 지연 초기화 서비스를 등록/조회 (Singleton 인스턴스로 사용)"""
+
+    def __init__(self):
+        self._services: Dict[str, LazyService] = {}
+
+    def register(self, name: str, factory: Callable[[], object]) -> LazyService:
+        """
+        서비스 등록 (생성은 첫 사용 시점)
+
+        Args:
+            name: 서비스 이름 (WARMUP_SERVICES에서 사용)
+            factory: 인스턴스를 만드는 함수
+
+        Returns:
+            LazyService: 모듈 수준 이름에 할당할 프록시
+        """
+        service = LazyService(name, factory)
+        self._services[name] = service
+        return service
+
+    def get(self, name: str):
+        """등록된 서비스의 인스턴스 반환 (없으면 생성)"""
+        return self._services[name].get()
+
+    def warm_up(self, names: Optional[Iterable[str]] = None, background: bool = True):
+        """
+        서비스를 미리 생성합니다. (첫 요청이 클라이언트 생성 시간을 기다리지 않도록)
+
+        Args:
+            names: 생성할 서비스 이름 목록 (None이면 등록된 전체)
+            background: True면 백그라운드 스레드에서 생성
+
+        Returns:
+            threading.Thread or None: background=True일 때 생성 스레드
+        """
+        targets = list(self._services) if names is None else [name for name in names if name]
+        if not targets:
+            return None
+
+        def run():
+            for name in targets:
+                if name not in self._services:
+                    logger.warning(f"⚠️ 미리 생성할 서비스를 찾을 수 없습니다: {name}")
+                    continue
+                try:
+                    self._services[name].get()
+                except Exception as e:
+                    logger.error(f"❌ 서비스 미리 생성 실패: {name} - {e}")
+
+        if not background:
+            run()
+            return None
+
+        thread = threading.Thread(target=run, name="service-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def status(self) -> dict:
+        """서비스별 생성 여부와 생성 시간 (관리자 모니터링용)"""
+        return {
+            name: {
+                "initialized": service.initialized,
+                "init_seconds": round(service._init_seconds, 3) if service._init_seconds is not None else None,
+            }
+            for name, service in self._services.items()
+        }
+
+
+# 싱글톤 인스턴스
+services = ServiceContainer()
@@ -1,14 +1,20 @@
 import os
-import json
 import logging
-from google import genai
-from google.genai import types
 
 from config import config
+from utils.model_router import model_router
+from utils.stt_parser import TolerantSegmentParser
 
 logger = logging.getLogger(__name__)
 
 
+def _load_genai():
+    """google-genai는 import 시간이 길어 API를 호출할 때 불러옵니다. (앱 시작 시간 단축)"""
+    from google import genai
+    from google.genai import types
+    return genai, types
+
+
 class STTManager:
     _instance = None
     _initialized = False
@@ -40,16 +46,64 @@ class STTManager:
                 return 0.0
         except:
             return 0.0
-        
-    
-    def transcribe_audio(self, audio_path):
-        """Google Gemini STT API로 음성 인식"""
+
+    @staticmethod
+    def _estimate_audio_seconds(audio_path, num_bytes):
+        """
+        모델 라우팅용 오디오 길이(초) 추정
+        WAV는 헤더에서 정확히 계산하고, 전처리된 Opus(.ogg)는 설정된 비트레이트,
+        그 외 형식은 128kbps 기준으로 추정합니다.
+        """
+        if audio_path.lower().endswith(".wav"):
+            try:
+                import wave
+                with wave.open(audio_path, "rb") as wav_file:
+                    return wav_file.getnframes() / float(wav_file.getframerate())
+            except Exception:
+                pass
+        if audio_path.lower().endswith(".ogg"):
+            bitrate = int(config.AUDIO_TARGET_BITRATE.rstrip("k")) * 1000
+            return num_bytes / (bitrate / 8)
+        return num_bytes / (128000 / 8)
+
+    @staticmethod
+    def _normalize_segment(idx, segment):
+        """Gemini 세그먼트 객체를 내부 세그먼트 형식으로 변환"""
+        return {
+            "id": idx,
+            "speaker": segment.get("speaker", 1),
+            "start_time": STTManager._parse_mmss_to_seconds(str(segment.get("start_time_mmss", "0:00:000"))),
+            "confidence": segment.get("confidence", 0.0),
+            "text": segment.get("text", ""),
+        }
+
+    def transcribe_audio(self, audio_path, on_segment=None, report=None):
+        """
+        Google Gemini STT API로 음성 인식
+
+        응답을 스트리밍으로 받으면서 관용 파서(TolerantSegmentParser)로 세그먼트를 즉시 추출합니다.
+        일부 세그먼트가 깨져 있어도 나머지는 살리고, 손실 구간은 로그로 보고합니다.
+
+        Args:
+            audio_path (str): 오디오 파일 경로
+            on_segment (callable, optional): 세그먼트가 파싱될 때마다 호출되는 콜백 (정규화된 segment dict)
+                                             응답이 끝나기 전에 앞부분을 저장하는 용도
+                                             콜백 예외(DB 저장 실패 등)는 스트림 오류로 처리하지 않고 그대로 다시 발생시킵니다.
+            report (dict, optional): 파싱 결과를 채워 받을 dict (parsed, repaired, lost, lost_ranges)
+                                     lost_ranges가 있으면 일부 구간이 빠진 전사입니다. (스트림 중단 포함)
+
+        Returns:
+            list or None: 정규화된 세그먼트 리스트 (실패 시 None)
+        """
+        # on_segment에서 발생한 예외 (모델 폴백/부분 결과 처리 없이 호출한 쪽으로 전달)
+        sink_error = []
         try:
             import threading
             import datetime
             thread_id = threading.current_thread().name
             timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
             logger.info(f"[{timestamp}][{thread_id}] 🎧 Gemini STT API로 음성 인식 중: {audio_path}")
+            genai, types = _load_genai()
             api_key = config.GOOGLE_API_KEY
             if api_key:
                 client = genai.Client(api_key=api_key)
@@ -63,6 +117,7 @@ class STTManager:
             mime_type_map = {
                 ".wav": "audio/wav", ".mp3": "audio/mp3",
                 ".m4a": "audio/mp4", ".flac": "audio/flac",
+                ".ogg": "audio/ogg",
             }
             mime_type = mime_type_map.get(file_ext, "audio/wav")
 
@@ -106,63 +161,108 @@ class STTManager:
             JSON 배열만 출력하고, 추가 설명이나 마크다운 코드 블록은 포함하지 마세요.
             """
 
-            logger.info("🤖 Gemini 2.5 Pro로 음성 인식 중...")
-            response = client.models.generate_content(
-                model="gemini-2.5-pro",
-                contents=[prompt, types.Part.from_bytes(data=file_bytes, mime_type=mime_type)],
+            audio_seconds = self._estimate_audio_seconds(audio_path, len(file_bytes))
+            logger.info(f"🤖 Gemini로 음성 인식 중... (오디오 약 {audio_seconds / 60:.1f}분)")
+
+            def stream_transcription(model):
+                # 모델 호출마다 새 파서 사용 (폴백 시 처음부터 다시 파싱)
+                parser = TolerantSegmentParser()
+                segments = []
+                raw_chunks = []
+                last_chunk = None
+
+                def accept(parsed):
+                    # 콜백 예외는 모델 라우터가 폴백 모델로 다시 호출하지 않도록(중복 저장) 기록만 하고 중단
+                    for item in parsed:
+                        segment = self._normalize_segment(len(segments), item)
+                        segments.append(segment)
+                        if on_segment:
+                            try:
+                                on_segment(segment)
+                            except Exception as e:
+                                sink_error.append(e)
+                                return False
+                    return True
+
+                stream = iter(client.models.generate_content_stream(
+                    model=model,
+                    contents=[prompt, types.Part.from_bytes(data=file_bytes, mime_type=mime_type)],
+                ))
+                interrupted = None
+                while True:
+                    # 스트림(전송) 오류만 잘린 응답으로 처리 (세그먼트 콜백은 try 밖에서 호출)
+                    try:
+                        chunk = next(stream)
+                    except StopIteration:
+                        break
+                    except Exception as stream_error:
+                        # 세그먼트를 하나도 받지 못했으면 폴백 모델로 재시도, 받았으면 잘린 응답으로 처리
+                        if not segments:
+                            raise
+                        logger.warning(f"⚠️ STT 스트림이 중간에 끊겼습니다 ({len(segments)}개 세그먼트 수신): {stream_error}")
+                        interrupted = stream_error
+                        break
+                    last_chunk = chunk
+                    if chunk.text:
+                        raw_chunks.append(chunk.text)
+                        if not accept(parser.feed(chunk.text)):
+                            return segments, parser, "".join(raw_chunks), last_chunk
+
+                accept(parser.finish())
+                if interrupted is not None:
+                    parser.record_interrupted(f"STT 스트림 중단: {interrupted}")
+                return segments, parser, "".join(raw_chunks), last_chunk
+
+            normalized_segments, parser, raw_response, last_chunk = model_router.call(
+                task="stt",
+                units=audio_seconds,
+                fn=stream_transcription,
             )
+            if sink_error:
+                raise sink_error[0]
 
-            # response.text가 None인지 체크
-            if response.text is None:
+            # 응답이 비어있는지 체크
+            if not raw_response.strip():
                 logger.warning("⚠️ Gemini 응답이 비어있습니다. 응답 상태 확인:")
-                logger.warning(f"   -candidates: {response.candidates if hasattr(response, 'candidates') else 'N/A'}")
-                logger.warning(f"   -prompt_feedback: {response.prompt_feedback if hasattr(response, 'prompt_feedback') else 'N/A'}")
+                logger.warning(f"   -candidates: {last_chunk.candidates if hasattr(last_chunk, 'candidates') else 'N/A'}")
+                logger.warning(f"   -prompt_feedback: {last_chunk.prompt_feedback if hasattr(last_chunk, 'prompt_feedback') else 'N/A'}")
 
                 # 안전 필터링 체크
-                if hasattr(response, 'prompt_feedback') and response.prompt_feedback:
-                    logger.warning(f"⚠️ 프롬프트가 차단되었을 수 있습니다: {response.prompt_feedback}")
+                if hasattr(last_chunk, 'prompt_feedback') and last_chunk.prompt_feedback:
+                    logger.warning(f"⚠️ 프롬프트가 차단되었을 수 있습니다: {last_chunk.prompt_feedback}")
 
                 raise ValueError("Gemini API가 빈 응답을 반환했습니다. 안전 필터링 또는 API 오류일 수 있습니다.")
 
-            cleaned_response = response.text.strip().replace("```json", "").replace("```", "").strip()
-
-            # JSON 파싱 시도
-            try:
-                result_list = json.loads(cleaned_response)
-            except json.JSONDecodeError as e:
-                logger.error(f"❌ JSON 파싱 실패: {e}")
-                logger.info(f"📝 오류 위치: line {e.lineno}, column {e.colno}")
-
-                # 응답 일부 출력 (디버깅용)
-                lines = cleaned_response.split('\n')
-                if e.lineno <= len(lines):
-                    error_line = lines[e.lineno - 1]
-                    logger.info(f"📄 오류 발생 줄: {error_line}")
-                    if e.colno > 0:
-                        logger.info(f"    {' ' * (e.colno - 1)}^ 여기")
+            parse_report = parser.report()
+            if report is not None:
+                report.update(parse_report)
+            if parse_report['lost']:
+                logger.warning(f"⚠️ 파싱 손실 구간 {parse_report['lost']}개 (복구 {parse_report['repaired']}개, 성공 {parse_report['parsed']}개)")
+                for lost in parse_report['lost_ranges']:
+                    logger.warning(
+                        f"   - 세그먼트 #{lost['after_segment_index']} 이후, "
+                        f"{lost['prev_start_time_mmss']} ~ {lost['next_start_time_mmss']}: {lost['reason']}"
+                    )
 
                 # 전체 응답 저장 (디버깅용)
                 error_log_path = os.path.join(os.path.dirname(__file__), '..', 'gemini_error_response.txt')
                 with open(error_log_path, 'w', encoding='utf-8') as f:
-                    f.write(cleaned_response)
+                    f.write(raw_response)
                 logger.info(f"📁 전체 응답이 저장되었습니다: {error_log_path}")
+            elif parse_report['repaired']:
+                logger.info(f"🔧 결함이 있는 세그먼트 {parse_report['repaired']}개를 복구했습니다.")
+
+            if not normalized_segments:
+                raise ValueError("Gemini 응답에서 유효한 세그먼트를 찾지 못했습니다.")
+
+            logger.info(f"✅ Gemini 음성 인식 완료 ({len(normalized_segments)}개 세그먼트)")
 
-                raise ValueError(f"Gemini 응답이 올바른 JSON 형식이 아닙니다: {e}")
-
-            normalized_segments = []
-            for idx, segment in enumerate(result_list):
-                normalized_segments.append({
-                    "id": idx,
-                    "speaker": segment.get("speaker", 1),
-                    "start_time": self._parse_mmss_to_seconds(segment.get("start_time_mmss", "0:00:000")),
-                    "confidence": segment.get("confidence", 0.0),
-                    "text": segment.get("text", ""),
-                })
-            logger.info("✅ Gemini 음성 인식 완료")
-            
             return normalized_segments
 
         except Exception as e:
+            if sink_error:
+                # 세그먼트 저장 실패는 STT 실패가 아니므로 호출한 쪽에서 처리 (잘린 전사를 성공으로 저장하지 않도록)
+                raise
             import traceback
             traceback.print_exc()
             logger.error(f"❌ Gemini 오류 발생: {e}")
@@ -209,8 +309,8 @@ class STTManager:
         if not api_key:
             raise ValueError("GOOGLE_API_KEY가 .env 파일에 설정되지 않았습니다.")
 
+        genai, types = _load_genai()
         client = genai.Client(api_key=api_key)
-        model = "gemini-2.5-pro"
 
         import threading
         import datetime
@@ -218,16 +318,20 @@ class STTManager:
         timestamp = datetime.datetime.now().strftime("%H:%M:%S.%f")[:-3]
         logger.info(f"[{timestamp}][{thread_id}] 🤖 Gemini를 통해 요약 생성 중...")
         try:
-            response = client.models.generate_content(
-                model=model,
-                contents=[
-                    types.Content(
-                        role="user",
-                        parts=[
-                            types.Part.from_text(text=prompt_text),
-                        ],
-                    ),
-                ],
+            response = model_router.call(
+                task="summary",
+                units=len(transcript_text),
+                fn=lambda model: client.models.generate_content(
+                    model=model,
+                    contents=[
+                        types.Content(
+                            role="user",
+                            parts=[
+                                types.Part.from_text(text=prompt_text),
+                            ],
+                        ),
+                    ],
+                ),
             )
             summary_content = response.text.strip()
             logger.info("✅ Gemini 요약 생성 완료.")
@@ -335,21 +439,25 @@ class STTManager:
         if not api_key:
             raise ValueError("GOOGLE_API_KEY가 .env 파일에 설정되지 않았습니다.")
 
+        genai, types = _load_genai()
         client = genai.Client(api_key=api_key)
-        model = "gemini-2.5-pro"
 
         logger.info("🤖 Gemini를 통해 회의록 생성 중...")
         try:
-            response = client.models.generate_content(
-                model=model,
-                contents=[
-                    types.Content(
-                        role="user",
-                        parts=[
-                            types.Part.from_text(text=prompt_text),
-                        ],
-                    ),
-                ],
+            response = model_router.call(
+                task="minutes",
+                units=len(transcript_text) + len(summary_content or ""),
+                fn=lambda model: client.models.generate_content(
+                    model=model,
+                    contents=[
+                        types.Content(
+                            role="user",
+                            parts=[
+                                types.Part.from_text(text=prompt_text),
+                            ],
+                        ),
+                    ],
+                ),
             )
             minutes_content = response.text.strip()
             logger.info("✅ Gemini 회의록 생성 완료.")
@@ -518,6 +626,7 @@ class STTManager:
         if not api_key:
             raise ValueError("GOOGLE_API_KEY가 .env 파일에 설정되지 않았습니다.")
 
+        genai, types = _load_genai()
         client = genai.Client(api_key=api_key)
         model = "gemini-2.5-flash"  # Flash 모델 사용 (빠르고 저렴)
 
@@ -0,0 +1,355 @@
+"""
+Gemini STT 응답용 관용(tolerant) 증분 JSON 파서
+- 세그먼트 배열을 문자 단위로 스캔하여 완성된 객체가 도착하는 즉시 반환합니다.
+- 흔한 결함을 복구합니다: 코드 블록(```json), 뒤에 붙은 쉼표, 문자열 안의 이스케이프되지 않은 따옴표/줄바꿈,
+  응답이 잘려서 닫히지 않은 마지막 객체.
+- 복구할 수 없는 구간은 버리지 않고 lost_ranges에 위치와 사유를 기록합니다.
+  파싱에 실패한 객체 안에 다음 객체 경계(`},{`)가 있으면 그 위치부터 다시 스캔하여 뒤 세그먼트까지 잃지 않습니다.
+"""
+import json
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# 문자열을 닫는 따옴표 뒤에 올 수 있는 구조 문자
+_STRUCTURAL_AFTER_STRING = set("}]:")
+# 쉼표 뒤에서 다음 키(따옴표 문자열)를 찾을 최대 길이
+_MAX_KEY_LOOKAHEAD = 200
+# 객체 경계: 파싱 실패 시 다음 '{'부터 다시 스캔
+_OBJECT_BOUNDARY = re.compile(r"\}\s*,\s*\{")
+
+
+class TolerantSegmentParser:
+    """
+    STT 세그먼트 배열을 스트리밍으로 파싱합니다.
+
+    사용법:
+        parser = TolerantSegmentParser()
+        for chunk in stream:
+            for segment in parser.feed(chunk.text):
+                ...
+        for segment in parser.finish():
+            ...
+        parser.lost_ranges  # 복구 실패 구간
+    """
+
+    def __init__(self, required_keys=("text",)):
+        self.required_keys = tuple(required_keys)
+        self.lost_ranges = []
+        self.parsed_count = 0
+        self.repaired_count = 0
+
+        self._pending = ""        # 아직 판정하지 못한 입력 (문자열 종료 판단용 lookahead)
+        self._offset = 0          # 전체 스트림 기준 _pending[0]의 위치
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._buffer = []         # 현재 객체의 정규화된 텍스트
+        self._raw = []            # 현재 객체의 원본 텍스트 (파싱 실패 시 다시 스캔할 위치 탐색용)
+        self._comma_positions = []  # 현재 객체 최상위의 쉼표 위치 (잘린 객체 복구용)
+        self._object_start = None
+        self._repaired = False
+        self._last_start_time = None
+
+    # ==================== 공개 API ====================
+
+    def feed(self, text: str) -> list:
+        """
+        응답 조각을 입력하고 새로 완성된 세그먼트 목록을 반환합니다.
+
+        Args:
+            text (str): 스트리밍 응답 조각
+
+        Returns:
+            list: 완성된 세그먼트 dict 목록
+        """
+        if not text:
+            return []
+        self._pending += text
+        return self._scan(final=False)
+
+    def finish(self) -> list:
+        """
+        스트림 종료 처리. 잘린 마지막 객체를 복구해 반환합니다.
+
+        Returns:
+            list: 남은 세그먼트 dict 목록
+        """
+        segments = self._scan(final=True)
+
+        while self._object_start is not None:
+            raw, start = "".join(self._raw), self._object_start
+            segment = self._recover_truncated()
+            if segment is not None:
+                logger.warning(f"⚠️ 잘린 마지막 세그먼트를 복구했습니다 (위치 {start})")
+                segments.append(segment)
+                self._reset_object()
+                break
+
+            # 복구 실패: 안에 다음 객체 경계가 있으면 그 앞까지만 손실로 기록하고 경계부터 다시 스캔
+            restart = self._resync_position(raw)
+            end = start + (restart if restart is not None else len(raw))
+            self._record_lost(start, end, "응답이 잘려 복구 불가", "".join(self._buffer))
+            self._reset_object()
+            if restart is None:
+                break
+            self._pending = raw[restart:]
+            self._offset = end
+            segments.extend(self._scan(final=True))
+
+        return segments
+
+    def record_interrupted(self, reason: str):
+        """
+        스트림이 중간에 끊겨 응답 끝부분을 받지 못했음을 기록합니다. (finish() 이후 호출)
+        end_offset은 알 수 없으므로 None입니다.
+        """
+        self._record_lost(self._offset, None, reason, self._pending)
+
+    def report(self) -> dict:
+        """파싱 결과 요약 (로그/디버깅용)"""
+        return {
+            "parsed": self.parsed_count,
+            "repaired": self.repaired_count,
+            "lost": len(self.lost_ranges),
+            "lost_ranges": self.lost_ranges,
+        }
+
+    # ==================== 내부 구현 ====================
+
+    def _scan(self, final: bool) -> list:
+        segments = []
+        text = self._pending
+        i = 0
+
+        while i < len(text):
+            ch = text[i]
+
+            if self._object_start is None:
+                # 객체 밖: '{'가 나올 때까지 '[', ',', ']', 코드 블록 등은 무시
+                if ch == "{":
+                    self._object_start = self._offset + i
+                    self._depth = 1
+                    self._buffer = ["{"]
+                    self._raw = ["{"]
+                    self._comma_positions = []
+                i += 1
+                continue
+
+            if self._in_string:
+                if ch == '"' and not self._escape:
+                    # 다음 의미 있는 내용이 구조 문자/다음 키일 때만 문자열 종료로 판단
+                    closes = self._closes_string(text, i + 1, final)
+                    if closes is None:
+                        break  # lookahead 부족 → 다음 조각을 기다림
+                    if closes:
+                        self._buffer.append('"')
+                        self._in_string = False
+                    else:
+                        self._buffer.append('\\"')
+                        self._repaired = True
+                elif self._escape:
+                    self._buffer.append(ch)
+                    self._escape = False
+                elif ch == "\\":
+                    self._buffer.append(ch)
+                    self._escape = True
+                elif ch == "\n":
+                    self._buffer.append("\\n")
+                    self._repaired = True
+                elif ch in "\r\t":
+                    self._buffer.append(" ")
+                else:
+                    self._buffer.append(ch)
+                self._raw.append(ch)
+                i += 1
+                continue
+
+            # 객체 안, 문자열 밖
+            self._raw.append(ch)
+            if ch == '"':
+                self._in_string = True
+                self._buffer.append(ch)
+            elif ch in "{[":
+                self._depth += 1
+                self._buffer.append(ch)
+            elif ch in "}]":
+                self._strip_trailing_comma()
+                self._depth -= 1
+                self._buffer.append(ch)
+                if self._depth == 0:
+                    start, raw = self._object_start, "".join(self._raw)
+                    segment = self._parse_object("".join(self._buffer), start, self._offset + i + 1, raw)
+                    self._reset_object()
+                    if segment is not None:
+                        segments.append(segment)
+                    else:
+                        restart = self._resync_position(raw)
+                        if restart is not None:
+                            # 실패한 객체가 다음 객체까지 삼켰으면 경계의 '{'부터 다시 스캔
+                            text = raw[restart:] + text[i + 1:]
+                            self._offset = start + restart
+                            i = 0
+                            continue
+            else:
+                if ch == "," and self._depth == 1:
+                    self._comma_positions.append(len(self._buffer))
+                self._buffer.append(ch)
+            i += 1
+
+        self._pending = text[i:]
+        self._offset += i
+        return segments
+
+    @staticmethod
+    def _closes_string(text, j, final):
+        """
+        text[j-1]의 따옴표가 문자열을 닫는지 판단합니다.
+        뒤에 '}', ']', ':'가 오거나, 쉼표 다음에 괄호 또는 다음 키("key":)가 와야 닫는 따옴표로 봅니다.
+        ("he said "no", really" 처럼 문장 속 따옴표 뒤의 쉼표는 닫는 따옴표로 보지 않음)
+
+        Returns:
+            bool 또는 None (판단에 필요한 입력이 아직 도착하지 않음)
+        """
+        # 판단에 필요한 만큼만 잘라서 확인 (창이 가득 찼으면 뒤에 입력이 더 있어도 결과는 같음)
+        window = text[j:j + 2 * _MAX_KEY_LOOKAHEAD]
+        final = final or len(window) == 2 * _MAX_KEY_LOOKAHEAD
+        rest = window.lstrip()
+        if not rest:
+            return None if not final else True
+        if rest[0] in _STRUCTURAL_AFTER_STRING:
+            return True
+        if rest[0] != ",":
+            return False
+
+        after = rest[1:].lstrip()
+        if not after:
+            return None if not final else True
+        if after[0] in "{[}]":
+            return True
+        if after[0] != '"':
+            return False
+
+        close = after.find('"', 1, _MAX_KEY_LOOKAHEAD + 1)
+        if close == -1:
+            if len(after) <= _MAX_KEY_LOOKAHEAD and not final:
+                return None
+            return False
+        tail = after[close + 1:].lstrip()
+        if not tail:
+            return None if not final else True
+        return tail[0] in ":,}]"
+
+    @staticmethod
+    def _resync_position(raw):
+        """실패한 객체 원본 안의 첫 객체 경계 다음 '{' 위치 (없으면 None)"""
+        match = _OBJECT_BOUNDARY.search(raw, 1)
+        return match.end() - 1 if match else None
+
+    def _strip_trailing_comma(self):
+        """닫는 괄호 직전의 쉼표 제거 (예: {"a": 1,})"""
+        k = len(self._buffer) - 1
+        while k >= 0 and self._buffer[k] in (" ", "\n", "\t", "\r"):
+            k -= 1
+        if k >= 0 and self._buffer[k] == ",":
+            del self._buffer[k]
+            self._repaired = True
+
+    def _recover_truncated(self):
+        """
+        닫히지 않은 마지막 객체 복구
+        1) 열린 문자열/괄호를 그대로 닫아 보고, 2) 실패하면 마지막 완성된 키-값 쌍까지 잘라서 닫습니다.
+        """
+        text = "".join(self._buffer)
+        if self._in_string:
+            if self._escape:
+                text = text[:-1]
+            text += '"'
+
+        candidates = [text.rstrip().rstrip(",") + "}" * max(self._depth, 1)]
+        for position in reversed(self._comma_positions):
+            candidates.append("".join(self._buffer[:position]) + "}")
+
+        for candidate in candidates:
+            try:
+                obj = json.loads(candidate)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(obj, dict) and all(key in obj for key in self.required_keys):
+                self._repaired = True
+                return self._accept(obj)
+
+        return None
+
+    def _parse_object(self, text: str, start: int, end: int, raw: str):
+        """
+        정규화된 객체 텍스트를 파싱·검증합니다. 실패하면 lost_ranges에 기록.
+        원본 안에 다음 객체 경계가 있으면 경계 앞까지만 손실로 기록합니다. (호출한 쪽이 경계부터 다시 스캔)
+        """
+        try:
+            obj = json.loads(text)
+        except json.JSONDecodeError as e:
+            restart = self._resync_position(raw)
+            self._record_lost(start, end if restart is None else start + restart, f"JSON 파싱 실패: {e.msg}", text)
+            return None
+
+        if not isinstance(obj, dict) or any(key not in obj for key in self.required_keys):
+            self._record_lost(start, end, "필수 키 누락", text)
+            return None
+
+        return self._accept(obj)
+
+    def _accept(self, obj: dict) -> dict:
+        """검증된 세그먼트를 집계에 반영합니다."""
+        if self._repaired:
+            self.repaired_count += 1
+
+        # 직전 손실 구간들의 다음 세그먼트 시간 기록
+        for lost in reversed(self.lost_ranges):
+            if lost.get("next_start_time_mmss") is not None:
+                break
+            lost["next_start_time_mmss"] = obj.get("start_time_mmss")
+
+        self._last_start_time = obj.get("start_time_mmss", self._last_start_time)
+        self.parsed_count += 1
+        return obj
+
+    def _record_lost(self, start, end, reason, text):
+        entry = {
+            "start_offset": start,
+            "end_offset": end,
+            "after_segment_index": self.parsed_count - 1,
+            "prev_start_time_mmss": self._last_start_time,
+            "next_start_time_mmss": None,
+            "reason": reason,
+            "excerpt": text[:120],
+        }
+        self.lost_ranges.append(entry)
+        logger.warning(f"⚠️ STT 세그먼트 손실 (위치 {start}-{end}, {reason}): {text[:80]}")
+
+    def _reset_object(self):
+        self._object_start = None
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._buffer = []
+        self._raw = []
+        self._comma_positions = []
+        self._repaired = False
+
+
+def parse_segments(text: str):
+    """
+    전체 응답 문자열을 한 번에 파싱합니다.
+
+    Args:
+        text (str): Gemini 응답 전체
+
+    Returns:
+        (segments, parser): 세그먼트 목록과 결과 보고용 파서
+    """
+    parser = TolerantSegmentParser()
+    segments = parser.feed(text)
+    segments.extend(parser.finish())
+    return segments, parser
@@ -0,0 +1,113 @@
+"""
+토큰 수 계산 (tiktoken)
+- 청크 크기, 임베딩 요청 묶음, 프롬프트 컨텍스트를 글자 수 대신 토큰 수로 맞출 때 사용합니다.
+  (한국어는 글자 수와 토큰 수의 비율이 일정하지 않아 글자 수로는 비용과 임베딩 입력 한도를 예측하기 어려움)
+- 인코딩은 처음 사용할 때 한 번만 불러와 프로세스 안에서 재사용합니다. (BPE 파일 로딩에 수백 ms)
+- tiktoken을 불러올 수 없으면 글자 수로 대신 셉니다.
+  실패는 캐시하지 않고 일정 시간 뒤 다시 시도합니다. (BPE 파일 다운로드 일시 실패 등)
+"""
+import logging
+import threading
+import time
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+# 불러오기에 실패한 인코딩을 다시 시도하기까지의 대기 시간 (초)
+_RETRY_SECONDS = 60
+
+_encodings = {}  # 이름 → tiktoken.Encoding (성공한 경우만 보관)
+_failed_at = {}  # 이름 → 마지막 실패 시각
+_lock = threading.Lock()
+
+
+def get_encoding(name=None):
+    """
+    tiktoken 인코딩 (이름별로 한 번만 생성)
+
+    Args:
+        name (str, optional): 인코딩 이름 (기본값: TOKENIZER_ENCODING)
+
+    Returns:
+        tiktoken.Encoding 또는 None (불러올 수 없으면 글자 수로 계산)
+    """
+    name = name or config.TOKENIZER_ENCODING
+    encoding = _encodings.get(name)
+    if encoding is not None:
+        return encoding
+
+    with _lock:
+        if name in _encodings:
+            return _encodings[name]
+        if time.monotonic() - _failed_at.get(name, float("-inf")) < _RETRY_SECONDS:
+            return None
+        try:
+            import tiktoken
+            _encodings[name] = tiktoken.get_encoding(name)
+        except Exception as e:
+            _failed_at[name] = time.monotonic()
+            logger.warning(f"⚠️ 토크나이저를 불러올 수 없어 글자 수로 계산합니다 ({_RETRY_SECONDS}초 후 재시도): {name} - {e}")
+            return None
+        _failed_at.pop(name, None)
+        return _encodings[name]
+
+
+def count_tokens(text):
+    """
+    텍스트 하나의 토큰 수
+
+    Args:
+        text (str): 텍스트
+
+    Returns:
+        int: 토큰 수
+    """
+    encoding = get_encoding()
+    if encoding is None:
+        return len(text)
+    return len(encoding.encode_ordinary(text))
+
+
+def count_tokens_batch(texts):
+    """
+    여러 텍스트의 토큰 수 (tiktoken 배치 인코딩은 여러 스레드에서 계산)
+    세그먼트별로 한 번씩 세어 두면 청크 크기는 합산만으로 늘려갈 수 있습니다.
+
+    Args:
+        texts (list): 텍스트 리스트
+
+    Returns:
+        list: 텍스트별 토큰 수
+    """
+    texts = list(texts)
+    encoding = get_encoding()
+    if encoding is None:
+        return [len(text) for text in texts]
+    return [len(tokens) for tokens in encoding.encode_ordinary_batch(texts)]
+
+
+def pack_batches(token_counts, max_tokens, max_items):
+    """
+    순서를 유지하면서 토큰 합 max_tokens 이하, 개수 max_items 이하로 묶습니다. (임베딩 요청 묶음)
+    max_tokens보다 큰 항목 하나는 단독 묶음입니다.
+
+    Args:
+        token_counts (list): 항목별 토큰 수
+        max_tokens (int): 묶음당 최대 토큰 합
+        max_items (int): 묶음당 최대 항목 수
+
+    Returns:
+        list: [(begin, end), ...] (end 미포함)
+    """
+    batches = []
+    begin = 0
+    total = 0
+    for i, count in enumerate(token_counts):
+        if i > begin and (i - begin >= max_items or total + count > max_tokens):
+            batches.append((begin, i))
+            begin, total = i, 0
+        total += count
+    if begin < len(token_counts):
+        batches.append((begin, len(token_counts)))
+    return batches
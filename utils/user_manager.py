@@ -6,11 +6,15 @@
 """
 
 import os
+import json
+import base64
 import logging
 import sqlite3
+from datetime import datetime, timezone
 from typing import Optional, Dict, List
 
 from config import config
+from utils.access_control import access_control
 
 logger = logging.getLogger(__name__)
 
@@ -131,9 +135,8 @@ def get_user_by_email(email: str) -> Optional[Dict]:
 
 
 def is_admin(user_id: int) -> bool:
-    """사용자가 admin인지 확인"""
-    user = get_user_by_id(user_id)
-    return user and user['role'] == 'admin'
+    """사용자가 admin인지 확인 (요청 단위로 캐시됨)"""
+    return access_control.is_admin(user_id)
 
 
 def can_access_meeting(user_id: int, meeting_id: str) -> bool:
@@ -145,39 +148,208 @@ def can_access_meeting(user_id: int, meeting_id: str) -> bool:
     2. admin 권한
     3. 공유받은 노트
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    return access_control.can_access(user_id, meeting_id)
+
+
+def _encode_cursor(meeting_date: str, meeting_id: str) -> str:
+    """목록의 마지막 항목 (meeting_date, meeting_id)를 불투명한 커서 문자열로 변환"""
+    raw = json.dumps([meeting_date, meeting_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple:
+    """
+    커서 문자열을 (meeting_date, meeting_id)로 복원
 
+    Raises:
+        ValueError: 잘못된 커서
+    """
     try:
-        # 1. Admin 체크
-        if is_admin(user_id):
-            return True
+        padded = cursor + "=" * (-len(cursor) % 4)
+        meeting_date, meeting_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return str(meeting_date), str(meeting_id)
+    except Exception:
+        raise ValueError("잘못된 커서입니다.")
 
-        # 2. 본인이 생성한 노트 체크 (meeting_dialogues 기준)
-        cursor.execute("""
-            SELECT COUNT(*) as count
-            FROM meeting_dialogues
-            WHERE meeting_id = ? AND owner_id = ?
-        """, (meeting_id, user_id))
-        result = cursor.fetchone()
-        if result and result['count'] > 0:
-            return True
 
-        # 3. 공유받은 노트 체크
-        cursor.execute("""
-            SELECT COUNT(*) as count
-            FROM meeting_shares
-            WHERE meeting_id = ? AND shared_with_user_id = ?
-        """, (meeting_id, user_id))
-        result = cursor.fetchone()
-        if result and result['count'] > 0:
-            return True
+def normalize_since(since: str) -> str:
+    """
+    변경분 기준 시각을 DB 저장 형식(UTC, 'YYYY-MM-DD HH:MM:SS.fff')으로 변환
+
+    Args:
+        since: ISO 8601 문자열 (시간대가 없으면 UTC로 간주) 또는 이전 응답의 next_since
+
+    Raises:
+        ValueError: 형식이 잘못된 경우
+    """
+    parsed = datetime.fromisoformat(since.strip().replace("Z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime("%Y-%m-%d %H:%M:%S.") + f"{parsed.microsecond // 1000:03d}"
+
+
+def _scope_condition(user_id: int, scope: str, admin: bool) -> tuple:
+    """목록 범위(mine/shared)에 해당하는 WHERE 조건과 파라미터"""
+    if scope == "shared":
+        return (
+            "m.meeting_id IN (SELECT meeting_id FROM meeting_shares WHERE shared_with_user_id = ?)",
+            [user_id]
+        )
+    if admin:
+        return "1 = 1", []
+    return "m.owner_id = ?", [user_id]
+
+
+def _meeting_row(row) -> Dict:
+    meeting = dict(row)
+    # 'date'는 템플릿 호환용
+    meeting['date'] = meeting['meeting_date']
+    return meeting
+
+
+def list_meetings(
+    user_id: int,
+    scope: str = "mine",
+    cursor: str = None,
+    limit: int = None,
+    order: str = "desc",
+    date_from: str = None,
+    date_to: str = None,
+    title_prefix: str = None,
+    owner_id: int = None
+) -> Dict:
+    """
+    노트 목록을 (meeting_date, meeting_id) 순서의 커서 기반으로 조회
+
+    OFFSET 없이 마지막 항목 이후부터 인덱스를 따라 읽으므로 페이지 위치와 관계없이 일정한 속도로 조회됩니다.
+
+    Args:
+        user_id: 사용자 ID
+        scope: 'mine' (Admin은 전체) 또는 'shared' (공유받은 노트)
+        cursor: 이전 페이지 응답의 next_cursor
+        limit: 페이지 크기 (None이면 전체)
+        order: 'desc' (최신순) 또는 'asc' (오래된순)
+        date_from: 시작 날짜 (YYYY-MM-DD, 포함)
+        date_to: 종료 날짜 (YYYY-MM-DD, 포함)
+        title_prefix: 제목 접두어
+        owner_id: 작성자 ID
+
+    Returns:
+        {'meetings': [...], 'next_cursor': str 또는 None}
+
+    Raises:
+        ValueError: 잘못된 커서
+    """
+    descending = order != "asc"
+    scope_sql, params = _scope_condition(user_id, scope, is_admin(user_id))
+    conditions = [scope_sql]
+
+    if cursor:
+        cursor_date, cursor_id = _decode_cursor(cursor)
+        conditions.append(f"(m.meeting_date, m.meeting_id) {'<' if descending else '>'} (?, ?)")
+        params += [cursor_date, cursor_id]
+    if date_from:
+        conditions.append("m.meeting_date >= ?")
+        params.append(date_from)
+    if date_to:
+        conditions.append("m.meeting_date < date(?, '+1 day')")
+        params.append(date_to)
+    if title_prefix:
+        escaped = title_prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        conditions.append("m.title LIKE ? ESCAPE '\\'")
+        params.append(escaped + "%")
+    if owner_id is not None:
+        conditions.append("m.owner_id = ?")
+        params.append(owner_id)
+
+    direction = "DESC" if descending else "ASC"
+    query = f"""
+        SELECT m.meeting_id, m.title, m.meeting_date, m.audio_file, m.owner_id, m.created_at, m.updated_at
+        FROM meetings m
+        WHERE {" AND ".join(conditions)}
+        ORDER BY m.meeting_date {direction}, m.meeting_id {direction}
+    """
+    if limit:
+        # 다음 페이지 존재 여부 확인을 위해 1개 더 조회
+        query += " LIMIT ?"
+        params.append(limit + 1)
+
+    conn = get_db_connection()
+    try:
+        rows = conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor(last['meeting_date'], last['meeting_id'])
+
+    return {"meetings": [_meeting_row(row) for row in rows], "next_cursor": next_cursor}
+
+
+def get_meetings_changed_since(user_id: int, since: str, scope: str = "mine") -> Dict:
+    """
+    since 이후 추가/변경/삭제된 노트만 조회 (업로드 상태 폴링용)
+
+    Args:
+        user_id: 사용자 ID
+        since: 기준 시각 (normalize_since 형식)
+        scope: 'mine' 또는 'shared'
+
+    Returns:
+        {'meetings': [...], 'deleted': [meeting_id, ...], 'next_since': str, 'reset': bool}
+        reset이 True이면 삭제 기록 보관 기간이 지났으므로 전체 목록을 다시 받아야 합니다.
+    """
+    admin = is_admin(user_id)
+    scope_sql, params = _scope_condition(user_id, scope, admin)
 
-        return False
+    if scope == "shared":
+        deletion_sql, deletion_params = "user_id = ?", [user_id]
+    elif admin:
+        deletion_sql, deletion_params = "user_id IS NULL", []
+    else:
+        deletion_sql, deletion_params = "user_id IS NULL AND owner_id = ?", [user_id]
 
+    conn = get_db_connection()
+    try:
+        # 다음 기준 시각은 조회 시작 시각보다 조금 앞당김 (조회 중 커밋된 쓰기 누락 방지, 중복은 클라이언트가 덮어씀)
+        clock = conn.execute("""
+            SELECT strftime('%Y-%m-%d %H:%M:%f', 'now', ?) AS next_since,
+                   strftime('%Y-%m-%d %H:%M:%f', 'now', ?) AS retention_start
+        """, (
+            f"-{config.NOTES_DELTA_SKEW_SECONDS} seconds",
+            f"-{config.NOTES_DELETION_RETENTION_DAYS} days"
+        )).fetchone()
+
+        if since < clock['retention_start']:
+            return {"meetings": [], "deleted": [], "next_since": clock['next_since'], "reset": True}
+
+        rows = conn.execute(f"""
+            SELECT m.meeting_id, m.title, m.meeting_date, m.audio_file, m.owner_id, m.created_at, m.updated_at
+            FROM meetings m
+            WHERE m.updated_at > ? AND {scope_sql}
+            ORDER BY m.updated_at
+        """, [since] + params).fetchall()
+
+        deleted = conn.execute(f"""
+            SELECT DISTINCT meeting_id
+            FROM meeting_deletions
+            WHERE deleted_at > ? AND {deletion_sql}
+        """, [since] + deletion_params).fetchall()
     finally:
         conn.close()
 
+    # 삭제 후 다시 공유된 경우처럼 현재 존재하는 노트는 삭제 목록에서 제외
+    present = {row['meeting_id'] for row in rows}
+    return {
+        "meetings": [_meeting_row(row) for row in rows],
+        "deleted": [row['meeting_id'] for row in deleted if row['meeting_id'] not in present],
+        "next_since": clock['next_since'],
+        "reset": False
+    }
+
 
 def get_user_meetings(user_id: int) -> List[Dict]:
     """
@@ -187,54 +359,12 @@ def get_user_meetings(user_id: int) -> List[Dict]:
     - Admin: 모든 노트
     - User: 본인이 생성한 노트만 (공유받은 노트는 get_shared_meetings()에서 조회)
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
-        if is_admin(user_id):
-            # Admin: 모든 노트 (meeting_dialogues에서 고유한 meeting_id 조회)
-            cursor.execute("""
-                SELECT
-                    meeting_id,
-                    title,
-                    MAX(meeting_date) as meeting_date,
-                    (SELECT audio_file FROM meeting_dialogues WHERE meeting_id = md.meeting_id LIMIT 1) as audio_file,
-                    (SELECT owner_id FROM meeting_dialogues WHERE meeting_id = md.meeting_id LIMIT 1) as owner_id
-                FROM meeting_dialogues md
-                GROUP BY meeting_id
-                ORDER BY meeting_date DESC
-            """)
-        else:
-            # User: 본인이 작성한 노트만
-            cursor.execute("""
-                SELECT
-                    meeting_id,
-                    title,
-                    MAX(meeting_date) as meeting_date,
-                    (SELECT audio_file FROM meeting_dialogues WHERE meeting_id = md.meeting_id LIMIT 1) as audio_file,
-                    (SELECT owner_id FROM meeting_dialogues WHERE meeting_id = md.meeting_id LIMIT 1) as owner_id
-                FROM meeting_dialogues md
-                WHERE (SELECT owner_id FROM meeting_dialogues WHERE meeting_id = md.meeting_id LIMIT 1) = ?
-                GROUP BY meeting_id
-                ORDER BY meeting_date DESC
-            """, (user_id,))
-
-        meetings = cursor.fetchall()
-        # 'meeting_date'를 'date'로 키 이름 변경 (템플릿 호환성)
-        result = []
-        for meeting in meetings:
-            meeting_dict = dict(meeting)
-            meeting_dict['date'] = meeting_dict.pop('meeting_date', None)
-            result.append(meeting_dict)
-        return result
-
-    finally:
-        conn.close()
+    return list_meetings(user_id, scope="mine")["meetings"]
 
 
 def get_shared_meetings(user_id: int) -> List[Dict]:
     """
-    사용자가 공유받은 회의 목록만 조회 (본인 노트 제외)
+    사용자가 공유받은 회의 목록만 조회
 
     Args:
         user_id: 사용자 ID
@@ -242,36 +372,7 @@ def get_shared_meetings(user_id: int) -> List[Dict]:
     Returns:
         공유받은 회의 목록 (meeting_id, title, meeting_date, audio_file)
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
-        # 공유받은 노트만 조회 (owner_id != user_id)
-        cursor.execute("""
-            SELECT DISTINCT
-                md.meeting_id,
-                md.title,
-                MAX(md.meeting_date) as meeting_date,
-                (SELECT audio_file FROM meeting_dialogues WHERE meeting_id = md.meeting_id LIMIT 1) as audio_file,
-                (SELECT owner_id FROM meeting_dialogues WHERE meeting_id = md.meeting_id LIMIT 1) as owner_id
-            FROM meeting_dialogues md
-            INNER JOIN meeting_shares s ON md.meeting_id = s.meeting_id
-            WHERE s.shared_with_user_id = ?
-            GROUP BY md.meeting_id
-            ORDER BY meeting_date DESC
-        """, (user_id,))
-
-        meetings = cursor.fetchall()
-        # 'meeting_date'를 'date'로 키 이름 변경 (템플릿 호환성)
-        result = []
-        for meeting in meetings:
-            meeting_dict = dict(meeting)
-            meeting_dict['date'] = meeting_dict.pop('meeting_date', None)
-            result.append(meeting_dict)
-        return result
-
-    finally:
-        conn.close()
+    return list_meetings(user_id, scope="shared")["meetings"]
 
 
 def share_meeting(meeting_id: str, owner_id: int, shared_with_email: str) -> Dict:
@@ -301,7 +402,7 @@ def share_meeting(meeting_id: str, owner_id: int, shared_with_email: str) -> Dic
 
         # 3. 소유자 확인
         cursor.execute("""
-            SELECT owner_id FROM meeting_dialogues WHERE meeting_id = ? LIMIT 1
+            SELECT owner_id FROM meetings WHERE meeting_id = ?
         """, (meeting_id,))
         result = cursor.fetchone()
 
@@ -328,6 +429,7 @@ def share_meeting(meeting_id: str, owner_id: int, shared_with_email: str) -> Dic
             VALUES (?, ?, ?, 'read')
         """, (meeting_id, owner_id, shared_user['id']))
         conn.commit()
+        access_control.invalidate(shared_user['id'])
 
         logger.info(f"✅ 회의 공유 완료: {meeting_id} → {shared_with_email}")
 
@@ -376,7 +478,7 @@ def remove_share(meeting_id: str, owner_id: int, shared_user_id: int) -> Dict:
     try:
         # 소유자 확인
         cursor.execute("""
-            SELECT owner_id FROM meeting_minutes WHERE meeting_id = ?
+            SELECT owner_id FROM meetings WHERE meeting_id = ?
         """, (meeting_id,))
         result = cursor.fetchone()
 
@@ -389,6 +491,7 @@ def remove_share(meeting_id: str, owner_id: int, shared_user_id: int) -> Dict:
             WHERE meeting_id = ? AND owner_id = ? AND shared_with_user_id = ?
         """, (meeting_id, owner_id, shared_user_id))
         conn.commit()
+        access_control.invalidate(shared_user_id)
 
         if cursor.rowcount > 0:
             return {'success': True, 'message': '공유가 제거되었습니다.'}
@@ -413,33 +516,9 @@ def get_user_accessible_meeting_ids(user_id: int) -> List[str]:
     Returns:
         meeting_id 목록 (예: ['meeting_1', 'meeting_2', ...])
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
-        if is_admin(user_id):
-            # Admin: 모든 meeting_id
-            cursor.execute("""
-                SELECT DISTINCT meeting_id
-                FROM meeting_dialogues
-            """)
-        else:
-            # User: 본인 노트 + 공유받은 노트
-            cursor.execute("""
-                SELECT DISTINCT md.meeting_id
-                FROM meeting_dialogues md
-                LEFT JOIN meeting_shares s ON md.meeting_id = s.meeting_id
-                WHERE md.owner_id = ? OR s.shared_with_user_id = ?
-            """, (user_id, user_id))
-
-        results = cursor.fetchall()
-        meeting_ids = [row['meeting_id'] for row in results]
-
-        logger.info(f"✅ 사용자 {user_id} 접근 가능한 노트: {len(meeting_ids)}개")
-        return meeting_ids
-
-    finally:
-        conn.close()
+    meeting_ids = access_control.get_accessible_meeting_ids(user_id)
+    logger.info(f"✅ 사용자 {user_id} 접근 가능한 노트: {len(meeting_ids)}개")
+    return meeting_ids
 
 
 def can_edit_meeting(user_id: int, meeting_id: str) -> bool:
@@ -458,27 +537,4 @@ def can_edit_meeting(user_id: int, meeting_id: str) -> bool:
     Returns:
         수정 권한 여부 (True/False)
     """
-    conn = get_db_connection()
-    cursor = conn.cursor()
-
-    try:
-        # 1. Admin 체크
-        if is_admin(user_id):
-            return True
-
-        # 2. Owner 체크 (meeting_dialogues 기준)
-        cursor.execute("""
-            SELECT owner_id
-            FROM meeting_dialogues
-            WHERE meeting_id = ?
-            LIMIT 1
-        """, (meeting_id,))
-        result = cursor.fetchone()
-
-        if not result:
-            return False
-
-        return result['owner_id'] == user_id
-
-    finally:
-        conn.close()
+    return access_control.can_edit(user_id, meeting_id)
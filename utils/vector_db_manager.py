@@ -1,22 +1,236 @@
 
-import chromadb
 import os
 import re
+import time
 import logging
-from langchain_openai import OpenAIEmbeddings, ChatOpenAI
-from langchain_chroma import Chroma
-
-from langchain_classic.retrievers.self_query.base import SelfQueryRetriever
-from langchain_classic.chains.query_constructor.base import AttributeInfo
-
-# 텍스트 분할을 위한 import (의미적 청킹 대안)
-from langchain_text_splitters import RecursiveCharacterTextSplitter
-import numpy as np
 
 from config import config
+from utils.chunking import format_segment, child_chunk_ranges, semantic_chunk_ranges
+from utils.query_filter import QueryFilterExtractor
+from utils.service_container import services
+from utils.tokenizer import count_tokens, count_tokens_batch, pack_batches
+
+# chromadb / langchain은 import만으로 수 초가 걸리므로 사용하는 메서드 안에서 import합니다.
+# (vdb_manager는 처음 사용할 때 생성되는 지연 초기화 서비스)
 
 logger = logging.getLogger(__name__)
 
+
+def create_chroma_client(mode, persist_directory):
+    """
+    VECTOR_DB_MODE에 따라 ChromaDB 클라이언트를 생성합니다.
+
+    - embedded: persist_directory를 프로세스 안에서 직접 여는 PersistentClient
+                (여러 프로세스가 같은 디렉터리를 열면 인덱스가 손상될 수 있으므로 워커 1개일 때만 사용)
+    - http: Chroma 서버에 접속하는 HttpClient
+            프로세스당 하나의 클라이언트가 keep-alive 연결 풀을 재사용하며, 여러 워커/호스트가 같은 인덱스를 공유합니다.
+
+    Args:
+        mode (str): 'embedded' 또는 'http' (VECTOR_DB_MODE)
+        persist_directory (str): embedded 모드의 저장 경로
+
+    Returns:
+        chromadb 클라이언트
+
+    Raises:
+        ValueError: 알 수 없는 모드
+        Exception: http 모드에서 서버에 연결할 수 없는 경우 (다음 사용 시 다시 생성 시도)
+    """
+    import chromadb
+    from chromadb.config import Settings
+
+    if mode == 'embedded':
+        logger.info(f"ℹ️ 벡터 DB embedded 모드: {persist_directory} (여러 워커로 실행하려면 VECTOR_DB_MODE=http)")
+        return chromadb.PersistentClient(path=persist_directory)
+
+    if mode == 'http':
+        headers = {"Authorization": f"Bearer {config.CHROMA_AUTH_TOKEN}"} if config.CHROMA_AUTH_TOKEN else None
+        # 연결 풀은 chromadb가 관리 (1.3.0: httpx 기본 풀 + keep-alive 40초, 설정으로 바꿀 수 없음)
+        # 클라이언트를 프로세스당 하나만 만들어 재사용하므로 요청마다 새 연결을 맺지 않습니다.
+        client = chromadb.HttpClient(
+            host=config.CHROMA_HOST,
+            port=config.CHROMA_PORT,
+            ssl=config.CHROMA_SSL,
+            headers=headers,
+            settings=Settings(anonymized_telemetry=False),
+        )
+        # 시작 시 서버 연결 확인 (실패하면 예외 → 처음 사용하는 요청이 오류를 받고, 다음 사용 시 다시 연결)
+        client.heartbeat()
+        logger.info(f"✅ Chroma 서버 연결: {config.CHROMA_HOST}:{config.CHROMA_PORT}")
+        return client
+
+    raise ValueError(f"알 수 없는 VECTOR_DB_MODE: {mode} (embedded 또는 http)")
+
+
+class VectorStore:
+    """
+    벡터 저장소 인터페이스 (컬렉션 1개)
+    - VectorDBManager는 이 인터페이스만 사용하므로 VECTOR_STORE_BACKEND 설정으로 구현을 바꿀 수 있습니다.
+    - where는 Chroma 메타데이터 필터 문법을 따릅니다. (예: {"meeting_id": "..."}, {"meeting_id": {"$in": [...]}})
+    - 점수는 클수록 유사한 relevance 점수입니다. (Chroma 기본 l2 거리를 변환한 값과 같은 척도)
+    """
+    backend = None
+
+    def __init__(self, name, embedding_function):
+        self.name = name
+        self.embedding_function = embedding_function
+
+    def add(self, ids, texts, metadatas=None, embeddings=None):
+        """
+        문서 추가 (같은 id가 있으면 교체)
+
+        Args:
+            ids (list): 문서 id 목록
+            texts (list): 문서 본문 목록
+            metadatas (list, optional): 메타데이터 목록
+            embeddings (list, optional): 미리 계산한 임베딩 (없으면 embedding_function으로 계산)
+
+        Returns:
+            list: 저장한 id 목록
+        """
+        raise NotImplementedError
+
+    def get(self, ids=None, where=None, include=("documents", "metadatas"), limit=None, offset=0):
+        """
+        조건에 맞는 문서 조회
+
+        Returns:
+            dict: {'ids': [...], 'documents': [...], 'metadatas': [...]} (include에 있는 항목만)
+        """
+        raise NotImplementedError
+
+    def delete(self, ids=None, where=None):
+        """
+        조건에 맞는 문서 삭제 (ids와 where가 모두 없으면 전체 삭제)
+
+        Returns:
+            int: 삭제한 문서 수
+        """
+        raise NotImplementedError
+
+    def update_metadata(self, ids, metadatas):
+        """문서 메타데이터 교체 (본문과 임베딩은 유지)"""
+        raise NotImplementedError
+
+    def count(self):
+        """저장된 문서 수"""
+        raise NotImplementedError
+
+    def heartbeat(self):
+        """저장소 연결 확인 (실패하면 예외)"""
+        raise NotImplementedError
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4, where=None):
+        """
+        임베딩과 가장 유사한 문서 검색
+
+        Returns:
+            list: [(Document, relevance 점수), ...] (점수 내림차순)
+        """
+        raise NotImplementedError
+
+    def similarity_search_by_vector_with_embeddings(self, embedding, k=4, where=None):
+        """
+        similarity_search_by_vector_with_score와 같지만 문서 임베딩도 함께 반환 (검색 결과 재순위용)
+
+        Returns:
+            list: [(Document, relevance 점수, 임베딩), ...] (점수 내림차순)
+        """
+        raise NotImplementedError
+
+    def max_marginal_relevance_search_by_vector(self, embedding, k=4, fetch_k=20, lambda_mult=0.5, where=None):
+        """
+        MMR 검색 (fetch_k개 후보 중 쿼리 유사도와 다양성을 함께 고려해 k개 선택)
+
+        Returns:
+            list: Document 목록
+        """
+        raise NotImplementedError
+
+    def similarity_search_with_score(self, query, k=4, where=None):
+        """텍스트 쿼리를 임베딩해서 similarity_search_by_vector_with_score 실행"""
+        embedding = self.embedding_function.embed_query(query)
+        return self.similarity_search_by_vector_with_score(embedding, k=k, where=where)
+
+    def max_marginal_relevance_search(self, query, k=4, fetch_k=20, lambda_mult=0.5, where=None):
+        """텍스트 쿼리를 임베딩해서 max_marginal_relevance_search_by_vector 실행"""
+        embedding = self.embedding_function.embed_query(query)
+        return self.max_marginal_relevance_search_by_vector(
+            embedding, k=k, fetch_k=fetch_k, lambda_mult=lambda_mult, where=where
+        )
+
+
+class ChromaVectorStore(VectorStore):
+    """ChromaDB 컬렉션 (LangChain Chroma 래퍼 사용, embedded/http 모드 모두 지원)"""
+    backend = 'chroma'
+
+    def __init__(self, client, name, embedding_function):
+        super().__init__(name, embedding_function)
+        from langchain_chroma import Chroma
+
+        self.client = client
+        self.langchain_store = Chroma(
+            client=client,
+            collection_name=name,
+            embedding_function=embedding_function,
+        )
+        self._collection = self.langchain_store._collection
+
+    def add(self, ids, texts, metadatas=None, embeddings=None):
+        if embeddings is None:
+            self.langchain_store.add_texts(texts=list(texts), metadatas=metadatas, ids=list(ids))
+        else:
+            self._collection.upsert(ids=list(ids), embeddings=embeddings, metadatas=metadatas, documents=list(texts))
+        return list(ids)
+
+    def get(self, ids=None, where=None, include=("documents", "metadatas"), limit=None, offset=0):
+        return self._collection.get(ids=ids, where=where or None, include=list(include), limit=limit, offset=offset)
+
+    def delete(self, ids=None, where=None):
+        matched = self._collection.get(ids=ids, where=where or None, include=[])['ids']
+        if matched:
+            self._collection.delete(ids=matched)
+        return len(matched)
+
+    def update_metadata(self, ids, metadatas):
+        self._collection.update(ids=list(ids), metadatas=list(metadatas))
+
+    def count(self):
+        return self._collection.count()
+
+    def heartbeat(self):
+        self.client.heartbeat()
+
+    def similarity_search_by_vector_with_score(self, embedding, k=4, where=None):
+        # LangChain Chroma는 거리(작을수록 유사)를 반환하므로 컬렉션 거리 함수에 맞춰 relevance 점수로 변환
+        pairs = self.langchain_store.similarity_search_by_vector_with_relevance_scores(
+            embedding=list(embedding), k=k, filter=where
+        )
+        relevance = self.langchain_store._select_relevance_score_fn()
+        return [(doc, relevance(distance)) for doc, distance in pairs]
+
+    def similarity_search_by_vector_with_embeddings(self, embedding, k=4, where=None):
+        from langchain_core.documents import Document
+
+        result = self._collection.query(
+            query_embeddings=[list(embedding)], n_results=k, where=where or None,
+            include=["documents", "metadatas", "distances", "embeddings"]
+        )
+        relevance = self.langchain_store._select_relevance_score_fn()
+        return [
+            (Document(page_content=document or "", metadata=metadata or {}, id=doc_id), relevance(distance), vector)
+            for doc_id, document, metadata, distance, vector in zip(
+                result["ids"][0], result["documents"][0], result["metadatas"][0],
+                result["distances"][0], result["embeddings"][0]
+            )
+        ]
+
+    def max_marginal_relevance_search_by_vector(self, embedding, k=4, fetch_k=20, lambda_mult=0.5, where=None):
+        return self.langchain_store.max_marginal_relevance_search_by_vector(
+            list(embedding), k=k, fetch_k=fetch_k, lambda_mult=lambda_mult, filter=where
+        )
+
+
 class VectorDBManager:
     _instance = None
     _initialized = False
@@ -31,32 +245,28 @@ class VectorDBManager:
             cls._instance = super().__new__(cls)
         return cls._instance
 
-    def __init__(self, persist_directory="./database/vector_db", upload_folder="./uploads", db_manager=None):
+    def __init__(self, persist_directory=None, upload_folder="./uploads"):
         if self._initialized:
             return
         if not config.OPENAI_API_KEY:
             raise ValueError("OPENAI_API_KEY가 .env 파일에 설정되지 않았습니다.")
 
-        self.client = chromadb.PersistentClient(path=persist_directory)
+        from langchain_openai import OpenAIEmbeddings, ChatOpenAI
+        from langchain_classic.chains.query_constructor.base import AttributeInfo
+
+        self.backend = config.VECTOR_STORE_BACKEND
+        self.mode = config.VECTOR_DB_MODE
+        self.client = None
+        self._health = None
         self.embedding_function = OpenAIEmbeddings()
         self.upload_folder = upload_folder
 
-        # DatabaseManager 인스턴스 (외부에서 주입받음, SQLite 삭제를 위해)
-        self.db_manager = db_manager
-
-        # Initialize LLM for SelfQueryRetriever
+        # Initialize LLM for self-query filter extraction
         self.llm = ChatOpenAI(api_key=config.OPENAI_API_KEY, temperature=0)
 
-        self.vectorstores = {
-            key: Chroma(
-                client=self.client,
-                collection_name=name,
-                embedding_function=self.embedding_function,
-            )
-            for key, name in self.COLLECTION_NAMES.items()
-        }
+        self.vectorstores = self._create_stores(persist_directory)
 
-        # Define metadata field information for SelfQueryRetriever
+        # Define metadata field information for self-query filter extraction
         self.metadata_field_infos = {
             "chunks": [
                 AttributeInfo(name="dialogue_id", description="The unique identifier for the dialogue within the meeting", type="string"),
@@ -93,16 +303,88 @@ class VectorDBManager:
             ],
         }
 
-        # Define document content descriptions for SelfQueryRetriever
+        # Define document content descriptions for self-query filter extraction
         self.document_content_descriptions = {
             "chunks": "회의 대화 내용의 의미론적으로 그룹화된 청크 (화자 라벨 및 타임스탬프 포함)",
             "subtopic": "회의록의 요약된 하위 주제",
         }
 
-        logger.info(f"✅ VectorDBManager for collections {list(self.COLLECTION_NAMES.values())} initialized.")
+        # self_query 필터 추출 (규칙 → LLM, query constructor와 LLM 결과는 캐시)
+        self.query_filter = QueryFilterExtractor(self.llm, self.metadata_field_infos, self.document_content_descriptions)
+
+        logger.info(f"✅ VectorDBManager for collections {list(self.COLLECTION_NAMES.values())} initialized. (backend={self.backend}, mode={self.mode})")
 
         self._initialized = True
 
+    def _create_stores(self, persist_directory):
+        """
+        VECTOR_STORE_BACKEND에 따라 컬렉션별 VectorStore를 생성합니다.
+
+        - chroma: ChromaDB (VECTOR_DB_MODE에 따라 embedded 또는 http 클라이언트)
+        - numpy: 프로세스 안의 메모리 매핑 행렬 (사용자/회의 수가 적은 설치용, chromadb를 불러오지 않음)
+
+        Args:
+            persist_directory (str, optional): chroma embedded 모드의 저장 경로
+
+        Returns:
+            dict: {'chunks': VectorStore, 'subtopic': VectorStore}
+
+        Raises:
+            ValueError: 알 수 없는 백엔드
+        """
+        if self.backend == 'chroma':
+            self.client = self._create_client(persist_directory or str(config.VECTOR_DB_PATH))
+            return {
+                key: ChromaVectorStore(self.client, name, self.embedding_function)
+                for key, name in self.COLLECTION_NAMES.items()
+            }
+
+        if self.backend == 'numpy':
+            from utils.numpy_vector_store import NumpyVectorStore
+            logger.info(f"ℹ️ 벡터 저장소 numpy 백엔드: {config.NUMPY_VECTOR_PATH}")
+            return {
+                key: NumpyVectorStore(config.NUMPY_VECTOR_PATH / name, name, self.embedding_function)
+                for key, name in self.COLLECTION_NAMES.items()
+            }
+
+        raise ValueError(f"알 수 없는 VECTOR_STORE_BACKEND: {self.backend} (chroma 또는 numpy)")
+
+    def _create_client(self, persist_directory):
+        """VECTOR_DB_MODE에 따라 ChromaDB 클라이언트 생성 (create_chroma_client 참고)"""
+        return create_chroma_client(self.mode, persist_directory)
+
+    def health_check(self, force=False):
+        """
+        벡터 DB 연결 상태를 heartbeat로 확인합니다. (CHROMA_HEALTHCHECK_INTERVAL_SECONDS 동안 결과 재사용)
+
+        Args:
+            force (bool): True면 재사용하지 않고 바로 확인
+
+        Returns:
+            dict: {'backend', 'mode', 'ok', 'latency_ms', 'checked_at', 'error'}
+        """
+        cached = self._health
+        if not force and cached and time.time() - cached['checked_at'] < config.CHROMA_HEALTHCHECK_INTERVAL_SECONDS:
+            return cached
+
+        started = time.perf_counter()
+        try:
+            self.vectorstores['chunks'].heartbeat()
+            error = None
+        except Exception as e:
+            error = str(e)
+            logger.warning(f"⚠️ 벡터 DB heartbeat 실패 (backend={self.backend}, mode={self.mode}): {e}")
+
+        self._health = {
+            'backend': self.backend,
+            'mode': self.mode,
+            'ok': error is None,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 1),
+            'checked_at': time.time(),
+            'error': error,
+        }
+        return self._health
+
     def _clean_text(self, formatted_text: str) -> str:
         """
         정규표현식을 사용해서 [Speaker X, MM:SS] 형식의 정보를 제거합니다.
@@ -126,8 +408,9 @@ class VectorDBManager:
 
     def add_meeting_as_chunk(self, meeting_id, title, meeting_date, audio_file, segments):
         """
-        회의 대화 내용을 스마트하게 청크로 묶어 DB에 저장합니다.
-        화자 변경, 시간 간격을 고려하여 청킹하며, Gemini를 사용해서 speaker와 시간 정보를 제거합니다.
+        회의 대화 내용을 작은 자식 청크로 묶어 DB에 저장합니다. (CHUNKING_STRATEGY: child 또는 semantic)
+        자식 청크는 검색용이며, 답변 컨텍스트는 ChatManager가 앞뒤 세그먼트를 붙인 부모 구간으로 넓혀서 만듭니다.
+        저장 전에 정규표현식으로 speaker와 시간 정보를 제거합니다.
 
         Args:
             meeting_id (str): 회의 ID
@@ -136,14 +419,22 @@ class VectorDBManager:
             audio_file (str): 오디오 파일명
             segments (list): 회의 대화 세그먼트 리스트
                 각 세그먼트는 {'speaker_label', 'start_time', 'segment', ...} 포함
+
+        Returns:
+            list: 저장한 청크 id 목록 (같은 id의 이전 청크는 교체됨)
         """
         chunk_vdb = self.vectorstores['chunks']
 
         try:
-            # 1. 스마트 청킹: 화자 변경과 시간 간격을 고려
-            chunks = self._create_smart_chunks(segments, max_chunk_size=1000, time_gap_threshold=60)
+            # 1. 자식 청크: 연속된 세그먼트 몇 개씩 (부모 구간은 검색 후 SQLite에서 조회)
+            strategy = config.CHUNKING_STRATEGY
+            if strategy == 'semantic':
+                chunks = self._create_semantic_chunks(segments)
+            else:
+                strategy = 'child'
+                chunks = self._create_child_chunks(segments)
 
-            logger.info(f"📦 스마트 청킹으로 {len(chunks)}개의 청크 생성 완료")
+            logger.info(f"📦 자식 청크 {len(chunks)}개 생성 완료 ({strategy})")
 
             # 2. 정규표현식으로 각 청크의 텍스트 정제 (speaker와 시간 정보 제거)
             logger.info(f"🔧 정규표현식으로 텍스트 정제 중...")
@@ -154,6 +445,7 @@ class VectorDBManager:
             chunk_texts = []
             chunk_metadatas = []
             chunk_ids = []
+            chunk_tokens = []
 
             for i, chunk_info in enumerate(chunks):
                 chunk_texts.append(chunk_info['text'])
@@ -168,41 +460,37 @@ class VectorDBManager:
                     "audio_file": audio_file,
                     "start_time": chunk_info['start_time'],
                     "end_time": chunk_info['end_time'],
-                    "speaker_count": chunk_info['speaker_count']
+                    "speaker_count": chunk_info['speaker_count'],
+                    "chunk_level": "child",
+                    "chunk_strategy": chunk_info['strategy'],
+                    "segment_count": chunk_info['segment_count'],
+                    "token_count": chunk_info['token_count']
                 })
                 chunk_ids.append(f"{meeting_id}_chunk_{i}")
+                chunk_tokens.append(chunk_info['token_count'])
 
-            # Vector DB에 추가
-            chunk_vdb.add_texts(
-                texts=chunk_texts,
-                metadatas=chunk_metadatas,
-                ids=chunk_ids
-            )
+            # Vector DB에 추가 (토큰 합 기준으로 묶어서 임베딩 요청)
+            self._add_in_batches(chunk_vdb, chunk_ids, chunk_texts, chunk_metadatas, chunk_tokens)
 
-            logger.info(f"✅ {len(chunks)}개의 스마트 청크를 meeting_chunks DB에 저장 완료 (meeting_id: {meeting_id})")
+            logger.info(
+                f"✅ {len(chunks)}개의 자식 청크를 meeting_chunks DB에 저장 완료 "
+                f"(meeting_id: {meeting_id}, {sum(chunk_tokens)} 토큰)"
+            )
+            return chunk_ids
 
         except Exception as e:
-            logger.warning(f"⚠️ 스마트 청킹 중 오류 발생: {e}")
+            logger.warning(f"⚠️ 자식 청킹 중 오류 발생: {e}")
             logger.info(f"📝 대신 기본 청킹 방식을 사용합니다.")
 
             # 에러 발생 시 폴백: RecursiveCharacterTextSplitter 사용
-            formatted_segments = []
-            for seg in segments:
-                speaker = seg.get('speaker_label', 'Unknown')
-                start_time = seg.get('start_time', 0)
-                text = seg.get('segment', '')
-                minutes = int(start_time // 60)
-                seconds = int(start_time % 60)
-                time_str = f"{minutes:02d}:{seconds:02d}"
-                formatted_text = f"[Speaker {speaker}, {time_str}] {text}"
-                formatted_segments.append(formatted_text)
-
-            full_text = "\n".join(formatted_segments)
-
-            # RecursiveCharacterTextSplitter로 청킹
+            full_text = "\n".join(format_segment(seg) for seg in segments)
+
+            # RecursiveCharacterTextSplitter로 청킹 (크기는 토큰 수 기준)
+            from langchain_text_splitters import RecursiveCharacterTextSplitter
             text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=200,
+                chunk_size=config.CHUNK_SIZE,
+                chunk_overlap=config.CHUNK_OVERLAP,
+                length_function=count_tokens,
                 separators=["\n[Speaker", "\n\n", "\n", " ", ""]
             )
 
@@ -230,94 +518,136 @@ class VectorDBManager:
                 })
                 chunk_ids.append(f"{meeting_id}_chunk_{i}")
 
-            chunk_vdb.add_texts(
-                texts=chunk_texts,
-                metadatas=chunk_metadatas,
-                ids=chunk_ids
-            )
+            self._add_in_batches(chunk_vdb, chunk_ids, chunk_texts, chunk_metadatas, count_tokens_batch(chunk_texts))
 
             logger.info(f"✅ {len(split_chunks)}개의 청크를 meeting_chunks DB에 저장 완료 (폴백 모드)")
+            return chunk_ids
 
-    def _create_smart_chunks(self, segments, max_chunk_size=1000, time_gap_threshold=60):
+    def _add_in_batches(self, store, ids, texts, metadatas, token_counts):
         """
-        화자 변경, 시간 간격을 고려한 스마트 청킹
+        토큰 합 EMBED_BATCH_MAX_TOKENS 이하로 묶어서 저장 (임베딩 요청 크기를 일정하게 유지)
 
         Args:
-            segments (list): 회의 대화 세그먼트 리스트
-            max_chunk_size (int): 최대 청크 크기 (문자 수)
-            time_gap_threshold (int): 시간 간격 임계값 (초)
+            store (VectorStore): 저장할 컬렉션
+            ids (list): 문서 ID
+            texts (list): 문서 텍스트
+            metadatas (list): 메타데이터
+            token_counts (list): 문서별 토큰 수
+        """
+        for begin, end in pack_batches(token_counts, config.EMBED_BATCH_MAX_TOKENS, config.EMBED_BATCH_MAX_TEXTS):
+            store.add(ids=ids[begin:end], texts=texts[begin:end], metadatas=metadatas[begin:end])
+
+    def _segment_token_counts(self, segments):
+        """
+        세그먼트별 토큰 수 (정제 후 임베딩되는 본문 + 줄바꿈 1토큰)
+        한 번만 세어 두고 청크 크기는 합산으로 계산합니다.
+        """
+        return [count + 1 for count in count_tokens_batch(seg.get('segment') or "" for seg in segments)]
+
+    def _build_chunks(self, segments, lines, ranges, strategy, token_counts):
+        """
+        세그먼트 구간을 청크 정보로 변환
+
+        Args:
+            segments (list): 회의 대화 세그먼트 리스트 (시간순)
+            lines (list): 세그먼트별 format_segment() 결과
+            ranges (list): [(begin, end), ...] 세그먼트 인덱스 구간 (end 미포함)
+            strategy (str): 청킹 방식 (메타데이터 기록용)
+            token_counts (list): 세그먼트별 토큰 수
 
         Returns:
-            list: 청크 정보 리스트 [{'text': str, 'start_time': float, 'end_time': float, 'speaker_count': int}]
+            list: [{'text': str, 'start_time': float, 'end_time': float, 'speaker_count': int,
+                    'segment_count': int, 'token_count': int, 'strategy': str}]
+                  start_time/end_time은 첫/마지막 세그먼트의 시작 시간
         """
-        chunks = []
-        current_chunk = []
-        current_chunk_text = ""
-        current_speaker = None
-        last_time = 0
-        speakers_in_chunk = set()
-
-        for seg in segments:
-            speaker = seg.get('speaker_label', 'Unknown')
-            start_time = seg.get('start_time', 0)
-            text = seg.get('segment', '')
-
-            # 시간을 MM:SS 형식으로 변환
-            minutes = int(start_time // 60)
-            seconds = int(start_time % 60)
-            time_str = f"{minutes:02d}:{seconds:02d}"
-
-            # 포맷팅된 텍스트
-            formatted_text = f"[Speaker {speaker}, {time_str}] {text}"
-
-            # 청크 분리 조건:
-            # 1. 현재 청크 크기가 max_chunk_size를 초과
-            # 2. 시간 간격이 time_gap_threshold 초과 (긴 침묵이나 주제 전환 가능성)
-            # 3. 화자가 변경되고 현재 청크가 충분히 큼 (500자 이상)
-
-            time_gap = start_time - last_time
-            should_split = False
-
-            if len(current_chunk_text) + len(formatted_text) > max_chunk_size:
-                should_split = True
-            elif time_gap > time_gap_threshold and len(current_chunk_text) > 200:
-                should_split = True
-            elif speaker != current_speaker and len(current_chunk_text) > 500:
-                # 화자 변경 시 적당한 크기면 분리
-                should_split = True
-
-            if should_split and current_chunk:
-                # 현재 청크 저장
-                chunks.append({
-                    'text': current_chunk_text.strip(),
-                    'start_time': current_chunk[0].get('start_time', 0),
-                    'end_time': current_chunk[-1].get('start_time', 0),
-                    'speaker_count': len(speakers_in_chunk)
-                })
+        return [
+            {
+                'text': "\n".join(lines[begin:end]),
+                'start_time': segments[begin].get('start_time', 0),
+                'end_time': segments[end - 1].get('start_time', 0),
+                'speaker_count': len({seg.get('speaker_label', 'Unknown') for seg in segments[begin:end]}),
+                'segment_count': end - begin,
+                'token_count': sum(token_counts[begin:end]),
+                'strategy': strategy
+            }
+            for begin, end in ranges
+        ]
 
-                # 새 청크 시작
-                current_chunk = []
-                current_chunk_text = ""
-                speakers_in_chunk = set()
-
-            # 현재 청크에 추가
-            current_chunk.append(seg)
-            current_chunk_text += formatted_text + "\n"
-            speakers_in_chunk.add(speaker)
-            current_speaker = speaker
-            last_time = start_time
-
-        # 마지막 청크 저장
-        if current_chunk:
-            chunks.append({
-                'text': current_chunk_text.strip(),
-                'start_time': current_chunk[0].get('start_time', 0),
-                'end_time': current_chunk[-1].get('start_time', 0),
-                'speaker_count': len(speakers_in_chunk)
-            })
+    def _create_child_chunks(self, segments, max_segments=None, max_tokens=None, time_gap_threshold=None, token_counts=None):
+        """
+        부모-자식 검색용 자식 청크: 연속된 세그먼트를 max_segments개 이하, max_tokens 토큰 이하로 묶습니다.
+        작은 청크는 질문과 임베딩이 더 정확히 맞고, 답변에 필요한 앞뒤 문맥은 검색 후 부모 구간으로 붙입니다.
+
+        Args:
+            segments (list): 회의 대화 세그먼트 리스트 (시간순)
+            max_segments (int, optional): 청크당 최대 세그먼트 수 (기본값: CHILD_CHUNK_MAX_SEGMENTS)
+            max_tokens (int, optional): 청크 최대 토큰 수 (기본값: CHILD_CHUNK_MAX_TOKENS)
+            time_gap_threshold (int, optional): 이 시간(초) 넘게 떨어진 세그먼트는 다른 청크로 분리
+                                                (기본값: TIME_GAP_THRESHOLD_SECONDS)
+            token_counts (list, optional): 세그먼트별 토큰 수 (이미 센 경우)
+
+        Returns:
+            list: _build_chunks() 결과
+        """
+        lines = [format_segment(seg) for seg in segments]
+        token_counts = token_counts or self._segment_token_counts(segments)
+        ranges = child_chunk_ranges(
+            token_counts,
+            [seg.get('start_time', 0) for seg in segments],
+            max_segments or config.CHILD_CHUNK_MAX_SEGMENTS,
+            max_tokens or config.CHILD_CHUNK_MAX_TOKENS,
+            time_gap_threshold or config.TIME_GAP_THRESHOLD_SECONDS
+        )
+        return self._build_chunks(segments, lines, ranges, 'child', token_counts)
+
+    def _embed_segments(self, segments, token_counts):
+        """
+        세그먼트 텍스트 임베딩 (토큰 합 EMBED_BATCH_MAX_TOKENS 이하로 묶어서 요청)
 
-        return chunks
+        Returns:
+            list: 세그먼트별 임베딩
+        """
+        # 빈 문자열은 임베딩 API가 거부하므로 공백으로 대체
+        texts = [seg.get('segment') or " " for seg in segments]
+        vectors = []
+        for begin, end in pack_batches(token_counts, config.EMBED_BATCH_MAX_TOKENS, config.EMBED_BATCH_MAX_TEXTS):
+            vectors.extend(self.embedding_function.embed_documents(texts[begin:end]))
+        return vectors
+
+    def _create_semantic_chunks(self, segments):
+        """
+        semantic 청킹: 세그먼트를 임베딩하고, 인접 세그먼트 사이 거리가 튀는 곳(주제 전환)에서 분리합니다.
+        같은 화자가 말하는 중간에 주제가 바뀌어도 경계를 찾지만, 세그먼트 임베딩 비용이 청크 임베딩만큼 더 듭니다.
+        세그먼트 임베딩에 실패하면 child 청킹을 사용합니다.
 
+        Args:
+            segments (list): 회의 대화 세그먼트 리스트 (시간순)
+
+        Returns:
+            list: _build_chunks() 결과
+        """
+        token_counts = self._segment_token_counts(segments)
+        if len(segments) <= config.SEMANTIC_CHUNK_MIN_SEGMENTS:
+            return self._create_child_chunks(segments, token_counts=token_counts)
+
+        try:
+            vectors = self._embed_segments(segments, token_counts)
+        except Exception as e:
+            logger.warning(f"⚠️ 세그먼트 임베딩 실패, child 청킹 사용: {e}")
+            return self._create_child_chunks(segments, token_counts=token_counts)
+
+        lines = [format_segment(seg) for seg in segments]
+        ranges = semantic_chunk_ranges(
+            vectors,
+            token_counts,
+            [seg.get('start_time', 0) for seg in segments],
+            min_segments=config.SEMANTIC_CHUNK_MIN_SEGMENTS,
+            max_segments=config.SEMANTIC_CHUNK_MAX_SEGMENTS,
+            max_size=config.SEMANTIC_CHUNK_MAX_TOKENS,
+            breakpoint_percentile=config.SEMANTIC_BREAKPOINT_PERCENTILE,
+            time_gap_threshold=config.TIME_GAP_THRESHOLD_SECONDS
+        )
+        return self._build_chunks(segments, lines, ranges, 'semantic', token_counts)
 
     def add_meeting_as_subtopic(self, meeting_id, title, meeting_date, audio_file, summary_content):
         """스크립트 전체를 소주제별 청크로 DB에 저장합니다."""
@@ -336,7 +666,7 @@ class VectorDBManager:
 
         logger.info("===============summary_chunks=================")
         logger.info(summary_chunks)
-        
+
         # 2. 각 요약 chunk를 Summary_Analysis_DB에 저장
         subtopic_vdb = self.vectorstores['subtopic']
         chunk_texts = []
@@ -366,7 +696,7 @@ class VectorDBManager:
             chunk_ids.append(f"{meeting_id}_summary_{i}")
 
         if chunk_texts:
-            subtopic_vdb.add_texts(texts=chunk_texts, metadatas=chunk_metadatas, ids=chunk_ids)
+            subtopic_vdb.add(ids=chunk_ids, texts=chunk_texts, metadatas=chunk_metadatas)
             logger.info(f"📄 요약 결과 {len(chunk_texts)}개를 Summary_Analysis_DB에 저장했습니다.")
             return summary_chunks
         else:
@@ -376,6 +706,10 @@ class VectorDBManager:
 
     
     
+    def embed_query(self, query: str) -> list:
+        """검색 query 임베딩 (컬렉션과 무관하므로 여러 컬렉션 검색에 재사용)"""
+        return self.embedding_function.embed_query(query)
+
     def search(self,
              db_type: str,
              query: str,
@@ -384,7 +718,9 @@ class VectorDBManager:
              filter_criteria: dict = None,
              score_threshold: float = None,  # <-- [수정됨] 점수 임계값 추가
              mmr_fetch_k: int = 20,         # <-- [수정됨] MMR fetch_k 추가
-             mmr_lambda_mult: float = 0.5   # <-- [수정됨] MMR lambda_mult 추가
+             mmr_lambda_mult: float = 0.5,  # <-- [수정됨] MMR lambda_mult 추가
+             query_embedding: list = None,
+             return_embeddings: bool = False
              ) -> list:
         """
         지정된 DB에서 쿼리와 필터 조건을 사용하여 문서를 검색합니다.
@@ -399,9 +735,11 @@ class VectorDBManager:
             score_threshold (float, optional): 유사도 점수 임계값 (0.0~1.0). Defaults to None.
             mmr_fetch_k (int, optional): MMR에서 초기 fetch할 문서 수. Defaults to 20.
             mmr_lambda_mult (float, optional): MMR의 다양성 파라미터 (0.0~1.0). Defaults to 0.5.
+            query_embedding (list, optional): 미리 계산한 query 임베딩 (여러 컬렉션을 검색할 때 한 번만 임베딩). Defaults to None.
+            return_embeddings (bool, optional): 문서 임베딩도 함께 반환 (재순위용, mmr은 similarity로 검색). Defaults to False.
 
         Returns:
-            list: LangChain Document 객체 리스트.
+            list: LangChain Document 객체 리스트. (return_embeddings=True이면 [(Document, 임베딩), ...])
         """
         # 1. Validate inputs
         if db_type not in self.vectorstores:
@@ -418,77 +756,51 @@ class VectorDBManager:
             current_retriever_type = "similarity_score_threshold"
             logger.info(f"ℹ️ score_threshold provided. Changing retriever_type to 'similarity_score_threshold'.")
 
-        vdb = self.vectorstores[db_type]
+        # MMR은 재순위 단계에서 임베딩으로 다시 계산하므로 후보는 유사도 순으로 가져옴
+        if return_embeddings and current_retriever_type == "mmr":
+            current_retriever_type = "similarity"
+
+        store = self.vectorstores[db_type]
         results = []
 
-        # 2. Handle 'similarity', 'mmr', 'similarity_score_threshold' retrievers
-        if current_retriever_type in ["similarity", "mmr", "similarity_score_threshold"]:
-            search_kwargs = {'k': k}
-            if filter_criteria:
-                search_kwargs['filter'] = filter_criteria
+        def embedding():
+            return query_embedding if query_embedding is not None else self.embed_query(query)
 
-            # [수정됨] 타입에 따라 search_kwargs 동적 구성
-            if current_retriever_type == "similarity_score_threshold":
-                if score_threshold is None:
-                    raise ValueError("score_threshold must be provided when retriever_type is 'similarity_score_threshold'")
-                search_kwargs['score_threshold'] = score_threshold
+        def scored_search(where):
+            if not return_embeddings:
+                return store.similarity_search_by_vector_with_score(embedding(), k=k, where=where)
+            found = store.similarity_search_by_vector_with_embeddings(embedding(), k=k, where=where)
+            return [((doc, vector), score) for doc, score, vector in found]
 
-            elif current_retriever_type == "mmr":
-                search_kwargs['fetch_k'] = mmr_fetch_k
-                search_kwargs['lambda_mult'] = mmr_lambda_mult
+        # 2. Handle 'similarity', 'similarity_score_threshold' (retriever 객체를 만들지 않고 저장소를 바로 검색)
+        if current_retriever_type in ["similarity", "similarity_score_threshold"]:
+            if current_retriever_type == "similarity_score_threshold" and score_threshold is None:
+                raise ValueError("score_threshold must be provided when retriever_type is 'similarity_score_threshold'")
 
-            retriever = vdb.as_retriever(
-                search_type=current_retriever_type,
-                search_kwargs=search_kwargs
+            scored = scored_search(filter_criteria)
+            if current_retriever_type == "similarity_score_threshold":
+                scored = [(doc, score) for doc, score in scored if score >= score_threshold]
+            results = [doc for doc, _ in scored]
+
+        # 3. Handle 'mmr'
+        elif current_retriever_type == "mmr":
+            results = store.max_marginal_relevance_search_by_vector(
+                embedding(),
+                k=k,
+                fetch_k=mmr_fetch_k,
+                lambda_mult=mmr_lambda_mult,
+                where=filter_criteria
             )
-            results = retriever.invoke(query)
 
-        # 3. Handle 'self_query' retriever
+        # 4. Handle 'self_query' (질문에서 제목/날짜 필터를 추출해 저장소를 바로 검색)
         elif current_retriever_type == "self_query":
-            # (참고: SelfQueryRetriever는 기본적으로 내부에서 similarity_search를 사용합니다.)
-            # (여기서 점수 기반 필터링을 하려면, SelfQueryRetriever를 커스텀해야 할 수도 있습니다.)
-            metadata_info = self.metadata_field_infos[db_type]
-            doc_description = self.document_content_descriptions[db_type]
-
-            try:
-                retriever = SelfQueryRetriever.from_llm(
-                    self.llm,
-                    vdb,
-                    doc_description,
-                    metadata_info,
-                    verbose=True,
-                    base_filter=filter_criteria,
-                    # [개선 아이디어] SelfQueryRetriever가 반환할 k의 개수를 설정할 수 있습니다.
-                    # 다만, invoke 시점이 아닌 생성 시점에 search_kwargs를 넘겨야 할 수 있습니다. (LangChain 버전에 따라 다름)
-                    # enable_limit=True를 사용하고 쿼리에 "top 3 results" 등을 포함시켜야 할 수도 있습니다.
-                )
-                results = retriever.invoke(query)
-
-                # [수정됨] SelfQuery 이후에도 k개만 반환하도록 강제 (필요시)
-                # SelfQueryRetriever는 k를 LLM이 추론하게 하므로, k가 무시될 수 있습니다.
-                # 만약 결과가 너무 많다면, k만큼 잘라냅니다.
-                if len(results) > k:
-                     logger.info(f"ℹ️ SelfQuery found {len(results)} results. Truncating to k={k}.")
-                     results = results[:k]
-
-            except Exception as e:
-                # SelfQuery 실패 시 similarity search로 폴백
-                error_msg = str(e)
-                logger.warning(f"⚠️ SelfQuery 실패 (폴백: similarity search): {error_msg}")
-
-                # ChromaDB 호환되지 않는 필터 오류인 경우, similarity search로 대체
-                if "Expected where operand value" in error_msg or "type" in error_msg:
-                    logger.warning("   → ChromaDB 호환되지 않는 필터 형식 감지. similarity search로 전환합니다.")
-
-                search_kwargs = {'k': k}
-                if filter_criteria:
-                    search_kwargs['filter'] = filter_criteria
-
-                retriever = vdb.as_retriever(
-                    search_type="similarity",
-                    search_kwargs=search_kwargs
-                )
-                results = retriever.invoke(query)
+            query_filter = self.query_filter.extract(db_type, query)
+            where = self.query_filter.to_where(query_filter, filter_criteria)
+            if query_filter.query != query:
+                # LLM이 조건을 뺀 질문으로 바꾼 경우에만 다시 임베딩
+                query, query_embedding = query_filter.query, None
+            scored = scored_search(where)
+            results = [doc for doc, _ in scored]
 
         logger.info(f"✅ Found {len(results)} documents from '{self.COLLECTION_NAMES[db_type]}' for query: '{query}'")
         return results
@@ -506,11 +818,8 @@ class VectorDBManager:
                  (청크가 없으면 빈 문자열 반환)
         """
         try:
-            # meeting_chunks 컬렉션에서 해당 meeting_id의 모든 청크 조회
-            collection = self.client.get_collection(name=self.COLLECTION_NAMES['chunks'])
-
-            # meeting_id로 필터링하여 모든 항목 가져오기
-            results = collection.get(
+            # meeting_chunks 컬렉션에서 meeting_id로 필터링하여 모든 항목 가져오기
+            results = self.vectorstores['chunks'].get(
                 where={"meeting_id": meeting_id},
                 include=["documents", "metadatas"]
             )
@@ -556,11 +865,8 @@ class VectorDBManager:
                  (요약이 없으면 빈 문자열 반환)
         """
         try:
-            # meeting_subtopic 컬렉션에서 해당 meeting_id의 모든 청크 조회
-            collection = self.client.get_collection(name=self.COLLECTION_NAMES['subtopic'])
-
-            # meeting_id로 필터링하여 모든 항목 가져오기
-            results = collection.get(
+            # meeting_subtopic 컬렉션에서 meeting_id로 필터링하여 모든 항목 가져오기
+            results = self.vectorstores['subtopic'].get(
                 where={"meeting_id": meeting_id},
                 include=["documents", "metadatas"]
             )
@@ -597,21 +903,14 @@ class VectorDBManager:
     def delete_from_collection(self, db_type, meeting_id=None, audio_file=None, title=None):
         """
         지정된 벡터 DB 컬렉션에서 항목을 삭제합니다.
-        db_type이 "all"이면 SQLite, Vector DB (chunks + subtopic), 오디오 파일을 모두 삭제합니다.
         meeting_id, audio_file, title 중 하나 이상이 제공되면 해당 조건에 맞는 항목을 삭제합니다.
         아무것도 제공되지 않으면 해당 db_type의 전체 컬렉션을 삭제합니다.
+        (회의 전체 삭제는 DatabaseManager.delete_meeting_by_id + 백그라운드 정리 작업이 처리합니다)
         """
-        # db_type이 "all"이면 모든 데이터 삭제 (SQLite + Vector DB + 오디오 파일)
-        if db_type == "all":
-            if not meeting_id:
-                raise ValueError("meeting_id is required when db_type is 'all'")
-            return self._delete_all_meeting_data(meeting_id)
-
-        # 기존 로직: 특정 컬렉션만 삭제
         if db_type not in self.vectorstores:
             raise ValueError(f"Unknown db_type: {db_type}. Must be one of {list(self.COLLECTION_NAMES.keys())}")
 
-        collection = self.client.get_or_create_collection(name=self.COLLECTION_NAMES[db_type])
+        store = self.vectorstores[db_type]
 
         filters = {}
         if meeting_id:
@@ -624,457 +923,162 @@ class VectorDBManager:
         if filters:
             # 특정 필터가 있는 경우
             logger.info(f"🗑️ Deleting from '{db_type}' collection with filters: {filters}")
-            collection.delete(where=filters)
+            # 조건이 여러 개면 $and로 묶음 (Chroma where는 최상위 키 1개만 허용)
+            where = filters if len(filters) == 1 else {"$and": [{key: value} for key, value in filters.items()]}
+            store.delete(where=where)
             logger.info(f"✅ Deletion from '{db_type}' collection complete.")
         else:
             # 필터가 없는 경우, 전체 컬렉션 삭제
             logger.warning(f"⚠️ No specific filters provided. Deleting ALL items from '{db_type}' collection.")
-            collection.delete(where={}) # deletes all items
+            store.delete() # deletes all items
             logger.info(f"✅ All items deleted from '{db_type}' collection.")
 
-    def _get_audio_file_from_vector_db(self, meeting_id):
+    def delete_meeting_vectors(self, meeting_id, db_types=('chunks', 'subtopic'), keep_ids=None):
         """
-        Vector DB에서 meeting_id로 audio_file을 조회합니다.
-        SQLite에서 조회 실패 시 폴백으로 사용됩니다.
+        meeting_id의 벡터 데이터를 chunks, subtopic 컬렉션에서 삭제합니다.
+        회의 삭제 후 정리 대기열, 청크/요약 재생성 전에 호출되며, 이미 삭제된 경우에도 안전하게 다시 실행할 수 있습니다.
 
         Args:
             meeting_id (str): 회의 ID
+            db_types (tuple): 삭제할 컬렉션 ('chunks', 'subtopic')
+            keep_ids (list, optional): 삭제하지 않을 문서 id (방금 다시 저장한 청크, 남은 이전 청크만 삭제)
 
         Returns:
-            str or None: audio_file 이름 또는 None
+            dict: 컬렉션별 삭제된 항목 수
         """
-        try:
-            import sqlite3
-            conn = sqlite3.connect(os.path.join(os.path.dirname(__file__), '..', 'database', 'vector_db', 'chroma.sqlite3'))
-            cursor = conn.cursor()
-
-            cursor.execute('''
-                SELECT string_value
-                FROM embedding_metadata
-                WHERE key = "audio_file" AND id IN (
-                    SELECT DISTINCT id FROM embedding_metadata
-                    WHERE key = "meeting_id" AND string_value = ?
-                )
-                LIMIT 1
-            ''', (meeting_id,))
-
-            result = cursor.fetchone()
-            conn.close()
-
-            return result[0] if result else None
-        except Exception as e:
-            logger.warning(f"⚠️ Vector DB에서 audio_file 조회 실패: {e}")
-            return None
-
-    def _delete_all_meeting_data(self, meeting_id):
-        """
-        meeting_id로 모든 회의 데이터를 삭제합니다.
-        - SQLite DB: meeting_dialogues, meeting_minutes
-        - Vector DB: meeting_chunks, meeting_subtopic
-        - 오디오 파일
-
-        Args:
-            meeting_id (str): 삭제할 회의 ID
-
-        Returns:
-            dict: 삭제 결과 정보
-        """
-        # db_manager가 주입되지 않은 경우 에러 발생
-        if not self.db_manager:
-            raise ValueError("DatabaseManager instance is required for deleting all meeting data. Please set db_manager in VectorDBManager constructor.")
-
-        # 삭제 프로세스 시작 로그
-        logger.info("\n\n" + "=" * 70)
-        logger.info(f"🗑️  [회의 데이터 삭제 프로세스 시작]")
-        logger.info("=" * 70)
-        logger.info(f"🔑 삭제 키값(meeting_id): {meeting_id}")
-        logger.info(f"📍 이 키값을 기준으로 다음 데이터를 검색하여 삭제합니다:")
-        logger.info(f"   • SQLite DB - meeting_dialogues 테이블 (WHERE meeting_id = '{meeting_id}')")
-        logger.info(f"   • SQLite DB - meeting_minutes 테이블 (WHERE meeting_id = '{meeting_id}')")
-        logger.info(f"   • Vector DB - meeting_chunk 컬렉션 (WHERE meeting_id = '{meeting_id}')")
-        logger.info(f"   • Vector DB - meeting_subtopic 컬렉션 (WHERE meeting_id = '{meeting_id}')")
-        logger.info(f"   • 미디어 파일 (오디오/비디오, uploads 폴더)")
-        logger.info("=" * 70)
-
-        # 1. meeting_id로 오디오 파일명 조회 (SQLite 우선, 실패 시 Vector DB)
-        audio_file = self.db_manager.get_audio_file_by_meeting_id(meeting_id)
-
-        if not audio_file:
-            logger.warning("⚠️ SQLite에서 audio_file을 찾을 수 없습니다. Vector DB에서 조회 시도...")
-            audio_file = self._get_audio_file_from_vector_db(meeting_id)
-
-        if not audio_file:
-            logger.warning("⚠️ audio_file을 찾을 수 없습니다. 파일 삭제를 건너뜁니다.")
-            logger.warning("   (SQLite와 Vector DB 삭제는 계속 진행됩니다)")
-            audio_file = None  # 파일 삭제 단계에서 처리
-        else:
-            logger.info(f"📄 미디어 파일명: {audio_file}")
-
-        logger.info("=" * 70)
-
-        # 2. SQLite DB 삭제
-        deleted_sqlite = self.db_manager.delete_meeting_by_id(meeting_id)
-
-        # 3. Vector DB chunks 삭제
-        deleted_chunks_count = 0
-        before_chunks_count = 0
-        after_chunks_count = 0
-        try:
-            logger.info(f"\n📊 [Vector DB Chunks 삭제 검증 시작] meeting_id = {meeting_id}")
-            logger.info("=" * 70)
-
-            # LangChain vectorstore의 underlying collection 사용
-            chunks_collection = self.vectorstores['chunks']._collection
-
-            # 삭제 전 전체 데이터 개수 확인 (limit 없이 조회)
-            before_delete = chunks_collection.get(where={"meeting_id": meeting_id})
-            if before_delete and before_delete.get('ids'):
-                before_chunks_count = len(before_delete['ids'])
-                logger.info(f"[삭제 전] meeting_chunk: {before_chunks_count}개")
-                logger.info("-" * 70)
-
-                # 삭제 실행
-                chunks_collection.delete(where={"meeting_id": meeting_id})
-                logger.info(f"[삭제 수행] meeting_chunk: {before_chunks_count}개 삭제 시도")
-                deleted_chunks_count = before_chunks_count
-
-                logger.info("-" * 70)
-
-                # 삭제 후 확인
-                after_delete = chunks_collection.get(where={"meeting_id": meeting_id})
-                if after_delete and after_delete.get('ids'):
-                    after_chunks_count = len(after_delete['ids'])
-                    logger.info(f"[삭제 후] meeting_chunk: {after_chunks_count}개 남음")
-                    logger.warning(f"⚠️ Vector DB (meeting_chunk) 삭제 검증 실패: {after_chunks_count}개 데이터가 남아있음")
-                else:
-                    logger.info(f"[삭제 후] meeting_chunk: 0개 남음")
-                    logger.info(f"✅ Vector DB (meeting_chunk) 삭제 검증 성공: 모든 데이터가 삭제되었습니다.")
-            else:
-                logger.info(f"[삭제 전] meeting_chunk: 0개")
-                logger.info(f"ℹ️ Vector DB (meeting_chunk)에 meeting_id={meeting_id} 데이터 없음")
-
-            logger.info("=" * 70)
-
-        except Exception as e:
-            logger.error(f"❌ Vector DB (meeting_chunk) 삭제 중 오류: {e}")
-            import traceback
-            traceback.print_exc()
-
-        # 4. Vector DB subtopic 삭제
-        deleted_subtopic_count = 0
-        before_subtopic_count = 0
-        after_subtopic_count = 0
-        try:
-            logger.info(f"\n📊 [Vector DB Subtopic 삭제 검증 시작] meeting_id = {meeting_id}")
-            logger.info("=" * 70)
-
-            # LangChain vectorstore의 underlying collection 사용
-            subtopic_collection = self.vectorstores['subtopic']._collection
-
-            # 삭제 전 전체 데이터 개수 확인 (limit 없이 조회)
-            before_delete = subtopic_collection.get(where={"meeting_id": meeting_id})
-            if before_delete and before_delete.get('ids'):
-                before_subtopic_count = len(before_delete['ids'])
-                logger.info(f"[삭제 전] meeting_subtopic: {before_subtopic_count}개")
-                logger.info("-" * 70)
-
-                # 삭제 실행
-                subtopic_collection.delete(where={"meeting_id": meeting_id})
-                logger.info(f"[삭제 수행] meeting_subtopic: {before_subtopic_count}개 삭제 시도")
-                deleted_subtopic_count = before_subtopic_count
-
-                logger.info("-" * 70)
-
-                # 삭제 후 확인
-                after_delete = subtopic_collection.get(where={"meeting_id": meeting_id})
-                if after_delete and after_delete.get('ids'):
-                    after_subtopic_count = len(after_delete['ids'])
-                    logger.info(f"[삭제 후] meeting_subtopic: {after_subtopic_count}개 남음")
-                    logger.warning(f"⚠️ Vector DB (meeting_subtopic) 삭제 검증 실패: {after_subtopic_count}개 데이터가 남아있음")
-                else:
-                    logger.info(f"[삭제 후] meeting_subtopic: 0개 남음")
-                    logger.info(f"✅ Vector DB (meeting_subtopic) 삭제 검증 성공: 모든 데이터가 삭제되었습니다.")
-            else:
-                logger.info(f"[삭제 전] meeting_subtopic: 0개")
-                logger.info(f"ℹ️ Vector DB (meeting_subtopic)에 meeting_id={meeting_id} 데이터 없음")
-
-            logger.info("=" * 70)
-
-        except Exception as e:
-            logger.error(f"❌ Vector DB (meeting_subtopic) 삭제 중 오류: {e}")
-            import traceback
-            traceback.print_exc()
-
-        # 5. 미디어 파일 삭제 (오디오 또는 비디오)
-        logger.info(f"\n📊 [미디어 파일 삭제 검증 시작] meeting_id = {meeting_id}")
-        logger.info("=" * 70)
-
-        audio_deleted = False
-
-        if audio_file:
-            audio_path = os.path.join(self.upload_folder, audio_file)
-
-            if os.path.exists(audio_path):
-                logger.info(f"[삭제 전] 미디어 파일 존재: {audio_file}")
-                logger.info(f"           경로: {audio_path}")
-                logger.info("-" * 70)
-
-                os.remove(audio_path)
-                logger.info(f"[삭제 수행] 미디어 파일 삭제 시도: {audio_file}")
-
-                logger.info("-" * 70)
-
-                if not os.path.exists(audio_path):
-                    logger.info(f"[삭제 후] 미디어 파일 없음")
-                    logger.info(f"✅ 미디어 파일 삭제 검증 성공: 파일이 삭제되었습니다.")
-                    audio_deleted = True
-                else:
-                    logger.info(f"[삭제 후] 미디어 파일 여전히 존재")
-                    logger.warning(f"⚠️ 미디어 파일 삭제 검증 실패: 파일이 남아있습니다.")
-            else:
-                logger.info(f"[삭제 전] 미디어 파일 없음: {audio_file}")
-                logger.info(f"ℹ️ 미디어 파일이 존재하지 않습니다.")
-        else:
-            logger.info(f"[건너뜀] audio_file 정보 없음")
-            logger.info(f"ℹ️ audio_file을 찾을 수 없어 파일 삭제를 건너뜁니다.")
-
-        logger.info("=" * 70)
-
-        # 최종 요약
-        logger.info(f"\n{'=' * 70}")
-        logger.info(f"🎉 [삭제 작업 최종 요약] meeting_id = {meeting_id}")
-        logger.info("=" * 70)
-        logger.info(f"✓ SQLite meeting_dialogues: {deleted_sqlite['dialogues']}개 삭제")
-        logger.info(f"✓ SQLite meeting_minutes: {deleted_sqlite['minutes']}개 삭제")
-        logger.info(f"✓ SQLite meeting_shares: {deleted_sqlite.get('shares', 0)}개 삭제")
-        logger.info(f"✓ Vector DB meeting_chunk: {deleted_chunks_count}개 삭제")
-        logger.info(f"✓ Vector DB meeting_subtopic: {deleted_subtopic_count}개 삭제")
-        logger.info(f"✓ 미디어 파일 (오디오/비디오): {'삭제됨' if audio_deleted else '없음/실패'}")
-        logger.info("=" * 70 + "\n")
-
-        return {
-            "success": True,
-            "message": "회의 데이터가 성공적으로 삭제되었습니다.",
-            "deleted": {
-                "sqlite_dialogues": deleted_sqlite["dialogues"],
-                "sqlite_minutes": deleted_sqlite["minutes"],
-                "sqlite_shares": deleted_sqlite.get("shares", 0),
-                "vector_chunks": deleted_chunks_count,
-                "vector_subtopic": deleted_subtopic_count,
-                "audio_file": audio_file if audio_deleted else None
-            }
-        }
+        deleted = {}
+        for db_type in db_types:
+            store = self.vectorstores[db_type]
+            if keep_ids is None:
+                deleted[db_type] = store.delete(where={"meeting_id": meeting_id})
+                continue
+            keep = set(keep_ids)
+            stale = [doc_id for doc_id in store.get(where={"meeting_id": meeting_id}, include=[])['ids'] if doc_id not in keep]
+            deleted[db_type] = store.delete(ids=stale) if stale else 0
+
+        logger.info(f"🗑️ Vector DB 삭제 완료: meeting_id={meeting_id}, {deleted}")
+        return deleted
+
+    # 컬렉션별 제목 메타데이터 필드 (meeting_subtopic은 'meeting_title' 필드 사용)
+    TITLE_FIELDS = {
+        'chunks': 'title',
+        'subtopic': 'meeting_title',
+    }
 
-    def update_metadata_title(self, meeting_id, new_title):
+    def update_meeting_metadata(self, meeting_id, title, meeting_date):
         """
-        ChromaDB의 meeting_chunk와 meeting_subtopic 컬렉션에서
-        해당 meeting_id의 모든 문서 메타데이터의 title을 업데이트합니다.
+        meeting_chunk와 meeting_subtopic 컬렉션에서 해당 meeting_id의 모든 문서 메타데이터의
+        제목과 meeting_date를 SQLite의 현재 값으로 맞춥니다. (이미 같은 값이면 건너뜀)
 
         Args:
             meeting_id (str): 회의 ID
-            new_title (str): 새로운 제목
+            title (str): 제목
+            meeting_date (str): 날짜 (형식: "YYYY-MM-DD HH:MM:SS")
 
         Returns:
             dict: 업데이트 결과 {'success': bool, 'updated_chunks': int, 'updated_subtopics': int}
         """
-        logger.info(f"\n📊 [ChromaDB 메타데이터 업데이트 시작] meeting_id = {meeting_id}")
-        logger.info("=" * 70)
-
-        updated_chunks = 0
-        updated_subtopics = 0
+        meeting_date = str(meeting_date) if meeting_date else ""
+        updated = {'chunks': 0, 'subtopic': 0}
 
         try:
-            # 1. meeting_chunk 컬렉션 업데이트
-            logger.info(f"[1/2] meeting_chunk 컬렉션 업데이트 중...")
-
-            # ChromaDB 네이티브 컬렉션 가져오기
-            chunk_collection = self.client.get_collection(name=self.COLLECTION_NAMES['chunks'])
-
-            # meeting_id로 문서 조회
-            chunk_results = chunk_collection.get(
-                where={"meeting_id": meeting_id}
-            )
-
-            chunk_ids = chunk_results['ids']
-
-            if chunk_ids:
-                # 모든 문서의 메타데이터에서 title만 변경
-                updated_metadatas = []
-                for metadata in chunk_results['metadatas']:
-                    updated_metadata = metadata.copy()
-                    updated_metadata['title'] = new_title
-                    updated_metadatas.append(updated_metadata)
-
-                # 일괄 업데이트
-                chunk_collection.update(
-                    ids=chunk_ids,
-                    metadatas=updated_metadatas
-                )
-                updated_chunks = len(chunk_ids)
-                logger.info(f"   ✅ meeting_chunk: {updated_chunks}개 문서의 title 업데이트 완료")
-            else:
-                logger.info(f"   ℹ️ meeting_chunk: 업데이트할 문서 없음")
-
-            # 2. meeting_subtopic 컬렉션 업데이트
-            logger.info(f"[2/2] meeting_subtopic 컬렉션 업데이트 중...")
-
-            # ChromaDB 네이티브 컬렉션 가져오기
-            subtopic_collection = self.client.get_collection(name=self.COLLECTION_NAMES['subtopic'])
-
-            # meeting_id로 문서 조회
-            subtopic_results = subtopic_collection.get(
-                where={"meeting_id": meeting_id}
-            )
-
-            subtopic_ids = subtopic_results['ids']
-
-            if subtopic_ids:
-                # 모든 문서의 메타데이터에서 meeting_title만 변경
-                updated_metadatas = []
-                for metadata in subtopic_results['metadatas']:
-                    updated_metadata = metadata.copy()
-                    updated_metadata['meeting_title'] = new_title  # ← meeting_subtopic은 'meeting_title' 필드 사용
-                    updated_metadatas.append(updated_metadata)
-
-                # 일괄 업데이트
-                subtopic_collection.update(
-                    ids=subtopic_ids,
-                    metadatas=updated_metadatas
-                )
-                updated_subtopics = len(subtopic_ids)
-                logger.info(f"   ✅ meeting_subtopic: {updated_subtopics}개 문서의 meeting_title 업데이트 완료")
-            else:
-                logger.info(f"   ℹ️ meeting_subtopic: 업데이트할 문서 없음")
-
-            logger.info("-" * 70)
-            logger.info(f"✅ ChromaDB 메타데이터 업데이트 완료")
-            logger.info(f"   • meeting_chunk: {updated_chunks}개")
-            logger.info(f"   • meeting_subtopic: {updated_subtopics}개")
-            logger.info("=" * 70 + "\n")
-
+            for db_type, title_field in self.TITLE_FIELDS.items():
+                store = self.vectorstores[db_type]
+                results = store.get(where={"meeting_id": meeting_id}, include=["metadatas"])
+
+                ids = []
+                metadatas = []
+                for doc_id, metadata in zip(results['ids'], results['metadatas']):
+                    if metadata.get(title_field) == title and metadata.get('meeting_date') == meeting_date:
+                        continue
+                    updated_metadata = dict(metadata)
+                    updated_metadata[title_field] = title
+                    updated_metadata['meeting_date'] = meeting_date
+                    ids.append(doc_id)
+                    metadatas.append(updated_metadata)
+
+                if ids:
+                    store.update_metadata(ids, metadatas)
+                updated[db_type] = len(ids)
+
+            logger.info(f"✅ Vector DB 메타데이터 업데이트 완료: meeting_id={meeting_id}, chunks={updated['chunks']}개, subtopic={updated['subtopic']}개")
             return {
                 'success': True,
-                'updated_chunks': updated_chunks,
-                'updated_subtopics': updated_subtopics
+                'updated_chunks': updated['chunks'],
+                'updated_subtopics': updated['subtopic']
             }
 
         except Exception as e:
-            logger.error(f"❌ ChromaDB 메타데이터 업데이트 실패: {e}")
-            logger.info("=" * 70 + "\n")
+            logger.error(f"❌ Vector DB 메타데이터 업데이트 실패: {e}")
             return {
                 'success': False,
                 'error': str(e),
-                'updated_chunks': updated_chunks,
-                'updated_subtopics': updated_subtopics
+                'updated_chunks': updated['chunks'],
+                'updated_subtopics': updated['subtopic']
             }
 
-    def update_metadata_date(self, meeting_id, new_date):
+    def scan_meeting_metadata(self, db_type, batch_size=1000):
         """
-        ChromaDB의 meeting_chunk와 meeting_subtopic 컬렉션에서
-        해당 meeting_id의 모든 문서 메타데이터의 meeting_date를 업데이트합니다.
+        컬렉션 전체를 배치로 읽어 회의별 (제목, 날짜) 조합을 모읍니다. (SQLite와의 정합성 검사용)
 
         Args:
-            meeting_id (str): 회의 ID
-            new_date (str): 새로운 날짜 (형식: "YYYY-MM-DD HH:MM:SS")
+            db_type (str): 'chunks' 또는 'subtopic'
+            batch_size (int): 한 번에 읽을 문서 수
 
         Returns:
-            dict: 업데이트 결과 {'success': bool, 'updated_chunks': int, 'updated_subtopics': int}
+            dict: {meeting_id: {(title, meeting_date), ...}}
         """
-        logger.info(f"\n📊 [ChromaDB 날짜 메타데이터 업데이트 시작] meeting_id = {meeting_id}")
-        logger.info("=" * 70)
-
-        updated_chunks = 0
-        updated_subtopics = 0
-
-        try:
-            # 1. meeting_chunk 컬렉션 업데이트
-            logger.info(f"[1/2] meeting_chunk 컬렉션 업데이트 중...")
-
-            # ChromaDB 네이티브 컬렉션 가져오기
-            chunk_collection = self.client.get_collection(name=self.COLLECTION_NAMES['chunks'])
-
-            # meeting_id로 문서 조회
-            chunk_results = chunk_collection.get(
-                where={"meeting_id": meeting_id}
-            )
-
-            chunk_ids = chunk_results['ids']
-
-            if chunk_ids:
-                # 모든 문서의 메타데이터에서 meeting_date만 변경
-                updated_metadatas = []
-                for metadata in chunk_results['metadatas']:
-                    updated_metadata = metadata.copy()
-                    updated_metadata['meeting_date'] = new_date
-                    updated_metadatas.append(updated_metadata)
-
-                # 일괄 업데이트
-                chunk_collection.update(
-                    ids=chunk_ids,
-                    metadatas=updated_metadatas
-                )
-                updated_chunks = len(chunk_ids)
-                logger.info(f"   ✅ meeting_chunk: {updated_chunks}개 문서의 meeting_date 업데이트 완료")
-            else:
-                logger.info(f"   ℹ️ meeting_chunk: 업데이트할 문서 없음")
-
-            # 2. meeting_subtopic 컬렉션 업데이트
-            logger.info(f"[2/2] meeting_subtopic 컬렉션 업데이트 중...")
-
-            # ChromaDB 네이티브 컬렉션 가져오기
-            subtopic_collection = self.client.get_collection(name=self.COLLECTION_NAMES['subtopic'])
-
-            # meeting_id로 문서 조회
-            subtopic_results = subtopic_collection.get(
-                where={"meeting_id": meeting_id}
-            )
+        store = self.vectorstores[db_type]
+        title_field = self.TITLE_FIELDS[db_type]
+
+        meetings = {}
+        offset = 0
+        while True:
+            results = store.get(include=["metadatas"], limit=batch_size, offset=offset)
+            metadatas = results.get('metadatas') or []
+            for metadata in metadatas:
+                meeting_id = metadata.get('meeting_id')
+                if meeting_id:
+                    meetings.setdefault(meeting_id, set()).add(
+                        (metadata.get(title_field) or "", metadata.get('meeting_date') or "")
+                    )
+            if len(metadatas) < batch_size:
+                break
+            offset += batch_size
+
+        return meetings
+
+    def scan_legacy_chunk_meetings(self, batch_size=1000):
+        """
+        부모-자식 검색 도입 이전 방식(chunk_level 메타데이터 없음)의 청크가 남아 있는 회의를 찾습니다.
+        (관리자가 재색인할 회의를 고를 때 사용)
 
-            subtopic_ids = subtopic_results['ids']
-
-            if subtopic_ids:
-                # 모든 문서의 메타데이터에서 meeting_date만 변경
-                updated_metadatas = []
-                for metadata in subtopic_results['metadatas']:
-                    updated_metadata = metadata.copy()
-                    updated_metadata['meeting_date'] = new_date
-                    updated_metadatas.append(updated_metadata)
-
-                # 일괄 업데이트
-                subtopic_collection.update(
-                    ids=subtopic_ids,
-                    metadatas=updated_metadatas
-                )
-                updated_subtopics = len(subtopic_ids)
-                logger.info(f"   ✅ meeting_subtopic: {updated_subtopics}개 문서의 meeting_date 업데이트 완료")
-            else:
-                logger.info(f"   ℹ️ meeting_subtopic: 업데이트할 문서 없음")
+        Args:
+            batch_size (int): 한 번에 읽을 문서 수
 
-            logger.info("-" * 70)
-            logger.info(f"✅ ChromaDB 날짜 메타데이터 업데이트 완료")
-            logger.info(f"   • meeting_chunk: {updated_chunks}개")
-            logger.info(f"   • meeting_subtopic: {updated_subtopics}개")
-            logger.info("=" * 70 + "\n")
+        Returns:
+            set: meeting_id 집합
+        """
+        store = self.vectorstores['chunks']
 
-            return {
-                'success': True,
-                'updated_chunks': updated_chunks,
-                'updated_subtopics': updated_subtopics
-            }
+        legacy = set()
+        offset = 0
+        while True:
+            results = store.get(include=["metadatas"], limit=batch_size, offset=offset)
+            metadatas = results.get('metadatas') or []
+            for metadata in metadatas:
+                if metadata.get('meeting_id') and metadata.get('chunk_level') != 'child':
+                    legacy.add(metadata['meeting_id'])
+            if len(metadatas) < batch_size:
+                break
+            offset += batch_size
 
-        except Exception as e:
-            logger.error(f"❌ ChromaDB 날짜 메타데이터 업데이트 실패: {e}")
-            logger.info("=" * 70 + "\n")
-            return {
-                'success': False,
-                'error': str(e),
-                'updated_chunks': updated_chunks,
-                'updated_subtopics': updated_subtopics
-            }
+        return legacy
 
 
 
-# --- 싱글톤 인스턴스 생성 ---
+# --- 싱글톤 인스턴스 (처음 사용할 때 생성) ---
 # DB 파일은 minute_ai/database/vector_db 경로에 저장됩니다.
 # vector_db_path = os.path.join(os.path.dirname(__file__), '..', 'database', 'vector_db')
 upload_folder_path = os.path.join(os.path.dirname(__file__), '..', 'uploads')
-vdb_manager = VectorDBManager(upload_folder=upload_folder_path)
+vdb_manager = services.register("vdb_manager", lambda: VectorDBManager(upload_folder=upload_folder_path))